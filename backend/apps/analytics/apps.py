@@ -0,0 +1,9 @@
+# apps/analytics/apps.py
+from django.apps import AppConfig
+
+
+class AnalyticsConfig(AppConfig):
+    default_auto_field  = 'django.db.models.BigAutoField'
+    name                = 'apps.analytics'
+    label               = 'analytics'
+    verbose_name        = 'Analytics'
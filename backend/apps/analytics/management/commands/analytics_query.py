@@ -0,0 +1,60 @@
+# backend/apps/analytics/management/commands/analytics_query.py
+
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analytics import reports
+from apps.analytics.snapshots import AnalyticsUnavailable, SnapshotMissing, query
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Run ad-hoc SQL, or a named report, in DuckDB over the Parquet '
+        'snapshots. Tables: events, registrations, sessions, quotations, '
+        'quotation_line_items. '
+        'Example: analytics_query "SELECT status, count(*) FROM registrations GROUP BY ALL"'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('sql', nargs='?', help='Query to run')
+        parser.add_argument('--report', choices=sorted(reports.REPORTS),
+                            help='Run a named report instead (needs --organizer)')
+        parser.add_argument('--organizer', help='Username the report is for')
+        parser.add_argument('--limit', type=int, default=100, help='Rows to print; 0 prints all')
+        parser.add_argument('--csv', action='store_true', help='Print CSV instead of a table')
+
+    def handle(self, *args, **options):
+        if bool(options['sql']) == bool(options['report']):
+            raise CommandError('Give either a query or --report')
+        if options['limit'] < 0:
+            raise CommandError('--limit must be zero or positive')
+
+        sql, params = options['sql'], None
+        if options['report']:
+            if not options['organizer']:
+                raise CommandError('--report needs --organizer')
+            try:
+                organizer = User.objects.get(username=options['organizer'])
+            except User.DoesNotExist:
+                raise CommandError(f'No user named "{options["organizer"]}"')
+            sql, params = reports.REPORTS[options['report']].sql, {'organizer': organizer.pk}
+
+        try:
+            columns, rows = query(sql, params, limit=options['limit'] or None)
+        except (AnalyticsUnavailable, SnapshotMissing) as e:
+            raise CommandError(str(e))
+
+        if options['csv']:
+            writer = csv.writer(self.stdout)
+            writer.writerow(columns)
+            writer.writerows(rows)
+            return
+        cells = [[str(c) for c in columns]] + [['' if v is None else str(v) for v in row] for row in rows]
+        widths = [max(len(row[i]) for row in cells) for i in range(len(columns))]
+        for n, row in enumerate(cells):
+            self.stdout.write('  '.join(value.ljust(width) for value, width in zip(row, widths)).rstrip())
+            if n == 0:
+                self.stdout.write('  '.join('-' * width for width in widths))
+        self.stdout.write(self.style.SUCCESS(f'{len(rows)} rows'))
@@ -0,0 +1,119 @@
+# backend/apps/analytics/management/commands/benchmark_analytics.py
+
+import statistics
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.analytics import reports, snapshots
+from apps.events.models import Event, Registration
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Time every analytics report in DuckDB over a fresh snapshot against '
+        'the equivalent ORM aggregate on the database, and check they agree. '
+        'Uses an organizer\'s data, or sample data (--sample-events) created in '
+        'a transaction that is rolled back. Snapshots go to a temporary '
+        'directory.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--organizer', help='Username whose reports to time')
+        parser.add_argument('--sample-events', type=int, default=0,
+                            help='Create this many sample events instead')
+        parser.add_argument('--sample-attendees', type=int, default=2000,
+                            help='Registrations per sample event')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Runs per measurement; the median is reported')
+
+    def handle(self, *args, **options):
+        if bool(options['organizer']) == bool(options['sample_events']):
+            raise CommandError('Give either --organizer or --sample-events')
+        if options['repeat'] < 1 or options['sample_events'] < 0 or options['sample_attendees'] < 1:
+            raise CommandError('--repeat and the sample sizes must be positive')
+        if snapshots.duckdb is None:
+            raise CommandError('Analytics need duckdb: pip install duckdb')
+
+        with transaction.atomic(), tempfile.TemporaryDirectory() as directory:
+            if options['organizer']:
+                try:
+                    organizer = User.objects.get(username=options['organizer'])
+                except User.DoesNotExist:
+                    raise CommandError(f'No user named "{options["organizer"]}"')
+            else:
+                organizer = self._sample(options['sample_events'], options['sample_attendees'])
+            self._run(organizer, Path(directory), options['repeat'])
+            transaction.set_rollback(True)
+
+    def _median(self, repeat, run):
+        timings, result = [], None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = run()
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings) * 1000, result
+
+    def _run(self, organizer, directory, repeat):
+        started = time.perf_counter()
+        written = snapshots.snapshot(directory=directory)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'Full snapshot: {sum(written.values())} rows in {elapsed:.2f}s '
+            f'({", ".join(f"{n} {name}" for name, n in written.items())})'
+        )
+
+        self.stdout.write(f'{"report":<24} {"rows":>6} {"ORM ms":>9} {"DuckDB ms":>10} {"match":>6}')
+        for name, report in reports.REPORTS.items():
+            orm_ms, expected = self._median(repeat, lambda: report.orm(organizer.pk))
+            try:
+                duck_ms, (_, rows) = self._median(
+                    repeat, lambda: snapshots.query(report.sql, {'organizer': organizer.pk}, directory),
+                )
+            except snapshots.SnapshotMissing:
+                self.stdout.write(f'{name:<24} {"-":>6} {orm_ms:>9.1f} {"no data":>10}')
+                continue
+            match = [tuple(row) for row in rows] == [tuple(row) for row in expected]
+            self.stdout.write(
+                f'{name:<24} {len(rows):>6} {orm_ms:>9.1f} {duck_ms:>10.1f} {"yes" if match else "NO":>6}'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            'DuckDB ms includes opening the snapshot views; ORM ms is the live '
+            'database. A NO in match means the snapshot and the database disagree.'
+        ))
+
+    def _sample(self, events, attendees):
+        now = timezone.now()
+        organizer = User.objects.create_user(username='benchmark-organizer', email='bench@example.com')
+        users = User.objects.bulk_create(
+            User(username=f'benchmark-{i}', email=f'benchmark-{i}@example.com')
+            for i in range(attendees)
+        )
+        statuses = ['confirmed', 'confirmed', 'pending', 'cancelled']
+        for n in range(events):
+            event = Event.objects.create(
+                title=f'Analytics benchmark {n}', slug=f'analytics-benchmark-{n}', description='-',
+                start_date=now + timedelta(days=30 + n), end_date=now + timedelta(days=31 + n),
+                registration_start=now, registration_end=now + timedelta(days=20),
+                venue_name='-', venue_address='-', city='-', country='-',
+                capacity=attendees, organizer=organizer,
+            )
+            Registration.objects.bulk_create(
+                (
+                    Registration(
+                        event=event, attendee=user, status=statuses[i % len(statuses)],
+                        confirmation_date=now if i % 4 < 2 else None,
+                        cancelled_at=now if i % 4 == 3 else None,
+                        checked_in_at=now if i % 8 == 0 else None,
+                    )
+                    for i, user in enumerate(users)
+                ),
+                batch_size=1000,
+            )
+        return organizer
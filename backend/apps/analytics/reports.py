@@ -0,0 +1,156 @@
+# =============================================================================
+# apps/analytics/reports.py
+# =============================================================================
+# Named reports over the Parquet snapshots (apps/analytics/snapshots.py),
+# each scoped to one organizer.
+#
+# Every report carries the DuckDB SQL the API runs and the equivalent ORM
+# aggregate on the live database. benchmark_analytics times the two against
+# each other and checks they agree; the ORM side is never used to serve a
+# request.
+# =============================================================================
+
+from dataclasses import dataclass
+from typing import Callable
+
+from django.db.models import Count, DateField, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from apps.events.models import Event
+from apps.mice.models import Quotation, QuotationLineItem, QuotationStatus
+from apps.session_manager.models import Session
+
+from . import snapshots
+
+
+@dataclass
+class Report:
+    description:    str
+    sql:            str
+    orm:            Callable
+
+
+def _registrations(**where):
+    return Count('registrations', filter=Q(**where) if where else None)
+
+
+def _registrations_by_event(organizer_id):
+    return list(
+        Event.objects.filter(organizer_id=organizer_id)
+        .annotate(
+            registration_count=_registrations(),
+            confirmed=_registrations(registrations__status='confirmed'),
+            waitlisted=_registrations(registrations__status='waitlisted'),
+            cancelled=_registrations(registrations__cancelled_at__isnull=False),
+            attended=_registrations(registrations__checked_in_at__isnull=False),
+        )
+        .order_by('-start_date', 'id')
+        .values_list(
+            'id', 'title', 'start_date', 'registration_count',
+            'confirmed', 'waitlisted', 'cancelled', 'attended',
+        )
+    )
+
+
+def _revenue_by_month(organizer_id):
+    return list(
+        Quotation.objects.filter(
+            mice_project__organizer_id=organizer_id,
+            status=QuotationStatus.APPROVED, approved_at__isnull=False,
+        )
+        .annotate(month=TruncMonth('approved_at', output_field=DateField()))
+        .order_by('month')
+        .values('month')
+        .annotate(quotations=Count('pk'), revenue=Sum('total_after_tax'), net_margin=Sum('net_margin'))
+        .values_list('month', 'quotations', 'revenue', 'net_margin')
+    )
+
+
+def _sessions_by_format(organizer_id):
+    return list(
+        Session.objects.filter(event__organizer_id=organizer_id)
+        .values('session_format', 'level')
+        .annotate(sessions=Count('pk'), minutes=Sum('duration_minutes'))
+        .order_by('-sessions', 'session_format', 'level')
+        .values_list('session_format', 'level', 'sessions', 'minutes')
+    )
+
+
+def _top_line_items(organizer_id):
+    return list(
+        QuotationLineItem.objects.filter(
+            section__quotation__mice_project__organizer_id=organizer_id,
+            section__quotation__status=QuotationStatus.APPROVED,
+        )
+        .values('item_key', 'vol_unit')
+        .annotate(lines=Count('pk'), cost=Sum('total_modal'), billed=Sum('total_client'))
+        .order_by('-billed', 'item_key', 'vol_unit')
+        .values_list('item_key', 'vol_unit', 'lines', 'cost', 'billed')[:50]
+    )
+
+
+REPORTS = {
+    'registrations_by_event': Report(
+        'Registrations, confirmations, waitlist, cancellations and check-ins per event',
+        """
+        SELECT e.id AS event, e.title, e.start_date,
+               count(r.id) AS registrations,
+               count(r.id) FILTER (WHERE r.status = 'confirmed') AS confirmed,
+               count(r.id) FILTER (WHERE r.status = 'waitlisted') AS waitlisted,
+               count(r.cancelled_at) AS cancelled,
+               count(r.checked_in_at) AS attended
+        FROM events e
+        LEFT JOIN registrations r ON r.event_id = e.id
+        WHERE e.organizer_id = $organizer
+        GROUP BY e.id, e.title, e.start_date
+        ORDER BY e.start_date DESC, e.id
+        """,
+        _registrations_by_event,
+    ),
+    'revenue_by_month': Report(
+        'Approved quotations, revenue and net margin per month of approval',
+        """
+        SELECT CAST(date_trunc('month', approved_at) AS DATE) AS month,
+               count(*) AS quotations,
+               sum(total_after_tax) AS revenue,
+               sum(net_margin) AS net_margin
+        FROM quotations
+        WHERE organizer_id = $organizer AND status = 'approved' AND approved_at IS NOT NULL
+        GROUP BY month
+        ORDER BY month
+        """,
+        _revenue_by_month,
+    ),
+    'sessions_by_format': Report(
+        'Sessions and programme minutes per format and level',
+        """
+        SELECT s.session_format, s.level, count(*) AS sessions, sum(s.duration_minutes) AS minutes
+        FROM sessions s
+        JOIN events e ON e.id = s.event_id
+        WHERE e.organizer_id = $organizer
+        GROUP BY s.session_format, s.level
+        ORDER BY sessions DESC, s.session_format, s.level
+        """,
+        _sessions_by_format,
+    ),
+    'top_line_items': Report(
+        'The 50 line items billed most across approved quotations',
+        """
+        SELECT li.item_key, li.vol_unit, count(*) AS lines,
+               sum(li.total_modal) AS cost, sum(li.total_client) AS billed
+        FROM quotation_line_items li
+        JOIN quotations q ON q.id = li.quotation_id
+        WHERE q.organizer_id = $organizer AND q.status = 'approved'
+        GROUP BY li.item_key, li.vol_unit
+        ORDER BY billed DESC, li.item_key, li.vol_unit
+        LIMIT 50
+        """,
+        _top_line_items,
+    ),
+}
+
+
+def run(name, organizer_id, directory=None):
+    """A report over the snapshots as {columns, rows: [dict]}"""
+    columns, rows = snapshots.query(REPORTS[name].sql, {'organizer': organizer_id}, directory)
+    return {'columns': columns, 'rows': [dict(zip(columns, row)) for row in rows]}
@@ -0,0 +1,380 @@
+# =============================================================================
+# apps/analytics/snapshots.py
+# =============================================================================
+# Columnar snapshots of the OLTP tables, queried in embedded DuckDB so
+# reporting never runs on the production database.
+#
+# snapshot() copies the rows of every table in TABLES that changed since the
+# table's watermark (the newest updated_at already exported) into a new
+# Parquet partition:
+#
+#   <ANALYTICS_ROOT>/<table>/batch=<run>/part-00000.parquet
+#   <ANALYTICS_ROOT>/_manifest.json          watermarks and row counts
+#
+# Rows are read in chunks (.iterator over the updated_at index) and staged
+# through a CSV temp file that DuckDB turns into typed Parquet, one file per
+# ROWS_PER_FILE rows — memory stays flat however many rows changed.
+#
+# Each run rereads OVERLAP before the watermark, so a transaction that set
+# updated_at before the previous run but committed after it is still
+# exported. A run with no row newer than the watermark writes nothing. A row
+# changed twice lives in two partitions: connect() exposes every table as a
+# view of the newest version per id.
+#
+# A watermark cannot see deletes; `snapshot_analytics --full` rewrites a
+# table from scratch, which also compacts its partitions.
+#
+# Counters kept with queryset updates that leave updated_at alone
+# (Event.current_attendees and the waitlist / attendance counters, Session
+# is_ongoing / has_ended) are not exported — they follow from registrations
+# and session times.
+#
+# Settings (optional):
+#   ANALYTICS_ROOT     where snapshots live        (BASE_DIR / 'snapshots')
+#
+# Needs duckdb (requirements.txt); without it snapshot() and connect() raise
+# AnalyticsUnavailable.
+# =============================================================================
+
+import csv
+import datetime
+import itertools
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.events.models import Event, Registration
+from apps.mice.models import Quotation, QuotationLineItem
+from apps.session_manager.models import Session
+
+try:
+    import duckdb
+except ImportError:  # pragma: no cover — optional
+    duckdb = None
+
+OVERLAP         = datetime.timedelta(minutes=5)
+CHUNK_SIZE      = 2000
+ROWS_PER_FILE   = 250_000
+NULL            = '\\N'
+MANIFEST        = '_manifest.json'
+
+DUCK_TYPES = {
+    'AutoField':                    'BIGINT',
+    'BigAutoField':                 'BIGINT',
+    'SmallIntegerField':            'BIGINT',
+    'IntegerField':                 'BIGINT',
+    'BigIntegerField':              'BIGINT',
+    'PositiveSmallIntegerField':    'BIGINT',
+    'PositiveIntegerField':         'BIGINT',
+    'BooleanField':                 'BOOLEAN',
+    'DateField':                    'DATE',
+    'DateTimeField':                'TIMESTAMPTZ',
+    'UUIDField':                    'UUID',
+}
+
+
+class AnalyticsUnavailable(RuntimeError):
+    """duckdb is not installed"""
+
+
+class SnapshotMissing(LookupError):
+    """A query names a table that has not been snapshotted yet"""
+
+
+@dataclass
+class Table:
+    """
+    One snapshotted table. `columns` are field names, or (column, lookup)
+    pairs for values denormalized from related rows.
+    """
+    name:       str
+    model:      type
+    columns:    list
+
+    @property
+    def lookups(self):
+        return [c[1] if isinstance(c, tuple) else c for c in self.columns]
+
+    @property
+    def names(self):
+        return [c[0] if isinstance(c, tuple) else c for c in self.columns]
+
+    def types(self):
+        return [duck_type(self.model, lookup) for lookup in self.lookups]
+
+
+MONEY = [
+    'subtotal_modal', 'subtotal_client', 'fee_management_amt', 'total_before_tax',
+    'ppn_amt', 'total_after_tax', 'total_margin', 'sodaqoh_amt', 'net_margin',
+]
+
+TABLES = {table.name: table for table in [
+    Table('events', Event, [
+        'id', 'title', 'slug', 'event_type', 'status', 'start_date', 'end_date',
+        'registration_start', 'registration_end', 'city', 'country', 'capacity',
+        'organizer_id', 'created_at', 'updated_at',
+    ]),
+    Table('registrations', Registration, [
+        'id', 'event_id', 'attendee_id', 'status', 'waitlist_rank', 'registration_date',
+        'confirmation_date', 'checked_in_at', 'cancelled_at', 'created_at', 'updated_at',
+    ]),
+    Table('sessions', Session, [
+        'id', 'event_id', 'track_id', 'title', 'session_format', 'level', 'start_time',
+        'end_time', 'duration_minutes', 'room', 'max_attendees', 'created_at', 'updated_at',
+    ]),
+    Table('quotations', Quotation, [
+        'id', 'mice_project_id',
+        ('organizer_id', 'mice_project__organizer_id'),
+        ('event_id', 'mice_project__event_id'),
+        'revision', 'status', *MONEY,
+        'payment_term_1', 'payment_term_2', 'payment_term_1_due', 'payment_term_2_due',
+        'payment_term_1_paid', 'payment_term_2_paid', 'sent_at', 'approved_at',
+        'created_at', 'updated_at',
+    ]),
+    Table('quotation_line_items', QuotationLineItem, [
+        'id', ('quotation_id', 'section__quotation_id'), 'section_id', 'vendor_id',
+        'item_name', 'item_key', 'vol_unit', 'dur_unit', 'qty', 'duration',
+        'modal_price', 'margin_pct', 'total_modal', 'margin_amt', 'total_margin',
+        'pph_amt', 'client_price', 'total_client', 'created_at', 'updated_at',
+    ]),
+]}
+
+
+def root():
+    return Path(getattr(settings, 'ANALYTICS_ROOT', Path(settings.BASE_DIR) / 'snapshots'))
+
+
+def _duckdb():
+    if duckdb is None:
+        raise AnalyticsUnavailable('Analytics need duckdb: pip install duckdb')
+    return duckdb
+
+
+def duck_type(model, lookup):
+    """DuckDB column type of the model field `lookup` leads to"""
+    *path, name = lookup.split('__')
+    for step in path:
+        model = model._meta.get_field(step).related_model
+    field = model._meta.get_field(name)
+    while field.is_relation:
+        field = field.target_field
+    kind = field.get_internal_type()
+    if kind == 'DecimalField':
+        return f'DECIMAL({min(field.max_digits, 38)}, {field.decimal_places})'
+    return DUCK_TYPES.get(kind, 'VARCHAR')
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _text(value):
+    if value is None:
+        return NULL
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+# ── Manifest ──────────────────────────────────────────────────────────────────
+
+def read_manifest(directory=None):
+    path = (directory or root()) / MANIFEST
+    if not path.exists():
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_manifest(directory, manifest):
+    path = directory / MANIFEST
+    with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(f'{path}.tmp', path)
+
+
+def watermark(manifest, table):
+    value = manifest.get(table.name, {}).get('watermark')
+    return datetime.datetime.fromisoformat(value) if value else None
+
+
+# ── Writing ───────────────────────────────────────────────────────────────────
+
+def changed_rows(table, since=None):
+    """
+    values_list() of the rows to export: all of them, or those updated
+    since OVERLAP before `since`. None when nothing is newer than `since`.
+    """
+    queryset = table.model._default_manager.all()
+    if since is not None:
+        if not queryset.filter(updated_at__gt=since).exists():
+            return None
+        queryset = queryset.filter(updated_at__gte=since - OVERLAP)
+    return queryset.order_by('updated_at', 'pk').values_list(*table.lookups)
+
+
+def _csv_to_parquet(connection, table, source, target):
+    columns = ', '.join(
+        f'CAST({_quote(name)} AS {kind}) AS {_quote(name)}'
+        for name, kind in zip(table.names, table.types())
+    )
+    connection.execute(
+        f'COPY (SELECT {columns} FROM read_csv({_literal(source)}, header = true, '
+        f"delim = ',', quote = '\"', escape = '\"', all_varchar = true, "
+        f'nullstr = {_literal(NULL)})) '
+        f'TO {_literal(f"{target}.tmp")} (FORMAT PARQUET, COMPRESSION ZSTD)'
+    )
+    os.replace(f'{target}.tmp', target)
+
+
+def write_parts(connection, table, rows, directory, rows_per_file=ROWS_PER_FILE):
+    """
+    Stream `rows` into Parquet files of up to `rows_per_file` rows in
+    `directory`. Returns (rows written, newest updated_at).
+    """
+    updated = table.names.index('updated_at')
+    rows = iter(rows)
+    count, newest = 0, None
+    directory.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory() as staging:
+        for part in itertools.count():
+            source = os.path.join(staging, f'part-{part:05d}.csv')
+            written = 0
+            with open(source, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(table.names)
+                for row in itertools.islice(rows, rows_per_file):
+                    writer.writerow([_text(value) for value in row])
+                    if newest is None or row[updated] > newest:
+                        newest = row[updated]
+                    written += 1
+            if written:
+                _csv_to_parquet(connection, table, source, directory / f'part-{part:05d}.parquet')
+                count += written
+            if written < rows_per_file:
+                return count, newest
+
+
+def _replace_table(directory, table, staged):
+    """Swap a fully rewritten table in for the old one"""
+    current = directory / table.name
+    retired = directory / f'.{table.name}.retired'
+    if retired.exists():
+        shutil.rmtree(retired)
+    if current.exists():
+        os.replace(current, retired)
+    os.replace(staged, current)
+    shutil.rmtree(retired, ignore_errors=True)
+
+
+def snapshot_table(connection, table, manifest, run, directory, full=False, rows_per_file=ROWS_PER_FILE):
+    """Export one table's changes (or all of it). Returns the rows written."""
+    since = None if full else watermark(manifest, table)
+    rows = changed_rows(table, since)
+    if rows is None:
+        return 0
+
+    if full:
+        staged = directory / f'.{table.name}.{run}'
+        count, newest = write_parts(
+            connection, table, rows.iterator(chunk_size=CHUNK_SIZE),
+            staged / f'batch={run}', rows_per_file,
+        )
+        _replace_table(directory, table, staged)
+    else:
+        count, newest = write_parts(
+            connection, table, rows.iterator(chunk_size=CHUNK_SIZE),
+            directory / table.name / f'batch={run}', rows_per_file,
+        )
+
+    state = {} if full else dict(manifest.get(table.name, {}))
+    if newest is not None and (since is None or newest > since):
+        state['watermark'] = newest.isoformat()
+    state['rows'] = state.get('rows', 0) + count
+    state['last_run'] = run
+    manifest[table.name] = state
+    return count
+
+
+def snapshot(tables=None, full=False, directory=None, rows_per_file=ROWS_PER_FILE):
+    """
+    One export pass over `tables` (names; default all). Returns
+    {table: rows written}.
+    """
+    connection = _duckdb().connect()
+    directory = directory or root()
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = read_manifest(directory)
+    run = timezone.now().astimezone(datetime.timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')
+    written = {}
+    try:
+        for name in tables or TABLES:
+            written[name] = snapshot_table(
+                connection, TABLES[name], manifest, run, directory, full, rows_per_file,
+            )
+            # After every table, so a failure keeps the progress made
+            _write_manifest(directory, manifest)
+    finally:
+        connection.close()
+    return written
+
+
+# ── Reading ───────────────────────────────────────────────────────────────────
+
+def connect(directory=None):
+    """
+    An in-memory DuckDB connection with one view per snapshotted table,
+    holding the newest version of every row. Tables never snapshotted are
+    left out, so queries naming them raise SnapshotMissing.
+    """
+    connection = _duckdb().connect()
+    # Month and day buckets of TIMESTAMPTZ columns follow the project's zone
+    connection.execute(f'SET TimeZone = {_literal(settings.TIME_ZONE)}')
+    directory = directory or root()
+    manifest = read_manifest(directory)
+    for table in TABLES.values():
+        files = directory / table.name
+        if not any(files.glob('batch=*/*.parquet')):
+            if table.name in manifest:
+                # Snapshotted while empty: an empty view of the right shape
+                columns = ', '.join(
+                    f'CAST(NULL AS {kind}) AS {_quote(name)}' for name, kind in zip(table.names, table.types())
+                )
+                connection.execute(f'CREATE VIEW {_quote(table.name)} AS SELECT {columns} WHERE false')
+            continue
+        pattern = str(files / 'batch=*' / '*.parquet')
+        connection.execute(
+            f'CREATE VIEW {_quote(table.name)} AS '
+            f'SELECT * EXCLUDE (batch) FROM read_parquet({_literal(pattern)}, hive_partitioning = true) '
+            f'QUALIFY row_number() OVER (PARTITION BY id ORDER BY updated_at DESC, batch DESC) = 1'
+        )
+    return connection
+
+
+def query(sql, params=None, directory=None, limit=None):
+    """
+    Run `sql` over the snapshots, with `params` bound to ? (a list) or
+    $name (a dict) placeholders. Returns (column names, rows).
+    """
+    connection = connect(directory)
+    try:
+        cursor = connection.execute(sql, params or [])
+        columns = [column[0] for column in cursor.description]
+        rows = cursor.fetchmany(limit) if limit else cursor.fetchall()
+    except duckdb.CatalogException as e:
+        raise SnapshotMissing(f'{e} — run `manage.py snapshot_analytics` first')
+    finally:
+        connection.close()
+    return columns, rows
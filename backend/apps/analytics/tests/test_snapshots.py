@@ -0,0 +1,123 @@
+# backend/apps/analytics/tests/test_snapshots.py
+
+import pytest
+from datetime import timedelta
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.analytics import reports, snapshots
+from apps.events.models import Event, Registration
+from apps.users.models import User
+
+needs_duckdb = pytest.mark.skipif(snapshots.duckdb is None, reason='duckdb is not installed')
+
+
+@pytest.fixture(autouse=True)
+def analytics_root(settings, tmp_path):
+    settings.ANALYTICS_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def organizer():
+    return User.objects.create_user(username='organizer', email='organizer@test.com', role='organizer')
+
+
+@pytest.fixture
+def event(organizer):
+    now = timezone.now()
+    return Event.objects.create(
+        title='Jakarta Summit', slug='jakarta-summit', description='Summit',
+        event_type='conference', status='published',
+        start_date=now + timedelta(days=30), end_date=now + timedelta(days=31),
+        registration_start=now - timedelta(days=1), registration_end=now + timedelta(days=20),
+        venue_name='JCC', venue_address='Senayan', city='Jakarta', country='Indonesia',
+        capacity=10, organizer=organizer,
+    )
+
+
+@pytest.fixture
+def registrations(event):
+    return [
+        Registration.objects.create(
+            event=event,
+            attendee=User.objects.create_user(username=f'guest{i}', email=f'guest{i}@test.com'),
+            status='confirmed' if i % 2 else 'pending',
+        )
+        for i in range(4)
+    ]
+
+
+@pytest.mark.django_db
+class TestSnapshots:
+
+    def test_changed_rows_follow_the_watermark(self, registrations):
+        table = snapshots.TABLES['registrations']
+        since = timezone.now() - timedelta(hours=1)
+        first, second, *_ = registrations
+        Registration.objects.update(updated_at=since - timedelta(hours=1))
+        assert snapshots.changed_rows(table, since) is None
+
+        # A row committed late, inside the overlap, rides along with a newer one
+        Registration.objects.filter(pk=first.pk).update(updated_at=since - timedelta(minutes=1))
+        Registration.objects.filter(pk=second.pk).update(updated_at=since + timedelta(minutes=1))
+        rows = snapshots.changed_rows(table, since)
+        assert [row[0] for row in rows] == [first.pk, second.pk]
+        assert len(snapshots.changed_rows(table)) == 4
+
+    def test_column_types(self):
+        quotations = dict(zip(snapshots.TABLES['quotations'].names, snapshots.TABLES['quotations'].types()))
+        assert quotations['id'] == 'UUID'
+        assert quotations['organizer_id'] == 'BIGINT'
+        assert quotations['total_after_tax'] == 'DECIMAL(16, 2)'
+        assert quotations['payment_term_1_due'] == 'DATE'
+        assert quotations['approved_at'] == 'TIMESTAMPTZ'
+
+    def test_orm_equivalents(self, organizer, event, registrations):
+        registrations[1].cancel()
+        rows = reports.REPORTS['registrations_by_event'].orm(organizer.pk)
+        assert rows == [(event.pk, event.title, event.start_date, 4, 1, 0, 1, 0)]
+        for report in reports.REPORTS.values():
+            report.orm(organizer.pk)
+
+    def test_report_api(self, organizer):
+        client = APIClient()
+        client.force_authenticate(user=organizer)
+        listing = client.get('/api/v1/analytics/reports/').data
+        assert [r['name'] for r in listing['reports']] == list(reports.REPORTS)
+        assert listing['snapshots']['events'] is None
+
+        # Nothing snapshotted (or no duckdb): unavailable, never the live database
+        assert client.get('/api/v1/analytics/reports/revenue_by_month/').status_code == 503
+        assert client.get('/api/v1/analytics/reports/nope/').status_code == 404
+
+
+@needs_duckdb
+@pytest.mark.django_db
+class TestDuckDB:
+
+    def test_incremental_snapshots_match_the_orm(self, analytics_root, organizer, event, registrations):
+        written = snapshots.snapshot()
+        assert written['registrations'] == 4 and written['events'] == 1
+        assert snapshots.snapshot()['registrations'] == 0
+
+        registrations[0].confirm()
+        written = snapshots.snapshot(['registrations'])
+        assert 1 <= written['registrations'] <= 4
+        assert len(list((analytics_root / 'registrations').glob('batch=*'))) == 2
+
+        columns, rows = snapshots.query('SELECT count(*), count(*) FILTER (WHERE status = ?) FROM registrations',
+                                        ['confirmed'])
+        assert rows == [(4, 3)]
+        for name, report in reports.REPORTS.items():
+            try:
+                result = reports.run(name, organizer.pk)
+            except snapshots.SnapshotMissing:
+                continue
+            assert [tuple(r.values()) for r in result['rows']] == [tuple(r) for r in report.orm(organizer.pk)]
+
+    def test_full_snapshot_drops_deleted_rows(self, registrations):
+        snapshots.snapshot(['registrations'])
+        Registration.objects.get(pk=registrations[0].pk).delete()
+        snapshots.snapshot(['registrations'], full=True)
+        _, rows = snapshots.query('SELECT count(*) FROM registrations')
+        assert rows == [(3,)]
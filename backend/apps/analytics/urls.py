@@ -0,0 +1,13 @@
+# apps/analytics/urls.py
+
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+
+from .views import ReportViewSet
+
+router = DefaultRouter()
+router.register(r'reports', ReportViewSet, basename='analytics-report')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -0,0 +1,41 @@
+# apps/analytics/views.py
+
+from rest_framework import status, viewsets
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from . import reports, snapshots
+
+
+class ReportViewSet(viewsets.ViewSet):
+    """
+    Organizer reports computed in DuckDB over the Parquet snapshots, never
+    on the live database — figures are as fresh as the last
+    snapshot_analytics run.
+
+    list:     GET /api/v1/analytics/reports/
+    retrieve: GET /api/v1/analytics/reports/{name}/
+    """
+    permission_classes = [IsAuthenticated]
+    lookup_value_regex = '[a-z_]+'
+
+    def list(self, request):
+        manifest = snapshots.read_manifest()
+        return Response({
+            'reports': [
+                {'name': name, 'description': report.description}
+                for name, report in reports.REPORTS.items()
+            ],
+            'snapshots': {
+                name: manifest.get(name, {}).get('watermark') for name in snapshots.TABLES
+            },
+        })
+
+    def retrieve(self, request, pk=None):
+        if pk not in reports.REPORTS:
+            return Response({'detail': f'No report named "{pk}"'}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            result = reports.run(pk, request.user.pk)
+        except (snapshots.AnalyticsUnavailable, snapshots.SnapshotMissing) as e:
+            return Response({'detail': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return Response({'report': pk, **result})
@@ -0,0 +1,59 @@
+# ============================================
+# apps/events/cache.py
+# ============================================
+# Per-event cache versions.
+#
+# Cached event payloads (EventViewSet.retrieve) are keyed by the event's
+# version. Anything that changes what they show bumps it with
+# invalidate(): Event / Registration / Session / Track saves on commit,
+# and the lifecycle job (apps/events/lifecycle.py) for exactly the events
+# whose status it advanced — other events keep their cache.
+#
+# All of this only runs on a cache shared by every process (redis,
+# memcached, database). With a per-process LocMemCache, invalidations from
+# one gunicorn worker or a management command never reach the others, so
+# nothing is cached and invalidate() does nothing.
+# ============================================
+
+import time
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+DETAIL_TIMEOUT = 5 * 60
+
+
+def shared():
+    """True when the default cache is visible to every process"""
+    return not isinstance(caches['default'], (LocMemCache, DummyCache))
+
+
+def _version_key(event_id):
+    return f'events:{event_id}:version'
+
+
+def version(event_id):
+    value = cache.get(_version_key(event_id))
+    if value is None:
+        value = time.time_ns()
+        cache.add(_version_key(event_id), value, None)
+        value = cache.get(_version_key(event_id), value)
+    return value
+
+
+def invalidate(*event_ids):
+    if not shared():
+        return
+    for event_id in {e for e in event_ids if e}:
+        cache.set(_version_key(event_id), time.time_ns(), None)
+
+
+def invalidate_on_commit(event_id):
+    transaction.on_commit(lambda: invalidate(event_id))
+
+
+def detail_key(event_id, request):
+    # Image URLs are absolute, so the host is part of the key
+    return f'events:detail:{event_id}:{version(event_id)}:{request.build_absolute_uri("/")}'
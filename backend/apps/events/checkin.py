@@ -0,0 +1,322 @@
+# ============================================
+# apps/events/checkin.py
+# ============================================
+# QR ticket check-in at the door.
+#
+# A ticket is "<event id>.<registration id>" signed with the project's
+# SECRET_KEY (django.core.signing), so a scan is verified without touching
+# the database. A valid scan then costs:
+#
+#   event      — one conditional UPDATE pending/confirmed → attended, plus
+#                one UPDATE of Event.attended_count and one of the day's
+#                RegistrationDailyStat (apps/events/stats.py) when it matched
+#   sub-event  — the SubEvent.attended_count UPDATE (which also holds the
+#                sub-event's row lock) and one INSERT into SubEventCheckIn,
+#                whose unique (sub_event, registration) constraint turns a
+#                double scan into a no-op
+#
+# Door staff are the event's organizer: the organizer is part of every
+# UPDATE's WHERE clause, not a separate lookup. Only scans that do not
+# check anybody in read the registration, to say why.
+#
+# sync() takes the backlog of a scanner that was offline: scans are
+# deduped in memory (earliest scan wins), then applied in chunks with one
+# locking read, one bulk update and one counter update per chunk.
+# ============================================
+
+import uuid
+from collections import Counter, defaultdict
+
+from django.core import signing
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+import segno
+
+from . import stats
+from .models import Event, Registration
+
+SALT = 'events.ticket'
+CHECK_IN_STATUSES = ['pending', 'confirmed']
+CHUNK_SIZE = 500
+MAX_SYNC_SCANS = 10000
+
+# Scan results
+CHECKED_IN = 'checked_in'
+ALREADY = 'already_checked_in'
+NOT_ELIGIBLE = 'not_eligible'
+INVALID = 'invalid'
+
+
+class InvalidTicket(ValueError):
+    """The token was not issued by this server, or was altered"""
+
+
+# ── Tokens ───────────────────────────────────────────────────────────────────
+
+def ticket_token(registration):
+    return signing.Signer(salt=SALT).sign(f'{registration.event_id}.{registration.pk}')
+
+
+def read_token(token):
+    """(event id, registration id) of a ticket token — no database access"""
+    try:
+        value = signing.Signer(salt=SALT).unsign(str(token).strip())
+        event_id, registration_id = (int(part) for part in value.split('.'))
+    except (signing.BadSignature, ValueError):
+        raise InvalidTicket('Not a valid ticket')
+    return event_id, registration_id
+
+
+def qr_code(registration, kind='svg'):
+    """The ticket as an SVG or PNG QR code"""
+    qr = segno.make(ticket_token(registration), error='m')
+    return qr.png_data_uri(scale=6) if kind == 'png' else qr.svg_inline(scale=6)
+
+
+# ── Live scans ───────────────────────────────────────────────────────────────
+
+def _why_not(user, event_id, registration_id):
+    status = (
+        Registration.objects.filter(pk=registration_id, event_id=event_id, event__organizer=user)
+        .values_list('status', flat=True).first()
+    )
+    return ALREADY if status == 'attended' else NOT_ELIGIBLE
+
+
+def check_in(user, token, sub_event_id=None, at=None):
+    """
+    Check the ticket holder in at the event, and at `sub_event_id` when
+    given (which implies the event). Returns {result, event, registration}.
+    """
+    try:
+        event_id, registration_id = read_token(token)
+    except InvalidTicket:
+        return {'result': INVALID, 'event': None, 'registration': None}
+    at = at or timezone.now()
+
+    with transaction.atomic():
+        admitted = Registration.objects.filter(
+            pk=registration_id, event_id=event_id, event__organizer=user,
+            status__in=CHECK_IN_STATUSES,
+        ).update(status='attended', checked_in_at=at, updated_at=at)
+        if admitted:
+            Event.objects.filter(pk=event_id).update(attended_count=F('attended_count') + 1)
+            stats.bump(event_id, at, attended=1)
+            result = CHECKED_IN
+        else:
+            result = _why_not(user, event_id, registration_id)
+
+        if sub_event_id and result != NOT_ELIGIBLE:
+            result = _check_in_sub_event(user, event_id, registration_id, sub_event_id, at)
+
+    return {'result': result, 'event': event_id, 'registration': registration_id}
+
+
+def _check_in_sub_event(user, event_id, registration_id, sub_event_id, at):
+    from apps.mice.models import SubEvent, SubEventCheckIn
+
+    counted = SubEvent.objects.filter(
+        pk=sub_event_id, mice_project__event_id=event_id, mice_project__event__organizer=user,
+    ).update(attended_count=F('attended_count') + 1)
+    if not counted:
+        return NOT_ELIGIBLE
+    try:
+        with transaction.atomic():
+            SubEventCheckIn.objects.create(
+                sub_event_id=sub_event_id, registration_id=registration_id,
+                checked_in_at=at, checked_in_by=user,
+            )
+    except IntegrityError:
+        SubEvent.objects.filter(pk=sub_event_id).update(attended_count=F('attended_count') - 1)
+        return ALREADY
+    return CHECKED_IN
+
+
+# ── Offline sync ─────────────────────────────────────────────────────────────
+
+def _parse_scans(scans, now):
+    """
+    {(registration, sub_event): (event, scanned_at, [scan indexes])} with
+    the earliest time of every double scan, and {index: result} of the
+    scans rejected outright.
+    """
+    unique, rejected = {}, {}
+    for index, scan in enumerate(scans):
+        if not isinstance(scan, dict):
+            rejected[index] = INVALID
+            continue
+        try:
+            event_id, registration_id = read_token(scan.get('token', ''))
+        except InvalidTicket:
+            rejected[index] = INVALID
+            continue
+        scanned_at = scan.get('scanned_at')
+        try:
+            scanned_at = parse_datetime(scanned_at) if isinstance(scanned_at, str) else None
+        except ValueError:
+            # Well-formed but impossible, e.g. month 13
+            rejected[index] = INVALID
+            continue
+        if scanned_at is None:
+            scanned_at = now
+        elif timezone.is_naive(scanned_at):
+            scanned_at = timezone.make_aware(scanned_at)
+        scanned_at = min(scanned_at, now)
+        sub_event_id = None
+        if scan.get('sub_event'):
+            try:
+                sub_event_id = str(uuid.UUID(str(scan['sub_event'])))
+            except ValueError:
+                rejected[index] = INVALID
+                continue
+        key = (registration_id, sub_event_id)
+        if key in unique:
+            event, earliest, indexes = unique[key]
+            indexes.append(index)
+            unique[key] = (event, min(earliest, scanned_at), indexes)
+        else:
+            unique[key] = (event_id, scanned_at, [index])
+    return unique, rejected
+
+
+def _sync_event_level(user, first_scans):
+    """
+    Admit every registration of `first_scans` ({registration: (event,
+    scanned_at)}). Returns {registration: result}.
+    """
+    results = {}
+    registration_ids = list(first_scans)
+    for start in range(0, len(registration_ids), CHUNK_SIZE):
+        chunk = registration_ids[start:start + CHUNK_SIZE]
+        with transaction.atomic():
+            rows = (
+                Registration.objects.select_for_update(of=('self',))
+                .filter(pk__in=chunk, event__organizer=user)
+                .values_list('pk', 'event_id', 'status')
+            )
+            admitted, per_event = [], defaultdict(list)
+            for pk, event_id, status in rows:
+                if event_id != first_scans[pk][0]:
+                    continue
+                if status in CHECK_IN_STATUSES:
+                    at = first_scans[pk][1]
+                    admitted.append(Registration(pk=pk, status='attended', checked_in_at=at, updated_at=at))
+                    per_event[event_id].append(at)
+                    results[pk] = CHECKED_IN
+                elif status == 'attended':
+                    results[pk] = ALREADY
+            Registration.objects.bulk_update(admitted, ['status', 'checked_in_at', 'updated_at'])
+            for event_id, times in per_event.items():
+                Event.objects.filter(pk=event_id).update(attended_count=F('attended_count') + len(times))
+                stats.bump_many(event_id, 'attended', times)
+    return results
+
+
+def _sync_sub_events(user, pairs):
+    """
+    Record sub-event check-ins ({(registration, sub_event): (event,
+    scanned_at)}) under the sub-events' row locks. Returns {pair: result}.
+    """
+    from apps.mice.models import SubEvent, SubEventCheckIn
+
+    results = {}
+    by_sub_event = defaultdict(dict)
+    for (registration_id, sub_event_id), value in pairs.items():
+        by_sub_event[sub_event_id][registration_id] = value
+
+    with transaction.atomic():
+        sub_events = dict(
+            SubEvent.objects.select_for_update(of=('self',))
+            .filter(pk__in=list(by_sub_event), mice_project__event__organizer=user)
+            .values_list('pk', 'mice_project__event_id')
+        )
+        sub_events = {str(pk): event_id for pk, event_id in sub_events.items()}
+        for sub_event_id, scans in by_sub_event.items():
+            registration_ids = [r for r, (event_id, _) in scans.items() if sub_events.get(sub_event_id) == event_id]
+            done = set()
+            for start in range(0, len(registration_ids), CHUNK_SIZE):
+                done.update(
+                    SubEventCheckIn.objects.filter(
+                        sub_event_id=sub_event_id, registration_id__in=registration_ids[start:start + CHUNK_SIZE],
+                    ).values_list('registration_id', flat=True)
+                )
+            fresh = [
+                SubEventCheckIn(
+                    sub_event_id=sub_event_id, registration_id=r,
+                    checked_in_at=scans[r][1], checked_in_by=user,
+                )
+                for r in registration_ids if r not in done
+            ]
+            SubEventCheckIn.objects.bulk_create(fresh, batch_size=CHUNK_SIZE)
+            if fresh:
+                SubEvent.objects.filter(pk=sub_event_id).update(attended_count=F('attended_count') + len(fresh))
+            for r in scans:
+                if r in done:
+                    results[(r, sub_event_id)] = ALREADY
+                elif r in registration_ids:
+                    results[(r, sub_event_id)] = CHECKED_IN
+                else:
+                    results[(r, sub_event_id)] = NOT_ELIGIBLE
+    return results
+
+
+def sync(user, scans):
+    """
+    Apply a batch of offline scans ([{token, sub_event?, scanned_at?}]).
+    Returns {summary: {result: count}, results: [{index, result, registration}]}
+    with one result per scan; repeats of a scan in the batch are 'duplicate'.
+    """
+    now = timezone.now()
+    unique, rejected = _parse_scans(scans, now)
+
+    # Event check-in first: a sub-event scan admits to the event too
+    first_scans = {}
+    for (registration_id, _), (event_id, at, _) in unique.items():
+        if registration_id not in first_scans or at < first_scans[registration_id][1]:
+            first_scans[registration_id] = (event_id, at)
+    event_results = _sync_event_level(user, first_scans)
+
+    pairs = {
+        key: (event_id, at) for key, (event_id, at, _) in unique.items()
+        if key[1] and event_results.get(key[0], NOT_ELIGIBLE) != NOT_ELIGIBLE
+    }
+    sub_event_results = _sync_sub_events(user, pairs) if pairs else {}
+
+    results = [None] * len(scans)
+    for index, result in rejected.items():
+        results[index] = {'index': index, 'result': result, 'registration': None}
+    for key, (_, _, indexes) in unique.items():
+        registration_id, sub_event_id = key
+        if sub_event_id and key in sub_event_results:
+            result = sub_event_results[key]
+        elif sub_event_id:
+            result = NOT_ELIGIBLE
+        else:
+            result = event_results.get(registration_id, NOT_ELIGIBLE)
+        for n, index in enumerate(indexes):
+            results[index] = {
+                'index': index, 'result': result if n == 0 else 'duplicate',
+                'registration': registration_id,
+            }
+    return {'summary': dict(Counter(r['result'] for r in results)), 'results': results}
+
+
+# ── Counters ─────────────────────────────────────────────────────────────────
+
+def attendance(event):
+    """Live attended counters of `event` and its sub-events"""
+    from apps.mice.models import SubEvent
+
+    counters = Event.objects.values('attended_count', 'current_attendees').get(pk=event.pk)
+    return {
+        'event': event.pk,
+        'attended': counters['attended_count'],
+        'registered': counters['current_attendees'],
+        'sub_events': list(
+            SubEvent.objects.filter(mice_project__event=event)
+            .order_by('sort_order', 'start_datetime')
+            .values('id', 'title', 'capacity', attended=F('attended_count'))
+        ),
+    }
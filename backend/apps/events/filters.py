@@ -108,14 +108,7 @@ class EventFilter(django_filters.FilterSet):
         return queryset.filter(start_date__lt=now)
     
     def filter_ongoing(self, queryset, name, value):
-        """Filter currently ongoing events"""
-        now = timezone.now()
+        """Filter currently ongoing events (status kept current by advance_event_status)"""
         if value:
-            return queryset.filter(
-                start_date__lte=now,
-                end_date__gte=now
-            )
-        return queryset.exclude(
-            start_date__lte=now,
-            end_date__gte=now
-        )
\ No newline at end of file
+            return queryset.filter(status='ongoing')
+        return queryset.exclude(status='ongoing')
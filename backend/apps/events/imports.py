@@ -0,0 +1,241 @@
+# ============================================
+# apps/events/imports.py
+# ============================================
+# Bulk attendee import for an event from a CSV file.
+#
+#   parse    — rows validated up front; emails compared case-insensitively,
+#              a repeated email in the file is reported, not imported twice
+#   match    — one query finds the users that already exist for the file's
+#              emails, one more their registrations for this event
+#   hash     — given passwords are hashed in a process pool (PBKDF2 is CPU
+#              bound: one request thread hashing 5,000 passwords takes
+#              minutes); rows without one get an unusable password and an
+#              invite email
+#   insert   — users and registrations go in with bulk_create inside one
+#              transaction that takes all seats with a single conditional
+#              UPDATE (Event.reserve_seats); rows past capacity join the
+#              waitlist with one rank reservation
+#
+# import_attendees() returns one ImportResult per input row; result_csv()
+# renders them as the result file the endpoint sends back.
+# ============================================
+
+import csv
+import io
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.tokens import default_token_generator
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Lower
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from apps.notifications.outbox import enqueue_many
+from . import stats
+from .cache import invalidate
+from .models import Event, Registration
+
+User = get_user_model()
+
+MAX_ROWS = 10000
+BATCH_SIZE = 1000
+PROFILE_FIELDS = ['first_name', 'last_name', 'phone', 'company', 'job_title']
+REGISTRATION_FIELDS = ['dietary_requirements', 'special_requests']
+RESULT_COLUMNS = ['row', 'email', 'result', 'user_id', 'registration_id', 'message']
+
+
+class ImportFileError(ValueError):
+    """The file as a whole cannot be imported"""
+
+
+@dataclass
+class ImportResult:
+    row: int
+    email: str
+    result: str = ''
+    user_id: int = None
+    registration_id: int = None
+    message: str = ''
+
+
+# ── Parsing ──────────────────────────────────────────────────────────────────
+
+def parse(upload):
+    """[(ImportResult, row dict)] of valid rows, and the ImportResults of rejected ones"""
+    try:
+        text = io.TextIOWrapper(upload, encoding='utf-8-sig', newline='')
+        reader = csv.DictReader(text)
+        if not reader.fieldnames or 'email' not in [f.strip().lower() for f in reader.fieldnames]:
+            raise ImportFileError('The file needs a header row with an "email" column')
+        valid, rejected, seen = [], [], set()
+        for number, raw in enumerate(reader, start=2):
+            if number - 1 > MAX_ROWS:
+                raise ImportFileError(f'At most {MAX_ROWS} rows can be imported at once')
+            row = {
+                (key or '').strip().lower(): (value or '').strip()
+                for key, value in raw.items() if isinstance(value, str) or value is None
+            }
+            email = row.get('email', '').lower()
+            result = ImportResult(row=number, email=email)
+            try:
+                validate_email(email)
+            except ValidationError:
+                result.result, result.message = 'invalid', 'Not a valid email address'
+                rejected.append(result)
+                continue
+            if email in seen:
+                result.result, result.message = 'duplicate', 'Email appears earlier in the file'
+                rejected.append(result)
+                continue
+            seen.add(email)
+            valid.append((result, row))
+    except UnicodeDecodeError:
+        raise ImportFileError('The file must be UTF-8 encoded CSV')
+    return valid, rejected
+
+
+# ── Passwords ────────────────────────────────────────────────────────────────
+
+def hash_passwords(passwords, workers=None):
+    """Hashes of `passwords` in order; workers=0 hashes in-process, None uses one process per CPU"""
+    if not passwords:
+        return []
+    if workers == 0 or len(passwords) < 8:
+        return [make_password(p) for p in passwords]
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as executor:
+        return list(executor.map(make_password, passwords, chunksize=32))
+
+
+def _invite(user, event):
+    uid = urlsafe_base64_encode(force_bytes(user.pk))
+    token = default_token_generator.make_token(user)
+    base = getattr(settings, 'FRONTEND_URL', 'https://eventhub.chrisimbolon.dev')
+    return (
+        user.email,
+        f"You're registered for {event.title}",
+        f"Hi {user.get_full_name() or user.email},\n\n"
+        f"{event.organizer.get_full_name() or event.organizer.username} registered you for "
+        f"{event.title} ({timezone.localtime(event.start_date):%d %B %Y}, {event.venue_name}, {event.city}).\n\n"
+        f"An EventHub account was created for you. Choose a password to sign in:\n"
+        f"{base}/activate/{uid}/{token}\n",
+    )
+
+
+# ── Import ───────────────────────────────────────────────────────────────────
+
+def _username(email, taken):
+    username = email[:150]
+    while username in taken:
+        username = f'{email[:140]}-{uuid.uuid4().hex[:8]}'
+    taken.add(username)
+    return username
+
+
+def import_attendees(event, upload, status='confirmed', send_invites=True, workers=None):
+    """Import the CSV `upload` into `event`. Returns ImportResults in file order."""
+    if event.status not in ['draft', 'published', 'ongoing']:
+        raise ImportFileError('Attendees can only be imported into upcoming or running events')
+    valid, results = parse(upload)
+    emails = [result.email for result, _ in valid]
+
+    # One query for the users that already exist, one for their registrations here
+    existing = {}
+    for user in (
+        User.objects.annotate(email_lower=Lower('email'))
+        .filter(email_lower__in=emails).order_by('pk')
+    ):
+        existing.setdefault(user.email_lower, user)
+    registered = dict(
+        Registration.objects.filter(event=event, attendee__in=existing.values())
+        .values_list('attendee_id', 'pk')
+    )
+
+    to_register, new_users, passwords = [], [], []
+    taken = set(
+        User.objects.filter(username__in=[e[:150] for e in emails]).values_list('username', flat=True)
+    )
+    for result, row in valid:
+        user = existing.get(result.email)
+        if user is not None and user.pk in registered:
+            result.result, result.user_id = 'already_registered', user.pk
+            result.registration_id = registered[user.pk]
+            results.append(result)
+            continue
+        if user is None:
+            user = User(
+                username=_username(result.email, taken), email=result.email, role='attendee',
+                **{field: row.get(field, '')[:User._meta.get_field(field).max_length] for field in PROFILE_FIELDS},
+            )
+            new_users.append(user)
+            passwords.append(row.get('password') or None)
+        to_register.append((result, user, row))
+
+    hashes = iter(hash_passwords([p for p in passwords if p], workers))
+    for user, password in zip(new_users, passwords):
+        user.password = next(hashes) if password else make_password(None)
+
+    with transaction.atomic():
+        event = Event.objects.select_for_update().get(pk=event.pk)
+        User.objects.bulk_create(new_users, batch_size=BATCH_SIZE)
+
+        # All seats in one reservation; the rest — or everyone, when people
+        # are already waiting — join the waitlist in file order
+        seats = 0 if event.has_waitlist else min(len(to_register), event.available_spots)
+        if seats and not event.reserve_seats(seats):
+            raise ImportFileError('Seats changed during the import, try again')
+        waiting = len(to_register) - seats
+        if waiting:
+            Event.objects.filter(pk=event.pk).update(waitlist_tail=F('waitlist_tail') + waiting)
+        first_rank = event.waitlist_tail + 1
+
+        now = timezone.now()
+        registrations = []
+        for i, (result, user, row) in enumerate(to_register):
+            seated = i < seats
+            registrations.append(Registration(
+                event=event, attendee=user,
+                status=status if seated else 'waitlisted',
+                waitlist_rank=None if seated else first_rank + i - seats,
+                confirmation_date=now if seated and status == 'confirmed' else None,
+                **{field: row.get(field, '') for field in REGISTRATION_FIELDS},
+            ))
+        Registration.objects.bulk_create(registrations, batch_size=BATCH_SIZE)
+        stats.bump(event.pk, now, registered=len(registrations),
+                   confirmed=sum(r.confirmation_date is not None for r in registrations))
+
+        created = {user.pk for user in new_users}
+        for (result, user, _), registration in zip(to_register, registrations):
+            result.user_id, result.registration_id = user.pk, registration.pk
+            result.result = 'registered' if registration.status != 'waitlisted' else 'waitlisted'
+            result.message = 'New account' if user.pk in created else 'Existing account'
+            results.append(result)
+
+        if send_invites:
+            enqueue_many(
+                [_invite(user, event) for user, password in zip(new_users, passwords) if not password],
+                kind='attendee_invite',
+            )
+        transaction.on_commit(lambda: invalidate(event.pk))
+
+    return sorted(results, key=lambda r: r.row)
+
+
+def result_csv(results):
+    """The per-row result file"""
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(RESULT_COLUMNS)
+    for result in results:
+        writer.writerow([getattr(result, column) if getattr(result, column) is not None else ''
+                         for column in RESULT_COLUMNS])
+    return out.getvalue()
@@ -0,0 +1,78 @@
+# ============================================
+# apps/events/lifecycle.py
+# ============================================
+# Time-driven state of events and sessions, advanced by the
+# advance_event_status job:
+#
+#   events   — published → ongoing once start_date has passed,
+#              published/ongoing → completed once end_date has passed
+#   sessions — is_ongoing / has_ended, materialized so reads filter on
+#              columns instead of comparing times per row
+#   waitlist — sweep for free seats the on-commit promotion missed
+#
+# Every transition is one set-based UPDATE over indexed columns
+# ((status, start_date) for events, the not-ended partial index for
+# sessions). Event.save()/Session.save() are bypassed on purpose: nothing
+# they validate changes with the clock. Only the events that actually
+# changed get their cached payloads invalidated.
+# ============================================
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.session_manager.models import Session
+from .cache import invalidate
+from .models import Event
+from .waitlist import promote_all
+
+
+def advance_events(now=None):
+    """Move events along published → ongoing → completed. Returns (started, completed) ids."""
+    now = now or timezone.now()
+    with transaction.atomic():
+        finished = Event.objects.filter(status__in=['published', 'ongoing'], end_date__lte=now)
+        completed = list(finished.select_for_update(skip_locked=True).values_list('pk', flat=True))
+        Event.objects.filter(pk__in=completed).update(status='completed', updated_at=now)
+
+        running = Event.objects.filter(status='published', start_date__lte=now, end_date__gt=now)
+        started = list(running.select_for_update(skip_locked=True).values_list('pk', flat=True))
+        Event.objects.filter(pk__in=started).update(status='ongoing', updated_at=now)
+
+        transaction.on_commit(lambda: invalidate(*started, *completed))
+    return started, completed
+
+
+def advance_sessions(now=None):
+    """Refresh is_ongoing / has_ended of sessions that have not ended yet. Returns (started, ended) counts."""
+    now = now or timezone.now()
+    pending = Session.objects.filter(has_ended=False)
+    with transaction.atomic():
+        ended_events = set(pending.filter(end_time__lt=now).values_list('event_id', flat=True))
+        ended = pending.filter(end_time__lt=now).update(
+            has_ended=True, is_ongoing=False, updated_at=now,
+        )
+        started_events = set(
+            pending.filter(is_ongoing=False, start_time__lte=now, end_time__gte=now)
+            .values_list('event_id', flat=True)
+        )
+        started = pending.filter(is_ongoing=False, start_time__lte=now, end_time__gte=now).update(
+            is_ongoing=True, updated_at=now,
+        )
+        # Sessions moved back into the future
+        pending.filter(is_ongoing=True, start_time__gt=now).update(is_ongoing=False)
+        transaction.on_commit(lambda: invalidate(*ended_events, *started_events))
+    return started, ended
+
+
+def advance(now=None):
+    """One job tick. Returns counts for the command's summary line."""
+    now = now or timezone.now()
+    started, completed = advance_events(now)
+    sessions_started, sessions_ended = advance_sessions(now)
+    return {
+        'events started': len(started),
+        'events completed': len(completed),
+        'sessions started': sessions_started,
+        'sessions ended': sessions_ended,
+        'waitlist promoted': promote_all(),
+    }
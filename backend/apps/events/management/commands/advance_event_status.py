@@ -0,0 +1,31 @@
+# backend/apps/events/management/commands/advance_event_status.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.events.lifecycle import advance
+
+
+class Command(BaseCommand):
+    help = (
+        'Advance event status (published → ongoing → completed) and session '
+        'ongoing/ended flags by the clock, and fill free seats from waitlists. '
+        'Run from cron, or keep it running with --interval.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Seconds between passes; 0 (default) runs once and exits')
+
+    def handle(self, *args, **options):
+        if options['interval'] < 0:
+            raise CommandError('--interval must be zero or positive')
+
+        while True:
+            counts = advance()
+            summary = ', '.join(f'{n} {name}' for name, n in counts.items())
+            self.stdout.write(self.style.SUCCESS(f'Lifecycle: {summary}'))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
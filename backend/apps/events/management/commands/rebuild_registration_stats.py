@@ -0,0 +1,29 @@
+# backend/apps/events/management/commands/rebuild_registration_stats.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.events.models import Event
+from apps.events.stats import rebuild
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the per-day registration counters from the registrations. '
+        'Run once after migrating, or after bulk changes that bypass the '
+        'Registration methods.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event', help='Event slug — rebuild only this event')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        event = None
+        if options['event']:
+            try:
+                event = Event.objects.get(slug=options['event'])
+            except Event.DoesNotExist:
+                raise CommandError(f'No event with slug "{options["event"]}"')
+
+        rows = rebuild(event, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} daily stat rows'))
@@ -0,0 +1,24 @@
+# QR check-in (apps/events/checkin.py): when a registration was scanned in
+# and the event's live attended counter.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_waitlist'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='attended_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='registration',
+            name='checked_in_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
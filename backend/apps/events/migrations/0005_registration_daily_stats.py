@@ -0,0 +1,50 @@
+# Per-event, per-day registration counters (apps/events/stats.py), and
+# Registration.cancelled_at to date cancellations by. Registrations
+# cancelled before this have no better date than their last update. The
+# counters themselves are filled by `manage.py rebuild_registration_stats`.
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_cancelled_at(apps, schema_editor):
+    Registration = apps.get_model('events', 'Registration')
+    Registration.objects.filter(status='cancelled').update(cancelled_at=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_check_in'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='registration',
+            name='cancelled_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='RegistrationDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('registered', models.IntegerField(default=0)),
+                ('confirmed', models.IntegerField(default=0)),
+                ('cancelled', models.IntegerField(default=0)),
+                ('attended', models.IntegerField(default=0)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='events.event')),
+            ],
+            options={
+                'verbose_name': 'Registration daily stat',
+                'verbose_name_plural': 'Registration daily stats',
+                'ordering': ['event', 'day'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='registrationdailystat',
+            constraint=models.UniqueConstraint(fields=('event', 'day'), name='registration_daily_stat_unique'),
+        ),
+        migrations.RunPython(fill_cancelled_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# updated_at indexes for the analytics snapshots (apps/analytics), which
+# read the rows changed since a watermark.
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_registration_daily_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['updated_at'], name='events_even_updated_1878aa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='registration',
+            index=models.Index(fields=['updated_at'], name='events_regi_updated_cdc79d_idx'),
+        ),
+    ]
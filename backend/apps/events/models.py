@@ -1,6 +1,8 @@
 # backend/apps/events/models.py
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator
 from django.core.exceptions import ValidationError
@@ -20,6 +22,7 @@ class Event(models.Model):
         ('completed', 'Completed'),
         ('cancelled', 'Cancelled'),
     ]
+    COUNTER_FIELDS = ('current_attendees', 'waitlist_head', 'waitlist_tail', 'attended_count')
 
     # Basic Information
     title = models.CharField(max_length=200, db_index=True)
@@ -67,6 +70,14 @@ class Event(models.Model):
         help_text="Current number of registered attendees"
     )
     
+    # Waitlist: ranks waitlist_head+1 .. waitlist_tail are waiting, so a
+    # registration's position is waitlist_rank - waitlist_head
+    waitlist_head = models.PositiveIntegerField(default=0, editable=False)
+    waitlist_tail = models.PositiveIntegerField(default=0, editable=False)
+    
+    # Live check-in counter (apps/events/checkin.py)
+    attended_count = models.PositiveIntegerField(default=0, editable=False)
+    
     # Organizer
     organizer = models.ForeignKey(
         User,
@@ -94,6 +105,8 @@ class Event(models.Model):
             models.Index(fields=['start_date', 'end_date']),
             models.Index(fields=['city', 'country']),
             models.Index(fields=['status', 'start_date']),
+            # Analytics snapshots read changes since a watermark (apps/analytics)
+            models.Index(fields=['updated_at']),
         ]
     
     def __str__(self):
@@ -124,8 +137,42 @@ class Event(models.Model):
             raise ValidationError(errors)
     
     def save(self, *args, **kwargs):
+        from .cache import invalidate_on_commit
         self.full_clean()
+        if self.pk and not self._state.adding and not kwargs.get('update_fields') and not kwargs.get('force_insert'):
+            # The seat, waitlist and check-in counters only move through
+            # conditional UPDATEs (reserve_seats, waitlist.py, checkin.py) —
+            # never write back a stale copy
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.COUNTER_FIELDS
+            ]
         super().save(*args, **kwargs)
+        invalidate_on_commit(self.pk)
+        if self.has_waitlist:
+            # Raised capacity frees seats for the waitlist
+            from .waitlist import promote_on_commit
+            promote_on_commit(self.pk)
+    
+    def reserve_seats(self, count=1):
+        """Atomically take `count` seats. False, and nothing taken, when fewer are left."""
+        taken = Event.objects.filter(
+            pk=self.pk, current_attendees__lte=F('capacity') - count
+        ).update(current_attendees=F('current_attendees') + count)
+        if taken:
+            self.current_attendees += count
+        return bool(taken)
+    
+    def release_seats(self, count=1):
+        """Atomically give back `count` seats"""
+        Event.objects.filter(pk=self.pk).update(
+            current_attendees=Greatest(F('current_attendees') - count, 0)
+        )
+        self.current_attendees = max(0, self.current_attendees - count)
+    
+    @property
+    def has_waitlist(self):
+        return self.waitlist_tail > self.waitlist_head
     
     @property
     def is_full(self):
@@ -140,11 +187,15 @@ class Event(models.Model):
     @property
     def is_registration_open(self):
         """Check if registration is currently open"""
+        return self.is_registration_window_open and not self.is_full
+    
+    @property
+    def is_registration_window_open(self):
+        """Check if the event takes registrations now, full or not (full events take the waitlist)"""
         now = timezone.now()
         return (
             self.status == 'published' and
-            self.registration_start <= now <= self.registration_end and
-            not self.is_full
+            self.registration_start <= now <= self.registration_end
         )
     
     @property
@@ -162,6 +213,7 @@ class Registration(models.Model):
         ('confirmed', 'Confirmed'),
         ('cancelled', 'Cancelled'),
         ('attended', 'Attended'),
+        ('waitlisted', 'Waitlisted'),
     ]
     
     event = models.ForeignKey(
@@ -181,9 +233,14 @@ class Registration(models.Model):
         default='pending'
     )
     
+    # Place in the event's waitlist while status is 'waitlisted'
+    waitlist_rank = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    
     # Registration details
     registration_date = models.DateTimeField(auto_now_add=True)
     confirmation_date = models.DateTimeField(blank=True, null=True)
+    checked_in_at = models.DateTimeField(blank=True, null=True, editable=False)
+    cancelled_at = models.DateTimeField(blank=True, null=True, editable=False)
     
     # Additional information
     dietary_requirements = models.TextField(blank=True)
@@ -201,6 +258,13 @@ class Registration(models.Model):
         indexes = [
             models.Index(fields=['event', 'status']),
             models.Index(fields=['attendee', 'status']),
+            # Waitlist order; promotion reads the head of it
+            models.Index(
+                fields=['event', 'waitlist_rank'],
+                name='registration_waitlist_idx',
+                condition=Q(status='waitlisted'),
+            ),
+            models.Index(fields=['updated_at']),
         ]
     
     def __str__(self):
@@ -210,12 +274,12 @@ class Registration(models.Model):
         """Validate registration"""
         errors = {}
         
-        # Check if event is full
-        if self.event.is_full and not self.pk:
+        # Check if event is full (full events still take the waitlist)
+        if self.event.is_full and not self.pk and self.status != 'waitlisted':
             errors['event'] = 'Event has reached maximum capacity'
         
         # Check if registration is open
-        if not self.event.is_registration_open and not self.pk:
+        if not self.event.is_registration_window_open and not self.pk:
             errors['event'] = 'Registration is not open for this event'
         
         # Check for duplicate registration
@@ -232,26 +296,118 @@ class Registration(models.Model):
             raise ValidationError(errors)
     
     def save(self, *args, **kwargs):
+        from .cache import invalidate_on_commit
         is_new = self.pk is None
         self.full_clean()
         
-        # Update event attendee count
-        if is_new and self.status in ['pending', 'confirmed']:
-            self.event.current_attendees += 1
-            self.event.save()
+        with transaction.atomic():
+            # Take a seat, or a place at the back of the waitlist
+            if is_new and self.status in ['pending', 'confirmed']:
+                if not self.event.reserve_seats():
+                    raise ValidationError({'event': 'Event has reached maximum capacity'})
+            elif is_new and self.status == 'waitlisted':
+                from .waitlist import next_rank
+                self.waitlist_rank = next_rank(self.event)
+            super().save(*args, **kwargs)
+            if is_new:
+                from . import stats
+                stats.record_created(self)
         
-        super().save(*args, **kwargs)
+        invalidate_on_commit(self.event_id)
     
     def confirm(self):
-        """Confirm registration"""
+        """Confirm registration and queue the confirmation email"""
+        from apps.notifications.outbox import enqueue
+
+        from . import stats
+
+        previous = self.confirmation_date
         self.status = 'confirmed'
         self.confirmation_date = timezone.now()
-        self.save()
+        with transaction.atomic():
+            self.save()
+            stats.move(self.event_id, 'confirmed', previous, self.confirmation_date)
+            enqueue(
+                self.attendee.email,
+                f"Registration confirmed: {self.event.title}",
+                self.confirmation_message(),
+                kind='registration_confirmed',
+            )
+
+    def delete(self, *args, **kwargs):
+        from . import stats
+        with transaction.atomic():
+            stats.record_deleted(self)
+            return super().delete(*args, **kwargs)
+    
+    @property
+    def ticket_token(self):
+        """Signed token for the registration's QR ticket (apps/events/checkin.py)"""
+        from .checkin import ticket_token
+        return ticket_token(self)
+    
+    def confirmation_message(self):
+        event = self.event
+        start = timezone.localtime(event.start_date)
+        return (
+            f"Hi {self.attendee.get_full_name() or self.attendee.username},\n\n"
+            f"Your registration for {event.title} is confirmed.\n\n"
+            f"When:  {start:%A %d %B %Y, %H:%M}\n"
+            f"Where: {event.venue_name}, {event.city}\n"
+        )
     
     def cancel(self):
-        """Cancel registration"""
+        """Cancel registration; a freed seat goes to the waitlist"""
+        from .waitlist import leave, promote_on_commit
+        from .cache import invalidate_on_commit
+        from . import stats
+        
+        # A place in line that was promoted meanwhile is cancelled as a seat
+        if self.status == 'waitlisted' and leave(self):
+            return
         if self.status in ['pending', 'confirmed']:
+            with transaction.atomic():
+                # Conditional, so concurrent cancels release the seat once
+                now = timezone.now()
+                cancelled = Registration.objects.filter(
+                    pk=self.pk, status__in=['pending', 'confirmed']
+                ).update(status='cancelled', cancelled_at=now, updated_at=now)
+                if cancelled:
+                    self.cancelled_at = now
+                    stats.bump(self.event_id, now, cancelled=1)
+                    self.event.release_seats()
+                    promote_on_commit(self.event_id)
+                    invalidate_on_commit(self.event_id)
             self.status = 'cancelled'
-            self.event.current_attendees = max(0, self.event.current_attendees - 1)
-            self.event.save()
-            self.save()
\ No newline at end of file
+
+
+class RegistrationDailyStat(models.Model):
+    """
+    Registration activity of one event on one day: how many registrations
+    were made, confirmed, cancelled and checked in that day.
+    
+    Maintained incrementally by apps/events/stats.py on every registration
+    state change; `manage.py rebuild_registration_stats` recomputes it.
+    """
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name='daily_stats'
+    )
+    day = models.DateField()
+    registered = models.IntegerField(default=0)
+    confirmed = models.IntegerField(default=0)
+    cancelled = models.IntegerField(default=0)
+    attended = models.IntegerField(default=0)
+    
+    class Meta:
+        ordering = ['event', 'day']
+        verbose_name = 'Registration daily stat'
+        verbose_name_plural = 'Registration daily stats'
+        # Leads with (event, day): every read is a range scan on it
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'day'], name='registration_daily_stat_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.event_id} {self.day}"
@@ -2,6 +2,7 @@
 
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError as DjangoValidationError
 from .models import Event, Registration
 
 User = get_user_model()
@@ -40,7 +41,10 @@ class EventDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Event
         fields = '__all__'
-        read_only_fields = ['id', 'slug', 'current_attendees', 'created_at', 'updated_at']
+        read_only_fields = [
+            'id', 'slug', 'current_attendees', 'waitlist_head', 'waitlist_tail',
+            'attended_count', 'created_at', 'updated_at',
+        ]
     
     def get_organizer(self, obj):
         return {
@@ -158,16 +162,26 @@ class RegistrationSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError({'event': 'You are already registered for this event.'})
 
         #  Check event status
-        if event.is_full:
-            raise serializers.ValidationError({'event': 'This event has reached maximum capacity.'})
-
-        if not event.is_registration_open:
+        if not event.is_registration_window_open:
             raise serializers.ValidationError({'event': 'Registration is not currently open for this event.'})
 
+        #  Full events, and events with people already waiting, take the waitlist
+        if event.is_full or event.has_waitlist:
+            data['status'] = 'waitlisted'
+
         return data
 
     def create(self, validated_data):
         validated_data['attendee'] = self.context['request'].user
+        try:
+            return super().create(validated_data)
+        except DjangoValidationError as e:
+            # Only retry when the last seat went between validate() and the reservation
+            event = validated_data['event']
+            event.refresh_from_db(fields=['current_attendees'])
+            if validated_data.get('status') == 'waitlisted' or not event.is_full:
+                raise serializers.ValidationError(e.message_dict)
+        validated_data['status'] = 'waitlisted'
         return super().create(validated_data)
 
 
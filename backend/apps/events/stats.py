@@ -0,0 +1,209 @@
+# ============================================
+# apps/events/stats.py
+# ============================================
+# Per-event, per-day registration counters (RegistrationDailyStat).
+#
+# Every registration state change bumps the counter of the day it happened
+# on, in the same transaction, as an F() increment — nothing rescans an
+# event's registrations on the write path:
+#
+#   registered — Registration.save() of a new registration, bulk imports
+#   confirmed  — Registration.confirm() (a re-confirmation moves the count
+#                from the old day to the new one)
+#   cancelled  — Registration.cancel() and waitlist.leave()
+#   attended   — check-in at the door, live or synced (apps/events/checkin.py)
+#
+# Registration.delete() withdraws what the registration contributed. Writes
+# that bypass those paths (queryset updates, cascade deletes) are repaired
+# by rebuild(), i.e. `manage.py rebuild_registration_stats`.
+#
+# Reads (daily, cumulative) touch one row per day of the requested range,
+# through the (event, day) unique index — at most MAX_DAYS rows.
+# ============================================
+
+import datetime
+from collections import Counter, defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Registration, RegistrationDailyStat
+
+COUNTERS = ('registered', 'confirmed', 'cancelled', 'attended')
+# Registration field each counter is dated by
+DATE_FIELDS = {
+    'registered': 'registration_date',
+    'confirmed': 'confirmation_date',
+    'cancelled': 'cancelled_at',
+    'attended': 'checked_in_at',
+}
+MAX_DAYS = 366
+
+
+def _day(when):
+    if isinstance(when, datetime.datetime):
+        return timezone.localdate(when) if timezone.is_aware(when) else when.date()
+    return when
+
+
+# ── Writing ──────────────────────────────────────────────────────────────────
+
+def _increment(event_id, day, delta):
+    rows = RegistrationDailyStat.objects.filter(event_id=event_id, day=day)
+    change = {field: F(field) + value for field, value in delta.items()}
+    if not rows.update(**change):
+        try:
+            with transaction.atomic():
+                RegistrationDailyStat.objects.create(event_id=event_id, day=day, **delta)
+        except IntegrityError:
+            # A concurrent writer created the row first
+            rows.update(**change)
+
+
+def bump(event_id, when, **counts):
+    """Add `counts` (e.g. confirmed=1, cancelled=-1) to the day of `when`"""
+    delta = {field: value for field, value in counts.items() if value}
+    if delta and when is not None:
+        _increment(event_id, _day(when), delta)
+
+
+def bump_many(event_id, counter, times):
+    """Add one to `counter` for every datetime in `times`, one UPDATE per day"""
+    per_day = Counter(_day(when) for when in times if when is not None)
+    for day in sorted(per_day):
+        _increment(event_id, day, {counter: per_day[day]})
+
+
+def move(event_id, counter, old, new):
+    """Move one count of `counter` from the day of `old` (if any) to the day of `new`"""
+    if old is not None and _day(old) == _day(new):
+        return
+    if old is not None:
+        bump(event_id, old, **{counter: -1})
+    bump(event_id, new, **{counter: 1})
+
+
+def _contributions(registration):
+    return {
+        counter: getattr(registration, field)
+        for counter, field in DATE_FIELDS.items()
+        if getattr(registration, field) is not None
+    }
+
+
+def record_created(registration):
+    """Count a new registration (and its confirmation, if born confirmed)"""
+    for counter, when in _contributions(registration).items():
+        bump(registration.event_id, when, **{counter: 1})
+
+
+def record_deleted(registration):
+    """Withdraw everything a registration about to be deleted was counted for"""
+    stored = (
+        Registration.objects.filter(pk=registration.pk)
+        .values(*DATE_FIELDS.values()).first()
+    )
+    if stored is None:
+        return
+    for counter, field in DATE_FIELDS.items():
+        bump(registration.event_id, stored[field], **{counter: -1})
+
+
+# ── Backfill ─────────────────────────────────────────────────────────────────
+
+def rebuild(event=None, batch_size=1000):
+    """
+    Recompute the counters from the registrations themselves — for the
+    initial backfill and after writes that bypass the hooks. One GROUP BY
+    per counter. Returns the number of rows written.
+    """
+    registrations = Registration.objects.all()
+    stats = RegistrationDailyStat.objects.all()
+    if event is not None:
+        registrations = registrations.filter(event=event)
+        stats = stats.filter(event=event)
+
+    totals = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    for counter, field in DATE_FIELDS.items():
+        rows = (
+            registrations.filter(**{f'{field}__isnull': False})
+            .annotate(day=TruncDate(field))
+            .order_by()
+            .values_list('event_id', 'day')
+            .annotate(count=Count('pk'))
+        )
+        for event_id, day, count in rows:
+            totals[(event_id, day)][counter] = count
+
+    with transaction.atomic():
+        stats.delete()
+        RegistrationDailyStat.objects.bulk_create(
+            [
+                RegistrationDailyStat(event_id=event_id, day=day, **counts)
+                for (event_id, day), counts in totals.items()
+            ],
+            batch_size=batch_size,
+        )
+    return len(totals)
+
+
+# ── Reading ──────────────────────────────────────────────────────────────────
+
+def default_range(event, today=None):
+    """From the event's creation to today, or to the event's end if earlier"""
+    today = today or timezone.localdate()
+    end = min(today, _day(event.end_date))
+    start = max(_day(event.created_at), end - datetime.timedelta(days=MAX_DAYS - 1))
+    return start, max(start, end)
+
+
+def _rows(event, start, end):
+    return {
+        row['day']: row
+        for row in RegistrationDailyStat.objects.filter(
+            event=event, day__gte=start, day__lte=end
+        ).values('day', *COUNTERS)
+    }
+
+
+def daily(event, start, end):
+    """
+    [{day, registered, confirmed, cancelled, attended}] for every day from
+    `start` to `end` inclusive, zeros where nothing happened.
+    """
+    rows = _rows(event, start, end)
+    series = []
+    day = start
+    while day <= end:
+        row = rows.get(day)
+        series.append({'day': day, **{c: row[c] if row else 0 for c in COUNTERS}})
+        day += datetime.timedelta(days=1)
+    return series
+
+
+def _rate(part, whole):
+    return round(part / whole, 4) if whole else None
+
+
+def cumulative(event, start, end):
+    """
+    Running totals per day from `start` to `end` — everything before `start`
+    comes from one SUM — with the confirmation and cancellation rates so far.
+    """
+    before = RegistrationDailyStat.objects.filter(event=event, day__lt=start).aggregate(
+        **{c: Sum(c) for c in COUNTERS}
+    )
+    running = {c: before[c] or 0 for c in COUNTERS}
+    series = []
+    for row in daily(event, start, end):
+        for c in COUNTERS:
+            running[c] += row[c]
+        series.append({
+            'day': row['day'],
+            **running,
+            'confirmation_rate': _rate(running['confirmed'], running['registered']),
+            'cancellation_rate': _rate(running['cancelled'], running['registered']),
+        })
+    return series
@@ -0,0 +1,154 @@
+# backend/apps/events/tests/test_checkin.py
+
+import pytest
+from datetime import timedelta
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.events import checkin
+from apps.events.models import Event, Registration
+from apps.mice.models import MICEProject, SubEvent, SubEventCheckIn
+from apps.users.models import User
+
+
+@pytest.mark.django_db
+class TestCheckIn:
+    """QR ticket check-in"""
+
+    @pytest.fixture
+    def organizer(self):
+        return User.objects.create_user(
+            username='organizer',
+            email='organizer@test.com',
+            password='testpass123',
+            role='organizer'
+        )
+
+    @pytest.fixture
+    def event(self, organizer):
+        now = timezone.now()
+        return Event.objects.create(
+            title='Gala Night',
+            slug='gala-night',
+            description='Annual gala',
+            event_type='conference',
+            status='published',
+            start_date=now + timedelta(days=30),
+            end_date=now + timedelta(days=31),
+            registration_start=now - timedelta(days=1),
+            registration_end=now + timedelta(days=20),
+            venue_name='GWK',
+            venue_address='Jimbaran',
+            city='Bali',
+            country='Indonesia',
+            capacity=100,
+            organizer=organizer
+        )
+
+    @pytest.fixture
+    def registrations(self, event):
+        return [
+            Registration.objects.create(
+                event=event,
+                attendee=User.objects.create_user(username=f'guest{i}', email=f'guest{i}@test.com'),
+                status='confirmed'
+            )
+            for i in range(4)
+        ]
+
+    @pytest.fixture
+    def dinner(self, event, organizer):
+        project = MICEProject.objects.create(
+            event=event, organizer=organizer, client_company='PT Maju', client_pic='Budi',
+        )
+        return SubEvent.objects.create(mice_project=project, title='Welcome Dinner', capacity=100)
+
+    @pytest.fixture
+    def client(self, organizer):
+        client = APIClient()
+        client.force_authenticate(user=organizer)
+        return client
+
+    def test_token_is_verified_without_queries(self, registrations, django_assert_num_queries):
+        token = registrations[0].ticket_token
+        with django_assert_num_queries(0):
+            assert checkin.read_token(token) == (registrations[0].event_id, registrations[0].pk)
+        with pytest.raises(checkin.InvalidTicket):
+            checkin.read_token(token[:-2] + 'xx')
+
+    def test_live_check_in(self, client, event, registrations, django_assert_num_queries):
+        token = registrations[0].ticket_token
+        # Registration, event counter and today's stats row (created with
+        # the registrations): three UPDATEs inside a savepoint of the test
+        # transaction
+        with django_assert_num_queries(5):
+            response = client.post('/api/v1/events/check-in/', {'token': token})
+        assert response.data['result'] == 'checked_in'
+        assert client.post('/api/v1/events/check-in/', {'token': token}).data['result'] == 'already_checked_in'
+        assert client.post('/api/v1/events/check-in/', {'token': 'forged'}).data['result'] == 'invalid'
+
+        registrations[1].cancel()
+        response = client.post('/api/v1/events/check-in/', {'token': registrations[1].ticket_token})
+        assert response.data['result'] == 'not_eligible'
+
+        event.refresh_from_db()
+        assert event.attended_count == 1
+        registration = Registration.objects.get(pk=registrations[0].pk)
+        assert registration.status == 'attended' and registration.checked_in_at is not None
+
+    def test_only_the_organizer_checks_in(self, registrations):
+        stranger = APIClient()
+        stranger.force_authenticate(user=User.objects.create_user(username='x', email='x@test.com'))
+        response = stranger.post('/api/v1/events/check-in/', {'token': registrations[0].ticket_token})
+        assert response.data['result'] == 'not_eligible'
+        assert Registration.objects.get(pk=registrations[0].pk).status == 'confirmed'
+
+    def test_sub_event_check_in(self, client, event, registrations, dinner):
+        token = registrations[0].ticket_token
+        payload = {'token': token, 'sub_event': str(dinner.pk)}
+        assert client.post('/api/v1/events/check-in/', payload).data['result'] == 'checked_in'
+        assert client.post('/api/v1/events/check-in/', payload).data['result'] == 'already_checked_in'
+
+        data = client.get(f'/api/v1/events/{event.slug}/attendance/').data
+        assert data['attended'] == 1
+        assert data['sub_events'][0]['attended'] == 1
+
+    def test_offline_sync_dedupes(self, client, event, registrations, dinner):
+        now = timezone.now()
+        client.post('/api/v1/events/check-in/', {'token': registrations[0].ticket_token})
+        scans = [
+            {'token': registrations[0].ticket_token},
+            {'token': registrations[1].ticket_token, 'scanned_at': (now - timedelta(minutes=5)).isoformat()},
+            {'token': registrations[1].ticket_token, 'scanned_at': (now - timedelta(minutes=9)).isoformat()},
+            {'token': registrations[2].ticket_token, 'sub_event': str(dinner.pk)},
+            {'token': registrations[2].ticket_token, 'sub_event': str(dinner.pk)},
+            {'token': 'garbage'},
+            {'token': registrations[1].ticket_token, 'scanned_at': '2024-13-01T00:00:00'},
+        ]
+        data = client.post('/api/v1/events/check-in/sync/', {'scans': scans}, format='json').data
+        assert [r['result'] for r in data['results']] == [
+            'already_checked_in', 'checked_in', 'duplicate', 'checked_in', 'duplicate', 'invalid', 'invalid',
+        ]
+
+        event.refresh_from_db()
+        dinner.refresh_from_db()
+        assert event.attended_count == 3
+        assert dinner.attended_count == 1
+        assert SubEventCheckIn.objects.filter(sub_event=dinner).count() == 1
+        # The earliest of the double scans is kept
+        checked_in_at = Registration.objects.get(pk=registrations[1].pk).checked_in_at
+        assert abs(checked_in_at - (now - timedelta(minutes=9))) < timedelta(seconds=1)
+
+        # Replaying the same batch changes nothing
+        data = client.post('/api/v1/events/check-in/sync/', {'scans': scans}, format='json').data
+        assert data['summary'] == {'already_checked_in': 3, 'duplicate': 2, 'invalid': 2}
+        event.refresh_from_db()
+        assert event.attended_count == 3
+
+    def test_ticket_endpoint(self, registrations):
+        client = APIClient()
+        client.force_authenticate(user=registrations[0].attendee)
+        data = client.get(f'/api/v1/registrations/{registrations[0].pk}/ticket/').data
+        assert checkin.read_token(data['token']) == (registrations[0].event_id, registrations[0].pk)
+        assert data['qr_code'].startswith('<svg')
+        data = client.get(f'/api/v1/registrations/{registrations[0].pk}/ticket/', {'image': 'png'}).data
+        assert data['qr_code'].startswith('data:image/png;base64,')
@@ -0,0 +1,119 @@
+# backend/apps/events/tests/test_exports.py
+
+import csv
+import io
+import json
+import zipfile
+import pytest
+from datetime import timedelta
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.events import exports
+from apps.events.models import Event, Registration
+from apps.users.models import User
+
+
+@pytest.mark.django_db
+class TestRegistrationExport:
+    """Streaming registration exports and the paged registrations list"""
+
+    @pytest.fixture
+    def organizer(self):
+        return User.objects.create_user(
+            username='organizer',
+            email='organizer@test.com',
+            password='testpass123',
+            role='organizer'
+        )
+
+    @pytest.fixture
+    def event(self, organizer):
+        now = timezone.now()
+        event = Event.objects.create(
+            title='Dev Summit',
+            slug='dev-summit',
+            description='Annual summit',
+            event_type='conference',
+            status='published',
+            start_date=now + timedelta(days=30),
+            end_date=now + timedelta(days=31),
+            registration_start=now - timedelta(days=1),
+            registration_end=now + timedelta(days=20),
+            venue_name='Hall',
+            venue_address='Main St',
+            city='Jakarta',
+            country='Indonesia',
+            capacity=100,
+            organizer=organizer
+        )
+        for i in range(25):
+            attendee = User.objects.create_user(
+                username=f'attendee{i}',
+                email=f'attendee{i}@test.com',
+                first_name='Ana',
+                last_name=f'Number {i}',
+                role='attendee'
+            )
+            Registration.objects.create(
+                event=event,
+                attendee=attendee,
+                status='confirmed' if i % 2 else 'pending',
+                dietary_requirements='Halal' if i == 0 else '',
+                special_requests='=HYPERLINK("x")' if i == 0 else '',
+            )
+        return event
+
+    @pytest.fixture
+    def client(self, organizer):
+        client = APIClient()
+        client.force_authenticate(user=organizer)
+        return client
+
+    def download(self, response):
+        assert response.status_code == 200
+        return b''.join(response.streaming_content)
+
+    def test_csv(self, client, event):
+        response = client.get(f'/api/v1/events/{event.slug}/registrations/export/')
+        assert response['Content-Disposition'] == 'attachment; filename="dev-summit-registrations.csv"'
+        rows = list(csv.DictReader(io.StringIO(self.download(response).decode('utf-8-sig'))))
+        assert len(rows) == 25
+        assert rows[0]['email'] == 'attendee0@test.com'
+        assert rows[0]['dietary_requirements'] == 'Halal'
+        assert rows[0]['special_requests'] == '\'=HYPERLINK("x")'
+
+    def test_ndjson_with_status_filter(self, client, event):
+        response = client.get(
+            f'/api/v1/events/{event.slug}/registrations/export/', {'type': 'ndjson', 'registration_status': 'confirmed'}
+        )
+        lines = [json.loads(line) for line in self.download(response).splitlines()]
+        assert len(lines) == 12
+        assert {line['status'] for line in lines} == {'confirmed'}
+
+    def test_xlsx(self, client, event):
+        response = client.get(f'/api/v1/events/{event.slug}/registrations/export/', {'type': 'xlsx'})
+        archive = zipfile.ZipFile(io.BytesIO(self.download(response)))
+        assert archive.testzip() is None
+        sheet = archive.read('xl/worksheets/sheet1.xml').decode()
+        assert sheet.count('<row>') == 26
+        assert 'attendee24@test.com' in sheet
+
+    def test_rejects_bad_requests(self, client, event):
+        url = f'/api/v1/events/{event.slug}/registrations/export/'
+        assert client.get(url, {'type': 'pdf'}).status_code == 400
+        assert client.get(url, {'registration_status': 'lost'}).status_code == 400
+        other = User.objects.create_user(username='other', email='other@test.com', role='organizer')
+        client.force_authenticate(user=other)
+        assert client.get(url).status_code == 403
+
+    def test_stream_reads_in_chunks(self, event, django_assert_num_queries, monkeypatch):
+        monkeypatch.setattr(exports, 'FLUSH_BYTES', 1)
+        with django_assert_num_queries(1):
+            chunks = list(exports.stream(event, 'csv'))
+        assert len(chunks) == 26
+
+    def test_registrations_are_paginated(self, client, event):
+        data = client.get(f'/api/v1/events/{event.slug}/registrations/').data
+        assert data['count'] == 25
+        assert len(data['results']) == 20
+        assert data['next'] is not None
@@ -0,0 +1,121 @@
+# backend/apps/events/tests/test_imports.py
+
+import csv
+import io
+import pytest
+from datetime import timedelta
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.events.imports import hash_passwords, import_attendees
+from apps.events.models import Event, Registration
+from apps.notifications.models import OutboxMessage
+from apps.users.models import User
+
+
+def csv_file(*rows):
+    lines = ['email,first_name,last_name,company,password,dietary_requirements']
+    lines += [','.join(row) for row in rows]
+    return io.BytesIO('\n'.join(lines).encode())
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAttendeeImport:
+    """Bulk attendee import"""
+
+    @pytest.fixture
+    def organizer(self):
+        return User.objects.create_user(
+            username='organizer',
+            email='organizer@test.com',
+            password='testpass123',
+            role='organizer'
+        )
+
+    @pytest.fixture
+    def event(self, organizer):
+        now = timezone.now()
+        return Event.objects.create(
+            title='Client Kickoff',
+            slug='client-kickoff',
+            description='Corporate delegates',
+            event_type='conference',
+            status='published',
+            start_date=now + timedelta(days=30),
+            end_date=now + timedelta(days=31),
+            registration_start=now - timedelta(days=1),
+            registration_end=now + timedelta(days=20),
+            venue_name='Ballroom',
+            venue_address='Main St',
+            city='Surabaya',
+            country='Indonesia',
+            capacity=3,
+            organizer=organizer
+        )
+
+    def test_import_dedupes_and_reserves_once(self, event, django_assert_max_num_queries):
+        existing = User.objects.create_user(username='budi', email='Budi@Corp.com', role='attendee')
+        upload = csv_file(
+            ('budi@corp.com', 'Budi', 'S', 'Corp', '', ''),
+            ('sari@corp.com', 'Sari', 'W', 'Corp', 's3cret-pass', 'Vegan'),
+            ('SARI@corp.com', 'Sari', 'W', 'Corp', '', ''),
+            ('not-an-email', '', '', '', '', ''),
+            ('andi@corp.com', 'Andi', 'P', 'Corp', '', ''),
+            ('rina@corp.com', 'Rina', 'K', 'Corp', '', ''),
+        )
+        with django_assert_max_num_queries(20):
+            results = import_attendees(event, upload, workers=0)
+
+        assert [(r.row, r.result) for r in results] == [
+            (2, 'registered'), (3, 'registered'), (4, 'duplicate'),
+            (5, 'invalid'), (6, 'registered'), (7, 'waitlisted'),
+        ]
+        assert results[0].user_id == existing.pk
+
+        event.refresh_from_db()
+        assert event.current_attendees == 3
+        assert event.waitlist_tail - event.waitlist_head == 1
+
+        sari = User.objects.get(email='sari@corp.com')
+        assert sari.check_password('s3cret-pass')
+        assert Registration.objects.get(attendee=sari).dietary_requirements == 'Vegan'
+        assert not User.objects.get(email='andi@corp.com').has_usable_password()
+        # Invites only for new accounts without a password
+        assert set(OutboxMessage.objects.filter(kind='attendee_invite').values_list('recipient', flat=True)) == {
+            'andi@corp.com', 'rina@corp.com',
+        }
+
+        # Importing again changes nothing
+        results = import_attendees(event, csv_file(('sari@corp.com', '', '', '', '', '')), workers=0)
+        assert results[0].result == 'already_registered'
+
+    def test_hash_passwords_in_process_pool(self):
+        passwords = [f'password-{i}' for i in range(8)]
+        hashes = hash_passwords(passwords, workers=2)
+        user = User(username='x')
+        for password, hashed in zip(passwords, hashes):
+            user.password = hashed
+            assert user.check_password(password)
+
+    def test_endpoint_returns_result_file(self, event, organizer):
+        client = APIClient()
+        client.force_authenticate(user=organizer)
+        upload = SimpleUploadedFile(
+            'delegates.csv', csv_file(('dewi@corp.com', 'Dewi', 'L', 'Corp', '', '')).getvalue(),
+            content_type='text/csv',
+        )
+        response = client.post(
+            f'/api/v1/events/{event.slug}/registrations/import/',
+            {'file': upload, 'send_invites': 'false'}, format='multipart',
+        )
+        assert response.status_code == 200
+        assert response['X-Import-Registered'] == '1'
+        rows = list(csv.DictReader(io.StringIO(response.content.decode())))
+        assert rows[0]['email'] == 'dewi@corp.com' and rows[0]['result'] == 'registered'
+        assert not OutboxMessage.objects.filter(kind='attendee_invite').exists()
+
+        bad = SimpleUploadedFile('x.csv', b'name\nfoo\n', content_type='text/csv')
+        response = client.post(
+            f'/api/v1/events/{event.slug}/registrations/import/', {'file': bad}, format='multipart',
+        )
+        assert response.status_code == 400
@@ -0,0 +1,137 @@
+# backend/apps/events/tests/test_lifecycle.py
+
+import pytest
+from datetime import timedelta
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.events import cache as event_cache
+from apps.events.lifecycle import advance, advance_events, advance_sessions
+from apps.events.models import Event
+from apps.session_manager.models import Session
+from apps.tracks.models import Track
+from apps.users.models import User
+
+
+def make_event(organizer, slug, start, end, status='published'):
+    return Event.objects.create(
+        title=slug.title(),
+        slug=slug,
+        description='Lifecycle test',
+        event_type='conference',
+        status=status,
+        start_date=start,
+        end_date=end,
+        registration_start=start - timedelta(days=10),
+        registration_end=start - timedelta(days=1),
+        venue_name='Hall',
+        venue_address='Main St',
+        city='Bandung',
+        country='Indonesia',
+        capacity=50,
+        organizer=organizer,
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestLifecycle:
+    """Clock-driven event status and session flags"""
+
+    @pytest.fixture(autouse=True)
+    def shared_cache(self, settings, tmp_path):
+        # Event payloads are only cached on a cache every process shares
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path / 'cache'),
+        }}
+
+    @pytest.fixture
+    def organizer(self):
+        return User.objects.create_user(
+            username='organizer',
+            email='organizer@test.com',
+            password='testpass123',
+            role='organizer'
+        )
+
+    @pytest.fixture
+    def events(self, organizer):
+        now = timezone.now()
+        return {
+            'future': make_event(organizer, 'future', now + timedelta(days=5), now + timedelta(days=6)),
+            'running': make_event(organizer, 'running', now - timedelta(hours=1), now + timedelta(hours=5)),
+            'over': make_event(organizer, 'over', now - timedelta(days=3), now - timedelta(days=2), 'ongoing'),
+            'draft': make_event(organizer, 'draft', now - timedelta(hours=1), now + timedelta(hours=5), 'draft'),
+        }
+
+    def test_advance_events(self, events):
+        started, completed = advance_events()
+        assert started == [events['running'].pk]
+        assert completed == [events['over'].pk]
+        statuses = dict(Event.objects.values_list('slug', 'status'))
+        assert statuses == {
+            'future': 'published', 'running': 'ongoing', 'over': 'completed', 'draft': 'draft',
+        }
+        # Nothing left to do on the next tick
+        assert advance_events() == ([], [])
+
+    def test_only_advanced_events_are_invalidated(self, events):
+        versions = {slug: event_cache.version(e.pk) for slug, e in events.items()}
+        advance_events()
+        assert event_cache.version(events['running'].pk) != versions['running']
+        assert event_cache.version(events['over'].pk) != versions['over']
+        assert event_cache.version(events['future'].pk) == versions['future']
+
+        client = APIClient()
+        assert client.get('/api/v1/events/running/').data['status'] == 'ongoing'
+        Event.objects.filter(slug='running').update(end_date=timezone.now())
+        advance_events()
+        assert client.get('/api/v1/events/running/').data['status'] == 'completed'
+
+    def test_nothing_cached_per_process(self, settings, events):
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        running = events['running']
+        advance_events()
+        assert APIClient().get('/api/v1/events/running/').data['status'] == 'ongoing'
+        assert cache.get(event_cache._version_key(running.pk)) is None
+
+    def test_ongoing_endpoint_and_filter(self, events):
+        advance_events()
+        client = APIClient()
+        response = client.get('/api/v1/events/ongoing/')
+        assert [e['slug'] for e in response.data] == ['running']
+        response = client.get('/api/v1/events/', {'is_ongoing': 'true'})
+        results = response.data.get('results', response.data)
+        assert [e['slug'] for e in results] == ['running']
+
+    def test_advance_sessions(self, events):
+        now = timezone.now()
+        event = events['running']
+        track = Track.objects.create(event=event, name='Main', description='Main stage')
+        session = Session.objects.create(
+            event=event,
+            track=track,
+            title='Keynote',
+            slug='keynote',
+            description='Opening keynote',
+            session_format='talk',
+            level='all',
+            start_time=now + timedelta(minutes=30),
+            end_time=now + timedelta(minutes=90),
+            duration_minutes=60,
+        )
+        assert (session.is_ongoing, session.has_ended) == (False, False)
+
+        assert advance_sessions(now + timedelta(hours=1)) == (1, 0)
+        session.refresh_from_db()
+        assert (session.is_ongoing, session.has_ended) == (True, False)
+
+        assert advance_sessions(now + timedelta(hours=2)) == (0, 1)
+        session.refresh_from_db()
+        assert (session.is_ongoing, session.has_ended) == (False, True)
+
+    def test_command(self, events, capsys):
+        call_command('advance_event_status')
+        assert '1 events started, 1 events completed' in capsys.readouterr().out
+        assert advance()['events started'] == 0
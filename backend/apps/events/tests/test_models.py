@@ -6,6 +6,7 @@ from django.utils import timezone
 from datetime import timedelta
 from apps.events.models import Event, Registration
 from apps.users.models import User
+from apps.notifications.models import OutboxMessage
 
 
 @pytest.mark.django_db
@@ -106,8 +107,9 @@ class TestEventModel:
         event = Event.objects.create(**valid_event_data)
 
     # Valid: exactly equal to capacity => should be full but still valid
+        # The counter is owned by reserve_seats(); a plain save() leaves it alone
         event.current_attendees = 100
-        event.save()
+        event.save(update_fields=['current_attendees'])
         event.refresh_from_db()
         assert event.is_full is True
         assert event.available_spots == 0
@@ -117,6 +119,14 @@ class TestEventModel:
         with pytest.raises(ValidationError):
             event.full_clean() 
     
+    def test_stale_save_keeps_reserved_seats(self, valid_event_data):
+        event = Event.objects.create(pk=4242, **valid_event_data)
+        assert Event.objects.get(pk=4242).reserve_seats(3)
+        event.title = 'Renamed'
+        event.save()
+        event.refresh_from_db()
+        assert (event.title, event.current_attendees) == ('Renamed', 3)
+
     def test_available_spots_property(self, valid_event_data):
         """Test available_spots property"""
         event = Event.objects.create(**valid_event_data)
@@ -301,6 +311,11 @@ class TestRegistrationModel:
         
         assert registration.status == 'confirmed'
         assert registration.confirmation_date is not None
+        
+        # Confirmation email is queued in the outbox, not sent inline
+        message = OutboxMessage.objects.get(kind='registration_confirmed')
+        assert message.recipient == attendee.email
+        assert event.title in message.subject
     
     def test_cancel_registration(self, event, attendee):
         """Test canceling a registration"""
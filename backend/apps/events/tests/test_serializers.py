@@ -117,6 +117,10 @@ class TestEventSerializers:
         assert organizer_data["id"] == organizer.id
         assert "name" in organizer_data  # optional field (can be blank)
 
+    def test_detail_serializer_counters_are_read_only(self):
+        fields = EventDetailSerializer().fields
+        assert all(fields[name].read_only for name in Event.COUNTER_FIELDS)
+
 
 
 @pytest.mark.django_db
@@ -0,0 +1,133 @@
+# backend/apps/events/tests/test_stats.py
+
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.events import checkin, stats
+from apps.events.models import Event, Registration, RegistrationDailyStat
+from apps.users.models import User
+
+
+def snapshot(event):
+    return list(
+        RegistrationDailyStat.objects.filter(event=event)
+        .exclude(registered=0, confirmed=0, cancelled=0, attended=0)
+        .order_by('day').values('day', *stats.COUNTERS)
+    )
+
+
+@pytest.mark.django_db
+class TestRegistrationStats:
+    """Per-day registration counters"""
+
+    @pytest.fixture
+    def organizer(self):
+        return User.objects.create_user(
+            username='organizer',
+            email='organizer@test.com',
+            password='testpass123',
+            role='organizer'
+        )
+
+    @pytest.fixture
+    def event(self, organizer):
+        now = timezone.now()
+        return Event.objects.create(
+            title='Bali Expo',
+            slug='bali-expo',
+            description='Trade expo',
+            event_type='conference',
+            status='published',
+            start_date=now + timedelta(days=30),
+            end_date=now + timedelta(days=31),
+            registration_start=now - timedelta(days=1),
+            registration_end=now + timedelta(days=20),
+            venue_name='BNDCC',
+            venue_address='Nusa Dua',
+            city='Bali',
+            country='Indonesia',
+            capacity=3,
+            organizer=organizer
+        )
+
+    @pytest.fixture
+    def registrations(self, event):
+        return [
+            Registration.objects.create(
+                event=event,
+                attendee=User.objects.create_user(username=f'guest{i}', email=f'guest{i}@test.com'),
+                status='pending' if i < 3 else 'waitlisted'
+            )
+            for i in range(4)
+        ]
+
+    @pytest.fixture
+    def client(self, organizer):
+        client = APIClient()
+        client.force_authenticate(user=organizer)
+        return client
+
+    def test_state_changes_match_a_rebuild(self, organizer, event, registrations):
+        today = timezone.localdate()
+        yesterday = timezone.now() - timedelta(days=1)
+        first, second, third, waiting = registrations
+        first.confirm()
+        first.confirm()
+        second.confirm()
+        third.cancel()
+        waiting.cancel()
+        checkin.check_in(organizer, first.ticket_token, at=yesterday)
+        checkin.sync(organizer, [{'token': second.ticket_token, 'scanned_at': yesterday.isoformat()}])
+
+        incremental = snapshot(event)
+        assert incremental == [
+            {'day': today - timedelta(days=1), 'registered': 0, 'confirmed': 0, 'cancelled': 0, 'attended': 2},
+            {'day': today, 'registered': 4, 'confirmed': 2, 'cancelled': 2, 'attended': 0},
+        ]
+        assert stats.rebuild(event) == 2
+        assert snapshot(event) == incremental
+
+        Registration.objects.get(pk=first.pk).delete()
+        incremental = snapshot(event)
+        assert incremental[0]['attended'] == 1 and incremental[1]['registered'] == 3
+        stats.rebuild(event)
+        assert snapshot(event) == incremental
+
+    def test_rebuild_command_repairs_bypassed_writes(self, event, registrations):
+        Registration.objects.filter(pk=registrations[0].pk).update(
+            status='confirmed', confirmation_date=timezone.now()
+        )
+        call_command('rebuild_registration_stats', event='bali-expo')
+        assert RegistrationDailyStat.objects.get(event=event).confirmed == 1
+
+    def test_daily_and_cumulative_endpoints(self, client, event, registrations, django_assert_max_num_queries):
+        today = timezone.localdate()
+        RegistrationDailyStat.objects.create(event=event, day=today - timedelta(days=3), registered=6, confirmed=3)
+        RegistrationDailyStat.objects.create(event=event, day=today - timedelta(days=1), cancelled=2)
+        registrations[0].confirm()
+
+        url = f'/api/v1/events/{event.slug}/stats/'
+        response = client.get(url + 'daily/', {'from': (today - timedelta(days=2)).isoformat()})
+        assert response.status_code == 200
+        assert [day['cancelled'] for day in response.data['days']] == [0, 2, 0]
+        assert response.data['days'][-1]['registered'] == 4
+
+        with django_assert_max_num_queries(3):
+            response = client.get(url + 'cumulative/', {'from': (today - timedelta(days=1)).isoformat()})
+        days = response.data['days']
+        assert [day['registered'] for day in days] == [6, 10]
+        assert days[-1]['confirmed'] == 4
+        assert days[-1]['confirmation_rate'] == 0.4
+        assert days[-1]['cancellation_rate'] == 0.2
+
+    def test_endpoint_validation(self, client, event):
+        url = f'/api/v1/events/{event.slug}/stats/daily/'
+        assert client.get(url, {'from': 'yesterday'}).status_code == 400
+        assert client.get(url, {'from': '2026-03-02', 'to': '2026-03-01'}).status_code == 400
+        assert client.get(url, {'from': '2024-01-01', 'to': '2026-01-01'}).status_code == 400
+
+        stranger = User.objects.create_user(username='stranger', email='stranger@test.com')
+        client.force_authenticate(user=stranger)
+        assert client.get(url).status_code == 403
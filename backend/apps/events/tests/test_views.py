@@ -6,6 +6,7 @@ from rest_framework.test import APIClient
 from rest_framework import status
 from datetime import timedelta
 from apps.users.models import User
+from apps.events.lifecycle import advance_events
 from apps.events.models import Event, Registration
 
 @pytest.mark.django_db
@@ -140,6 +141,8 @@ class TestEventViewSet:
             capacity=50,
             organizer=sample_event.organizer,
         )
+        # Status moves to "ongoing" with the lifecycle job
+        advance_events()
         upcoming_response = api_client.get("/api/v1/events/upcoming/")
         assert upcoming_response.status_code == status.HTTP_200_OK
         ongoing_response = api_client.get("/api/v1/events/ongoing/")
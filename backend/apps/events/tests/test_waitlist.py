@@ -0,0 +1,122 @@
+# backend/apps/events/tests/test_waitlist.py
+
+import pytest
+from datetime import timedelta
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.events.models import Event, Registration
+from apps.events.waitlist import position, promote
+from apps.notifications.models import OutboxMessage
+from apps.users.models import User
+
+
+@pytest.mark.django_db(transaction=True)
+class TestWaitlist:
+    """FIFO waitlist with automatic promotion"""
+
+    @pytest.fixture
+    def organizer(self):
+        return User.objects.create_user(
+            username='organizer',
+            email='organizer@test.com',
+            password='testpass123',
+            role='organizer'
+        )
+
+    @pytest.fixture
+    def attendees(self):
+        return [
+            User.objects.create_user(
+                username=f'attendee{i}',
+                email=f'attendee{i}@test.com',
+                password='testpass123',
+                role='attendee'
+            )
+            for i in range(6)
+        ]
+
+    @pytest.fixture
+    def event(self, organizer):
+        now = timezone.now()
+        return Event.objects.create(
+            title='Small Workshop',
+            slug='small-workshop',
+            description='Two seats only',
+            event_type='workshop',
+            status='published',
+            start_date=now + timedelta(days=30),
+            end_date=now + timedelta(days=31),
+            registration_start=now - timedelta(days=1),
+            registration_end=now + timedelta(days=20),
+            venue_name='Lab',
+            venue_address='Main St',
+            city='Jakarta',
+            country='Indonesia',
+            capacity=2,
+            organizer=organizer
+        )
+
+    def register(self, user, event):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.post('/api/v1/registrations/', {'event': event.pk})
+        assert response.status_code == 201, response.data
+        return Registration.objects.get(pk=response.data['id'])
+
+    def test_full_event_takes_waitlist_in_order(self, event, attendees):
+        registrations = [self.register(user, event) for user in attendees[:5]]
+        assert [r.status for r in registrations] == ['pending'] * 2 + ['waitlisted'] * 3
+        assert [position(r) for r in registrations[2:]] == [1, 2, 3]
+
+        client = APIClient()
+        client.force_authenticate(user=attendees[3])
+        response = client.get(f'/api/v1/events/{event.slug}/waitlist/')
+        assert response.data['position'] == 2
+        assert response.data['waiting'] == 3
+        client.force_authenticate(user=attendees[0])
+        assert client.get(f'/api/v1/events/{event.slug}/waitlist/').status_code == 404
+
+    def test_cancellation_promotes_first_in_line(self, event, attendees):
+        seated, _, first, second = [self.register(user, event) for user in attendees[:4]]
+        seated.cancel()
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        event.refresh_from_db()
+        assert first.status == 'pending' and first.waitlist_rank is None
+        assert position(second) == 1
+        assert event.current_attendees == 2
+        assert OutboxMessage.objects.filter(kind='waitlist_promoted', recipient=first.attendee.email).exists()
+
+        # A second cancel of the same registration frees nothing
+        Registration.objects.get(pk=seated.pk).cancel()
+        event.refresh_from_db()
+        assert event.current_attendees == 2
+
+    def test_leaving_closes_the_gap(self, event, attendees):
+        registrations = [self.register(user, event) for user in attendees[:5]]
+        registrations[3].cancel()
+        registrations[2].refresh_from_db()
+        registrations[4].refresh_from_db()
+        assert position(registrations[2]) == 1
+        assert position(registrations[4]) == 2
+        event.refresh_from_db()
+        assert (event.waitlist_tail - event.waitlist_head) == 2
+
+    def test_raised_capacity_promotes_in_batches(self, event, attendees):
+        registrations = [self.register(user, event) for user in attendees]
+        Event.objects.filter(pk=event.pk).update(capacity=5)
+        assert promote(event.pk, batch_size=2) == 3
+
+        statuses = list(
+            Registration.objects.filter(pk__in=[r.pk for r in registrations])
+            .order_by('pk').values_list('status', flat=True)
+        )
+        assert statuses == ['pending'] * 5 + ['waitlisted']
+        assert position(Registration.objects.get(pk=registrations[-1].pk)) == 1
+
+        # Capacity raised through the model promotes on commit
+        event.refresh_from_db()
+        event.capacity = 6
+        event.save()
+        assert Registration.objects.get(pk=registrations[-1].pk).status == 'pending'
@@ -1,11 +1,20 @@
 # backend/apps/events/views.py
 
+import datetime
+import uuid
+from collections import Counter
+
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from django_filters.rest_framework import DjangoFilterBackend
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils import timezone
+from . import cache as event_cache
+from . import checkin, exports, imports, stats
 from .models import Event, Registration
 from .serializers import (
     EventListSerializer, EventDetailSerializer, 
@@ -42,10 +51,29 @@ class EventViewSet(viewsets.ModelViewSet):
             return EventCreateUpdateSerializer
         return EventDetailSerializer
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ['stats_daily', 'stats_cumulative']:
+            # The stats read the event row only, not its program
+            queryset = queryset.prefetch_related(None)
+        return queryset
+    
     def perform_create(self, serializer):
         """Set organizer to current user"""
         serializer.save(organizer=self.request.user)
     
+    def retrieve(self, request, *args, **kwargs):
+        """Event detail, cached until something about the event changes"""
+        if not event_cache.shared():
+            return super().retrieve(request, *args, **kwargs)
+        event = self.get_object()
+        key = event_cache.detail_key(event.pk, request)
+        data = cache.get(key)
+        if data is None:
+            data = self.get_serializer(event).data
+            cache.set(key, data, event_cache.DETAIL_TIMEOUT)
+        return Response(data)
+    
     @action(detail=True, methods=['get'])
     def registrations(self, request, slug=None):
         """Get all registrations for an event"""
@@ -58,9 +86,91 @@ class EventViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        registrations = event.registrations.select_related('attendee').all()
-        serializer = RegistrationSerializer(registrations, many=True)
-        return Response(serializer.data)
+        registrations = event.registrations.select_related('attendee').order_by('pk')
+        page = self.paginate_queryset(registrations)
+        serializer = RegistrationSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+    
+    @action(detail=True, methods=['get'], url_path='registrations/export')
+    def export_registrations(self, request, slug=None):
+        """
+        Stream the event's registrations as a file
+        GET /api/v1/events/{slug}/registrations/export/?type=csv|xlsx|ndjson&registration_status=confirmed,attended
+        """
+        event = self.get_object()
+        
+        if event.organizer != request.user:
+            return Response(
+                {'detail': 'Only event organizer can export registrations'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        export_format = request.query_params.get('type', 'csv')
+        if export_format not in exports.FORMATS:
+            return Response(
+                {'detail': f"type must be one of: {', '.join(exports.FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        statuses = [s for s in request.query_params.get('registration_status', '').split(',') if s]
+        valid = {value for value, _ in Registration.STATUS_CHOICES}
+        if not set(statuses) <= valid:
+            return Response(
+                {'detail': f"registration_status must be among: {', '.join(sorted(valid))}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        response = StreamingHttpResponse(
+            exports.stream(event, export_format, statuses),
+            content_type=exports.FORMATS[export_format][0]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{exports.export_filename(event, export_format)}"'
+        )
+        return response
+    
+    @action(detail=True, methods=['post'], url_path='registrations/import',
+            parser_classes=[MultiPartParser, FormParser])
+    def import_registrations(self, request, slug=None):
+        """
+        Register attendees in bulk from a CSV file; responds with a per-row result file
+        POST /api/v1/events/{slug}/registrations/import/
+            file          CSV with an email column, and optionally first_name,
+                          last_name, phone, company, job_title, password,
+                          dietary_requirements, special_requests
+            status        confirmed (default) or pending
+            send_invites  email new accounts without a password (default true)
+        """
+        event = self.get_object()
+        
+        if event.organizer != request.user:
+            return Response(
+                {'detail': 'Only event organizer can import registrations'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'detail': 'file is required'}, status=status.HTTP_400_BAD_REQUEST)
+        registration_status = request.data.get('status', 'confirmed')
+        if registration_status not in ['confirmed', 'pending']:
+            return Response(
+                {'detail': 'status must be confirmed or pending'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        send_invites = str(request.data.get('send_invites', 'true')).lower() not in ['false', '0', 'no']
+        
+        try:
+            results = imports.import_attendees(
+                event, upload.file, status=registration_status, send_invites=send_invites
+            )
+        except imports.ImportFileError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        response = HttpResponse(imports.result_csv(results), content_type='text/csv; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="{event.slug}-import-results.csv"'
+        for outcome, count in Counter(r.result for r in results).items():
+            response[f'X-Import-{outcome.replace("_", "-").title()}'] = count
+        return response
     
     @action(detail=True, methods=['get'])
     def sessions(self, request, slug=None):
@@ -105,6 +215,133 @@ class EventViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(event)
         return Response(serializer.data)
     
+    @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
+    def waitlist(self, request, slug=None):
+        """
+        The caller's place on the event's waitlist
+        GET /api/v1/events/{slug}/waitlist/
+        """
+        event = self.get_object()
+        registration = (
+            Registration.objects.filter(event=event, attendee=request.user, status='waitlisted')
+            .only('pk', 'event_id', 'status', 'waitlist_rank')
+            .first()
+        )
+        if registration is None:
+            return Response(
+                {'detail': 'You are not on the waitlist for this event'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response({
+            'registration': registration.pk,
+            'position': registration.waitlist_rank - event.waitlist_head,
+            'waiting': event.waitlist_tail - event.waitlist_head,
+        })
+    
+    @action(detail=False, methods=['post'], url_path='check-in', permission_classes=[IsAuthenticated])
+    def check_in(self, request):
+        """
+        Check a ticket holder in (organizer's door staff)
+        POST /api/v1/events/check-in/  {"token": "...", "sub_event": "<uuid>"}
+        """
+        token = request.data.get('token')
+        if not token:
+            return Response({'detail': 'token is required'}, status=status.HTTP_400_BAD_REQUEST)
+        sub_event = request.data.get('sub_event') or None
+        if sub_event:
+            try:
+                sub_event = uuid.UUID(str(sub_event))
+            except ValueError:
+                return Response({'detail': 'sub_event must be a UUID'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(checkin.check_in(request.user, token, sub_event))
+    
+    @action(detail=False, methods=['post'], url_path='check-in/sync', permission_classes=[IsAuthenticated])
+    def check_in_sync(self, request):
+        """
+        Upload the scans of a scanner that was offline
+        POST /api/v1/events/check-in/sync/
+            {"scans": [{"token": "...", "sub_event": "<uuid>", "scanned_at": "<ISO 8601>"}, ...]}
+        """
+        scans = request.data.get('scans')
+        if not isinstance(scans, list):
+            return Response({'detail': 'scans must be a list'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(scans) > checkin.MAX_SYNC_SCANS:
+            return Response(
+                {'detail': f'At most {checkin.MAX_SYNC_SCANS} scans per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(checkin.sync(request.user, scans))
+    
+    @action(detail=True, methods=['get'])
+    def attendance(self, request, slug=None):
+        """
+        Live attended counts of the event and its sub-events
+        GET /api/v1/events/{slug}/attendance/
+        """
+        event = self.get_object()
+        
+        if event.organizer != request.user:
+            return Response(
+                {'detail': 'Only event organizer can view attendance'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        return Response(checkin.attendance(event))
+    
+    def _stats_range(self, request, event):
+        """(start, end) from ?from=&to= (YYYY-MM-DD), or a Response with the error"""
+        start, end = stats.default_range(event)
+        bounds = {}
+        for param in ('from', 'to'):
+            value = request.query_params.get(param)
+            if not value:
+                continue
+            try:
+                bounds[param] = datetime.date.fromisoformat(value)
+            except ValueError:
+                return Response(
+                    {'detail': f'{param} must be a date as YYYY-MM-DD'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        start, end = bounds.get('from', start), bounds.get('to', end)
+        if end < start:
+            return Response({'detail': 'from must not be after to'}, status=status.HTTP_400_BAD_REQUEST)
+        if (end - start).days >= stats.MAX_DAYS:
+            return Response(
+                {'detail': f'At most {stats.MAX_DAYS} days per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return start, end
+    
+    def _stats(self, request, series):
+        event = self.get_object()
+        
+        if event.organizer != request.user:
+            return Response(
+                {'detail': 'Only event organizer can view registration stats'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        period = self._stats_range(request, event)
+        if isinstance(period, Response):
+            return period
+        start, end = period
+        return Response({'event': event.pk, 'from': start, 'to': end, 'days': series(event, start, end)})
+    
+    @action(detail=True, methods=['get'], url_path='stats/daily')
+    def stats_daily(self, request, slug=None):
+        """
+        Registrations made, confirmed, cancelled and checked in per day
+        GET /api/v1/events/{slug}/stats/daily/?from=YYYY-MM-DD&to=YYYY-MM-DD
+        """
+        return self._stats(request, stats.daily)
+    
+    @action(detail=True, methods=['get'], url_path='stats/cumulative')
+    def stats_cumulative(self, request, slug=None):
+        """
+        Running registration totals per day, with confirmation and cancellation rates
+        GET /api/v1/events/{slug}/stats/cumulative/?from=YYYY-MM-DD&to=YYYY-MM-DD
+        """
+        return self._stats(request, stats.cumulative)
+    
     @action(detail=False, methods=['get'])
     def upcoming(self, request):
         """Get upcoming events"""
@@ -119,13 +356,8 @@ class EventViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def ongoing(self, request):
-        """Get currently ongoing events"""
-        now = timezone.now()
-        events = self.queryset.filter(
-            start_date__lte=now,
-            end_date__gte=now,
-            status__in=['published', 'ongoing']
-        )
+        """Get currently ongoing events (status kept current by advance_event_status)"""
+        events = self.queryset.filter(status='ongoing').order_by('start_date')
         
         serializer = EventListSerializer(events, many=True)
         return Response(serializer.data)
@@ -172,6 +404,26 @@ class RegistrationViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(registration)
         return Response(serializer.data)
     
+    @action(detail=True, methods=['get'])
+    def ticket(self, request, pk=None):
+        """
+        The registration's QR ticket
+        GET /api/v1/registrations/{id}/ticket/?image=svg|png
+        """
+        registration = self.get_object()
+        
+        if registration.status not in checkin.CHECK_IN_STATUSES + ['attended']:
+            return Response(
+                {'detail': 'Only pending or confirmed registrations have a ticket'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        kind = request.query_params.get('image', 'svg')
+        return Response({
+            'registration': registration.pk,
+            'token': registration.ticket_token,
+            'qr_code': checkin.qr_code(registration, 'png' if kind == 'png' else 'svg'),
+        })
+    
     @action(detail=True, methods=['post'])
     def cancel(self, request, pk=None):
         """Cancel a registration"""
@@ -0,0 +1,140 @@
+# ============================================
+# apps/events/waitlist.py
+# ============================================
+# FIFO waitlist of full events.
+#
+# Waiting registrations (status 'waitlisted') carry a dense waitlist_rank;
+# the event keeps the ranks already served (waitlist_head) and the last
+# rank handed out (waitlist_tail). So:
+#
+#   position — waitlist_rank - waitlist_head, read off two rows, no COUNT
+#   join     — waitlist_tail += 1 takes the next rank
+#   promote  — the first N ranks (partial index on (event, waitlist_rank))
+#              become pending registrations and waitlist_head += N
+#   leave    — ranks behind the leaver shift down by one in one UPDATE
+#
+# Every change of the counters happens under the event's row lock (the
+# UPDATE of waitlist_tail, or select_for_update in promote), and seats are
+# taken with the same conditional UPDATE as a direct registration
+# (Event.reserve_seats), so concurrent cancellations, joins and promotions
+# never hand out a seat twice or lose a place in line.
+# ============================================
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.notifications.outbox import enqueue
+from . import stats
+from .cache import invalidate
+from .models import Event, Registration
+
+DEFAULT_BATCH_SIZE = 100
+
+
+def next_rank(event):
+    """Take the next waitlist rank of `event`; call inside the registration's transaction"""
+    Event.objects.filter(pk=event.pk).update(waitlist_tail=F('waitlist_tail') + 1)
+    event.waitlist_tail = Event.objects.values_list('waitlist_tail', flat=True).get(pk=event.pk)
+    return event.waitlist_tail
+
+
+def position(registration):
+    """1-based place in line of a waitlisted registration, or None"""
+    if registration.status != 'waitlisted' or registration.waitlist_rank is None:
+        return None
+    head = Event.objects.values_list('waitlist_head', flat=True).get(pk=registration.event_id)
+    return registration.waitlist_rank - head
+
+
+def leave(registration):
+    """
+    Take a waitlisted registration out of line and close the gap behind it.
+    False when it was no longer waiting (e.g. promoted meanwhile).
+    """
+    with transaction.atomic():
+        # The event's row lock keeps ranks from moving under us
+        Event.objects.select_for_update().filter(pk=registration.event_id).values_list('pk').first()
+        rank = (
+            Registration.objects.filter(pk=registration.pk, status='waitlisted')
+            .values_list('waitlist_rank', flat=True).first()
+        )
+        if rank is None:
+            registration.refresh_from_db(fields=['status', 'waitlist_rank'])
+            return False
+        now = timezone.now()
+        Registration.objects.filter(pk=registration.pk).update(
+            status='cancelled', waitlist_rank=None, cancelled_at=now, updated_at=now
+        )
+        stats.bump(registration.event_id, now, cancelled=1)
+        Registration.objects.filter(
+            event_id=registration.event_id, status='waitlisted', waitlist_rank__gt=rank
+        ).update(waitlist_rank=F('waitlist_rank') - 1)
+        Event.objects.filter(pk=registration.event_id).update(waitlist_tail=F('waitlist_tail') - 1)
+        transaction.on_commit(lambda: invalidate(registration.event_id))
+    registration.status, registration.waitlist_rank = 'cancelled', None
+    registration.cancelled_at = now
+    return True
+
+
+def _promotion_message(registration):
+    event = registration.event
+    return (
+        f"Hi {registration.attendee.get_full_name() or registration.attendee.username},\n\n"
+        f"A seat opened up for {event.title} and it is yours — you are off the waitlist.\n\n"
+        f"When:  {timezone.localtime(event.start_date):%A %d %B %Y, %H:%M}\n"
+        f"Where: {event.venue_name}, {event.city}\n"
+    )
+
+
+def promote(event_id, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Move waitlisted registrations into free seats, first in line first, up
+    to `batch_size` per transaction. Returns how many were promoted.
+    """
+    promoted = 0
+    while True:
+        with transaction.atomic():
+            event = (
+                Event.objects.select_for_update()
+                .filter(pk=event_id, status__in=['published', 'ongoing'])
+                .first()
+            )
+            if event is None or not event.has_waitlist or event.is_full:
+                break
+            batch = list(
+                Registration.objects.filter(event_id=event_id, status='waitlisted')
+                .select_related('attendee')
+                .order_by('waitlist_rank')[:min(event.available_spots, batch_size)]
+            )
+            if not batch or not event.reserve_seats(len(batch)):
+                break
+            Registration.objects.filter(pk__in=[r.pk for r in batch]).update(
+                status='pending', waitlist_rank=None, updated_at=timezone.now()
+            )
+            Event.objects.filter(pk=event_id).update(waitlist_head=F('waitlist_head') + len(batch))
+            for registration in batch:
+                registration.event = event
+                enqueue(
+                    registration.attendee.email,
+                    f"You're in: {event.title}",
+                    _promotion_message(registration),
+                    kind='waitlist_promoted',
+                )
+            transaction.on_commit(lambda: invalidate(event_id))
+        promoted += len(batch)
+    return promoted
+
+
+def promote_on_commit(event_id):
+    transaction.on_commit(lambda: promote(event_id))
+
+
+def promote_all(batch_size=DEFAULT_BATCH_SIZE):
+    """Fill free seats of every event with people waiting. Returns how many were promoted."""
+    events = Event.objects.filter(
+        status__in=['published', 'ongoing'],
+        waitlist_tail__gt=F('waitlist_head'),
+        current_attendees__lt=F('capacity'),
+    ).values_list('pk', flat=True)
+    return sum(promote(event_id, batch_size) for event_id in events)
@@ -1,8 +1,11 @@
 # apps/mice/admin.py
 from django.contrib import admin
+from django.template.defaultfilters import filesizeformat
+from .blobs import storage_report
 from .models import (
     MICEProject, SubEvent, Quotation, QuotationSection,
-    QuotationLineItem, ProjectTask, ProjectAsset, Vendor,
+    QuotationLineItem, ProjectTask, TaskDependency, ProjectAsset, Vendor, AssetBlob,
+    Reminder,
 )
 
 
@@ -79,11 +82,26 @@ class VendorAdmin(admin.ModelAdmin):
     search_fields   = ['name', 'contact_name', 'contact_email']
 
 
+class PredecessorInline(admin.TabularInline):
+    # Read-only: edges are added through TaskDependency.link(), which
+    # refuses cycles
+    model           = TaskDependency
+    fk_name         = 'successor'
+    extra           = 0
+    fields          = ['predecessor', 'lag', 'created_at']
+    readonly_fields = fields
+    can_delete      = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(ProjectTask)
 class ProjectTaskAdmin(admin.ModelAdmin):
-    list_display    = ['title', 'mice_project', 'assigned_to', 'status', 'priority', 'due_at']
-    list_filter     = ['status', 'priority']
+    list_display    = ['title', 'mice_project', 'assigned_to', 'status', 'priority', 'due_at', 'is_overdue']
+    list_filter     = ['status', 'priority', 'is_overdue']
     raw_id_fields   = ['mice_project', 'assigned_to', 'sub_event']
+    inlines         = [PredecessorInline]
 
 
 @admin.register(ProjectAsset)
@@ -91,3 +109,31 @@ class ProjectAssetAdmin(admin.ModelAdmin):
     list_display    = ['title', 'mice_project', 'asset_type', 'uploaded_by', 'created_at']
     list_filter     = ['asset_type']
     raw_id_fields   = ['mice_project', 'uploaded_by']
+    readonly_fields = ['blob']
+
+
+@admin.register(AssetBlob)
+class AssetBlobAdmin(admin.ModelAdmin):
+    list_display    = ['sha256', 'size', 'ref_count', 'last_referenced_at', 'created_at']
+    readonly_fields = ['sha256', 'file', 'size', 'ref_count', 'last_referenced_at', 'created_at']
+    ordering        = ['-ref_count']
+
+    def has_add_permission(self, request):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        report = storage_report()
+        self.message_user(request, (
+            f"{report['blobs']} blobs, {filesizeformat(report['stored'])} stored for "
+            f"{filesizeformat(report['logical'])} of assets — "
+            f"{filesizeformat(report['saved'])} saved by deduplication"
+        ))
+        return super().changelist_view(request, extra_context)
+
+
+@admin.register(Reminder)
+class ReminderAdmin(admin.ModelAdmin):
+    list_display    = ['user', 'kind', 'message', 'due', 'sent_at']
+    list_filter     = ['kind']
+    raw_id_fields   = ['user', 'mice_project']
+    date_hierarchy  = 'due'
@@ -0,0 +1,117 @@
+# =============================================================================
+# apps/mice/asset_hub.py
+# =============================================================================
+# Grouped asset listing for the Asset Hub UI (ProjectAssetViewSet.by_type).
+#
+#   counts  — one aggregate query: count and total bytes per asset_type
+#   pages   — one query: ROW_NUMBER() partitioned by asset_type picks the
+#             requested page of every group at once
+#   output  — one ProjectAssetSerializer(many=True) pass over all pages
+#
+# Responses are cached per project under a version key. ProjectAsset.save()
+# and delete() bump the version on commit; queryset updates that bypass
+# them (preview worker, blob migration) call invalidate() themselves. The
+# key also carries the signed-URL window (apps/mice/media.py), so cached
+# file URLs never outlive their signatures. Like the event caches
+# (apps/events/cache.py) this only runs on a cache every process shares;
+# on a per-process LocMemCache each listing is built fresh.
+# =============================================================================
+
+import time
+
+from django.core.cache import cache
+from django.db.models import Count, F, Sum, Window
+from django.db.models.functions import RowNumber
+
+from apps.events.cache import shared as shared_cache
+
+from .media import _window as media_url_window
+from .models import ProjectAsset
+
+CACHE_TIMEOUT       = 60 * 60
+INTERNAL_TYPES      = {'contract'}  # vendor contracts always internal
+
+
+def _version_key(project_id):
+    return f'mice:asset-hub:{project_id}:version'
+
+
+def _version(project_id):
+    version = cache.get(_version_key(project_id))
+    if version is None:
+        version = time.time_ns()
+        cache.add(_version_key(project_id), version, None)
+        version = cache.get(_version_key(project_id), version)
+    return version
+
+
+def invalidate(*project_ids):
+    if not shared_cache():
+        return
+    for project_id in {p for p in project_ids if p}:
+        cache.set(_version_key(project_id), time.time_ns(), None)
+
+
+def grouped_assets(request, project_id, serializer_class, asset_type=None, page=1, page_size=20):
+    """
+    [{type, label, count, total_size, internal, page, pages, assets}] in
+    ASSET_TYPES order. Every group shows page `page`, or only `asset_type`
+    when given.
+    """
+    key = None
+    if shared_cache():
+        key = 'mice:asset-hub:{}:{}:{}:{}:{}:{}:{}'.format(
+            project_id, _version(project_id), int(time.time()) // media_url_window(),
+            request.build_absolute_uri('/'), asset_type or '*', page, page_size,
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    assets = ProjectAsset.objects.filter(mice_project_id=project_id)
+    if asset_type:
+        assets = assets.filter(asset_type=asset_type)
+
+    totals = {
+        row['asset_type']: row
+        for row in assets.order_by().values('asset_type').annotate(
+            count=Count('pk'), total_size=Sum('file_size'),
+        )
+    }
+
+    offset = (page - 1) * page_size
+    rows = list(
+        assets.filter(asset_type__in=totals)
+        .select_related('uploaded_by')
+        .annotate(position=Window(
+            RowNumber(), partition_by=[F('asset_type')],
+            order_by=[F('created_at').desc(), F('pk').desc()],
+        ))
+        .filter(position__gt=offset, position__lte=offset + page_size)
+        .order_by('asset_type', 'position')
+    )
+    serialized = serializer_class(rows, many=True, context={'request': request}).data
+
+    pages = {}
+    for asset, data in zip(rows, serialized):
+        pages.setdefault(asset.asset_type, []).append(data)
+
+    result = []
+    for type_key, label in ProjectAsset.ASSET_TYPES:
+        if type_key not in totals:
+            continue
+        count = totals[type_key]['count']
+        result.append({
+            'type':         type_key,
+            'label':        label,
+            'count':        count,
+            'total_size':   totals[type_key]['total_size'] or 0,
+            'internal':     type_key in INTERNAL_TYPES,
+            'page':         page,
+            'pages':        -(-count // page_size),
+            'assets':       pages.get(type_key, []),
+        })
+
+    if key:
+        cache.set(key, result, CACHE_TIMEOUT)
+    return result
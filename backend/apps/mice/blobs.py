@@ -0,0 +1,214 @@
+# =============================================================================
+# apps/mice/blobs.py
+# =============================================================================
+# Content-addressed storage behind ProjectAsset.file.
+#
+#   acquire   → hash the content; if an AssetBlob with that SHA-256 exists it
+#               is referenced as-is, otherwise the bytes are written once to
+#               mice/blobs/<ab>/<cd>/<sha256>. Either way ref_count goes up
+#   release   → ref_count goes down (asset deleted or its file replaced)
+#   gc        → ref_counts are recounted from ProjectAsset (cascades and
+#               queryset deletes skip ProjectAsset.delete), then blobs left at
+#               zero for longer than the grace period lose their row, file
+#               and previews
+#   migrate   → pre-blob assets under mice/assets/ are hashed and moved in
+#
+# A blob row is only deleted with a conditional DELETE … WHERE ref_count = 0,
+# and acquire stamps last_referenced_at, so a concurrent upload of the same
+# content never loses its file to the collector.
+# =============================================================================
+
+import hashlib
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .asset_hub import invalidate as invalidate_asset_hub
+from .models import AssetBlob, ProjectAsset
+from .previews import preview_path, preview_sizes
+
+READ_CHUNK      = 1024 * 1024
+ACQUIRE_RETRIES = 3
+GC_GRACE        = timedelta(hours=1)
+
+
+class BlobError(Exception):
+    pass
+
+
+def blob_storage():
+    return AssetBlob._meta.get_field('file').storage
+
+
+def blob_path(sha256):
+    return f'mice/blobs/{sha256[:2]}/{sha256[2:4]}/{sha256}'
+
+
+def digest(fileobj):
+    """(sha256 hex, size) of a file-like, rewound before and after when it can be."""
+    if hasattr(fileobj, 'seek'):
+        fileobj.seek(0)
+    h, size = hashlib.sha256(), 0
+    while True:
+        chunk = fileobj.read(READ_CHUNK)
+        if not chunk:
+            break
+        h.update(chunk)
+        size += len(chunk)
+    if hasattr(fileobj, 'seek'):
+        fileobj.seek(0)
+    return h.hexdigest(), size
+
+
+# ── Acquire / release ─────────────────────────────────────────────────────────
+
+def _put(sha256, size, open_content, check=None):
+    """The blob for `sha256`, writing `open_content()` only if it is new."""
+    blob = AssetBlob.objects.filter(pk=sha256).first()
+    if blob is not None:
+        return blob
+
+    storage = blob_storage()
+    with open_content() as content:
+        saved = storage.save(blob_path(sha256), File(content, name=blob_path(sha256)))
+    if check is not None:
+        try:
+            check()
+        except Exception:
+            storage.delete(saved)
+            raise
+
+    blob, created = AssetBlob.objects.get_or_create(
+        sha256=sha256, defaults={'file': saved, 'size': size},
+    )
+    if not created and blob.file.name != saved:
+        # Another request stored the same content first
+        storage.delete(saved)
+    return blob
+
+
+def acquire(sha256, size, open_content, check=None):
+    """
+    Take a reference on the blob for `sha256`. If no such blob exists yet,
+    `open_content()` — a context manager yielding the bytes — is stored.
+    `check()`, when given, runs once a new file is written and before its
+    row exists; raising discards the file, so content whose hash was only
+    claimed can be verified while it is written. Returns the AssetBlob.
+    """
+    for _ in range(ACQUIRE_RETRIES):
+        blob = _put(sha256, size, open_content, check)
+        if AssetBlob.objects.filter(pk=blob.pk).update(
+            ref_count=F('ref_count') + 1, last_referenced_at=timezone.now(),
+        ):
+            blob.ref_count += 1
+            return blob
+        # Collected between lookup and reference — store it again
+    raise BlobError(f'Could not reference blob {sha256}')
+
+
+def acquire_file(fileobj):
+    """acquire() for an uploaded file; hashed first, written only if new."""
+    sha256, size = digest(fileobj)
+    return acquire(sha256, size, lambda: nullcontext(fileobj))
+
+
+def release(sha256):
+    AssetBlob.objects.filter(pk=sha256, ref_count__gt=0).update(ref_count=F('ref_count') - 1)
+
+
+# ── Garbage collection ────────────────────────────────────────────────────────
+
+def recount():
+    """Reset every ref_count to the number of assets pointing at the blob."""
+    references = (
+        ProjectAsset.objects.filter(blob=OuterRef('pk'))
+        .order_by().values('blob').annotate(n=Count('pk')).values('n')
+    )
+    return AssetBlob.objects.update(ref_count=Coalesce(Subquery(references), Value(0)))
+
+
+def collect_garbage(grace=GC_GRACE, now=None, dry_run=False):
+    """
+    Delete unreferenced blobs idle for longer than `grace`.
+    Returns (blobs removed, bytes freed).
+    """
+    now = now or timezone.now()
+    if not dry_run:
+        recount()
+    orphans = AssetBlob.objects.filter(ref_count=0, last_referenced_at__lt=now - grace)
+    if dry_run:
+        totals = orphans.aggregate(n=Count('pk'), size=Coalesce(Sum('size'), 0))
+        return totals['n'], totals['size']
+
+    storage  = blob_storage()
+    previews = ProjectAsset._meta.get_field('file').storage
+    removed  = freed = 0
+    for sha256, name, size in orphans.values_list('sha256', 'file', 'size').iterator():
+        with transaction.atomic():
+            deleted, _ = AssetBlob.objects.filter(pk=sha256, ref_count=0).delete()
+        if deleted:
+            storage.delete(name)
+            for size_name in preview_sizes():
+                previews.delete(preview_path(name, size_name))
+            removed += 1
+            freed   += size
+    return removed, freed
+
+
+# ── Reporting ─────────────────────────────────────────────────────────────────
+
+def storage_report():
+    """Stored vs. logical bytes across all blobs."""
+    totals = AssetBlob.objects.aggregate(
+        blobs    = Count('pk'),
+        stored   = Coalesce(Sum('size'), 0),
+        logical  = Coalesce(Sum(F('size') * F('ref_count')), 0),
+    )
+    referenced = AssetBlob.objects.filter(ref_count__gt=0).aggregate(
+        stored=Coalesce(Sum('size'), 0),
+    )['stored']
+    totals['saved'] = max(totals['logical'] - referenced, 0)
+    return totals
+
+
+# ── Migration of pre-blob files ───────────────────────────────────────────────
+
+def migrate_legacy_files(batch_size=200, delete_originals=True):
+    """
+    Move assets stored before the blob store into it. Idempotent.
+    Returns (migrated, missing) — missing files are left untouched.
+    """
+    storage  = blob_storage()
+    migrated = missing = 0
+    pending  = ProjectAsset.objects.filter(blob__isnull=True).exclude(file='').order_by('pk')
+    last_pk  = None
+    while True:
+        batch = pending if last_pk is None else pending.filter(pk__gt=last_pk)
+        batch = list(batch.only('pk', 'mice_project', 'file')[:batch_size])
+        if not batch:
+            break
+        for asset in batch:
+            last_pk  = asset.pk
+            original = asset.file.name
+            try:
+                with asset.file.open('rb') as f:
+                    sha256, size = digest(f)
+            except FileNotFoundError:
+                missing += 1
+                continue
+
+            blob = acquire(sha256, size, lambda: asset.file.open('rb'))
+            ProjectAsset.objects.filter(pk=asset.pk).update(
+                blob=blob, file=blob.file.name, file_size=blob.size,
+            )
+            if (delete_originals and original != blob.file.name
+                    and not ProjectAsset.objects.filter(file=original).exists()):
+                storage.delete(original)
+            migrated += 1
+        invalidate_asset_hub(*{a.mice_project_id for a in batch})
+    return migrated, missing
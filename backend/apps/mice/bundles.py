@@ -0,0 +1,151 @@
+# =============================================================================
+# apps/mice/bundles.py
+# =============================================================================
+# Streaming ZIP bundles of project assets.
+#
+# The archive is produced while it is sent: zipfile writes into a sink the
+# response generator drains after every chunk, so neither the archive nor a
+# whole member file is ever held in memory or written to disk. Members are
+# STORED — key visuals, videos and PDFs are already compressed — which makes
+# the archive size known up front: Content-Length is exact, and clients get
+# a real progress bar for multi-GB bundles.
+# =============================================================================
+
+import os
+import zipfile
+
+from django.utils import timezone
+from django.utils.text import slugify
+
+READ_CHUNK = 1024 * 1024
+
+
+class _Sink:
+    """Write-only, tell-able file object zipfile streams into."""
+
+    def __init__(self):
+        self.chunks   = []
+        self.position = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data, self.chunks = b''.join(self.chunks), []
+        return data
+
+
+# ── Members ───────────────────────────────────────────────────────────────────
+
+def _clean(part):
+    return part.replace('/', '-').replace('\\', '-').strip() or 'untitled'
+
+
+def _arcname(asset, taken):
+    """<sub-event>/<asset type>/<title><ext>, made unique within the archive."""
+    ext     = asset.extension
+    title   = _clean(asset.title)
+    if ext and not title.lower().endswith(ext.lower()):
+        title += ext
+    folders = [_clean(asset.sub_event.title)] if asset.sub_event_id else []
+    folders.append(asset.get_asset_type_display())
+    name    = '/'.join(folders + [title])
+
+    stem, ext = os.path.splitext(name)
+    n = 2
+    while name in taken:
+        name = f'{stem} ({n}){ext}'
+        n += 1
+    taken.add(name)
+    return name
+
+
+def _zip_info(name, when):
+    info = zipfile.ZipInfo(name, date_time=timezone.localtime(when).timetuple()[:6])
+    info.compress_type = zipfile.ZIP_STORED
+    info.external_attr = 0o644 << 16
+    return info
+
+
+def plan(assets):
+    """
+    [(asset, ZipInfo)] for the assets whose file exists, sized from storage
+    rather than the file_size column so Content-Length cannot drift.
+    """
+    members, taken = [], set()
+    for asset in assets:
+        if not asset.file:
+            continue
+        try:
+            size = asset.file.storage.size(asset.file.name)
+        except OSError:
+            continue
+        info = _zip_info(_arcname(asset, taken), asset.updated_at)
+        info.file_size = size
+        members.append((asset, info))
+    return members
+
+
+# ── Size ──────────────────────────────────────────────────────────────────────
+
+def _encoded_name(info):
+    try:
+        return info.filename.encode('ascii')
+    except UnicodeEncodeError:
+        return info.filename.encode('utf-8')
+
+
+def archive_size(members):
+    """
+    Exact byte length of the archive stream() produces — mirrors zipfile's
+    layout for STORED members on an unseekable stream (local header, data,
+    data descriptor; then central directory and end records, ZIP64 where
+    zipfile would use it).
+    """
+    limit  = zipfile.ZIP64_LIMIT
+    offset = central = 0
+    for _, info in members:
+        name  = _encoded_name(info)
+        zip64 = info.file_size * 1.05 > limit
+        extra64 = (2 if info.file_size > limit else 0) + (1 if offset > limit else 0)
+        central += (zipfile.sizeCentralDir + len(name) + len(info.extra) + len(info.comment)
+                    + (4 + 8 * extra64 if extra64 else 0))
+        offset  += (zipfile.sizeFileHeader + len(name) + len(info.extra) + (20 if zip64 else 0)
+                    + info.file_size + (24 if zip64 else 16))
+
+    size = offset + central + zipfile.sizeEndCentDir
+    if len(members) > zipfile.ZIP_FILECOUNT_LIMIT or offset > limit or central > limit:
+        size += zipfile.sizeEndCentDir64 + zipfile.sizeEndCentDir64Locator
+    return size
+
+
+# ── Stream ────────────────────────────────────────────────────────────────────
+
+def stream(members):
+    """Yield the ZIP archive of `members` (from plan()) chunk by chunk."""
+    sink = _Sink()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for asset, info in members:
+            with asset.file.storage.open(asset.file.name, 'rb') as source, \
+                    archive.open(info, 'w') as target:
+                while True:
+                    chunk = source.read(READ_CHUNK)
+                    if not chunk:
+                        break
+                    target.write(chunk)
+                    yield sink.drain()
+            yield sink.drain()      # data descriptor
+    yield sink.drain()              # central directory
+
+
+def bundle_filename(project, suffix=''):
+    name = slugify(f'{project.client_company} {project.quotation_number}') or 'assets'
+    return f'{name}{suffix}-assets.zip'
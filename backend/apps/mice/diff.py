@@ -0,0 +1,195 @@
+# =============================================================================
+# apps/mice/diff.py
+# =============================================================================
+# Row-level diff between two revisions of a quotation.
+#
+# Line items and sections are matched on lineage_id, which create_revision()
+# copies onto every clone. Both revisions are read in two queries (the
+# quotations, then all their line items together) and matched in O(n)
+# with dicts. Results are cached per revision pair; the cache key carries
+# both quotations' updated_at, which recalculate() bumps on every edit.
+# =============================================================================
+
+from decimal import Decimal
+
+from django.core.cache import cache
+
+from .models import Quotation, QuotationLineItem
+
+CACHE_TIMEOUT = 60 * 60
+
+# Fields compared per line item, by audience
+ORGANIZER_ITEM_FIELDS = [
+    'item_name', 'detail', 'vendor_id',
+    'qty', 'vol_unit', 'duration', 'dur_unit',
+    'modal_price', 'margin_pct', 'margin_amt', 'pph_amt',
+    'total_modal', 'total_margin', 'client_price', 'total_client',
+]
+CLIENT_ITEM_FIELDS = [
+    'item_name', 'detail',
+    'qty', 'vol_unit', 'duration', 'dur_unit',
+    'client_price', 'total_client',
+]
+
+# Quotation totals compared, by audience
+ORGANIZER_TOTAL_FIELDS = [
+    'subtotal_modal', 'subtotal_client', 'fee_management_amt',
+    'total_before_tax', 'ppn_amt', 'total_after_tax',
+    'margin_produksi', 'total_margin', 'sodaqoh_amt', 'net_margin',
+]
+CLIENT_TOTAL_FIELDS = [
+    'subtotal_client', 'fee_management_amt',
+    'total_before_tax', 'ppn_amt', 'total_after_tax',
+]
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def _plain(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _delta(base, target):
+    return {
+        'base':     _plain(base),
+        'target':   _plain(target),
+        'delta':    _plain(target - base),
+    }
+
+
+def _cache_key(base, target, client):
+    return 'mice:quotation-diff:{}:{}:{}:{}:{}'.format(
+        base.pk, base.updated_at.timestamp(),
+        target.pk, target.updated_at.timestamp(),
+        'client' if client else 'organizer',
+    )
+
+
+# ── Diff ──────────────────────────────────────────────────────────────────────
+
+def diff_quotations(base, target, client=False):
+    """
+    Compare two quotations of the same project.
+
+    Returns added / removed / changed line items, per-section subtotal
+    deltas and quotation total deltas. With client=True only client-facing
+    prices are compared or returned — no modal prices, margins or PPh.
+    """
+    key    = _cache_key(base, target, client)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    item_fields  = CLIENT_ITEM_FIELDS if client else ORGANIZER_ITEM_FIELDS
+    total_fields = CLIENT_TOTAL_FIELDS if client else ORGANIZER_TOTAL_FIELDS
+    subtotals    = ['total_client'] if client else ['total_modal', 'total_client']
+
+    rows = QuotationLineItem.objects.filter(
+        section__quotation__in=[base.pk, target.pk],
+    ).order_by('section__sort_order', 'sort_order', 'pk').values(
+        'lineage_id', 'sort_order',
+        'section__quotation_id', 'section__lineage_id', 'section__name',
+        *item_fields, *[f for f in subtotals if f not in item_fields],
+    )
+
+    sides    = {base.pk: ({}, {}), target.pk: ({}, {})}
+    sections = {}   # section lineage → name, in display order
+    for row in rows:
+        items, section_totals = sides[row['section__quotation_id']]
+        items[row['lineage_id']] = row
+        lineage = row['section__lineage_id']
+        sections.setdefault(lineage, row['section__name'])
+        totals = section_totals.setdefault(lineage, dict.fromkeys(subtotals, Decimal('0')))
+        for field in subtotals:
+            totals[field] += row[field]
+
+    base_items, base_sections     = sides[base.pk]
+    target_items, target_sections = sides[target.pk]
+
+    def describe(row):
+        out = {'lineage_id': str(row['lineage_id']), 'section': row['section__name']}
+        out.update({f: _plain(row[f]) for f in item_fields})
+        return out
+
+    added   = [describe(r) for k, r in target_items.items() if k not in base_items]
+    removed = [describe(r) for k, r in base_items.items() if k not in target_items]
+    changed = []
+    unchanged = 0
+    for lineage, new in target_items.items():
+        old = base_items.get(lineage)
+        if old is None:
+            continue
+        changes = {
+            f: {'base': _plain(old[f]), 'target': _plain(new[f])}
+            for f in item_fields if old[f] != new[f]
+        }
+        if old['section__lineage_id'] != new['section__lineage_id']:
+            changes['section'] = {'base': old['section__name'], 'target': new['section__name']}
+        if changes:
+            changed.append({
+                'lineage_id':   str(lineage),
+                'item_name':    new['item_name'],
+                'section':      new['section__name'],
+                'changes':      changes,
+            })
+        else:
+            unchanged += 1
+
+    zero = dict.fromkeys(subtotals, Decimal('0'))
+    section_rows = []
+    for lineage, name in sections.items():
+        old = base_sections.get(lineage)
+        new = target_sections.get(lineage)
+        if old is None:
+            state = 'added'
+        elif new is None:
+            state = 'removed'
+        else:
+            state = 'changed' if old != new else 'unchanged'
+        old, new = old or zero, new or zero
+        section_rows.append({
+            'lineage_id':   str(lineage),
+            'name':         name,
+            'status':       state,
+            **{
+                f.replace('total_', 'subtotal_'): _delta(old[f], new[f])
+                for f in subtotals
+            },
+        })
+
+    result = {
+        'base':     {'id': str(base.pk), 'revision': base.revision},
+        'target':   {'id': str(target.pk), 'revision': target.revision},
+        'summary':  {
+            'added':        len(added),
+            'removed':      len(removed),
+            'changed':      len(changed),
+            'unchanged':    unchanged,
+        },
+        'totals':   {
+            f: _delta(getattr(base, f), getattr(target, f)) for f in total_fields
+        },
+        'sections': section_rows,
+        'items':    {'added': added, 'removed': removed, 'changed': changed},
+    }
+    cache.set(key, result, CACHE_TIMEOUT)
+    return result
+
+
+def load_revision_pair(quotations, base_revision, target_revision):
+    """
+    Pick two revisions out of `quotations` (already scoped to one project
+    and its owner) in one query.
+    Returns (base, target); raises Quotation.DoesNotExist if either is missing.
+    """
+    found = {
+        q.revision: q
+        for q in quotations.filter(revision__in=[base_revision, target_revision])
+    }
+    if base_revision not in found or target_revision not in found:
+        raise Quotation.DoesNotExist
+    return found[base_revision], found[target_revision]
@@ -0,0 +1,33 @@
+# backend/apps/mice/management/commands/gc_asset_blobs.py
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.template.defaultfilters import filesizeformat
+
+from apps.mice.blobs import collect_garbage
+
+
+class Command(BaseCommand):
+    help = (
+        'Recount AssetBlob references and delete blobs no asset has used for '
+        'longer than the grace period, files included.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-minutes', type=int, default=60,
+                            help='Minimum idle time before an unreferenced blob is deleted')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report what would be deleted without recounting or deleting')
+
+    def handle(self, *args, **options):
+        if options['grace_minutes'] < 0:
+            raise CommandError('--grace-minutes must be zero or positive')
+
+        removed, freed = collect_garbage(
+            grace=timedelta(minutes=options['grace_minutes']), dry_run=options['dry_run'],
+        )
+        verb = 'Would remove' if options['dry_run'] else 'Removed'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {removed} blobs ({filesizeformat(freed)})'
+        ))
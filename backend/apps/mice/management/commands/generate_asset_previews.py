@@ -0,0 +1,47 @@
+# backend/apps/mice/management/commands/generate_asset_previews.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.mice.previews import generate_previews, requeue
+
+
+class Command(BaseCommand):
+    help = (
+        'Render thumbnails for pending ProjectAssets in a process pool. '
+        'Also backfills existing assets, which start out pending. '
+        'Run from cron, or keep it running with --interval.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=32)
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Worker processes (default: one per CPU, 0 renders in-process)')
+        parser.add_argument('--limit', type=int, default=None,
+                            help='Stop after this many assets per pass')
+        parser.add_argument('--retry', action='store_true',
+                            help='Requeue failed and interrupted assets first')
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Seconds between passes; 0 (default) runs once and exits')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        if options['interval'] < 0:
+            raise CommandError('--interval must be zero or positive')
+
+        if options['retry']:
+            self.stdout.write(f'Requeued {requeue()} assets')
+
+        while True:
+            counts = generate_previews(
+                batch_size=options['batch_size'],
+                workers=options['workers'],
+                limit=options['limit'],
+            )
+            summary = ', '.join(f'{n} {status}' for status, n in sorted(counts.items())) or 'nothing pending'
+            self.stdout.write(self.style.SUCCESS(f'Previews: {summary}'))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,32 @@
+# backend/apps/mice/management/commands/migrate_asset_blobs.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.mice.blobs import migrate_legacy_files, storage_report
+
+
+class Command(BaseCommand):
+    help = (
+        'Move ProjectAsset files stored before the blob store into it, '
+        'deduplicating identical content. Safe to re-run.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--keep-originals', action='store_true',
+                            help='Leave the old mice/assets/ files in place')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        migrated, missing = migrate_legacy_files(
+            batch_size=options['batch_size'],
+            delete_originals=not options['keep_originals'],
+        )
+        if missing:
+            self.stdout.write(self.style.WARNING(f'{missing} assets have no file on storage'))
+        report = storage_report()
+        self.stdout.write(self.style.SUCCESS(
+            f"Migrated {migrated} assets — {report['blobs']} blobs, {report['saved']} bytes saved"
+        ))
@@ -0,0 +1,29 @@
+# backend/apps/mice/management/commands/rebuild_financial_rollups.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.models import User
+from apps.mice.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute FinancialRollup rows and quotation rollup snapshots from '
+        'scratch. Run once after migrating, or after bulk deletes that bypass '
+        'Quotation.delete().'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--organizer', help='Username — rebuild only this organizer')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        organizer = None
+        if options['organizer']:
+            try:
+                organizer = User.objects.get(username=options['organizer'])
+            except User.DoesNotExist:
+                raise CommandError(f'No user named "{options["organizer"]}"')
+
+        rows = rebuild_rollups(organizer, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} rollup rows'))
@@ -0,0 +1,27 @@
+# backend/apps/mice/management/commands/rebuild_price_index.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.models import User
+from apps.mice.price_index import rebuild_price_index
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute VendorPriceIndex from historical line items. Run once after '
+        'migrating, or after bulk deletes that bypass QuotationLineItem.delete().'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--organizer', help='Username — rebuild only this organizer')
+
+    def handle(self, *args, **options):
+        organizer = None
+        if options['organizer']:
+            try:
+                organizer = User.objects.get(username=options['organizer'])
+            except User.DoesNotExist:
+                raise CommandError(f'No user named "{options["organizer"]}"')
+
+        rows = rebuild_price_index(organizer)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} price index rows'))
@@ -0,0 +1,46 @@
+# backend/apps/mice/management/commands/send_reminders.py
+
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.mice.reminders import run_pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Flag overdue tasks, queue reminders for tasks and unpaid installments '
+        'falling due, and email each user a digest. '
+        'Run from cron, or keep it running with --interval.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--task-lead-hours', type=int, default=24,
+                            help='Remind about tasks due within this many hours')
+        parser.add_argument('--payment-lead-days', type=int, default=3,
+                            help='Remind about installments due within this many days')
+        parser.add_argument('--no-digest', action='store_true',
+                            help='Flag and queue only; leave sending to a later pass')
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Seconds between passes; 0 (default) runs once and exits')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        if options['interval'] < 0:
+            raise CommandError('--interval must be zero or positive')
+
+        while True:
+            counts = run_pass(
+                task_lead=datetime.timedelta(hours=options['task_lead_hours']),
+                payment_lead=datetime.timedelta(days=options['payment_lead_days']),
+                batch_size=options['batch_size'],
+                digest=not options['no_digest'],
+            )
+            summary = ', '.join(f'{n} {name}' for name, n in counts.items())
+            self.stdout.write(self.style.SUCCESS(f'Reminders: {summary}'))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
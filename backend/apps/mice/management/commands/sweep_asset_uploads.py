@@ -0,0 +1,37 @@
+# backend/apps/mice/management/commands/sweep_asset_uploads.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.mice.uploads import assemble_pending, sweep
+
+
+class Command(BaseCommand):
+    help = (
+        'Assemble completed chunked uploads into assets, then delete expired '
+        'and aborted uploads together with their stored parts. Run from cron, '
+        'or keep it running with --interval.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Seconds between sweeps; 0 (default) sweeps once and exits',
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+        if interval < 0:
+            raise CommandError('--interval must be zero or positive')
+
+        while True:
+            completed, failed = assemble_pending()
+            removed = sweep()
+            self.stdout.write(self.style.SUCCESS(
+                f'Assembled {completed} uploads ({failed} checksum mismatches), '
+                f'removed {removed} stale uploads'
+            ))
+            if not interval:
+                return
+            time.sleep(interval)
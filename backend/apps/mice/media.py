@@ -0,0 +1,99 @@
+# =============================================================================
+# apps/mice/media.py
+# =============================================================================
+# Signed, expiring URLs for ProjectAsset files and previews.
+#
+# Asset files are not reachable under MEDIA_URL. Serializers mint a URL only
+# for assets the caller may see — the organizer's own, or client-visible
+# ones in the client portal — and the media view checks the signature,
+# expiry and, for client links, that the asset is still client-visible
+# before handing the transfer to eventmaster.media.send_file.
+#
+# Expiry is rounded to a window, so an asset keeps the same URL for a while
+# and browsers can cache it (<img src> cannot send a JWT header).
+# =============================================================================
+
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.http import Http404, HttpResponseForbidden
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.http import require_safe
+
+from eventmaster.media import send_file
+from .models import PreviewStatus, ProjectAsset
+
+SALT = 'mice.asset-media'
+
+ORGANIZER   = 'o'
+CLIENT      = 'c'
+
+
+def _window():
+    return getattr(settings, 'MICE_MEDIA_URL_WINDOW', 3600)
+
+
+def asset_media_url(request, asset, audience, preview=None):
+    """Absolute signed URL for `asset` (or one of its previews), valid 1–2 windows."""
+    window  = _window()
+    expires = (int(time.time()) // window + 2) * window
+    token   = signing.dumps([str(asset.pk), audience, preview or '', expires], salt=SALT)
+    return request.build_absolute_uri(reverse('asset-media', args=[token]))
+
+
+def preview_urls(request, asset, audience):
+    """{size: signed URL} once the preview worker has rendered the asset."""
+    if asset.preview_status != PreviewStatus.READY:
+        return None
+    return {name: asset_media_url(request, asset, audience, name) for name in asset.previews}
+
+
+def download_name(asset):
+    ext   = asset.extension
+    title = asset.title.replace('/', '-').replace('"', "'")
+    return title if not ext or title.lower().endswith(ext.lower()) else title + ext
+
+
+@require_safe
+def asset_media(request, token):
+    """
+    GET /api/v1/mice/media/{token}/            — inline
+    GET /api/v1/mice/media/{token}/?download=1 — as attachment
+    """
+    try:
+        asset_id, audience, preview, expires = signing.loads(token, salt=SALT)
+    except (signing.BadSignature, ValueError):
+        raise Http404('Not found')
+    remaining = expires - int(time.time())
+    if remaining <= 0:
+        return HttpResponseForbidden('This link has expired')
+
+    asset = get_object_or_404(
+        ProjectAsset.objects.only(
+            'pk', 'file', 'title', 'mime_type', 'client_visible', 'blob', 'previews',
+        ),
+        pk=asset_id,
+    )
+    if audience == CLIENT and not asset.client_visible:
+        raise Http404('Not found')
+
+    cache_control = f'private, max-age={remaining}'
+    if preview:
+        name = asset.previews.get(preview)
+        if not name:
+            raise Http404('Not found')
+        return send_file(
+            request, name, asset.file.storage, content_type='image/jpeg',
+            etag=f'{asset.blob_id}-{preview}' if asset.blob_id else None,
+            cache_control=cache_control,
+        )
+    return send_file(
+        request, asset.file.name, asset.file.storage,
+        filename=download_name(asset),
+        content_type=asset.mime_type or None,
+        as_attachment=request.GET.get('download') == '1',
+        etag=asset.blob_id,
+        cache_control=cache_control,
+    )
@@ -0,0 +1,82 @@
+# Adds a stable lineage key to quotation sections and line items so that
+# revisions can be diffed row by row.
+
+import uuid
+from collections import defaultdict
+from django.db import migrations, models
+
+
+def backfill_lineage(apps, schema_editor):
+    """
+    Give every existing row a lineage_id. Revisions created before this
+    migration are linked best-effort: a row inherits the lineage of the row
+    in the previous revision with the same section name, item name, detail
+    and occurrence index. Anything unmatched starts a new lineage.
+    """
+    Quotation           = apps.get_model('mice', 'Quotation')
+    QuotationSection    = apps.get_model('mice', 'QuotationSection')
+    QuotationLineItem   = apps.get_model('mice', 'QuotationLineItem')
+
+    def keyed(rows, key):
+        seen, out = defaultdict(int), {}
+        for row in rows:
+            k = key(row)
+            out[(k, seen[k])] = row
+            seen[k] += 1
+        return out
+
+    previous = {}   # mice_project_id → (section map, item map) of last revision
+    for quotation in Quotation.objects.order_by('mice_project_id', 'revision'):
+        prev_sections, prev_items = previous.get(quotation.mice_project_id, ({}, {}))
+
+        sections = keyed(
+            QuotationSection.objects.filter(quotation=quotation).order_by('sort_order', 'pk'),
+            lambda s: s.name,
+        )
+        for key, section in sections.items():
+            match = prev_sections.get(key)
+            section.lineage_id = match.lineage_id if match else uuid.uuid4()
+        QuotationSection.objects.bulk_update(sections.values(), ['lineage_id'])
+
+        names = {s.pk: s.name for s in sections.values()}
+        items = keyed(
+            QuotationLineItem.objects.filter(section__quotation=quotation).order_by('sort_order', 'pk'),
+            lambda i: (names[i.section_id], i.item_name, i.detail),
+        )
+        for key, item in items.items():
+            match = prev_items.get(key)
+            item.lineage_id = match.lineage_id if match else uuid.uuid4()
+        QuotationLineItem.objects.bulk_update(items.values(), ['lineage_id'])
+
+        previous[quotation.mice_project_id] = (sections, items)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mice', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quotationsection',
+            name='lineage_id',
+            field=models.UUIDField(null=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='quotationlineitem',
+            name='lineage_id',
+            field=models.UUIDField(null=True, editable=False),
+        ),
+        migrations.RunPython(backfill_lineage, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='quotationsection',
+            name='lineage_id',
+            field=models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, help_text='Stable across revisions — copied by create_revision()'),
+        ),
+        migrations.AlterField(
+            model_name='quotationlineitem',
+            name='lineage_id',
+            field=models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, help_text='Stable across revisions — copied by create_revision()'),
+        ),
+    ]
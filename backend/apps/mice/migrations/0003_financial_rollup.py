@@ -0,0 +1,45 @@
+# Generated by Django 5.0.8 on 2026-10-19 12:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mice', '0002_lineage_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quotation',
+            name='rollup_snapshot',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.CreateModel(
+            name='FinancialRollup',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('metric', models.CharField(choices=[('pipeline', 'Pipeline'), ('realized', 'Realized'), ('receivable', 'Receivable')], max_length=20)),
+                ('period', models.DateField(help_text='First day of the month')),
+                ('status', models.CharField(blank=True, max_length=20)),
+                ('client_company', models.CharField(blank=True, max_length=255)),
+                ('quotation_count', models.IntegerField(default=0)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, help_text='total_after_tax, or the outstanding term for receivables', max_digits=18)),
+                ('net_margin', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('sodaqoh_amt', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('organizer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='financial_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'mice_financial_rollup',
+                'ordering': ['organizer', 'metric', 'period'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='financialrollup',
+            constraint=models.UniqueConstraint(fields=('organizer', 'metric', 'period', 'status', 'client_company'), name='mice_rollup_unique_key'),
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Adds the vendor price index and the normalized item_key it is keyed on.
+# The index itself is filled by `manage.py rebuild_price_index`.
+
+import re
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_item_key(apps, schema_editor):
+    """Same normalization as apps.mice.models.normalize_item_name."""
+    QuotationLineItem = apps.get_model('mice', 'QuotationLineItem')
+    non_word = re.compile(r'[\W_]+')
+    batch = []
+    for item in QuotationLineItem.objects.only('pk', 'item_name').iterator(chunk_size=2000):
+        item.item_key = non_word.sub(' ', item.item_name.casefold()).strip()
+        batch.append(item)
+        if len(batch) >= 2000:
+            QuotationLineItem.objects.bulk_update(batch, ['item_key'])
+            batch = []
+    if batch:
+        QuotationLineItem.objects.bulk_update(batch, ['item_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mice', '0003_financial_rollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VendorPriceIndex',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('category', models.CharField(choices=[('venue', 'Venue'), ('catering', 'Catering'), ('av_technical', 'AV & Technical'), ('decoration', 'Decoration & Staging'), ('entertainment', 'Entertainment & Talent'), ('photography', 'Photography & Video'), ('transportation', 'Transportation'), ('accommodation', 'Accommodation'), ('crew', 'Crew & HR'), ('design', 'Design & Multimedia'), ('other', 'Other')], max_length=50)),
+                ('item_key', models.CharField(max_length=255)),
+                ('item_name', models.CharField(help_text='Most recent spelling', max_length=255)),
+                ('vol_unit', models.CharField(choices=[('pax', 'Pax'), ('pack', 'Package'), ('unit', 'Unit'), ('prsn', 'Person'), ('team', 'Team'), ('set', 'Set'), ('pcs', 'Pieces'), ('file', 'File'), ('space', 'Space'), ('table', 'Table'), ('lot', 'Lot')], max_length=20)),
+                ('sample_count', models.PositiveIntegerField(default=0)),
+                ('p25', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('median', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('p75', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('last_price', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('last_seen_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'mice_vendor_price_index',
+                'ordering': ['item_key'],
+            },
+        ),
+        migrations.AddField(
+            model_name='quotationlineitem',
+            name='item_key',
+            field=models.CharField(blank=True, editable=False, help_text='normalize_item_name(item_name) — price index key', max_length=255),
+        ),
+        migrations.RunPython(backfill_item_key, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='quotationlineitem',
+            index=models.Index(fields=['item_key', 'vol_unit'], name='mice_quotat_item_ke_c87126_idx'),
+        ),
+        migrations.AddField(
+            model_name='vendorpriceindex',
+            name='organizer',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='price_index', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='vendorpriceindex',
+            name='vendor',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='price_index', to='mice.vendor'),
+        ),
+        migrations.AddIndex(
+            model_name='vendorpriceindex',
+            index=models.Index(fields=['organizer', 'item_key'], name='mice_vendor_organiz_1c798b_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='vendorpriceindex',
+            constraint=models.UniqueConstraint(condition=models.Q(('vendor__isnull', False)), fields=('vendor', 'item_key', 'vol_unit'), name='mice_price_index_vendor_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='vendorpriceindex',
+            constraint=models.UniqueConstraint(condition=models.Q(('vendor__isnull', True)), fields=('organizer', 'category', 'item_key', 'vol_unit'), name='mice_price_index_category_key'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Normalized vendor name key plus, on PostgreSQL, pg_trgm GIN indexes for
+# fuzzy autocomplete (apps/mice/search.py). Other backends fall back to
+# prefix ranges and substring matches and skip the trigram indexes.
+
+import re
+from django.conf import settings
+from django.db import migrations, models
+
+TRIGRAM_INDEXES = [
+    ('mice_vendor_name_key_trgm', 'mice_vendor', 'name_key'),
+    ('mice_line_item_item_key_trgm', 'mice_quotation_line_item', 'item_key'),
+]
+
+
+def backfill_name_key(apps, schema_editor):
+    """Same normalization as apps.mice.models.normalize_item_name."""
+    Vendor = apps.get_model('mice', 'Vendor')
+    non_word = re.compile(r'[\W_]+')
+    vendors = list(Vendor.objects.only('pk', 'name'))
+    for vendor in vendors:
+        vendor.name_key = non_word.sub(' ', vendor.name.casefold()).strip()
+    Vendor.objects.bulk_update(vendors, ['name_key'], batch_size=2000)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({column} gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mice', '0004_vendor_price_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vendor',
+            name='name_key',
+            field=models.CharField(blank=True, editable=False, help_text='normalize_item_name(name) — autocomplete key', max_length=255),
+        ),
+        migrations.RunPython(backfill_name_key, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['created_by', 'name_key'], name='mice_vendor_created_46cde0_idx'),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,56 @@
+# Per-organizer, per-year quotation number counters. Existing numbers are
+# parsed so each year's counter resumes above the highest one already issued.
+
+import re
+import django.db.models.deletion
+from collections import defaultdict
+from django.conf import settings
+from django.db import migrations, models
+
+LEADING_SEQ = re.compile(r'^(\d+)/')
+
+
+def seed_sequences(apps, schema_editor):
+    MICEProject             = apps.get_model('mice', 'MICEProject')
+    QuotationNumberSequence = apps.get_model('mice', 'QuotationNumberSequence')
+
+    last = defaultdict(int)
+    for organizer_id, number, created_at in MICEProject.objects.values_list(
+        'organizer_id', 'quotation_number', 'created_at',
+    ).iterator():
+        key = (organizer_id, created_at.year)
+        match = LEADING_SEQ.match(number or '')
+        last[key] = max(last[key] + 1, int(match.group(1)) if match else 0)
+
+    QuotationNumberSequence.objects.bulk_create([
+        QuotationNumberSequence(organizer_id=organizer_id, year=year, last_value=value)
+        for (organizer_id, year), value in last.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mice', '0005_autocomplete_keys'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuotationNumberSequence',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('year', models.PositiveSmallIntegerField()),
+                ('last_value', models.PositiveIntegerField(default=0)),
+                ('organizer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='quotation_sequences', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'mice_quotation_number_sequence',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='quotationnumbersequence',
+            constraint=models.UniqueConstraint(fields=('organizer', 'year'), name='mice_quotation_seq_unique'),
+        ),
+        migrations.RunPython(seed_sequences, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.0.8 on 2026-10-19 12:52
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mice', '0006_quotation_number_sequence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssetUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('active', 'Active'), ('completed', 'Completed'), ('aborted', 'Aborted')], default='active', max_length=20)),
+                ('filename', models.CharField(max_length=255)),
+                ('total_size', models.PositiveBigIntegerField(help_text='Bytes')),
+                ('part_size', models.PositiveIntegerField(help_text='Bytes per part; the last may be shorter')),
+                ('asset_type', models.CharField(choices=[('sow', 'Scope of Work'), ('key_visual', 'Key Visual 2D'), ('stage_3d', 'Stage Design 3D'), ('multimedia', 'Multimedia / Video'), ('contract', 'Vendor Contract'), ('report', 'Post-Event Report'), ('other', 'Other')], default='other', max_length=30)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('version', models.CharField(blank=True, max_length=50)),
+                ('client_visible', models.BooleanField(default=False)),
+                ('expires_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('asset', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='upload', to='mice.projectasset')),
+                ('mice_project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='uploads', to='mice.miceproject')),
+                ('sub_event', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='mice.subevent')),
+                ('uploaded_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='asset_uploads', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'mice_asset_upload',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AssetUploadPart',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('number', models.PositiveIntegerField()),
+                ('size', models.PositiveIntegerField()),
+                ('sha256', models.CharField(max_length=64)),
+                ('path', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('upload', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='parts', to='mice.assetupload')),
+            ],
+            options={
+                'db_table': 'mice_asset_upload_part',
+                'ordering': ['number'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='assetupload',
+            index=models.Index(fields=['status', 'expires_at'], name='mice_asset__status_489b32_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='assetuploadpart',
+            constraint=models.UniqueConstraint(fields=('upload', 'number'), name='mice_upload_part_unique'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Content-addressed blob store for ProjectAsset files (apps/mice/blobs.py).
+# Schema only — existing files are hashed and moved into mice/blobs/ by
+# `python manage.py migrate_asset_blobs`, which can run while serving.
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mice', '0007_asset_upload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssetBlob',
+            fields=[
+                ('sha256', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('file', models.FileField(max_length=255, upload_to='mice/blobs/')),
+                ('size', models.PositiveBigIntegerField(help_text='Bytes')),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('last_referenced_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'mice_asset_blob',
+                'indexes': [models.Index(fields=['ref_count', 'last_referenced_at'], name='mice_asset__ref_cou_8843d5_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='projectasset',
+            name='blob',
+            field=models.ForeignKey(blank=True, editable=False, help_text='Deduplicated content behind `file`', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='assets', to='mice.assetblob'),
+        ),
+    ]
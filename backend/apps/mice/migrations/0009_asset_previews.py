@@ -0,0 +1,25 @@
+# Preview state for ProjectAsset (apps/mice/previews.py). Existing assets
+# start out `pending`, so `python manage.py generate_asset_previews`
+# backfills them in parallel batches.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mice', '0008_asset_blob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectasset',
+            name='preview_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('unsupported', 'Unsupported'), ('failed', 'Failed')], db_index=True, default='pending', editable=False, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='projectasset',
+            name='previews',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='{size name: storage path} — see apps/mice/previews.py'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Task scheduling inputs (start_at, duration) and the TaskDependency DAG used
+# by apps/mice/schedule.py. Existing tasks default to a one-day duration.
+
+import datetime
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mice', '0009_asset_previews'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projecttask',
+            name='duration',
+            field=models.DurationField(default=datetime.timedelta(days=1), help_text='Planned working time, for critical-path scheduling'),
+        ),
+        migrations.AddField(
+            model_name='projecttask',
+            name='start_at',
+            field=models.DateTimeField(blank=True, help_text='Planned start — the task starts no earlier than this', null=True),
+        ),
+        migrations.CreateModel(
+            name='TaskDependency',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('lag', models.DurationField(default=datetime.timedelta(0))),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('predecessor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='successor_links', to='mice.projecttask')),
+                ('successor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='predecessor_links', to='mice.projecttask')),
+            ],
+            options={
+                'db_table': 'mice_task_dependency',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='taskdependency',
+            constraint=models.UniqueConstraint(fields=('predecessor', 'successor'), name='mice_task_dependency_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='taskdependency',
+            constraint=models.CheckConstraint(check=models.Q(('predecessor', models.F('successor')), _negated=True), name='mice_task_dependency_not_self'),
+        ),
+    ]
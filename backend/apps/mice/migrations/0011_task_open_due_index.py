@@ -0,0 +1,20 @@
+# Partial index on open tasks by due date — the workload histogram
+# (apps/mice/workload.py) and overdue scans only range over unfinished tasks.
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mice', '0010_task_dependencies'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='projecttask',
+            index=models.Index(condition=models.Q(('status__in', ['todo', 'in_progress', 'blocked'])), fields=['due_at'], name='mice_task_open_due_idx'),
+        ),
+    ]
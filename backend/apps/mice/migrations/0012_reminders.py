@@ -0,0 +1,74 @@
+# Persisted ProjectTask.is_overdue, the Reminder queue and partial indexes on
+# unpaid installment due dates (apps/mice/reminders.py). Existing overdue
+# tasks are flagged here; the send_reminders command keeps it current.
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def flag_overdue(apps, schema_editor):
+    ProjectTask = apps.get_model('mice', 'ProjectTask')
+    ProjectTask.objects.filter(
+        status__in=['todo', 'in_progress', 'blocked'], due_at__lt=timezone.now(),
+    ).update(is_overdue=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mice', '0011_task_open_due_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Reminder',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('task_due', 'Task due soon'), ('task_overdue', 'Task overdue'), ('payment_due', 'Installment due soon'), ('payment_overdue', 'Installment overdue')], max_length=20)),
+                ('key', models.CharField(max_length=200)),
+                ('message', models.CharField(max_length=500)),
+                ('due', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'mice_reminder',
+                'ordering': ['due'],
+            },
+        ),
+        migrations.AddField(
+            model_name='projecttask',
+            name='is_overdue',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='quotation',
+            index=models.Index(condition=models.Q(('payment_term_1_paid', False)), fields=['payment_term_1_due'], name='mice_quotation_term1_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quotation',
+            index=models.Index(condition=models.Q(('payment_term_2_paid', False)), fields=['payment_term_2_due'], name='mice_quotation_term2_due_idx'),
+        ),
+        migrations.AddField(
+            model_name='reminder',
+            name='mice_project',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='mice.miceproject'),
+        ),
+        migrations.AddField(
+            model_name='reminder',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mice_reminders', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='reminder',
+            index=models.Index(condition=models.Q(('sent_at__isnull', True)), fields=['user', 'due'], name='mice_reminder_unsent_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='reminder',
+            constraint=models.UniqueConstraint(fields=('user', 'key'), name='mice_reminder_unique_key'),
+        ),
+        migrations.RunPython(flag_overdue, migrations.RunPython.noop),
+    ]
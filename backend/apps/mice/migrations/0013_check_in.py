@@ -0,0 +1,40 @@
+# Sub-event check-ins (apps/events/checkin.py): one row per registration and
+# sub-event door, plus the sub-event's live attended counter.
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_check_in'),
+        ('mice', '0012_reminders'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subevent',
+            name='attended_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name='SubEventCheckIn',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('checked_in_at', models.DateTimeField()),
+                ('checked_in_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('registration', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sub_event_check_ins', to='events.registration')),
+                ('sub_event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='check_ins', to='mice.subevent')),
+            ],
+            options={
+                'db_table': 'mice_sub_event_check_in',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='subeventcheckin',
+            constraint=models.UniqueConstraint(fields=('sub_event', 'registration'), name='mice_sub_event_check_in_unique'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# updated_at indexes for the analytics snapshots (apps/analytics), which
+# read the rows changed since a watermark.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mice', '0013_check_in'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quotation',
+            index=models.Index(fields=['updated_at'], name='mice_quotat_updated_7cf6b8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quotationlineitem',
+            index=models.Index(fields=['updated_at'], name='mice_quotat_updated_2aa7e0_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Chunked uploads are assembled by a worker (apps/mice/uploads.py): complete()
+# records the whole-file checksum and hands the upload over as `assembling`.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mice', '0014_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assetupload',
+            name='error',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='assetupload',
+            name='sha256',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='assetupload',
+            name='status',
+            field=models.CharField(choices=[('active', 'Active'), ('assembling', 'Assembling'), ('completed', 'Completed'), ('aborted', 'Aborted')], default='active', max_length=20),
+        ),
+    ]
@@ -11,14 +11,22 @@
 #                  ──► Quotation (many revisions)
 #                        ──► QuotationSection (many)
 #                              ──► QuotationLineItem (many)
-#                  ──► ProjectTask (many)
-#                  ──► ProjectAsset (many)
+#                  ──► ProjectTask (many) ◄─► TaskDependency (DAG edges)
+#                  ──► ProjectAsset (many) ──► AssetBlob (shared, by content hash)
+#                  ──► AssetUpload (many) ──► AssetUploadPart (many)
 #   Vendor (standalone, referenced by line items)
+#   FinancialRollup (per organizer × month, maintained from Quotation)
+#   VendorPriceIndex (price stats per vendor / category, from line items)
+#   Reminder (due / overdue notices per user, sent as digests)
 # =============================================================================
 
+import mimetypes
+import os
+import re
 import uuid
+from datetime import timedelta
 from decimal import Decimal, ROUND_HALF_UP
-from django.db import models, transaction
+from django.db import IntegrityError, models, transaction
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
@@ -38,6 +46,14 @@ def _round(value):
     return Decimal(str(value)).quantize(TWO_PLACES, rounding=ROUND_HALF_UP)
 
 
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize_item_name(name):
+    """'  Sound-System (Main Hall) ' → 'sound system main hall'"""
+    return _NON_WORD.sub(' ', (name or '').casefold()).strip()
+
+
 def _generate_quotation_token():
     return get_random_string(length=48)
 
@@ -68,6 +84,9 @@ class TaskStatus(models.TextChoices):
     BLOCKED     = 'blocked',     'Blocked'
 
 
+OPEN_TASK_STATUSES = [TaskStatus.TODO, TaskStatus.IN_PROGRESS, TaskStatus.BLOCKED]
+
+
 class VendorCategory(models.TextChoices):
     VENUE           = 'venue',          'Venue'
     CATERING        = 'catering',       'Catering'
@@ -82,6 +101,12 @@ class VendorCategory(models.TextChoices):
     OTHER           = 'other',          'Other'
 
 
+class RollupMetric(models.TextChoices):
+    PIPELINE    = 'pipeline',    'Pipeline'
+    REALIZED    = 'realized',    'Realized'
+    RECEIVABLE  = 'receivable',  'Receivable'
+
+
 class DurationUnit(models.TextChoices):
     DAY     = 'day',    'Day'
     EVENT   = 'event',  'Event'
@@ -116,6 +141,10 @@ class Vendor(models.Model):
     created_by      = models.ForeignKey(User, on_delete=models.CASCADE, related_name='vendors')
 
     name            = models.CharField(max_length=255, db_index=True)
+    name_key        = models.CharField(
+        max_length=255, blank=True, editable=False,
+        help_text='normalize_item_name(name) — autocomplete key',
+    )
     category        = models.CharField(max_length=50, choices=VendorCategory.choices)
     contact_name    = models.CharField(max_length=200, blank=True)
     contact_phone   = models.CharField(max_length=30, blank=True)
@@ -142,11 +171,19 @@ class Vendor(models.Model):
         indexes     = [
             models.Index(fields=['created_by', 'category']),
             models.Index(fields=['created_by', 'is_active']),
+            models.Index(fields=['created_by', 'name_key']),
         ]
 
     def __str__(self):
         return f'{self.name} ({self.get_category_display()})'
 
+    def save(self, *args, **kwargs):
+        self.name_key = normalize_item_name(self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'name_key'}
+        super().save(*args, **kwargs)
+
 
 # ── MICEProject ───────────────────────────────────────────────────────────────
 
@@ -207,16 +244,25 @@ class MICEProject(models.Model):
         return f'{self.event.title} — {self.client_company}'
 
     def save(self, *args, **kwargs):
-        if not self.quotation_number:
-            self.quotation_number = self._generate_quotation_number()
-        super().save(*args, **kwargs)
+        adding = self._state.adding
+        # The number is drawn in the same transaction as the insert, so a
+        # failed save rolls the counter back and leaves no gap
+        with transaction.atomic():
+            if not self.quotation_number:
+                self.quotation_number = QuotationNumberSequence.next_number(self.organizer_id)
+            super().save(*args, **kwargs)
+        # Rollups are keyed by client_company — re-key this project's quotations
+        update_fields = kwargs.get('update_fields')
+        if not adding and (update_fields is None or 'client_company' in update_fields):
+            from .rollups import sync_quotation
+            for quotation_id in self.quotations.values_list('pk', flat=True):
+                sync_quotation(quotation_id)
 
-    def _generate_quotation_number(self):
-        from django.utils import timezone
-        month   = timezone.now().strftime('%m')
-        year    = timezone.now().strftime('%Y')
-        count   = MICEProject.objects.filter(organizer=self.organizer).count() + 1
-        return f'{count:03d}/QUO-EH/{month}/{year}'
+    def delete(self, *args, **kwargs):
+        from .rollups import retract_quotations
+        with transaction.atomic():
+            retract_quotations(self.quotations.values_list('pk', flat=True))
+            return super().delete(*args, **kwargs)
 
     @property
     def active_quotation(self):
@@ -263,6 +309,80 @@ class MICEProject(models.Model):
             self.save(update_fields=['status', 'updated_at'])
 
 
+# ── QuotationNumberSequence ───────────────────────────────────────────────────
+
+ROMAN_MONTHS = ['I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX', 'X', 'XI', 'XII']
+
+DEFAULT_QUOTATION_NUMBER_FORMAT = '{seq:03d}/QUO-EH/{month:02d}/{year}'
+
+
+def format_quotation_number(fmt, seq, when):
+    """
+    Render a quotation number. Placeholders:
+      {seq} {year} {yy} {month} {month_roman}
+    e.g. '{seq:03d}/QUO-MEO/{month_roman}/{year}' → 020/QUO-MEO/IV/2025
+    """
+    return fmt.format(
+        seq         = seq,
+        year        = when.year,
+        yy          = f'{when.year % 100:02d}',
+        month       = when.month,
+        month_roman = ROMAN_MONTHS[when.month - 1],
+    )
+
+
+class QuotationNumberSequence(models.Model):
+    """
+    Per-organizer, per-year counter behind MICEProject.quotation_number.
+    One row per (organizer, year); incremented in place, never read-then-written.
+    """
+    id          = models.BigAutoField(primary_key=True)
+    organizer   = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='quotation_sequences',
+    )
+    year        = models.PositiveSmallIntegerField()
+    last_value  = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table    = 'mice_quotation_number_sequence'
+        constraints = [
+            models.UniqueConstraint(fields=['organizer', 'year'], name='mice_quotation_seq_unique'),
+        ]
+
+    def __str__(self):
+        return f'{self.organizer_id}/{self.year}: {self.last_value}'
+
+    @classmethod
+    def next_value(cls, organizer_id, year):
+        """
+        Increment and return the counter. Must run inside the caller's
+        transaction: the UPDATE's row lock holds off concurrent allocations
+        until it commits, and a rollback returns the number.
+        """
+        counter = cls.objects.filter(organizer_id=organizer_id, year=year)
+        if not counter.update(last_value=models.F('last_value') + 1):
+            try:
+                with transaction.atomic():
+                    cls.objects.create(organizer_id=organizer_id, year=year, last_value=1)
+                return 1
+            except IntegrityError:
+                # Another transaction created this year's row first
+                counter.update(last_value=models.F('last_value') + 1)
+        return counter.values_list('last_value', flat=True).get()
+
+    @classmethod
+    def next_number(cls, organizer_id, fmt=None, when=None):
+        """
+        Allocate the organizer's next formatted quotation number.
+        The format defaults to settings.MICE_QUOTATION_NUMBER_FORMAT.
+        """
+        from django.conf import settings
+        when = when or timezone.localdate()
+        fmt  = fmt or getattr(settings, 'MICE_QUOTATION_NUMBER_FORMAT', DEFAULT_QUOTATION_NUMBER_FORMAT)
+        with transaction.atomic():
+            return format_quotation_number(fmt, cls.next_value(organizer_id, when.year), when)
+
+
 # ── SubEvent ──────────────────────────────────────────────────────────────────
 
 class SubEvent(models.Model):
@@ -288,6 +408,8 @@ class SubEvent(models.Model):
     capacity        = models.PositiveIntegerField(default=0)
     sort_order      = models.PositiveIntegerField(default=0)
     is_active       = models.BooleanField(default=True)
+    # Live check-in counter, moved only by apps/events/checkin.py
+    attended_count  = models.PositiveIntegerField(default=0, editable=False)
 
     created_at      = models.DateTimeField(auto_now_add=True)
     updated_at      = models.DateTimeField(auto_now=True)
@@ -300,6 +422,36 @@ class SubEvent(models.Model):
         return f'{self.mice_project.event.title} — {self.title}'
 
 
+class SubEventCheckIn(models.Model):
+    """
+    An event registration scanned in at a sub-event's door
+    (apps/events/checkin.py). One per registration and sub-event — the
+    unique constraint is what dedupes double scans.
+    """
+    id              = models.BigAutoField(primary_key=True)
+    sub_event       = models.ForeignKey(
+        SubEvent, on_delete=models.CASCADE, related_name='check_ins',
+    )
+    registration    = models.ForeignKey(
+        'events.Registration', on_delete=models.CASCADE, related_name='sub_event_check_ins',
+    )
+    checked_in_at   = models.DateTimeField()
+    checked_in_by   = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+',
+    )
+
+    class Meta:
+        db_table    = 'mice_sub_event_check_in'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['sub_event', 'registration'], name='mice_sub_event_check_in_unique',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.registration_id} @ {self.sub_event_id}'
+
+
 # ── Quotation ─────────────────────────────────────────────────────────────────
 
 class Quotation(models.Model):
@@ -394,6 +546,10 @@ class Quotation(models.Model):
     approved_at         = models.DateTimeField(null=True, blank=True)
     notes               = models.TextField(blank=True)
 
+    # What this quotation currently contributes to FinancialRollup —
+    # lets rollups.sync_quotation() apply only the difference
+    rollup_snapshot     = models.JSONField(default=list, blank=True, editable=False)
+
     created_at          = models.DateTimeField(auto_now_add=True)
     updated_at          = models.DateTimeField(auto_now=True)
 
@@ -404,6 +560,17 @@ class Quotation(models.Model):
         indexes     = [
             models.Index(fields=['mice_project', 'status']),
             models.Index(fields=['client_token']),
+            # Unpaid installments by due date — the reminder scan
+            models.Index(
+                fields=['payment_term_1_due'], name='mice_quotation_term1_due_idx',
+                condition=models.Q(payment_term_1_paid=False),
+            ),
+            models.Index(
+                fields=['payment_term_2_due'], name='mice_quotation_term2_due_idx',
+                condition=models.Q(payment_term_2_paid=False),
+            ),
+            # Analytics snapshots read changes since a watermark (apps/analytics)
+            models.Index(fields=['updated_at']),
         ]
 
     def __str__(self):
@@ -412,6 +579,32 @@ class Quotation(models.Model):
             f'Rev.{self.revision} [{self.get_status_display()}]'
         )
 
+    def save(self, *args, **kwargs):
+        # rollup_snapshot belongs to rollups.sync_quotation() — a full save
+        # from a stale instance must not overwrite it
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name != 'rollup_snapshot'
+            ]
+        super().save(*args, **kwargs)
+        self.sync_rollups()
+
+    def delete(self, *args, **kwargs):
+        from .rollups import retract_quotations
+        with transaction.atomic():
+            retract_quotations([self.pk])
+            return super().delete(*args, **kwargs)
+
+    def sync_rollups(self):
+        """
+        Bring the organizer's FinancialRollup rows in line with this
+        quotation's current status, totals and payment terms.
+        Called after every change that can move them.
+        """
+        from .rollups import sync_quotation
+        sync_quotation(self.pk)
+
     # ── The calculation engine ────────────────────────────────────────────────
 
     def recalculate(self):
@@ -478,6 +671,7 @@ class Quotation(models.Model):
             margin_pct_of_total = margin_pct,
             updated_at          = timezone.now(),
         )
+        self.sync_rollups()
 
         # Refresh instance fields
         self.subtotal_modal      = subtotal_modal
@@ -497,6 +691,7 @@ class Quotation(models.Model):
         """
         Create a new revision of this quotation.
         Marks current as SUPERSEDED, clones all sections and line items.
+        Clones keep their lineage_id so revisions can be diffed row by row.
         Returns the new Quotation instance.
         """
         with transaction.atomic():
@@ -504,6 +699,7 @@ class Quotation(models.Model):
             Quotation.objects.filter(pk=self.pk).update(
                 status=QuotationStatus.SUPERSEDED
             )
+            self.sync_rollups()
 
             # Clone quotation
             new_q = Quotation.objects.create(
@@ -522,6 +718,7 @@ class Quotation(models.Model):
                     quotation   = new_q,
                     name        = section.name,
                     sort_order  = section.sort_order,
+                    lineage_id  = section.lineage_id,
                 )
                 for item in section.line_items.all().order_by('sort_order'):
                     QuotationLineItem.objects.create(
@@ -537,28 +734,57 @@ class Quotation(models.Model):
                         margin_pct      = item.margin_pct,
                         sort_order      = item.sort_order,
                         notes           = item.notes,
+                        lineage_id      = item.lineage_id,
                     )
 
             new_q.recalculate()
             return new_q
 
     def send_to_client(self):
-        """Mark quotation as sent and record timestamp."""
+        """Mark quotation as sent, record timestamp and email the client the portal link."""
+        from apps.notifications.outbox import enqueue
+
+        project      = self.mice_project
         self.status  = QuotationStatus.SENT
         self.sent_at = timezone.now()
-        Quotation.objects.filter(pk=self.pk).update(
-            status=self.status, sent_at=self.sent_at
-        )
+        with transaction.atomic():
+            Quotation.objects.filter(pk=self.pk).update(
+                status=self.status, sent_at=self.sent_at
+            )
+            self.sync_rollups()
+            enqueue(
+                project.client_email,
+                f'Quotation {project.quotation_number} Rev.{self.revision} — {project.event.title}',
+                f'Dear {project.client_pic},\n\n'
+                f'Please review our quotation for {project.event.title}:\n'
+                f'{self.client_portal_url}\n\n'
+                f'Total: Rp {self.total_after_tax:,.0f}\n',
+                kind='quotation_sent',
+            )
 
     def approve_by_client(self):
-        """Called when client approves via portal."""
+        """Called when client approves via portal. Notifies the organizer."""
+        from apps.notifications.outbox import enqueue
+
+        project          = self.mice_project
         self.status      = QuotationStatus.APPROVED
         self.approved_at = timezone.now()
-        Quotation.objects.filter(pk=self.pk).update(
-            status=self.status, approved_at=self.approved_at
-        )
-        # Also approve the parent project
-        self.mice_project.approve()
+        with transaction.atomic():
+            Quotation.objects.filter(pk=self.pk).update(
+                status=self.status, approved_at=self.approved_at
+            )
+            self.sync_rollups()
+            # Also approve the parent project
+            project.approve()
+            enqueue(
+                project.organizer.email,
+                f'{project.client_company} approved quotation {project.quotation_number} Rev.{self.revision}',
+                f'{project.client_pic} approved Rev.{self.revision} '
+                f'(Rp {self.total_after_tax:,.0f}) on '
+                f'{timezone.localtime(self.approved_at):%d %b %Y %H:%M}.\n',
+                kind='quotation_approved',
+                digest=True,
+            )
 
     @property
     def client_portal_url(self):
@@ -582,6 +808,10 @@ class QuotationSection(models.Model):
     )
     name        = models.CharField(max_length=200)
     sort_order  = models.PositiveIntegerField(default=0)
+    lineage_id  = models.UUIDField(
+        default=uuid.uuid4, editable=False, db_index=True,
+        help_text='Stable across revisions — copied by create_revision()',
+    )
 
     # Section-level subtotals (computed, cached)
     subtotal_modal  = models.DecimalField(max_digits=16, decimal_places=2, default=0)
@@ -597,18 +827,25 @@ class QuotationSection(models.Model):
     def __str__(self):
         return f'{self.quotation} — {self.name}'
 
-    def recalculate(self):
-        """Recompute section subtotals and trigger parent quotation recalc."""
+    def recalculate(self, cascade=True):
+        """
+        Recompute section subtotals and trigger parent quotation recalc.
+        Pass cascade=False when several sections change in one batch and
+        the caller recalculates the quotation once at the end.
+        """
         from django.db.models import Sum
         agg = self.line_items.aggregate(
             sm=Sum('total_modal'),
             sc=Sum('total_client'),
         )
+        self.subtotal_modal  = _round(agg['sm'] or 0)
+        self.subtotal_client = _round(agg['sc'] or 0)
         QuotationSection.objects.filter(pk=self.pk).update(
-            subtotal_modal  = _round(agg['sm'] or 0),
-            subtotal_client = _round(agg['sc'] or 0),
+            subtotal_modal  = self.subtotal_modal,
+            subtotal_client = self.subtotal_client,
         )
-        self.quotation.recalculate()
+        if cascade:
+            self.quotation.recalculate()
 
 
 # ── QuotationLineItem ─────────────────────────────────────────────────────────
@@ -639,9 +876,17 @@ class QuotationLineItem(models.Model):
         Vendor, on_delete=models.SET_NULL,
         null=True, blank=True, related_name='line_items',
     )
+    lineage_id  = models.UUIDField(
+        default=uuid.uuid4, editable=False, db_index=True,
+        help_text='Stable across revisions — copied by create_revision()',
+    )
 
     # Core item info
     item_name   = models.CharField(max_length=255)
+    item_key    = models.CharField(
+        max_length=255, blank=True, editable=False,
+        help_text='normalize_item_name(item_name) — price index key',
+    )
     detail      = models.CharField(max_length=500, blank=True)
 
     # Quantity dimensions
@@ -690,11 +935,27 @@ class QuotationLineItem(models.Model):
         ordering    = ['sort_order', 'item_name']
         indexes     = [
             models.Index(fields=['section', 'sort_order']),
+            models.Index(fields=['item_key', 'vol_unit']),
+            models.Index(fields=['updated_at']),
         ]
 
     def __str__(self):
         return f'{self.section.name} — {self.item_name}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the price index key as loaded, so a save that renames
+        # the item or switches vendor also refreshes the key it left
+        if {'vendor_id', 'item_key', 'vol_unit'} <= set(field_names):
+            instance._loaded_price_key = instance.price_key
+        return instance
+
+    @property
+    def price_key(self):
+        """(vendor_id, item_key, vol_unit) — see apps/mice/price_index.py"""
+        return (self.vendor_id, self.item_key, self.vol_unit)
+
     def calculate(self):
         """
         Compute all derived price fields for this line item.
@@ -716,6 +977,7 @@ class QuotationLineItem(models.Model):
         self.pph_amt        = pph_amt
         self.client_price   = client_price
         self.total_client   = total_client
+        self.item_key       = normalize_item_name(self.item_name)
 
     def save(self, *args, **kwargs):
         # Always recalculate before saving
@@ -723,12 +985,20 @@ class QuotationLineItem(models.Model):
         super().save(*args, **kwargs)
         # Cascade up: section → quotation
         self.section.recalculate()
+        self._refresh_price_index(self.price_key, getattr(self, '_loaded_price_key', None))
+        self._loaded_price_key = self.price_key
 
     def delete(self, *args, **kwargs):
         section = self.section
         super().delete(*args, **kwargs)
         # Cascade recalc after deletion too
         section.recalculate()
+        self._refresh_price_index(self.price_key)
+
+    def _refresh_price_index(self, *keys):
+        from .price_index import refresh_on_commit
+        organizer_id = self.section.quotation.mice_project.organizer_id
+        refresh_on_commit(organizer_id, keys)
 
 
 # ── ProjectTask ───────────────────────────────────────────────────────────────
@@ -764,9 +1034,19 @@ class ProjectTask(models.Model):
         default='medium',
     )
     due_at          = models.DateTimeField(null=True, blank=True)
+    start_at        = models.DateTimeField(
+        null=True, blank=True, help_text='Planned start — the task starts no earlier than this',
+    )
+    duration        = models.DurationField(
+        default=timedelta(days=1), help_text='Planned working time, for critical-path scheduling',
+    )
     completed_at    = models.DateTimeField(null=True, blank=True)
     sort_order      = models.PositiveIntegerField(default=0)
 
+    # Open and past due_at. Set on save; tasks that fall overdue while
+    # nobody touches them are flagged by apps/mice/reminders.py
+    is_overdue      = models.BooleanField(default=False, editable=False)
+
     created_at      = models.DateTimeField(auto_now_add=True)
     updated_at      = models.DateTimeField(auto_now=True)
 
@@ -776,21 +1056,157 @@ class ProjectTask(models.Model):
         indexes     = [
             models.Index(fields=['mice_project', 'status']),
             models.Index(fields=['assigned_to', 'status']),
+            # Open tasks by due date — workload histograms, overdue scans
+            models.Index(
+                fields=['due_at'], name='mice_task_open_due_idx',
+                condition=models.Q(status__in=OPEN_TASK_STATUSES),
+            ),
         ]
 
     def __str__(self):
         return f'{self.mice_project} — {self.title}'
 
+    def save(self, *args, **kwargs):
+        self.is_overdue = (
+            self.status in OPEN_TASK_STATUSES
+            and self.due_at is not None
+            and self.due_at < timezone.now()
+        )
+        super().save(*args, **kwargs)
+        self._reschedule()
+        if self.is_overdue:
+            from .reminders import queue_overdue_task
+            transaction.on_commit(lambda: queue_overdue_task(self))
+
+    def delete(self, *args, **kwargs):
+        task_id = self.pk
+        result  = super().delete(*args, **kwargs)
+        self._reschedule(task_id, removed=True)
+        return result
+
+    def _reschedule(self, task_id=None, removed=False):
+        # Keep the cached critical-path schedule current (apps/mice/schedule.py)
+        from .schedule import task_changed
+        project_id, task_id = self.mice_project_id, task_id or self.pk
+        transaction.on_commit(lambda: task_changed(project_id, task_id, removed=removed))
+
     def complete(self):
         self.status       = TaskStatus.DONE
         self.completed_at = timezone.now()
+        self.is_overdue   = False
         ProjectTask.objects.filter(pk=self.pk).update(
-            status=self.status, completed_at=self.completed_at
+            status=self.status, completed_at=self.completed_at, is_overdue=False,
+            updated_at=self.completed_at,
         )
+        self._reschedule()
+
+
+class TaskDependency(models.Model):
+    """
+    Finish-to-start edge: `successor` starts no earlier than `lag` after
+    `predecessor` finishes. Edges stay within one project and never form a
+    cycle — create them through TaskDependency.link().
+    """
+    id              = models.BigAutoField(primary_key=True)
+    predecessor     = models.ForeignKey(
+        ProjectTask, on_delete=models.CASCADE, related_name='successor_links',
+    )
+    successor       = models.ForeignKey(
+        ProjectTask, on_delete=models.CASCADE, related_name='predecessor_links',
+    )
+    lag             = models.DurationField(default=timedelta(0))
+    created_at      = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table    = 'mice_task_dependency'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['predecessor', 'successor'], name='mice_task_dependency_unique',
+            ),
+            models.CheckConstraint(
+                check=~models.Q(predecessor=models.F('successor')),
+                name='mice_task_dependency_not_self',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.predecessor_id} → {self.successor_id}'
+
+    @classmethod
+    def link(cls, predecessor, successor, lag=None):
+        """
+        Add an edge after checking project and acyclicity against the
+        project's task graph. Raises ValidationError.
+        """
+        from .schedule import would_cycle, edge_changed
+
+        if predecessor.mice_project_id != successor.mice_project_id:
+            raise ValidationError('Tasks belong to different projects')
+        if predecessor.pk == successor.pk:
+            raise ValidationError('A task cannot depend on itself')
+        with transaction.atomic():
+            # Serialize edge changes per project so two requests cannot
+            # each add half of a cycle
+            MICEProject.objects.select_for_update().filter(pk=predecessor.mice_project_id).first()
+            path = would_cycle(predecessor.mice_project_id, predecessor.pk, successor.pk)
+            if path:
+                raise ValidationError(
+                    'Dependency would create a cycle: ' + ' → '.join(path)
+                )
+            edge, _ = cls.objects.update_or_create(
+                predecessor=predecessor, successor=successor,
+                defaults={'lag': lag or timedelta(0)},
+            )
+            project_id = predecessor.mice_project_id
+            transaction.on_commit(
+                lambda: edge_changed(project_id, edge.predecessor_id, edge.successor_id, edge.lag)
+            )
+        return edge
+
+    def delete(self, *args, **kwargs):
+        from .schedule import edge_changed
+
+        project_id = self.predecessor.mice_project_id
+        result     = super().delete(*args, **kwargs)
+        pred, succ = self.predecessor_id, self.successor_id
+        transaction.on_commit(lambda: edge_changed(project_id, pred, succ))
+        return result
+
+
+# ── AssetBlob ─────────────────────────────────────────────────────────────────
+
+class AssetBlob(models.Model):
+    """
+    One stored copy of a file's content, keyed by its SHA-256 and shared by
+    every ProjectAsset with identical bytes. ref_count tracks how many assets
+    point at it; blobs at zero are removed by gc_asset_blobs after a grace
+    period. See apps/mice/blobs.py.
+    """
+    sha256              = models.CharField(max_length=64, primary_key=True)
+    file                = models.FileField(upload_to='mice/blobs/', max_length=255)
+    size                = models.PositiveBigIntegerField(help_text='Bytes')
+    ref_count           = models.PositiveIntegerField(default=0)
+    last_referenced_at  = models.DateTimeField(default=timezone.now)
+    created_at          = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table    = 'mice_asset_blob'
+        indexes     = [models.Index(fields=['ref_count', 'last_referenced_at'])]
+
+    def __str__(self):
+        return f'{self.sha256[:12]} ({self.ref_count} refs)'
 
 
 # ── ProjectAsset ──────────────────────────────────────────────────────────────
 
+class PreviewStatus(models.TextChoices):
+    PENDING     = 'pending',        'Pending'
+    PROCESSING  = 'processing',     'Processing'
+    READY       = 'ready',          'Ready'
+    UNSUPPORTED = 'unsupported',    'Unsupported'
+    FAILED      = 'failed',         'Failed'
+
+
 class ProjectAsset(models.Model):
     """
     File attached to a MICE project.
@@ -827,6 +1243,19 @@ class ProjectAsset(models.Model):
     mime_type       = models.CharField(max_length=100, blank=True)
     version         = models.CharField(max_length=50, blank=True, help_text='e.g. v1, v2-final')
     client_visible  = models.BooleanField(default=False, db_index=True,help_text='If True, visible to client via their portal',)
+    blob            = models.ForeignKey(
+        AssetBlob, on_delete=models.PROTECT,
+        null=True, blank=True, editable=False, related_name='assets',
+        help_text='Deduplicated content behind `file`',
+    )
+    preview_status  = models.CharField(
+        max_length=20, choices=PreviewStatus.choices,
+        default=PreviewStatus.PENDING, db_index=True, editable=False,
+    )
+    previews        = models.JSONField(
+        default=dict, blank=True, editable=False,
+        help_text='{size name: storage path} — see apps/mice/previews.py',
+    )
 
     created_at      = models.DateTimeField(auto_now_add=True)
     updated_at      = models.DateTimeField(auto_now=True)
@@ -838,7 +1267,319 @@ class ProjectAsset(models.Model):
     def __str__(self):
         return f'{self.mice_project} — {self.title}'
 
+    @property
+    def extension(self):
+        """'.pdf', '.png', … — blob names carry none, so fall back to mime_type."""
+        ext = os.path.splitext(self.file.name or '')[1]
+        if not ext and self.mime_type:
+            ext = mimetypes.guess_extension(self.mime_type) or ''
+        return ext
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the blob as loaded, so replacing the file releases it
+        if 'blob_id' in field_names:
+            instance._loaded_blob_id = instance.blob_id
+        return instance
+
     def save(self, *args, **kwargs):
-        if self.file and hasattr(self.file, 'size'):
+        """
+        A freshly uploaded file is hashed and stored through the blob store:
+        identical content already on disk is referenced instead of written.
+        """
+        from .blobs import acquire_file, release
+
+        if self.file and not self.file._committed:
+            blob = acquire_file(self.file)
+            self.blob       = blob
+            self.file.name  = blob.file.name
+            self.file._committed = True
+            self.file_size  = blob.size
+            # New content — the preview worker renders it again
+            self.preview_status, self.previews = PreviewStatus.PENDING, {}
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {
+                    *kwargs['update_fields'],
+                    'blob', 'file', 'file_size', 'preview_status', 'previews',
+                }
+        elif not self.blob_id and self.file and hasattr(self.file, 'size'):
             self.file_size = self.file.size
-        super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            previous = getattr(self, '_loaded_blob_id', None)
+            if previous and previous != self.blob_id:
+                release(previous)
+            self._invalidate_asset_hub()
+        self._loaded_blob_id = self.blob_id
+
+    def delete(self, *args, **kwargs):
+        from .blobs import release
+
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            if self.blob_id:
+                release(self.blob_id)
+            self._invalidate_asset_hub()
+        return result
+
+    def _invalidate_asset_hub(self):
+        from .asset_hub import invalidate
+        project_id = self.mice_project_id
+        transaction.on_commit(lambda: invalidate(project_id))
+
+
+# ── AssetUpload ───────────────────────────────────────────────────────────────
+
+class UploadStatus(models.TextChoices):
+    ACTIVE      = 'active',     'Active'
+    ASSEMBLING  = 'assembling', 'Assembling'
+    COMPLETED   = 'completed',  'Completed'
+    ABORTED     = 'aborted',    'Aborted'
+
+
+class AssetUpload(models.Model):
+    """
+    A resumable, chunked upload that becomes a ProjectAsset on completion.
+    Parts are stored individually under mice/uploads/<id>/ until the upload
+    is assembled, aborted, or swept after expires_at.
+    See apps/mice/uploads.py.
+    """
+    id              = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    mice_project    = models.ForeignKey(
+        MICEProject, on_delete=models.CASCADE, related_name='uploads',
+    )
+    uploaded_by     = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='asset_uploads',
+    )
+    status          = models.CharField(
+        max_length=20, choices=UploadStatus.choices, default=UploadStatus.ACTIVE,
+    )
+
+    filename        = models.CharField(max_length=255)
+    total_size      = models.PositiveBigIntegerField(help_text='Bytes')
+    part_size       = models.PositiveIntegerField(help_text='Bytes per part; the last may be shorter')
+
+    # Metadata for the ProjectAsset created on completion
+    asset_type      = models.CharField(max_length=30, choices=ProjectAsset.ASSET_TYPES, default='other')
+    title           = models.CharField(max_length=255)
+    description     = models.TextField(blank=True)
+    version         = models.CharField(max_length=50, blank=True)
+    client_visible  = models.BooleanField(default=False)
+    sub_event       = models.ForeignKey(
+        SubEvent, on_delete=models.SET_NULL, null=True, blank=True, related_name='+',
+    )
+
+    # Set by complete(); the worker assembles the parts against it
+    sha256          = models.CharField(max_length=64, blank=True)
+    error           = models.CharField(max_length=255, blank=True)
+    asset           = models.OneToOneField(
+        ProjectAsset, on_delete=models.SET_NULL,
+        null=True, blank=True, related_name='upload',
+    )
+    expires_at      = models.DateTimeField()
+    created_at      = models.DateTimeField(auto_now_add=True)
+    updated_at      = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table    = 'mice_asset_upload'
+        ordering    = ['-created_at']
+        indexes     = [
+            models.Index(fields=['status', 'expires_at']),
+        ]
+
+    def __str__(self):
+        return f'{self.filename} ({self.get_status_display()})'
+
+    @property
+    def part_count(self):
+        return max(1, -(-self.total_size // self.part_size))
+
+    def expected_part_size(self, number):
+        """Exact byte length part `number` (1-based) must have."""
+        if number < self.part_count:
+            return self.part_size
+        return self.total_size - self.part_size * (self.part_count - 1)
+
+    @property
+    def storage_prefix(self):
+        return f'mice/uploads/{self.pk}'
+
+
+class AssetUploadPart(models.Model):
+    """One received part of an AssetUpload — re-sending a part replaces it."""
+    id          = models.BigAutoField(primary_key=True)
+    upload      = models.ForeignKey(AssetUpload, on_delete=models.CASCADE, related_name='parts')
+    number      = models.PositiveIntegerField()
+    size        = models.PositiveIntegerField()
+    sha256      = models.CharField(max_length=64)
+    path        = models.CharField(max_length=255)
+    created_at  = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table    = 'mice_asset_upload_part'
+        ordering    = ['number']
+        constraints = [
+            models.UniqueConstraint(fields=['upload', 'number'], name='mice_upload_part_unique'),
+        ]
+
+    def __str__(self):
+        return f'{self.upload_id} part {self.number}'
+
+
+# ── FinancialRollup ───────────────────────────────────────────────────────────
+
+class FinancialRollup(models.Model):
+    """
+    Pre-aggregated quotation money for one organizer and calendar month.
+
+    One row per (organizer, metric, period, status, client_company):
+      pipeline    — every non-superseded quotation, by created month & status
+      realized    — approved quotations, by approval month
+      receivable  — unpaid payment terms of approved quotations, by due month
+                    (status holds 'term_1' / 'term_2')
+
+    Maintained incrementally by apps/mice/rollups.py; never edit by hand.
+    `manage.py rebuild_financial_rollups` recomputes it from scratch.
+    """
+    id              = models.BigAutoField(primary_key=True)
+    organizer       = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='financial_rollups',
+    )
+    metric          = models.CharField(max_length=20, choices=RollupMetric.choices)
+    period          = models.DateField(help_text='First day of the month')
+    status          = models.CharField(max_length=20, blank=True)
+    client_company  = models.CharField(max_length=255, blank=True)
+
+    quotation_count = models.IntegerField(default=0)
+    amount          = models.DecimalField(
+        max_digits=18, decimal_places=2, default=0,
+        help_text='total_after_tax, or the outstanding term for receivables',
+    )
+    net_margin      = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    sodaqoh_amt     = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+
+    updated_at      = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table    = 'mice_financial_rollup'
+        ordering    = ['organizer', 'metric', 'period']
+        # The unique index leads with (organizer, metric, period) — every
+        # analytics query is a range scan on it
+        constraints = [
+            models.UniqueConstraint(
+                fields=['organizer', 'metric', 'period', 'status', 'client_company'],
+                name='mice_rollup_unique_key',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.organizer_id} {self.metric} {self.period:%Y-%m} {self.status} {self.client_company}'
+
+
+# ── VendorPriceIndex ──────────────────────────────────────────────────────────
+
+class VendorPriceIndex(models.Model):
+    """
+    Modal price statistics from past line items, for rate suggestions.
+
+    vendor set   → one vendor's prices for an item and unit
+    vendor null  → every vendor of `category` for that organizer
+
+    Maintained by apps/mice/price_index.py; never edit by hand.
+    `manage.py rebuild_price_index` recomputes it from scratch.
+    """
+    id              = models.BigAutoField(primary_key=True)
+    organizer       = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='price_index',
+    )
+    vendor          = models.ForeignKey(
+        Vendor, on_delete=models.CASCADE,
+        null=True, blank=True, related_name='price_index',
+    )
+    category        = models.CharField(max_length=50, choices=VendorCategory.choices)
+    item_key        = models.CharField(max_length=255)
+    item_name       = models.CharField(max_length=255, help_text='Most recent spelling')
+    vol_unit        = models.CharField(max_length=20, choices=VolUnit.choices)
+
+    sample_count    = models.PositiveIntegerField(default=0)
+    p25             = models.DecimalField(max_digits=14, decimal_places=2)
+    median          = models.DecimalField(max_digits=14, decimal_places=2)
+    p75             = models.DecimalField(max_digits=14, decimal_places=2)
+    last_price      = models.DecimalField(max_digits=14, decimal_places=2)
+    last_seen_at    = models.DateTimeField()
+
+    updated_at      = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table    = 'mice_vendor_price_index'
+        ordering    = ['item_key']
+        indexes     = [
+            models.Index(fields=['organizer', 'item_key']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['vendor', 'item_key', 'vol_unit'],
+                condition=models.Q(vendor__isnull=False),
+                name='mice_price_index_vendor_key',
+            ),
+            models.UniqueConstraint(
+                fields=['organizer', 'category', 'item_key', 'vol_unit'],
+                condition=models.Q(vendor__isnull=True),
+                name='mice_price_index_category_key',
+            ),
+        ]
+
+    def __str__(self):
+        scope = self.vendor_id or self.category
+        return f'{scope} {self.item_key} /{self.vol_unit}'
+
+
+# ── Reminder ──────────────────────────────────────────────────────────────────
+
+class ReminderKind(models.TextChoices):
+    TASK_DUE        = 'task_due',        'Task due soon'
+    TASK_OVERDUE    = 'task_overdue',    'Task overdue'
+    PAYMENT_DUE     = 'payment_due',     'Installment due soon'
+    PAYMENT_OVERDUE = 'payment_overdue', 'Installment overdue'
+
+
+class Reminder(models.Model):
+    """
+    One due / overdue notice for one user, queued by apps/mice/reminders.py
+    and sent as part of that user's next digest.
+
+    `key` names the occurrence (task or installment, kind and due date), so
+    rescanning never queues the same notice twice; moving a due date makes a
+    new occurrence.
+    """
+    id              = models.BigAutoField(primary_key=True)
+    user            = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='mice_reminders',
+    )
+    mice_project    = models.ForeignKey(
+        MICEProject, on_delete=models.CASCADE, related_name='reminders',
+    )
+    kind            = models.CharField(max_length=20, choices=ReminderKind.choices)
+    key             = models.CharField(max_length=200)
+    message         = models.CharField(max_length=500)
+    due             = models.DateTimeField()
+    created_at      = models.DateTimeField(auto_now_add=True)
+    sent_at         = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table    = 'mice_reminder'
+        ordering    = ['due']
+        indexes     = [
+            models.Index(
+                fields=['user', 'due'], name='mice_reminder_unsent_idx',
+                condition=models.Q(sent_at__isnull=True),
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='mice_reminder_unique_key'),
+        ]
+
+    def __str__(self):
+        return f'{self.user_id} {self.key}'
@@ -0,0 +1,187 @@
+# =============================================================================
+# apps/mice/ordering.py
+# =============================================================================
+# Gap-based sort_order ranks shared by line items, sections, sub-events and
+# tasks.
+#
+# Ranks are spaced RANK_GAP apart, so moving one row normally means writing a
+# single new rank halfway between its new neighbours. Only when two
+# neighbours are adjacent integers is the scope renumbered — and that is one
+# bulk UPDATE … CASE statement touching only rows whose rank changed.
+# =============================================================================
+
+from django.db import transaction
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+RANK_GAP = 1024
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def _scope_ranks(queryset):
+    """
+    Lock and load (pk, sort_order) for every row in scope — one query.
+    Scopes filter through their quotation / project / organizer joins, so
+    the lock is limited to this table (of=self); the parents stay unlocked.
+    """
+    # Model rows, not values_list(): Django drops OF (…) without them
+    rows = (
+        queryset.select_related(None)
+                .select_for_update(of=('self',))
+                .order_by('sort_order', 'pk')
+                .only('pk', 'sort_order')
+    )
+    return [(row.pk, row.sort_order) for row in rows]
+
+
+def _write_ranks(model, ordered_ids, current):
+    """
+    Renumber ordered_ids to RANK_GAP, 2×RANK_GAP, … in a single
+    bulk_update. Rows already holding their target rank are skipped.
+    """
+    changed = []
+    for position, pk in enumerate(ordered_ids, start=1):
+        rank = position * RANK_GAP
+        if current.get(pk) != rank:
+            changed.append(model(pk=pk, sort_order=rank))
+    if changed:
+        model.objects.bulk_update(changed, ['sort_order'], batch_size=None)
+    return len(changed)
+
+
+def apply_order(queryset, ordered_ids):
+    """
+    Apply a new order to the rows of `queryset`.
+
+    Every id must belong to the scope — one foreign or unknown id rejects
+    the whole request. Rows left out of a partial order keep their current
+    relative order after the listed ones. Returns the number of rows
+    actually rewritten. Raises ValueError on invalid input.
+    """
+    if len(set(map(str, ordered_ids))) != len(ordered_ids):
+        raise ValueError('order contains duplicate ids')
+
+    with transaction.atomic():
+        ranks   = _scope_ranks(queryset)
+        by_str  = {str(pk): pk for pk, _ in ranks}
+        missing = [i for i in ordered_ids if str(i) not in by_str]
+        if missing:
+            raise ValueError(f'Unknown ids: {", ".join(map(str, missing))}')
+
+        listed = [by_str[str(i)] for i in ordered_ids]
+        chosen = set(listed)
+        rest   = [pk for pk, _ in ranks if pk not in chosen]
+        return _write_ranks(queryset.model, listed + rest, dict(ranks))
+
+
+def move_item(queryset, item_id, after=None, before=None):
+    """
+    Move one row next to a neighbour.
+
+      after=<id>   → place directly after that row
+      before=<id>  → place directly before that row
+      neither      → place first
+
+    Writes one row when there is room between the neighbours' ranks,
+    otherwise renumbers the scope in one statement.
+    Returns (new_rank, rows_written). Raises ValueError on invalid input.
+    """
+    if str(item_id) in (str(after), str(before)):
+        raise ValueError('An item cannot be moved relative to itself')
+
+    with transaction.atomic():
+        ranks   = _scope_ranks(queryset)
+        ids     = [str(pk) for pk, _ in ranks]
+        current = dict(ranks)
+        for ref in (item_id, after, before):
+            if ref is not None and str(ref) not in ids:
+                raise ValueError(f'Unknown id: {ref}')
+
+        target = ranks[ids.index(str(item_id))][0]
+        order  = [pk for pk, _ in ranks if pk != target]
+        keys   = [str(pk) for pk in order]
+
+        if before is not None:
+            position = keys.index(str(before))
+        elif after is not None:
+            position = keys.index(str(after)) + 1
+        else:
+            position = 0
+
+        prev_rank = current[order[position - 1]] if position > 0 else None
+        next_rank = current[order[position]] if position < len(order) else None
+
+        if prev_rank is None and next_rank is None:
+            rank = RANK_GAP
+        elif prev_rank is None:
+            rank = next_rank // 2 if next_rank > 0 else None
+        elif next_rank is None:
+            rank = prev_rank + RANK_GAP
+        else:
+            rank = (prev_rank + next_rank) // 2 if next_rank - prev_rank >= 2 else None
+
+        if rank is not None:
+            if current[target] != rank:
+                queryset.model.objects.filter(pk=target).update(sort_order=rank)
+                return rank, 1
+            return rank, 0
+
+        order.insert(position, target)
+        written = _write_ranks(queryset.model, order, current)
+        return (position + 1) * RANK_GAP, written
+
+
+# ── ViewSet mixin ─────────────────────────────────────────────────────────────
+
+class SortOrderMixin:
+    """
+    Adds `reorder` and `move` list-level actions to a ModelViewSet whose
+    model has a `sort_order` column.
+
+    The scope is `get_reorder_queryset()`, which defaults to `get_queryset()`
+    — ownership is enforced by exactly the same filter as the list endpoint.
+    """
+
+    def get_reorder_queryset(self):
+        return self.get_queryset()
+
+    @action(detail=False, methods=['post'])
+    def reorder(self, request, *args, **kwargs):
+        """
+        POST …/reorder/
+        Body: { "order": ["uuid1", "uuid2", "uuid3"] }
+        Applies the full order in one transaction and one UPDATE.
+        """
+        order = request.data.get('order', [])
+        if not isinstance(order, list) or not order:
+            return Response(
+                {'detail': 'order must be a non-empty list of ids'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            written = apply_order(self.get_reorder_queryset(), order)
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'reordered': len(order), 'updated': written})
+
+    @action(detail=False, methods=['post'])
+    def move(self, request, *args, **kwargs):
+        """
+        POST …/move/
+        Body: { "id": "uuid", "after": "uuid" | null } or { "id": "uuid", "before": "uuid" }
+        Usually rewrites only the moved row.
+        """
+        item_id = request.data.get('id')
+        if not item_id:
+            return Response({'detail': 'id is required'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            rank, written = move_item(
+                self.get_reorder_queryset(), item_id,
+                after=request.data.get('after'),
+                before=request.data.get('before'),
+            )
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'id': str(item_id), 'sort_order': rank, 'updated': written})
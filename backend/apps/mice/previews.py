@@ -0,0 +1,254 @@
+# =============================================================================
+# apps/mice/previews.py
+# =============================================================================
+# Thumbnail / preview generation for ProjectAsset images and PDFs.
+#
+# Runs outside the request cycle: uploads leave the asset `pending`, and the
+# generate_asset_previews command claims pending assets in batches and
+# renders them in a process pool. Each render is a pure function from bytes
+# to {size name: JPEG bytes}, so workers never touch the database. Sources
+# are read only as a slot frees up, keeping one per worker in memory rather
+# than the whole batch.
+#
+# Previews are stored next to the asset file as
+#   <file name>.previews/<size>.jpg
+# Identical content shares one blob (apps/mice/blobs.py) and therefore one
+# set of previews — an asset whose blob already has them is done instantly.
+#
+# PDF first pages need PyMuPDF (`pip install pymupdf`); without it PDFs are
+# marked unsupported and the UI falls back to a file icon.
+# =============================================================================
+
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from . import asset_hub
+from .models import PreviewStatus, ProjectAsset
+
+try:
+    import fitz     # PyMuPDF
+except ImportError:  # pragma: no cover — optional
+    fitz = None
+
+DEFAULT_SIZES       = {'sm': 160, 'md': 480, 'lg': 1280}
+DEFAULT_MAX_SOURCE  = 64 * 1024 * 1024
+JPEG_QUALITY        = 82
+
+# Pillow decodes these; SVG and the like are left to the browser
+RASTER_TYPES = {
+    'image/jpeg', 'image/png', 'image/gif', 'image/webp',
+    'image/bmp', 'image/tiff',
+}
+
+
+class Unsupported(Exception):
+    pass
+
+
+def preview_sizes():
+    return getattr(settings, 'MICE_PREVIEW_SIZES', DEFAULT_SIZES)
+
+
+def preview_path(file_name, size_name):
+    return f'{file_name}.previews/{size_name}.jpg'
+
+
+def is_previewable(mime_type):
+    return mime_type in RASTER_TYPES or (mime_type == 'application/pdf' and fitz is not None)
+
+
+# ── Rendering (runs in worker processes) ──────────────────────────────────────
+
+def _pdf_first_page(data, edge):
+    if fitz is None:
+        raise Unsupported('PDF previews need PyMuPDF')
+    with fitz.open(stream=data, filetype='pdf') as doc:
+        if not doc.page_count:
+            raise Unsupported('PDF has no pages')
+        page = doc.load_page(0)
+        zoom = edge / max(page.rect.width, page.rect.height)
+        pix  = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        return Image.frombytes('RGB', (pix.width, pix.height), pix.samples)
+
+
+def _open_image(data, edge):
+    try:
+        image = Image.open(io.BytesIO(data))
+    except UnidentifiedImageError as e:
+        raise Unsupported(str(e))
+    # JPEG can decode straight at a reduced scale
+    image.draft('RGB', (edge, edge))
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        flat  = Image.new('RGB', image.size, 'white')
+        flat.paste(image, mask=image.getchannel('A'))
+        return flat
+    return image.convert('RGB')
+
+
+def render(data, mime_type, sizes):
+    """
+    {size name: JPEG bytes} for every entry of `sizes` ({name: longest edge}).
+    Sizes are produced largest first, each from the previous one.
+    Raises Unsupported for content that cannot be previewed.
+    """
+    ordered = sorted(sizes.items(), key=lambda item: item[1], reverse=True)
+    largest = ordered[0][1]
+    if mime_type == 'application/pdf':
+        image = _pdf_first_page(data, largest)
+    elif mime_type in RASTER_TYPES:
+        image = _open_image(data, largest)
+    else:
+        raise Unsupported(mime_type or 'unknown type')
+
+    rendered = {}
+    for name, edge in ordered:
+        image = image.copy()
+        image.thumbnail((edge, edge), Image.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+        rendered[name] = buffer.getvalue()
+    return rendered
+
+
+# ── Orchestration (main process) ──────────────────────────────────────────────
+
+def claim(batch_size):
+    """Mark up to `batch_size` pending assets as processing and return them."""
+    with transaction.atomic():
+        ids = list(
+            ProjectAsset.objects.select_for_update(skip_locked=True)
+            .filter(preview_status=PreviewStatus.PENDING)
+            .order_by('created_at')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        ProjectAsset.objects.filter(pk__in=ids).update(preview_status=PreviewStatus.PROCESSING)
+    return list(
+        ProjectAsset.objects.filter(pk__in=ids).only(
+            'pk', 'mice_project', 'file', 'file_size', 'mime_type',
+        )
+    )
+
+
+def _shared_previews(assets):
+    """Ready previews of other assets with the same stored file, by file name."""
+    return dict(
+        ProjectAsset.objects.filter(
+            file__in={a.file.name for a in assets}, preview_status=PreviewStatus.READY,
+        ).values_list('file', 'previews')
+    )
+
+
+def _store(file_name, rendered):
+    storage = ProjectAsset._meta.get_field('file').storage
+    stored  = {}
+    for name, data in rendered.items():
+        path = preview_path(file_name, name)
+        if not storage.exists(path):
+            path = storage.save(path, ContentFile(data))
+        stored[name] = path
+    return stored
+
+
+def _finish(asset, result):
+    """Record the outcome of one render; `result` returns it or raises."""
+    try:
+        rendered = result()
+    except Unsupported:
+        asset.preview_status, asset.previews = PreviewStatus.UNSUPPORTED, {}
+    except Exception:
+        asset.preview_status, asset.previews = PreviewStatus.FAILED, {}
+    else:
+        asset.preview_status = PreviewStatus.READY
+        asset.previews       = _store(asset.file.name, rendered)
+
+
+def process(assets, executor=None, window=None):
+    """
+    Render previews for claimed `assets`, in `executor` when given.
+    Sources are read one at a time as renders finish, so at most `window`
+    (default: one per CPU) are held in memory or in flight at once.
+    Saves the outcome of every asset in one bulk update.
+    """
+    sizes      = preview_sizes()
+    max_source = getattr(settings, 'MICE_PREVIEW_MAX_SOURCE', DEFAULT_MAX_SOURCE)
+    window     = max(window or os.cpu_count() or 1, 1)
+    shared     = _shared_previews(assets)
+    leaders    = {}     # file name → the asset rendering it in this batch
+    followers  = []
+    in_flight  = deque()
+
+    for asset in assets:
+        if asset.file.name in leaders:
+            followers.append(asset)
+        elif asset.file.name in shared:
+            asset.preview_status, asset.previews = PreviewStatus.READY, shared[asset.file.name]
+        elif not is_previewable(asset.mime_type) or asset.file_size > max_source:
+            asset.preview_status, asset.previews = PreviewStatus.UNSUPPORTED, {}
+        else:
+            leaders[asset.file.name] = asset
+
+    for asset in leaders.values():
+        try:
+            with asset.file.open('rb') as f:
+                data = f.read()
+        except OSError:
+            asset.preview_status, asset.previews = PreviewStatus.FAILED, {}
+            continue
+        if executor is None:
+            _finish(asset, partial(render, data, asset.mime_type, sizes))
+            continue
+        if len(in_flight) >= window:
+            _finish(*in_flight.popleft())
+        in_flight.append((asset, executor.submit(render, data, asset.mime_type, sizes).result))
+    while in_flight:
+        _finish(*in_flight.popleft())
+
+    for asset in followers:
+        leader = leaders[asset.file.name]
+        asset.preview_status, asset.previews = leader.preview_status, leader.previews
+
+    ProjectAsset.objects.bulk_update(assets, ['preview_status', 'previews'])
+    asset_hub.invalidate(*{a.mice_project_id for a in assets})
+    return assets
+
+
+def generate_previews(batch_size=32, workers=None, limit=None):
+    """
+    Drain the pending queue — new uploads and, after migrating, every
+    existing asset. workers=0 renders in-process; None uses one process
+    per CPU. Returns {status: count}.
+    """
+    counts   = {}
+    workers  = (os.cpu_count() or 1) if workers is None else workers
+    executor = ProcessPoolExecutor(max_workers=workers) if workers != 0 else None
+    try:
+        done = 0
+        while limit is None or done < limit:
+            size  = batch_size if limit is None else min(batch_size, limit - done)
+            batch = claim(size)
+            if not batch:
+                break
+            for asset in process(batch, executor, window=workers):
+                counts[asset.preview_status] = counts.get(asset.preview_status, 0) + 1
+            done += len(batch)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return counts
+
+
+def requeue(statuses=(PreviewStatus.FAILED, PreviewStatus.PROCESSING)):
+    """Put failed or abandoned assets back in the queue."""
+    return ProjectAsset.objects.filter(preview_status__in=statuses).update(
+        preview_status=PreviewStatus.PENDING,
+    )
@@ -0,0 +1,211 @@
+# =============================================================================
+# apps/mice/price_index.py
+# =============================================================================
+# Vendor price intelligence built from historical line items.
+#
+# VendorPriceIndex keeps count / p25 / median / p75 / last modal price for
+#   - every (vendor, normalized item name, vol_unit), and
+#   - every (organizer, vendor category, normalized item name, vol_unit).
+#
+# A line item save refreshes only the keys it touched (old and new), each
+# from one indexed query on QuotationLineItem(item_key, vol_unit), once its
+# transaction commits — every save in one transaction shares one refresh,
+# and the write path itself never waits on the index. Revision
+# clones share a lineage_id and are counted once, at their latest price.
+# Rate autocomplete reads the index alone — never the line-item table.
+# =============================================================================
+
+import threading
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import BooleanField, ExpressionWrapper, Q
+
+from .models import (
+    QuotationLineItem, Vendor, VendorPriceIndex,
+    TWO_PLACES, _round, normalize_item_name,
+)
+
+
+# ── Statistics ────────────────────────────────────────────────────────────────
+
+def _percentile(ordered, q):
+    """Linear-interpolated percentile of an already sorted list of Decimals."""
+    position = (len(ordered) - 1) * Decimal(q)
+    lower    = int(position)
+    upper    = min(lower + 1, len(ordered) - 1)
+    weight   = position - lower
+    return _round(ordered[lower] + (ordered[upper] - ordered[lower]) * weight)
+
+
+def _stats(rows):
+    """
+    rows: (lineage_id, modal_price, item_name, created_at) ordered by
+    created_at. Keeps the latest row per lineage, then summarises.
+    """
+    latest = {}
+    for row in rows:
+        latest[row[0]] = row
+    if not latest:
+        return None
+    samples = sorted(latest.values(), key=lambda r: r[3])
+    prices  = sorted(r[1] for r in samples)
+    last    = samples[-1]
+    return {
+        'item_name':    last[2],
+        'sample_count': len(prices),
+        'p25':          _percentile(prices, '0.25'),
+        'median':       _percentile(prices, '0.5'),
+        'p75':          _percentile(prices, '0.75'),
+        'last_price':   last[1].quantize(TWO_PLACES),
+        'last_seen_at': last[3],
+    }
+
+
+def _samples(organizer_id, item_key, vol_unit, **scope):
+    return QuotationLineItem.objects.filter(
+        item_key=item_key, vol_unit=vol_unit, modal_price__gt=0,
+        section__quotation__mice_project__organizer_id=organizer_id,
+        **scope,
+    ).order_by('created_at').values_list('lineage_id', 'modal_price', 'item_name', 'created_at')
+
+
+def _store(lookup, stats):
+    if stats is None:
+        VendorPriceIndex.objects.filter(**lookup).delete()
+    else:
+        VendorPriceIndex.objects.update_or_create(**lookup, defaults=stats)
+
+
+# ── Refresh ───────────────────────────────────────────────────────────────────
+
+def refresh_price_index(organizer_id, keys):
+    """
+    Recompute the index rows behind `keys` — an iterable of
+    (vendor_id, item_key, vol_unit) — for one organizer. Keys without a
+    vendor or item name are ignored. Returns the number of rows refreshed.
+    """
+    keys = {k for k in keys if k and k[0] and k[1]}
+    if not keys:
+        return 0
+
+    categories = dict(
+        Vendor.objects.filter(pk__in={k[0] for k in keys}).values_list('pk', 'category')
+    )
+    refreshed = 0
+    with transaction.atomic():
+        by_category = set()
+        for vendor_id, item_key, vol_unit in keys:
+            category = categories.get(vendor_id)
+            if category is None:
+                continue
+            _store(
+                {'organizer_id': organizer_id, 'vendor_id': vendor_id,
+                 'category': category, 'item_key': item_key, 'vol_unit': vol_unit},
+                _stats(_samples(organizer_id, item_key, vol_unit, vendor_id=vendor_id)),
+            )
+            by_category.add((category, item_key, vol_unit))
+            refreshed += 1
+
+        for category, item_key, vol_unit in by_category:
+            _store(
+                {'organizer_id': organizer_id, 'vendor_id': None,
+                 'category': category, 'item_key': item_key, 'vol_unit': vol_unit},
+                _stats(_samples(organizer_id, item_key, vol_unit, vendor__category=category)),
+            )
+            refreshed += 1
+    return refreshed
+
+
+_pending = threading.local()
+
+
+def _refresh_pending():
+    keys, _pending.keys = getattr(_pending, 'keys', {}), {}
+    for organizer_id, organizer_keys in keys.items():
+        refresh_price_index(organizer_id, organizer_keys)
+
+
+def refresh_on_commit(organizer_id, keys):
+    """
+    Queue `keys` for refresh_price_index once the current transaction
+    commits (at once outside one). Keys queued by several saves of one
+    transaction are refreshed together; keys of a rolled back transaction
+    are refreshed harmlessly with the next commit.
+    """
+    if not hasattr(_pending, 'keys'):
+        _pending.keys = {}
+    _pending.keys.setdefault(organizer_id, set()).update(k for k in keys if k)
+    transaction.on_commit(_refresh_pending)
+
+
+def rebuild_price_index(organizer=None):
+    """
+    Recompute the whole index from the line-item table — for backfills and
+    after deletes that bypass QuotationLineItem.delete().
+    Returns the number of index rows written.
+    """
+    items = QuotationLineItem.objects.filter(vendor__isnull=False, modal_price__gt=0)
+    index = VendorPriceIndex.objects.all()
+    if organizer is not None:
+        items = items.filter(section__quotation__mice_project__organizer=organizer)
+        index = index.filter(organizer=organizer)
+
+    vendor_rows   = defaultdict(list)
+    category_rows = defaultdict(list)
+    for organizer_id, vendor_id, category, item_key, vol_unit, *sample in (
+        items.order_by('created_at').values_list(
+            'section__quotation__mice_project__organizer_id',
+            'vendor_id', 'vendor__category', 'item_key', 'vol_unit',
+            'lineage_id', 'modal_price', 'item_name', 'created_at',
+        ).iterator(chunk_size=5000)
+    ):
+        if not item_key:
+            continue
+        vendor_rows[(organizer_id, vendor_id, category, item_key, vol_unit)].append(sample)
+        category_rows[(organizer_id, None, category, item_key, vol_unit)].append(sample)
+
+    entries = []
+    for (organizer_id, vendor_id, category, item_key, vol_unit), rows in (
+        list(vendor_rows.items()) + list(category_rows.items())
+    ):
+        entries.append(VendorPriceIndex(
+            organizer_id=organizer_id, vendor_id=vendor_id, category=category,
+            item_key=item_key, vol_unit=vol_unit, **_stats(rows),
+        ))
+
+    with transaction.atomic():
+        index.delete()
+        VendorPriceIndex.objects.bulk_create(entries, batch_size=1000)
+    return len(entries)
+
+
+# ── Lookup ────────────────────────────────────────────────────────────────────
+
+def suggest_rates(organizer, query, vendor=None, category=None, vol_unit=None, limit=10):
+    """
+    Index rows whose normalized item name starts with `query`.
+    A half-open range on item_key rather than LIKE, so the
+    (organizer, item_key) b-tree serves it on every backend.
+    Vendor-specific rows rank ahead of category-wide ones.
+    """
+    prefix = normalize_item_name(query)
+    if not prefix:
+        return []
+    qs = VendorPriceIndex.objects.filter(
+        organizer=organizer, item_key__gte=prefix, item_key__lt=prefix + '\uffff',
+    )
+    if vendor:
+        qs = qs.filter(vendor_id=vendor)
+    if category:
+        qs = qs.filter(category=category)
+    if vol_unit:
+        qs = qs.filter(vol_unit=vol_unit)
+    return list(
+        qs.select_related('vendor')
+          .annotate(category_wide=ExpressionWrapper(
+              Q(vendor__isnull=True), output_field=BooleanField(),
+          ))
+          .order_by('category_wide', '-sample_count', '-last_seen_at')[:limit]
+    )
@@ -0,0 +1,184 @@
+# =============================================================================
+# apps/mice/pricing.py
+# =============================================================================
+# Read-only "what-if" pricing over a quotation's line items.
+#
+# The line items are loaded ONCE into integer NumPy arrays (sen/cents for
+# money, 1/100 for qty & duration, 1/10000 for percentages), and every
+# scenario is evaluated as one row of a (scenarios × items) matrix.
+#
+# Rounding reproduces QuotationLineItem.calculate() and
+# Quotation.recalculate() exactly: every _round() in the Decimal engine
+# becomes an integer division rounded half away from zero, which is what
+# ROUND_HALF_UP does. Nothing is written to the database.
+# =============================================================================
+
+from decimal import Decimal
+
+import numpy as np
+
+from .models import QuotationLineItem, TWO_PLACES
+
+# Scale factors of the stored DecimalFields
+MONEY_SCALE = 100       # decimal_places=2  → sen
+QTY_SCALE   = 100       # qty / duration, decimal_places=2
+PCT_SCALE   = 10000     # *_pct, decimal_places=4
+
+# Largest magnitude we allow in an int64 intermediate before falling back
+# to exact Python integers (dtype=object) — IDR amounts get large quickly.
+_INT64_SAFE = 2 ** 62
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def _scaled(value, scale):
+    """Decimal → exact integer at the given scale."""
+    return int(Decimal(value) * scale)
+
+
+def _round_div(numer, denom):
+    """
+    numer / denom rounded half away from zero — integer ROUND_HALF_UP.
+    Works elementwise on int64 or object arrays; denom may be an array.
+    """
+    sign = np.where(numer < 0, -1, 1)
+    return sign * ((2 * abs(numer) + denom) // (2 * denom))
+
+
+def _money(cents):
+    return str((Decimal(int(cents)) / MONEY_SCALE).quantize(TWO_PLACES))
+
+
+# ── Pricer ────────────────────────────────────────────────────────────────────
+
+class QuotationPricer:
+    """
+    Compact, array-backed snapshot of a quotation's line items.
+
+        pricer  = QuotationPricer(quotation)       # one SELECT
+        results = pricer.simulate([{...}, {...}])  # no further queries
+
+    A scenario is a dict with any of:
+      fee_management_pct, ppn_pct, pph_vendor_pct, sodaqoh_pct  — Decimal
+      margin_pct        — override every line item's margin
+      section_margins   — { section_id: margin_pct }
+      category_margins  — { vendor category: margin_pct }
+    Precedence for margins: item < margin_pct < section < vendor category.
+    """
+
+    def __init__(self, quotation):
+        self.quotation = quotation
+        rows = list(
+            QuotationLineItem.objects.filter(section__quotation=quotation)
+            .order_by('pk')
+            .values_list(
+                'section_id', 'vendor__category',
+                'modal_price', 'qty', 'duration', 'margin_pct',
+            )
+        )
+        modal   = [_scaled(r[2], MONEY_SCALE) for r in rows]
+        qty_dur = [_scaled(r[3], QTY_SCALE) * _scaled(r[4], QTY_SCALE) for r in rows]
+        margin  = [_scaled(r[5], PCT_SCALE) for r in rows]
+
+        # Worst-case intermediates: client price (≤ 11× modal at a 1000%
+        # margin) × qty × dur summed over all items, doubled by _round_div,
+        # and modal × a 1000% margin at percentage scale.
+        bound = max(
+            22 * sum(m * qd for m, qd in zip(modal, qty_dur)),
+            2 * max(modal, default=0) * 10 * PCT_SCALE,
+        )
+        self.dtype = np.int64 if bound < _INT64_SAFE else object
+
+        self.section_ids = np.array([str(r[0]) for r in rows], dtype=object)
+        self.categories  = np.array([r[1] or '' for r in rows], dtype=object)
+        self.modal       = np.array(modal, dtype=self.dtype)
+        self.qty_dur     = np.array(qty_dur, dtype=self.dtype)
+        self.margin      = np.array(margin, dtype=self.dtype)
+
+        # total_modal does not depend on any scenario parameter
+        self.total_modal = _round_div(self.modal * self.qty_dur, QTY_SCALE * QTY_SCALE)
+
+    def __len__(self):
+        return len(self.modal)
+
+    # ── Scenario parameters → matrices ────────────────────────────────────────
+
+    def _param(self, scenarios, key):
+        default = getattr(self.quotation, key)
+        return np.array(
+            [_scaled(s.get(key, default), PCT_SCALE) for s in scenarios],
+            dtype=self.dtype,
+        )
+
+    def _margins(self, scenarios):
+        margins = np.tile(self.margin, (len(scenarios), 1))
+        for row, scenario in zip(margins, scenarios):
+            if scenario.get('margin_pct') is not None:
+                row[:] = _scaled(scenario['margin_pct'], PCT_SCALE)
+            for section_id, pct in (scenario.get('section_margins') or {}).items():
+                row[self.section_ids == str(section_id)] = _scaled(pct, PCT_SCALE)
+            for category, pct in (scenario.get('category_margins') or {}).items():
+                row[self.categories == category] = _scaled(pct, PCT_SCALE)
+        return margins
+
+    # ── Evaluation ────────────────────────────────────────────────────────────
+
+    def simulate(self, scenarios):
+        """
+        Evaluate every scenario in one vectorised pass.
+        Returns one dict of totals per scenario, amounts as 2-dp strings.
+        """
+        if not scenarios:
+            return []
+
+        unit   = QTY_SCALE * QTY_SCALE
+        fee_p  = self._param(scenarios, 'fee_management_pct')
+        ppn_p  = self._param(scenarios, 'ppn_pct')
+        pph_p  = self._param(scenarios, 'pph_vendor_pct')
+        sod_p  = self._param(scenarios, 'sodaqoh_pct')
+        modal  = self.modal[np.newaxis, :]
+        qd     = self.qty_dur[np.newaxis, :]
+
+        # Line items — mirrors QuotationLineItem.calculate()
+        margin_amt   = _round_div(modal * self._margins(scenarios), PCT_SCALE)
+        total_margin = _round_div(margin_amt * qd, unit)
+        pph_amt      = _round_div(modal * pph_p[:, np.newaxis], PCT_SCALE)
+        client_price = modal + margin_amt - pph_amt
+        total_client = _round_div(client_price * qd, unit)
+
+        # Quotation — mirrors Quotation.recalculate()
+        n = len(scenarios)
+        subtotal_modal   = np.full(n, self.total_modal.sum(), dtype=self.dtype)
+        subtotal_client  = total_client.sum(axis=1)
+        margin_produksi  = total_margin.sum(axis=1)
+        fee_amt          = _round_div(subtotal_modal * fee_p, PCT_SCALE)
+        total_before_tax = subtotal_modal + fee_amt
+        ppn_amt          = _round_div(total_before_tax * ppn_p, PCT_SCALE)
+        total_after_tax  = total_before_tax + ppn_amt
+        total_margin_q   = margin_produksi + fee_amt
+        sodaqoh_amt      = _round_div(total_margin_q * sod_p, PCT_SCALE)
+        net_margin       = total_margin_q - sodaqoh_amt
+
+        results = []
+        for i, scenario in enumerate(scenarios):
+            tat = int(total_after_tax[i])
+            margin_pct = (
+                int(_round_div(np.array(int(net_margin[i]) * 100, dtype=object), tat))
+                if tat > 0 else 0
+            )
+            results.append({
+                'name':                 scenario.get('name', ''),
+                'subtotal_modal':       _money(subtotal_modal[i]),
+                'subtotal_client':      _money(subtotal_client[i]),
+                'fee_management_amt':   _money(fee_amt[i]),
+                'total_before_tax':     _money(total_before_tax[i]),
+                'ppn_amt':              _money(ppn_amt[i]),
+                'total_after_tax':      _money(total_after_tax[i]),
+                'margin_produksi':      _money(margin_produksi[i]),
+                'margin_fee_amt':       _money(fee_amt[i]),
+                'total_margin':         _money(total_margin_q[i]),
+                'sodaqoh_amt':          _money(sodaqoh_amt[i]),
+                'net_margin':           _money(net_margin[i]),
+                'margin_pct_of_total':  _money(margin_pct),
+            })
+        return results
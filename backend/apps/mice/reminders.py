@@ -0,0 +1,223 @@
+# =============================================================================
+# apps/mice/reminders.py
+# =============================================================================
+# Due-date reminders and overdue detection for tasks and payment terms.
+#
+# run_pass() is one scheduler tick (manage.py send_reminders, looped with
+# --interval):
+#
+#   1. flag      — open tasks whose due_at has passed get is_overdue=True,
+#                  in bulk; flags that no longer hold are cleared
+#   2. scan      — tasks due within the lead time and unpaid installments
+#                  (payment_term_1_due / payment_term_2_due) due soon or
+#                  overdue, read in keyset batches over the partial due-date
+#                  indexes — no OFFSET, no full scans
+#   3. queue     — one Reminder per user and occurrence; the unique
+#                  (user, key) constraint makes rescans free of duplicates
+#   4. digest    — every user with unsent reminders gets one email listing
+#                  them, queued in the outbox (apps/notifications)
+#
+# Tasks go to their assignee (the organizer when unassigned); installments
+# go to the project organizer.
+# =============================================================================
+
+import datetime
+from itertools import groupby
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.notifications.outbox import enqueue
+from .models import (
+    OPEN_TASK_STATUSES, ProjectTask, Quotation, QuotationStatus, Reminder, ReminderKind,
+)
+
+DEFAULT_TASK_LEAD       = datetime.timedelta(hours=24)
+DEFAULT_PAYMENT_LEAD    = datetime.timedelta(days=3)
+
+
+def keyset(queryset, field, batch_size):
+    """
+    Yield lists of rows ordered by (field, pk), each batch starting after the
+    last row of the previous one — stable even when a batch's processing
+    takes rows out of `queryset`.
+    """
+    last = None
+    while True:
+        page = queryset
+        if last is not None:
+            value, pk = last
+            page = page.filter(Q(**{f'{field}__gt': value}) | Q(**{field: value, 'pk__gt': pk}))
+        batch = list(page.order_by(field, 'pk')[:batch_size])
+        if not batch:
+            return
+        yield batch
+        if len(batch) < batch_size:
+            return
+        last = getattr(batch[-1], field), batch[-1].pk
+
+
+def _open_tasks():
+    return (
+        ProjectTask.objects.filter(status__in=OPEN_TASK_STATUSES, due_at__isnull=False)
+        .select_related('mice_project')
+        .only('pk', 'title', 'due_at', 'assigned_to', 'mice_project',
+              'mice_project__organizer', 'mice_project__client_company')
+    )
+
+
+# ── Queueing ──────────────────────────────────────────────────────────────────
+
+def task_reminders(tasks, kind):
+    return [
+        Reminder(
+            user_id=task.assigned_to_id or task.mice_project.organizer_id,
+            mice_project_id=task.mice_project_id,
+            kind=kind,
+            key=f'task:{task.pk}:{kind}:{task.due_at.isoformat()}',
+            message=f'{task.title} — {task.mice_project.client_company}'[:500],
+            due=task.due_at,
+        )
+        for task in tasks
+    ]
+
+
+def _installment_reminder(quotation, term, today):
+    due  = getattr(quotation, f'payment_term_{term}_due')
+    kind = ReminderKind.PAYMENT_OVERDUE if due < today else ReminderKind.PAYMENT_DUE
+    project = quotation.mice_project
+    amount  = getattr(quotation, f'payment_term_{term}')
+    return Reminder(
+        user_id=project.organizer_id,
+        mice_project_id=project.pk,
+        kind=kind,
+        key=f'payment:{quotation.pk}:{term}:{kind}:{due.isoformat()}',
+        message=f'Installment {term} of Rp {amount:,.0f} — {project.client_company}',
+        due=timezone.make_aware(datetime.datetime.combine(due, datetime.time.min)),
+    )
+
+
+def queue(reminders):
+    """Insert reminders, skipping occurrences already queued. Returns how many were new."""
+    if not reminders:
+        return 0
+    queued = set(
+        Reminder.objects.filter(key__in={r.key for r in reminders}).values_list('user_id', 'key')
+    )
+    fresh = {(r.user_id, r.key): r for r in reminders if (r.user_id, r.key) not in queued}
+    # A concurrent pass may insert the same occurrence — the unique
+    # constraint settles it
+    Reminder.objects.bulk_create(fresh.values(), ignore_conflicts=True)
+    return len(fresh)
+
+
+def queue_overdue_task(task):
+    """Called when a save makes a task overdue, so it is reminded like the rest."""
+    task = _open_tasks().filter(pk=task.pk).first()
+    if task is not None:
+        queue(task_reminders([task], ReminderKind.TASK_OVERDUE))
+
+
+# ── Scans ─────────────────────────────────────────────────────────────────────
+
+def flag_overdue_tasks(now, batch_size=500):
+    """
+    Set is_overdue on open tasks past their due date and clear it where it no
+    longer holds. Returns (flagged, cleared); newly overdue tasks are queued
+    for a reminder.
+    """
+    flagged = 0
+    for batch in keyset(_open_tasks().filter(is_overdue=False, due_at__lt=now), 'due_at', batch_size):
+        ProjectTask.objects.filter(pk__in=[t.pk for t in batch]).update(is_overdue=True)
+        queue(task_reminders(batch, ReminderKind.TASK_OVERDUE))
+        flagged += len(batch)
+
+    cleared = ProjectTask.objects.filter(is_overdue=True).exclude(
+        status__in=OPEN_TASK_STATUSES, due_at__lt=now,
+    ).update(is_overdue=False)
+    return flagged, cleared
+
+
+def scan_due_tasks(now, lead=DEFAULT_TASK_LEAD, batch_size=500):
+    """Queue reminders for open tasks falling due within `lead`."""
+    queued = 0
+    tasks  = _open_tasks().filter(due_at__gte=now, due_at__lt=now + lead)
+    for batch in keyset(tasks, 'due_at', batch_size):
+        queued += queue(task_reminders(batch, ReminderKind.TASK_DUE))
+    return queued
+
+
+def scan_installments(now, lead=DEFAULT_PAYMENT_LEAD, batch_size=500):
+    """Queue reminders for unpaid installments of approved quotations due within `lead` or overdue."""
+    today  = timezone.localdate(now)
+    queued = 0
+    for term in (1, 2):
+        due_field   = f'payment_term_{term}_due'
+        quotations  = (
+            Quotation.objects.filter(**{
+                'status':                       QuotationStatus.APPROVED,
+                f'payment_term_{term}_paid':    False,
+                f'payment_term_{term}__gt':     0,
+                f'{due_field}__lte':            today + lead,
+            })
+            .select_related('mice_project')
+            .only('pk', due_field, f'payment_term_{term}', 'mice_project',
+                  'mice_project__organizer', 'mice_project__client_company')
+        )
+        for batch in keyset(quotations, due_field, batch_size):
+            queued += queue([_installment_reminder(q, term, today) for q in batch])
+    return queued
+
+
+# ── Digests ───────────────────────────────────────────────────────────────────
+
+def _digest(user, reminders):
+    overdue = sum(r.kind in (ReminderKind.TASK_OVERDUE, ReminderKind.PAYMENT_OVERDUE) for r in reminders)
+    subject = f'{len(reminders)} reminder{"s" if len(reminders) != 1 else ""}'
+    if overdue:
+        subject += f', {overdue} overdue'
+    lines = [f'Hi {user.get_full_name() or user.username},', '']
+    for reminder in reminders:
+        when = timezone.localtime(reminder.due).strftime('%d %b %Y %H:%M')
+        lines.append(f'• [{reminder.get_kind_display()}] {reminder.message} — due {when}')
+    return f'[EventHub] {subject}', '\n'.join(lines)
+
+
+def send_digests(now=None):
+    """
+    Queue one digest email per user with unsent reminders in the outbox
+    (drain_outbox delivers it). Users without an email address have theirs
+    marked sent. Returns the number of digests queued.
+    """
+    now     = now or timezone.now()
+    pending = (
+        Reminder.objects.filter(sent_at__isnull=True)
+        .select_related('user')
+        .order_by('user_id', 'due', 'pk')
+    )
+    queued = 0
+    for _, group in groupby(pending.iterator(), key=lambda r: r.user_id):
+        group = list(group)
+        user  = group[0].user
+        with transaction.atomic():
+            if user.email:
+                subject, body = _digest(user, group)
+                enqueue(user.email, subject, body, kind='reminder_digest')
+                queued += 1
+            Reminder.objects.filter(pk__in=[r.pk for r in group]).update(sent_at=now)
+    return queued
+
+
+def run_pass(now=None, task_lead=DEFAULT_TASK_LEAD, payment_lead=DEFAULT_PAYMENT_LEAD,
+             batch_size=500, digest=True):
+    """One scheduler tick. Returns counts for the command's summary line."""
+    now = now or timezone.now()
+    flagged, cleared = flag_overdue_tasks(now, batch_size)
+    return {
+        'flagged':      flagged,
+        'cleared':      cleared,
+        'tasks_due':    scan_due_tasks(now, task_lead, batch_size),
+        'installments': scan_installments(now, payment_lead, batch_size),
+        'digests':      send_digests(now) if digest else 0,
+    }
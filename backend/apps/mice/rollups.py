@@ -0,0 +1,305 @@
+# =============================================================================
+# apps/mice/rollups.py
+# =============================================================================
+# Organizer-wide financial rollups (FinancialRollup), kept current
+# incrementally.
+#
+# Every quotation stores what it last contributed in rollup_snapshot.
+# sync_quotation() recomputes the contribution from the quotation's current
+# row and applies only the difference, as F() increments on the affected
+# rollup rows — a status change touches two rows, a totals change one or
+# two. Nothing ever rescans an organizer's quotations on the write path.
+#
+# The read side (pipeline, realized_margin, receivables_aging, top_clients)
+# is one GROUP BY each over a range of the (organizer, metric, period)
+# unique index.
+# =============================================================================
+
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import FinancialRollup, Quotation, QuotationStatus, RollupMetric
+
+KEY_FIELDS   = ('organizer_id', 'metric', 'period', 'status', 'client_company')
+MONEY_FIELDS = ('amount', 'net_margin', 'sodaqoh_amt')
+
+AGING_BUCKETS = [
+    'not_yet_due', 'due_this_month',
+    'overdue_1_month', 'overdue_2_months', 'overdue_3_plus_months',
+]
+
+
+# ── Contributions ─────────────────────────────────────────────────────────────
+
+def _month(value):
+    if isinstance(value, datetime.datetime):
+        value = timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+    return value.replace(day=1)
+
+
+def contributions(quotation):
+    """
+    The rollup entries one quotation accounts for, as JSON-ready dicts.
+    Reads quotation.mice_project for the organizer and client.
+    """
+    project = quotation.mice_project
+    entries = []
+
+    def add(metric, when, status='', amount=Decimal('0'), net_margin=Decimal('0'), sodaqoh_amt=Decimal('0')):
+        entries.append({
+            'organizer_id':     str(project.organizer_id),
+            'metric':           metric,
+            'period':           _month(when).isoformat(),
+            'status':           status,
+            'client_company':   project.client_company,
+            'quotation_count':  1,
+            'amount':           str(amount),
+            'net_margin':       str(net_margin),
+            'sodaqoh_amt':      str(sodaqoh_amt),
+        })
+
+    money = {
+        'amount':       quotation.total_after_tax,
+        'net_margin':   quotation.net_margin,
+        'sodaqoh_amt':  quotation.sodaqoh_amt,
+    }
+    if quotation.status != QuotationStatus.SUPERSEDED:
+        add(RollupMetric.PIPELINE, quotation.created_at, quotation.status, **money)
+
+    if quotation.status == QuotationStatus.APPROVED:
+        approved = quotation.approved_at or quotation.created_at
+        add(RollupMetric.REALIZED, approved, **money)
+        for term in (1, 2):
+            amount = getattr(quotation, f'payment_term_{term}')
+            if amount > 0 and not getattr(quotation, f'payment_term_{term}_paid'):
+                due = getattr(quotation, f'payment_term_{term}_due') or approved
+                add(RollupMetric.RECEIVABLE, due, f'term_{term}', amount=amount)
+    return entries
+
+
+# ── Applying deltas ───────────────────────────────────────────────────────────
+
+def _deltas(old_entries, new_entries):
+    """Net change per rollup key; keys whose contribution is unchanged are dropped."""
+    deltas = defaultdict(lambda: {'quotation_count': 0, **dict.fromkeys(MONEY_FIELDS, Decimal('0'))})
+    for sign, entries in ((-1, old_entries), (1, new_entries)):
+        for entry in entries:
+            delta = deltas[tuple(entry[k] for k in KEY_FIELDS)]
+            delta['quotation_count'] += sign * entry['quotation_count']
+            for field in MONEY_FIELDS:
+                delta[field] += sign * Decimal(entry[field])
+    return {key: delta for key, delta in deltas.items() if any(delta.values())}
+
+
+def _increment(key, delta):
+    lookup = dict(zip(KEY_FIELDS, key))
+    lookup['period'] = datetime.date.fromisoformat(lookup['period'])
+    rows   = FinancialRollup.objects.filter(**lookup)
+    change = {field: F(field) + value for field, value in delta.items()}
+    change['updated_at'] = timezone.now()
+
+    if not rows.update(**change):
+        try:
+            with transaction.atomic():
+                FinancialRollup.objects.create(**lookup, **delta)
+        except IntegrityError:
+            # A concurrent writer created the row first
+            rows.update(**change)
+    if delta['quotation_count'] < 0:
+        rows.filter(quotation_count__lte=0).delete()
+
+
+def _apply(old_entries, new_entries):
+    deltas = _deltas(old_entries, new_entries)
+    for key, delta in deltas.items():
+        _increment(key, delta)
+    return len(deltas)
+
+
+def sync_quotation(quotation_id):
+    """
+    Re-derive one quotation's contribution and apply the difference.
+    The quotation row is locked so concurrent syncs of the same quotation
+    serialise on it; rollup rows only ever receive relative increments.
+    Returns the number of rollup keys touched.
+    """
+    with transaction.atomic():
+        quotation = (
+            Quotation.objects.select_for_update(of=('self',))
+            .select_related('mice_project')
+            .filter(pk=quotation_id).first()
+        )
+        if quotation is None:
+            return 0
+        entries = contributions(quotation)
+        touched = _apply(quotation.rollup_snapshot or [], entries)
+        if entries != quotation.rollup_snapshot:
+            Quotation.objects.filter(pk=quotation_id).update(rollup_snapshot=entries)
+        return touched
+
+
+def retract_quotations(quotation_ids):
+    """Withdraw the contributions of quotations about to be deleted."""
+    with transaction.atomic():
+        snapshots = (
+            Quotation.objects.select_for_update()
+            .filter(pk__in=list(quotation_ids))
+            .values_list('rollup_snapshot', flat=True)
+        )
+        for snapshot in snapshots:
+            _apply(snapshot or [], [])
+
+
+def rebuild_rollups(organizer=None, batch_size=1000):
+    """
+    Recompute rollups (and every quotation snapshot) from scratch —
+    for backfills and after cascade deletes that bypass Quotation.delete().
+    Returns the number of rollup rows written.
+    """
+    quotations = Quotation.objects.select_related('mice_project').order_by('pk')
+    rollups    = FinancialRollup.objects.all()
+    if organizer is not None:
+        quotations = quotations.filter(mice_project__organizer=organizer)
+        rollups    = rollups.filter(organizer=organizer)
+
+    with transaction.atomic():
+        rollups.delete()
+        totals  = {}
+        pending = []
+        for quotation in quotations.iterator(chunk_size=batch_size):
+            quotation.rollup_snapshot = contributions(quotation)
+            pending.append(quotation)
+            for key, delta in _deltas([], quotation.rollup_snapshot).items():
+                row = totals.setdefault(key, dict.fromkeys(delta, 0))
+                for field, value in delta.items():
+                    row[field] += value
+            if len(pending) >= batch_size:
+                Quotation.objects.bulk_update(pending, ['rollup_snapshot'])
+                pending = []
+        if pending:
+            Quotation.objects.bulk_update(pending, ['rollup_snapshot'])
+
+        FinancialRollup.objects.bulk_create(
+            [
+                FinancialRollup(
+                    organizer_id    = key[0],
+                    metric          = key[1],
+                    period          = datetime.date.fromisoformat(key[2]),
+                    status          = key[3],
+                    client_company  = key[4],
+                    **values,
+                )
+                for key, values in totals.items()
+            ],
+            batch_size=batch_size,
+        )
+    return len(totals)
+
+
+# ── Analytics queries ─────────────────────────────────────────────────────────
+
+def _scope(organizer, metric, start=None, end=None):
+    qs = FinancialRollup.objects.filter(organizer=organizer, metric=metric)
+    if start is not None:
+        qs = qs.filter(period__gte=_month(start))
+    if end is not None:
+        qs = qs.filter(period__lte=_month(end))
+    return qs
+
+
+def _totals(qs, *group_by):
+    return qs.values(*group_by).annotate(
+        quotations  = Sum('quotation_count'),
+        total       = Sum('amount'),
+        margin      = Sum('net_margin'),
+        sodaqoh     = Sum('sodaqoh_amt'),
+    ).order_by(*group_by)
+
+
+def _money(value):
+    return str(Decimal(value or 0).quantize(Decimal('0.01')))
+
+
+def _margin_pct(margin, total):
+    margin, total = Decimal(margin or 0), Decimal(total or 0)
+    return str((margin / total).quantize(Decimal('0.0001'))) if total > 0 else '0.0000'
+
+
+def pipeline(organizer, start=None, end=None):
+    """Quotation count and value per status, for quotations created in range."""
+    return [
+        {
+            'status':       row['status'],
+            'quotations':   row['quotations'],
+            'total':        _money(row['total']),
+            'net_margin':   _money(row['margin']),
+        }
+        for row in _totals(_scope(organizer, RollupMetric.PIPELINE, start, end), 'status')
+    ]
+
+
+def realized_margin(organizer, start=None, end=None):
+    """Approved revenue and net margin per approval month."""
+    return [
+        {
+            'period':       row['period'].strftime('%Y-%m'),
+            'quotations':   row['quotations'],
+            'total':        _money(row['total']),
+            'net_margin':   _money(row['margin']),
+            'sodaqoh_amt':  _money(row['sodaqoh']),
+            'margin_pct':   _margin_pct(row['margin'], row['total']),
+        }
+        for row in _totals(_scope(organizer, RollupMetric.REALIZED, start, end), 'period')
+    ]
+
+
+def receivables_aging(organizer, today=None):
+    """
+    Outstanding payment terms bucketed by how many months past due they
+    are, at month granularity.
+    """
+    current = _month(today or timezone.localdate())
+    buckets = {
+        name: {'bucket': name, 'terms': 0, 'outstanding': Decimal('0')}
+        for name in AGING_BUCKETS
+    }
+    for row in _totals(_scope(organizer, RollupMetric.RECEIVABLE), 'period'):
+        age = (current.year - row['period'].year) * 12 + current.month - row['period'].month
+        name = AGING_BUCKETS[max(min(age, 3), -1) + 1]
+        buckets[name]['terms']       += row['quotations']
+        buckets[name]['outstanding'] += Decimal(row['total'] or 0)
+
+    result = list(buckets.values())
+    for bucket in result:
+        bucket['outstanding'] = _money(bucket['outstanding'])
+    return result
+
+
+def top_clients(organizer, start=None, end=None, basis=RollupMetric.REALIZED, limit=10):
+    """
+    Clients ranked by value. basis='realized' ranks approved business by
+    approval month; basis='pipeline' ranks open quotations (draft / sent)
+    by creation month.
+    """
+    qs = _scope(organizer, basis, start, end)
+    if basis == RollupMetric.PIPELINE:
+        qs = qs.filter(status__in=[QuotationStatus.DRAFT, QuotationStatus.SENT])
+    rows = qs.values('client_company').annotate(
+        quotations  = Sum('quotation_count'),
+        total       = Sum('amount'),
+        margin      = Sum('net_margin'),
+    ).order_by('-total', 'client_company')[:limit]
+    return [
+        {
+            'client_company':   row['client_company'],
+            'quotations':       row['quotations'],
+            'total':            _money(row['total']),
+            'net_margin':       _money(row['margin']),
+        }
+        for row in rows
+    ]
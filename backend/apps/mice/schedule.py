@@ -0,0 +1,341 @@
+# =============================================================================
+# apps/mice/schedule.py
+# =============================================================================
+# Critical-path scheduling of a project's tasks over their dependency DAG
+# (TaskDependency: finish-to-start edges with an optional lag).
+#
+#   forward   — ES = max(start_at or today, EF(pred) + lag), EF = ES + duration;
+#               done tasks are pinned to their completion time
+#   backward  — LF = min(LS(succ) - lag), or the project finish for sinks;
+#               LS = LF - duration
+#   slack     — LF - EF; open tasks with no slack form the critical path
+#
+# A Schedule is built from one load of the project's tasks and edges and
+# kept in the cache. Task and edge changes (ProjectTask.save/delete/complete,
+# TaskDependency.link/delete) are applied on commit as incremental passes:
+# forward over the changed task's descendants, backward over its ancestors —
+# and only over the whole graph when the project finish moves. Reads check a
+# one-query fingerprint of the project's tasks and edges, so writes that
+# bypass the hooks (bulk updates, raw SQL) cause a rebuild, never a stale
+# Gantt chart.
+# =============================================================================
+
+import datetime
+from collections import deque
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from .models import MICEProject, ProjectTask, TaskDependency, TaskStatus
+
+CACHE_TIMEOUT = 24 * 60 * 60
+ZERO          = datetime.timedelta(0)
+
+
+class CycleError(ValueError):
+    """The stored dependency edges of a project form a cycle."""
+
+
+def _cache_key(project_id):
+    return f'mice:schedule:{project_id}'
+
+
+def _anchor():
+    """Open tasks without a start date start no earlier than today."""
+    return timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def fingerprint(project_id):
+    """Cheap summary of everything a schedule depends on — one aggregate query."""
+    row = MICEProject.objects.filter(pk=project_id).aggregate(
+        task_count=Count('tasks', distinct=True),
+        task_touched=Max('tasks__updated_at'),
+        edge_count=Count('tasks__predecessor_links', distinct=True),
+        edge_last=Max('tasks__predecessor_links__id'),
+    )
+    return (
+        row['task_count'], row['task_touched'], row['edge_count'], row['edge_last'],
+        _anchor().date(),
+    )
+
+
+# ── Graph ─────────────────────────────────────────────────────────────────────
+
+def _topological(nodes, succ, pred):
+    """Kahn's algorithm. Raises CycleError naming the tasks left on a cycle."""
+    indegree = {n: len(pred[n]) for n in nodes}
+    queue    = deque(sorted((n for n, d in indegree.items() if not d), key=lambda n: nodes[n]['title']))
+    order    = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for nxt in succ[node]:
+            indegree[nxt] -= 1
+            if not indegree[nxt]:
+                queue.append(nxt)
+    if len(order) != len(nodes):
+        stuck = [nodes[n]['title'] for n, d in indegree.items() if d]
+        raise CycleError('Task dependencies form a cycle: ' + ', '.join(sorted(stuck)))
+    return order
+
+
+def _find_path(succ, start, goal):
+    """Task ids from `start` to `goal` following edges, or None."""
+    parents = {start: None}
+    queue   = deque([start])
+    while queue:
+        node = queue.popleft()
+        if node == goal:
+            path = []
+            while node is not None:
+                path.append(node)
+                node = parents[node]
+            return path[::-1]
+        for nxt in succ.get(node, ()):
+            if nxt not in parents:
+                parents[nxt] = node
+                queue.append(nxt)
+    return None
+
+
+def _load_edges(project_id):
+    return list(
+        TaskDependency.objects.filter(successor__mice_project_id=project_id)
+        .values_list('predecessor_id', 'successor_id', 'lag')
+    )
+
+
+def would_cycle(project_id, predecessor_id, successor_id):
+    """
+    Titles along the existing path successor → … → predecessor that a new
+    predecessor → successor edge would close into a cycle, or None.
+    """
+    succ = {}
+    for p, s, _ in _load_edges(project_id):
+        succ.setdefault(p, []).append(s)
+    path = _find_path(succ, successor_id, predecessor_id)
+    if path is None:
+        return None
+    titles = dict(ProjectTask.objects.filter(pk__in=path).values_list('pk', 'title'))
+    return [titles[t] for t in path] + [titles[successor_id]]
+
+
+# ── Schedule ──────────────────────────────────────────────────────────────────
+
+class Schedule:
+    """In-memory task graph of one project with its critical-path times."""
+
+    def __init__(self, project_id, tasks, edges, anchor):
+        self.project_id  = project_id
+        self.anchor      = anchor
+        self.fingerprint = None
+        self.nodes       = {t['id']: t for t in tasks}
+        self.succ        = {n: {} for n in self.nodes}     # task → {successor: lag}
+        self.pred        = {n: {} for n in self.nodes}     # task → {predecessor: lag}
+        for p, s, lag in edges:
+            if p in self.nodes and s in self.nodes:
+                self.succ[p][s] = lag
+                self.pred[s][p] = lag
+        self.es, self.ef, self.ls, self.lf = {}, {}, {}, {}
+        self.finish = None
+        self._reorder()
+        self._forward(self.order)
+        self._backward(self.order)
+
+    @classmethod
+    def load(cls, project_id):
+        tasks = list(
+            ProjectTask.objects.filter(mice_project_id=project_id)
+            .values('id', 'title', 'status', 'start_at', 'duration', 'completed_at')
+        )
+        return cls(project_id, tasks, _load_edges(project_id), _anchor())
+
+    def _reorder(self):
+        self.order    = _topological(self.nodes, self.succ, self.pred)
+        self.position = {n: i for i, n in enumerate(self.order)}
+
+    # ── Passes ────────────────────────────────────────────────────────────
+
+    def _times(self, node):
+        task = self.nodes[node]
+        if task['status'] == TaskStatus.DONE and task['completed_at']:
+            return task['completed_at'] - task['duration'], task['completed_at']
+        start = task['start_at'] or self.anchor
+        for p, lag in self.pred[node].items():
+            start = max(start, self.ef[p] + lag)
+        return start, start + task['duration']
+
+    def _forward(self, nodes):
+        """Recompute ES/EF for `nodes` (in topological order) and everything downstream that moves."""
+        dirty = set(nodes)
+        for node in self.order[min((self.position[n] for n in dirty), default=len(self.order)):]:
+            if node not in dirty:
+                continue
+            times = self._times(node)
+            if times != (self.es.get(node), self.ef.get(node)):
+                self.es[node], self.ef[node] = times
+                dirty.update(self.succ[node])
+        finish = max(self.ef.values(), default=None)
+        moved, self.finish = finish != self.finish, finish
+        return moved
+
+    def _late(self, node):
+        finish = self.lf[node] = min(
+            (self.ls[s] - lag for s, lag in self.succ[node].items()), default=self.finish,
+        )
+        self.ls[node] = finish - self.nodes[node]['duration']
+
+    def _backward(self, nodes):
+        """Recompute LS/LF for `nodes` and every ancestor whose late times move."""
+        dirty = set(nodes)
+        start = max((self.position[n] for n in dirty), default=-1)
+        for node in reversed(self.order[:start + 1]):
+            if node not in dirty:
+                continue
+            before = self.ls.get(node)
+            self._late(node)
+            if self.ls[node] != before:
+                dirty.update(self.pred[node])
+
+    def _update(self, forward, backward):
+        if self._forward(sorted(forward, key=self.position.get)):
+            self._backward(self.order)
+        else:
+            self._backward(backward)
+
+    # ── Incremental changes ───────────────────────────────────────────────
+
+    def set_task(self, task):
+        """Insert or replace one task (a dict like load() reads)."""
+        node  = task['id']
+        added = node not in self.nodes
+        self.nodes[node] = task
+        if added:
+            self.succ[node], self.pred[node] = {}, {}
+            self.order.append(node)
+            self.position[node] = len(self.order) - 1
+        self._update([node], [node])
+
+    def remove_task(self, node):
+        if node not in self.nodes:
+            return
+        preds = list(self.pred[node])
+        succs = list(self.succ[node])
+        for p in preds:
+            del self.succ[p][node]
+        for s in succs:
+            del self.pred[s][node]
+        for table in (self.nodes, self.succ, self.pred, self.es, self.ef, self.ls, self.lf):
+            del table[node]
+        self.order.remove(node)
+        self.position = {n: i for i, n in enumerate(self.order)}
+        self._update(succs, preds)
+
+    def set_edge(self, predecessor, successor, lag):
+        """Add, change (`lag`) or remove (`lag` None) one edge."""
+        if predecessor not in self.nodes or successor not in self.nodes:
+            return
+        if lag is None:
+            self.succ[predecessor].pop(successor, None)
+            self.pred[successor].pop(predecessor, None)
+        else:
+            self.succ[predecessor][successor] = lag
+            self.pred[successor][predecessor] = lag
+            if self.position[predecessor] > self.position[successor]:
+                self._reorder()
+        self._update([successor], [predecessor])
+
+    # ── Output ────────────────────────────────────────────────────────────
+
+    def slack(self, node):
+        return self.lf[node] - self.ef[node]
+
+    def is_critical(self, node):
+        return self.nodes[node]['status'] != TaskStatus.DONE and self.slack(node) <= ZERO
+
+    def critical_path(self):
+        """Critical task ids in start order."""
+        critical = [n for n in self.order if self.is_critical(n)]
+        return sorted(critical, key=lambda n: (self.es[n], self.position[n]))
+
+    def rows(self):
+        return [
+            {
+                'id':           str(node),
+                'title':        self.nodes[node]['title'],
+                'status':       self.nodes[node]['status'],
+                'duration':     self.nodes[node]['duration'],
+                'es':           self.es[node],
+                'ef':           self.ef[node],
+                'ls':           self.ls[node],
+                'lf':           self.lf[node],
+                'slack':        self.slack(node),
+                'critical':     self.is_critical(node),
+                'predecessors': [
+                    {'id': str(p), 'lag': lag} for p, lag in self.pred[node].items()
+                ],
+            }
+            for node in sorted(self.order, key=lambda n: (self.es[n], self.position[n]))
+        ]
+
+
+# ── Cache ─────────────────────────────────────────────────────────────────────
+
+def get_schedule(project_id):
+    """The project's Schedule — from cache when its fingerprint still matches."""
+    current  = fingerprint(project_id)
+    schedule = cache.get(_cache_key(project_id))
+    if schedule is None or schedule.fingerprint != current:
+        schedule = Schedule.load(project_id)
+        schedule.fingerprint = current
+        cache.set(_cache_key(project_id), schedule, CACHE_TIMEOUT)
+    return schedule
+
+
+def _apply(project_id, change):
+    schedule = cache.get(_cache_key(project_id))
+    if schedule is None:
+        return
+    try:
+        change(schedule)
+    except CycleError:
+        cache.delete(_cache_key(project_id))
+        return
+    schedule.fingerprint = fingerprint(project_id)
+    cache.set(_cache_key(project_id), schedule, CACHE_TIMEOUT)
+
+
+def task_changed(project_id, task_id, removed=False):
+    """Apply one task's new scheduling fields (or its deletion) to the cached schedule."""
+    if removed:
+        _apply(project_id, lambda schedule: schedule.remove_task(task_id))
+        return
+    task = (
+        ProjectTask.objects.filter(pk=task_id)
+        .values('id', 'title', 'status', 'start_at', 'duration', 'completed_at')
+        .first()
+    )
+    if task is None:
+        _apply(project_id, lambda schedule: schedule.remove_task(task_id))
+    else:
+        _apply(project_id, lambda schedule: schedule.set_task(task))
+
+
+def edge_changed(project_id, predecessor_id, successor_id, lag=None):
+    """Apply one added, changed or (lag None) removed edge to the cached schedule."""
+    _apply(project_id, lambda schedule: schedule.set_edge(predecessor_id, successor_id, lag))
+
+
+def gantt(project):
+    """Gantt payload: per-task ES/EF/LS/LF and slack, project finish and event slack."""
+    schedule = get_schedule(project.pk)
+    event_start = project.event.start_date if project.event_id else None
+    return {
+        'anchor':           schedule.anchor,
+        'finish':           schedule.finish,
+        'event_start':      event_start,
+        'event_slack':      event_start - schedule.finish if event_start and schedule.finish else None,
+        'critical_path':    [str(n) for n in schedule.critical_path()],
+        'tasks':            schedule.rows(),
+    }
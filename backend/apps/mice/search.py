@@ -0,0 +1,255 @@
+# =============================================================================
+# apps/mice/search.py
+# =============================================================================
+# Per-keystroke autocomplete for vendors and past line items.
+#
+# Two stages, both scoped to the organizer:
+#   1. prefix  — a half-open range on the normalized key column (name_key /
+#                item_key); any b-tree serves it
+#   2. fuzzy   — only while fewer than `limit` candidates were found and
+#                time remains. On PostgreSQL this is the pg_trgm `%` operator
+#                on a GIN trigram index (migration 0005); elsewhere a
+#                substring match on the same normalized key
+#
+# Candidates are ranked in Python by trigram similarity (the pg_trgm
+# definition) plus a recency bonus. The whole lookup runs under a hard
+# budget — on PostgreSQL the fuzzy query gets the remaining time as its
+# statement_timeout — and answers are kept in a small per-user LRU.
+# =============================================================================
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+from .models import QuotationLineItem, Vendor, normalize_item_name
+
+CANDIDATES      = 200     # rows fetched per stage before ranking
+MIN_SIMILARITY  = 0.2
+RECENCY_WEIGHT  = 0.2
+PREFIX_BONUS    = 0.3
+
+
+def _budget_ms():
+    return getattr(settings, 'MICE_AUTOCOMPLETE_BUDGET_MS', 50)
+
+
+# ── Trigram similarity (same definition as pg_trgm) ──────────────────────────
+
+def trigrams(text):
+    grams = set()
+    for word in normalize_item_name(text).split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(a, b):
+    ta, tb = trigrams(a), trigrams(b)
+    if not ta or not tb:
+        return 0.0
+    return len(ta & tb) / len(ta | tb)
+
+
+def _score(query_key, key, seen_at, now):
+    score = similarity(query_key, key)
+    if key.startswith(query_key):
+        score = min(1.0, score + PREFIX_BONUS)
+    age_days = max((now - seen_at).total_seconds(), 0) / 86400 if seen_at else 365
+    return score * (1 - RECENCY_WEIGHT) + RECENCY_WEIGHT / (1 + age_days / 30)
+
+
+# ── Per-user LRU ──────────────────────────────────────────────────────────────
+
+class UserLRU:
+    """
+    Tiny in-process LRU of recent lookups: `per_user` answers for each of
+    the `max_users` most recent users, each valid for `ttl` seconds.
+    """
+
+    def __init__(self, per_user=32, max_users=1024, ttl=30):
+        self.per_user   = per_user
+        self.max_users  = max_users
+        self.ttl        = ttl
+        self._users     = OrderedDict()
+        self._lock      = threading.Lock()
+
+    def get(self, user_id, key):
+        with self._lock:
+            entries = self._users.get(user_id)
+            if entries is None or key not in entries:
+                return None
+            expires, value = entries[key]
+            if expires < time.monotonic():
+                del entries[key]
+                return None
+            entries.move_to_end(key)
+            self._users.move_to_end(user_id)
+            return value
+
+    def put(self, user_id, key, value):
+        with self._lock:
+            entries = self._users.setdefault(user_id, OrderedDict())
+            self._users.move_to_end(user_id)
+            entries[key] = (time.monotonic() + self.ttl, value)
+            entries.move_to_end(key)
+            while len(entries) > self.per_user:
+                entries.popitem(last=False)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+
+    def clear(self, user_id):
+        with self._lock:
+            self._users.pop(user_id, None)
+
+
+recent_lookups = UserLRU()
+
+
+# ── Stages ────────────────────────────────────────────────────────────────────
+
+def _prefix(qs, column, key):
+    return qs.filter(**{f'{column}__gte': key, f'{column}__lt': key + '\uffff'})
+
+
+def _fuzzy(qs, table, column, key, remaining_ms):
+    """
+    Trigram candidates. Returns None if the budget ran out first.
+    """
+    if remaining_ms <= 0:
+        return None
+    if connection.vendor != 'postgresql':
+        return list(qs.filter(**{f'{column}__contains': key})[:CANDIDATES])
+
+    # `%%` reaches the driver as the pg_trgm similarity operator
+    match = RawSQL(f'"{table}"."{column}" %% %s', [key], output_field=BooleanField())
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute('SET LOCAL statement_timeout = %s', [max(int(remaining_ms), 1)])
+            rows = list(qs.filter(match)[:CANDIDATES])
+            # SET LOCAL outlives the savepoint inside an outer transaction
+            cursor.execute('SET LOCAL statement_timeout = DEFAULT')
+            return rows
+    except DatabaseError:
+        return None
+
+
+def _run(qs, table, column, key, limit, started):
+    """Both stages under the budget → (rows, partial)."""
+    rows = list(_prefix(qs, column, key)[:CANDIDATES])
+    if len(rows) >= limit:
+        return rows, False
+
+    remaining = _budget_ms() - (time.monotonic() - started) * 1000
+    fuzzy = _fuzzy(qs, table, column, key, remaining)
+    if fuzzy is None:
+        return rows, True
+    seen = {r['pk'] for r in rows}
+    rows.extend(r for r in fuzzy if r['pk'] not in seen)
+    return rows, False
+
+
+def _lookup(kind, user, query, limit, search):
+    key = normalize_item_name(query)
+    if not key:
+        return {'results': [], 'partial': False}
+
+    cache_key = (kind, key, limit)
+    cached = recent_lookups.get(user.pk, cache_key)
+    if cached is not None:
+        return cached
+
+    results, partial = search(key, time.monotonic())
+    answer = {'results': results, 'partial': partial}
+    if not partial:
+        recent_lookups.put(user.pk, cache_key, answer)
+    return answer
+
+
+# ── Public API ────────────────────────────────────────────────────────────────
+
+def autocomplete_vendors(user, query, limit=10):
+    """Top-k of the user's active vendors by name similarity and recency."""
+    def search(key, started):
+        qs = Vendor.objects.filter(created_by=user, is_active=True).order_by('-updated_at').values(
+            'pk', 'name', 'name_key', 'category', 'default_rate', 'default_rate_unit', 'updated_at',
+        )
+        rows, partial = _run(qs, Vendor._meta.db_table, 'name_key', key, limit, started)
+        now = timezone.now()
+        scored = [
+            (_score(key, r['name_key'], r['updated_at'], now), r) for r in rows
+            if key in r['name_key'] or similarity(key, r['name_key']) >= MIN_SIMILARITY
+        ]
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        return [
+            {
+                'id':                   str(r['pk']),
+                'name':                 r['name'],
+                'category':             r['category'],
+                'default_rate':         r['default_rate'],
+                'default_rate_unit':    r['default_rate_unit'],
+                'score':                round(score, 4),
+            }
+            for score, r in scored[:limit]
+        ], partial
+
+    return _lookup('vendor', user, query, limit, search)
+
+
+def autocomplete_line_items(user, query, limit=10):
+    """
+    Past line items of the organizer matching `query`, one result per
+    distinct (item, detail, vendor) at its most recent price.
+    """
+    def search(key, started):
+        qs = QuotationLineItem.objects.filter(
+            section__quotation__mice_project__organizer=user,
+        ).order_by('-created_at').values(
+            'pk', 'item_name', 'item_key', 'detail', 'vendor_id', 'vendor__name',
+            'qty', 'vol_unit', 'duration', 'dur_unit', 'modal_price', 'margin_pct',
+            'created_at',
+        )
+        rows, partial = _run(qs, QuotationLineItem._meta.db_table, 'item_key', key, limit, started)
+
+        # Newest first, so the first row of each group is its latest use
+        groups = OrderedDict()
+        for r in sorted(rows, key=lambda r: r['created_at'], reverse=True):
+            group = (r['item_key'], normalize_item_name(r['detail']), r['vendor_id'])
+            if group in groups:
+                groups[group]['uses'] += 1
+            else:
+                groups[group] = {'row': r, 'uses': 1}
+
+        now = timezone.now()
+        scored = []
+        for group in groups.values():
+            r = group['row']
+            if not (key in r['item_key'] or similarity(key, r['item_key']) >= MIN_SIMILARITY):
+                continue
+            scored.append((_score(key, r['item_key'], r['created_at'], now), group))
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        return [
+            {
+                'item_name':    g['row']['item_name'],
+                'detail':       g['row']['detail'],
+                'vendor':       str(g['row']['vendor_id']) if g['row']['vendor_id'] else None,
+                'vendor_name':  g['row']['vendor__name'],
+                'qty':          g['row']['qty'],
+                'vol_unit':     g['row']['vol_unit'],
+                'duration':     g['row']['duration'],
+                'dur_unit':     g['row']['dur_unit'],
+                'modal_price':  g['row']['modal_price'],
+                'margin_pct':   g['row']['margin_pct'],
+                'last_used_at': g['row']['created_at'],
+                'uses':         g['uses'],
+                'score':        round(score, 4),
+            }
+            for score, g in scored[:limit]
+        ], partial
+
+    return _lookup('line_item', user, query, limit, search)
@@ -11,9 +11,11 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import (
     MICEProject, SubEvent, Quotation, QuotationSection,
-    QuotationLineItem, ProjectTask, ProjectAsset, Vendor,
-    ProjectStatus, QuotationStatus,
+    QuotationLineItem, ProjectTask, TaskDependency, ProjectAsset, Vendor, VendorPriceIndex,
+    AssetUpload,
+    ProjectStatus, QuotationStatus, VendorCategory,
 )
+from .media import CLIENT, ORGANIZER, asset_media_url, preview_urls
 
 User = get_user_model()
 
@@ -38,6 +40,18 @@ class VendorSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class VendorRateSerializer(serializers.ModelSerializer):
+    """Rate suggestion from VendorPriceIndex. vendor is null for category-wide rows."""
+    vendor_name = serializers.CharField(source='vendor.name', read_only=True, default=None)
+
+    class Meta:
+        model   = VendorPriceIndex
+        fields  = [
+            'vendor', 'vendor_name', 'category', 'item_name', 'vol_unit',
+            'sample_count', 'p25', 'median', 'p75', 'last_price', 'last_seen_at',
+        ]
+
+
 # ── QuotationLineItem — ORGANIZER view (full pricing) ─────────────────────────
 
 class LineItemOrganizerSerializer(serializers.ModelSerializer):
@@ -94,6 +108,55 @@ class LineItemCreateSerializer(serializers.ModelSerializer):
         return value
 
 
+class LineItemBatchRowSerializer(LineItemCreateSerializer):
+    """
+    One row of a batch edit. section/vendor are plain UUIDs here — the view
+    resolves them against rows it has already loaded, so validating a
+    500-row grid paste costs no per-row lookups.
+    """
+    id      = serializers.UUIDField(required=False)
+    section = serializers.UUIDField(source='section_id', required=False)
+    vendor  = serializers.UUIDField(source='vendor_id', required=False, allow_null=True)
+
+
+class LineItemBatchSerializer(serializers.Serializer):
+    """
+    PATCH /api/v1/mice/quotations/{id}/line-items/
+    { "update": [{"id": …, <changed fields>}], "create": [{…}], "delete": [ids] }
+    """
+    update  = serializers.ListField(child=serializers.DictField(), required=False, default=list)
+    create  = serializers.ListField(child=serializers.DictField(), required=False, default=list)
+    delete  = serializers.ListField(child=serializers.UUIDField(), required=False, default=list)
+
+    def validate_update(self, rows):
+        serializer = LineItemBatchRowSerializer(data=rows, many=True, partial=True)
+        serializer.is_valid(raise_exception=True)
+        validated = serializer.validated_data
+        for row in validated:
+            if 'id' not in row:
+                raise serializers.ValidationError('Every updated row needs an id')
+        ids = [row['id'] for row in validated]
+        if len(set(ids)) != len(ids):
+            raise serializers.ValidationError('Duplicate ids in update')
+        return validated
+
+    def validate_create(self, rows):
+        serializer = LineItemBatchRowSerializer(data=rows, many=True)
+        serializer.is_valid(raise_exception=True)
+        for row in serializer.validated_data:
+            if 'section_id' not in row:
+                raise serializers.ValidationError('Every created row needs a section')
+        return serializer.validated_data
+
+    def validate(self, data):
+        if not (data['update'] or data['create'] or data['delete']):
+            raise serializers.ValidationError('Nothing to do')
+        overlap = {row['id'] for row in data['update']} & set(data['delete'])
+        if overlap:
+            raise serializers.ValidationError('Rows cannot be updated and deleted in one batch')
+        return data
+
+
 # ── QuotationLineItem — CLIENT view (prices only, no margins) ─────────────────
 
 class LineItemClientSerializer(serializers.ModelSerializer):
@@ -307,6 +370,48 @@ class QuotationCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class PricingScenarioSerializer(serializers.Serializer):
+    """One what-if scenario. Omitted parameters keep the quotation's values."""
+    name                = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    fee_management_pct  = serializers.DecimalField(max_digits=5, decimal_places=4, min_value=0, max_value=1, required=False)
+    ppn_pct             = serializers.DecimalField(max_digits=5, decimal_places=4, min_value=0, max_value=1, required=False)
+    pph_vendor_pct      = serializers.DecimalField(max_digits=5, decimal_places=4, min_value=0, max_value=1, required=False)
+    sodaqoh_pct         = serializers.DecimalField(max_digits=5, decimal_places=4, min_value=0, max_value=1, required=False)
+    margin_pct          = serializers.DecimalField(max_digits=5, decimal_places=4, min_value=0, max_value=10, required=False)
+    section_margins     = serializers.DictField(
+        child=serializers.DecimalField(max_digits=5, decimal_places=4, min_value=0, max_value=10),
+        required=False,
+    )
+    category_margins    = serializers.DictField(
+        child=serializers.DecimalField(max_digits=5, decimal_places=4, min_value=0, max_value=10),
+        required=False,
+    )
+
+    def validate_category_margins(self, value):
+        unknown = set(value) - set(VendorCategory.values)
+        if unknown:
+            raise serializers.ValidationError(
+                f'Unknown vendor categories: {", ".join(sorted(unknown))}'
+            )
+        return value
+
+
+class PricingSimulationSerializer(serializers.Serializer):
+    """POST /api/v1/mice/quotations/{id}/simulate/"""
+    MAX_SCENARIOS = 200
+
+    scenarios = PricingScenarioSerializer(many=True)
+
+    def validate_scenarios(self, value):
+        if not value:
+            raise serializers.ValidationError('At least one scenario is required')
+        if len(value) > self.MAX_SCENARIOS:
+            raise serializers.ValidationError(
+                f'At most {self.MAX_SCENARIOS} scenarios per request'
+            )
+        return value
+
+
 # ── SubEvent ──────────────────────────────────────────────────────────────────
 
 class SubEventSerializer(serializers.ModelSerializer):
@@ -318,10 +423,10 @@ class SubEventSerializer(serializers.ModelSerializer):
             'venue_name', 'venue_address',
             'start_datetime', 'end_datetime',
             'capacity', 'sort_order', 'is_active',
-            'ticket_tier_id',
+            'ticket_tier_id', 'attended_count',
             'created_at',
         ]
-        read_only_fields = ['id', 'ticket_tier_id', 'created_at']
+        read_only_fields = ['id', 'ticket_tier_id', 'attended_count', 'created_at']
 
 
 # ── ProjectTask ───────────────────────────────────────────────────────────────
@@ -331,7 +436,6 @@ class ProjectTaskSerializer(serializers.ModelSerializer):
         source='assigned_to.get_full_name', read_only=True, default=None
     )
     status_display      = serializers.CharField(source='get_status_display', read_only=True)
-    is_overdue          = serializers.SerializerMethodField()
 
     class Meta:
         model   = ProjectTask
@@ -339,18 +443,34 @@ class ProjectTaskSerializer(serializers.ModelSerializer):
             'id', 'title', 'description',
             'status', 'status_display', 'priority',
             'assigned_to', 'assigned_to_name',
-            'sub_event', 'due_at', 'completed_at',
+            'sub_event', 'start_at', 'duration', 'due_at', 'completed_at',
             'sort_order', 'is_overdue', 'created_at',
         ]
-        read_only_fields = ['id', 'completed_at', 'created_at']
+        # is_overdue is persisted — kept current by save() and the reminder scheduler
+        read_only_fields = ['id', 'completed_at', 'is_overdue', 'created_at']
 
-    def get_is_overdue(self, obj):
-        from django.utils import timezone
-        return (
-            obj.due_at is not None
-            and obj.due_at < timezone.now()
-            and obj.status not in ('done',)
-        )
+
+class BoardTaskSerializer(ProjectTaskSerializer):
+    """Task card on the cross-project board — says which project it belongs to."""
+    project_name        = serializers.CharField(source='mice_project.client_company', read_only=True)
+
+    class Meta(ProjectTaskSerializer.Meta):
+        fields = ProjectTaskSerializer.Meta.fields + ['mice_project', 'project_name']
+
+
+class TaskDependencySerializer(serializers.ModelSerializer):
+    predecessor_title   = serializers.CharField(source='predecessor.title', read_only=True)
+    successor_title     = serializers.CharField(source='successor.title', read_only=True)
+
+    class Meta:
+        model   = TaskDependency
+        fields  = [
+            'id', 'predecessor', 'predecessor_title',
+            'successor', 'successor_title', 'lag', 'created_at',
+        ]
+        read_only_fields = ['id', 'created_at']
+        # TaskDependency.link() upserts on (predecessor, successor)
+        validators = []
 
 # ── ADD to apps/mice/serializers.py ──────────────────────────────────────────
 # Replace existing ProjectAssetSerializer with this version
@@ -365,6 +485,7 @@ class ProjectAssetSerializer(serializers.ModelSerializer):
     file_size_display   = serializers.SerializerMethodField()
     file_url            = serializers.SerializerMethodField()
     is_image            = serializers.SerializerMethodField()
+    preview_urls        = serializers.SerializerMethodField()
 
     class Meta:
         model   = ProjectAsset
@@ -374,12 +495,14 @@ class ProjectAssetSerializer(serializers.ModelSerializer):
             'file_size', 'file_size_display', 'mime_type',
             'client_visible',
             'sub_event', 'uploaded_by', 'uploaded_by_name',
-            'is_image', 'created_at',
+            'is_image', 'preview_status', 'preview_urls', 'created_at',
         ]
         read_only_fields = [
             'id', 'file_size', 'mime_type',
-            'uploaded_by', 'created_at',
+            'uploaded_by', 'preview_status', 'created_at',
         ]
+        # Files are served through signed URLs only — see file_url
+        extra_kwargs = {'file': {'write_only': True}}
 
     def get_file_size_display(self, obj):
         size = obj.file_size
@@ -393,12 +516,16 @@ class ProjectAssetSerializer(serializers.ModelSerializer):
     def get_file_url(self, obj):
         request = self.context.get('request')
         if obj.file and request:
-            return request.build_absolute_uri(obj.file.url)
+            return asset_media_url(request, obj, ORGANIZER)
         return None
 
     def get_is_image(self, obj):
         return obj.mime_type.startswith('image/') if obj.mime_type else False
 
+    def get_preview_urls(self, obj):
+        request = self.context.get('request')
+        return preview_urls(request, obj, ORGANIZER) if request else None
+
     def create(self, validated_data):
         validated_data['uploaded_by'] = self.context['request'].user
         file = validated_data.get('file')
@@ -415,24 +542,70 @@ class ProjectAssetClientSerializer(serializers.ModelSerializer):
     )
     file_url            = serializers.SerializerMethodField()
     is_image            = serializers.SerializerMethodField()
+    preview_urls        = serializers.SerializerMethodField()
 
     class Meta:
         model   = ProjectAsset
         fields  = [
             'id', 'asset_type', 'asset_type_display',
             'title', 'description', 'file_url',
-            'version', 'file_size', 'is_image', 'created_at',
+            'version', 'file_size', 'is_image', 'preview_urls', 'created_at',
         ]
 
     def get_file_url(self, obj):
         request = self.context.get('request')
         if obj.file and request:
-            return request.build_absolute_uri(obj.file.url)
+            return asset_media_url(request, obj, CLIENT)
         return None
 
     def get_is_image(self, obj):
         return obj.mime_type.startswith('image/') if obj.mime_type else False
 
+    def get_preview_urls(self, obj):
+        request = self.context.get('request')
+        return preview_urls(request, obj, CLIENT) if request else None
+
+
+# ── Chunked asset uploads ─────────────────────────────────────────────────────
+
+class AssetUploadInitiateSerializer(serializers.ModelSerializer):
+    part_size = serializers.IntegerField(required=False, min_value=1)
+
+    class Meta:
+        model   = AssetUpload
+        fields  = [
+            'filename', 'total_size', 'part_size',
+            'asset_type', 'title', 'description', 'version',
+            'client_visible', 'sub_event',
+        ]
+
+    def validate_sub_event(self, sub_event):
+        project = self.context['project']
+        if sub_event and sub_event.mice_project_id != project.pk:
+            raise serializers.ValidationError('Sub-event belongs to another project')
+        return sub_event
+
+
+class AssetUploadSerializer(serializers.ModelSerializer):
+    """Upload state — `received` tells a resuming client which parts to skip."""
+    part_count  = serializers.IntegerField(read_only=True)
+    received    = serializers.SerializerMethodField()
+    asset       = ProjectAssetSerializer(read_only=True)
+
+    class Meta:
+        model   = AssetUpload
+        fields  = [
+            'id', 'status', 'error', 'filename', 'total_size', 'part_size', 'part_count',
+            'received', 'asset_type', 'title', 'client_visible', 'sub_event',
+            'asset', 'expires_at', 'created_at',
+        ]
+
+    def get_received(self, obj):
+        return [
+            {'number': p.number, 'size': p.size, 'sha256': p.sha256}
+            for p in obj.parts.all()
+        ]
+
 
 # ── MICEProject ───────────────────────────────────────────────────────────────
 
@@ -459,14 +632,12 @@ class MICEProjectListSerializer(serializers.ModelSerializer):
         return obj.sub_events.filter(is_active=True).count()
 
     def get_task_counts(self, obj):
+        # Counted from the prefetched tasks — no query per project
         tasks = obj.tasks.all()
         return {
-            'total':        tasks.count(),
-            'done':         tasks.filter(status='done').count(),
-            'overdue':      tasks.filter(
-                status__in=['todo', 'in_progress'],
-                due_at__lt=__import__('django.utils.timezone', fromlist=['now']).now()
-            ).count(),
+            'total':        len(tasks),
+            'done':         sum(t.status == 'done' for t in tasks),
+            'overdue':      sum(t.is_overdue for t in tasks),
         }
 
 
@@ -0,0 +1,107 @@
+# backend/apps/mice/tests/conftest.py
+
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.users.models import User
+from apps.events.models import Event
+from apps.mice.models import (
+    MICEProject, Quotation, QuotationSection, QuotationLineItem, Vendor,
+)
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def organizer():
+    return User.objects.create_user(
+        username='organizer',
+        email='organizer@test.com',
+        password='testpass123',
+        role='organizer',
+    )
+
+
+@pytest.fixture
+def other_organizer():
+    return User.objects.create_user(
+        username='other_organizer',
+        email='other@test.com',
+        password='testpass123',
+        role='organizer',
+    )
+
+
+@pytest.fixture
+def event(organizer):
+    now = timezone.now()
+    return Event.objects.create(
+        title='Annual Gathering',
+        slug='annual-gathering',
+        description='Corporate annual gathering',
+        event_type='conference',
+        status='draft',
+        start_date=now + timedelta(days=30),
+        end_date=now + timedelta(days=32),
+        registration_start=now,
+        registration_end=now + timedelta(days=25),
+        venue_name='GWK',
+        venue_address='Jimbaran',
+        city='Bali',
+        country='Indonesia',
+        capacity=200,
+        organizer=organizer,
+    )
+
+
+@pytest.fixture
+def project(event, organizer):
+    return MICEProject.objects.create(
+        event=event,
+        organizer=organizer,
+        client_company='Mandiri Utama Finance',
+        client_pic='Ibu Sari',
+    )
+
+
+@pytest.fixture
+def vendor(organizer):
+    return Vendor.objects.create(
+        created_by=organizer, name='Bali Sound Pro', category='av_technical',
+    )
+
+
+@pytest.fixture
+def quotation(project):
+    return Quotation.objects.create(mice_project=project)
+
+
+@pytest.fixture
+def section(quotation):
+    return QuotationSection.objects.create(
+        quotation=quotation, name='Venue & Arrangement', sort_order=0,
+    )
+
+
+@pytest.fixture
+def line_items(section):
+    items = []
+    for i, (name, price) in enumerate([
+        ('Ballroom', Decimal('25000000')),
+        ('Catering', Decimal('350000')),
+        ('Sound System', Decimal('12500000')),
+    ]):
+        items.append(QuotationLineItem.objects.create(
+            section=section,
+            item_name=name,
+            qty=Decimal('2'),
+            duration=Decimal('1'),
+            modal_price=price,
+            sort_order=i,
+        ))
+    return items
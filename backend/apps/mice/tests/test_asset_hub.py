@@ -0,0 +1,77 @@
+# backend/apps/mice/tests/test_asset_hub.py
+
+import pytest
+from django.core.files.base import ContentFile
+from apps.mice.models import ProjectAsset
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    # The listing is only cached on a cache every process shares
+    settings.CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': str(tmp_path / 'cache'),
+    }}
+    return tmp_path
+
+
+@pytest.fixture
+def assets(project, organizer):
+    made = []
+    for i, asset_type in enumerate(['key_visual'] * 5 + ['contract'] * 2 + ['sow']):
+        asset = ProjectAsset(
+            mice_project=project, uploaded_by=organizer,
+            title=f'{asset_type} {i}', asset_type=asset_type,
+        )
+        asset.file = ContentFile(f'{asset_type}-{i}'.encode(), name=f'{i}.pdf')
+        asset.save()
+        made.append(asset)
+    return made
+
+
+def hub_url(project):
+    return f'/api/v1/mice/projects/{project.pk}/assets/by-type/'
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAssetHub:
+
+    def test_groups_counts_and_pages(self, api_client, organizer, project, assets):
+        api_client.force_authenticate(user=organizer)
+        groups = api_client.get(hub_url(project), {'limit': 2}).data
+        assert [g['type'] for g in groups] == ['sow', 'key_visual', 'contract']
+        kv = groups[1]
+        assert (kv['count'], kv['pages'], len(kv['assets'])) == (5, 3, 2)
+        assert kv['total_size'] == sum(a.file_size for a in assets if a.asset_type == 'key_visual')
+        assert [a['title'] for a in kv['assets']] == ['key_visual 4', 'key_visual 3']
+        assert groups[2]['internal'] is True
+
+        last = api_client.get(hub_url(project), {'limit': 2, 'page': 3, 'type': 'key_visual'}).data
+        assert len(last) == 1 and [a['title'] for a in last[0]['assets']] == ['key_visual 0']
+
+    def test_cached_and_invalidated(self, api_client, organizer, project, assets, django_assert_max_num_queries):
+        api_client.force_authenticate(user=organizer)
+        first = api_client.get(hub_url(project)).data
+        with django_assert_max_num_queries(3):      # auth user + project lookup only
+            assert api_client.get(hub_url(project)).data == first
+
+        kv = assets[0]
+        api_client.patch(f'/api/v1/mice/projects/{project.pk}/assets/{kv.pk}/toggle-visibility/')
+        groups = {g['type']: g for g in api_client.get(hub_url(project)).data}
+        assert next(a for a in groups['key_visual']['assets'] if a['id'] == str(kv.pk))['client_visible']
+
+        api_client.delete(f'/api/v1/mice/projects/{project.pk}/assets/{assets[-1].pk}/')
+        assert 'sow' not in {g['type'] for g in api_client.get(hub_url(project)).data}
+
+    def test_not_cached_per_process(self, api_client, organizer, project, assets, settings):
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        api_client.force_authenticate(user=organizer)
+        api_client.get(hub_url(project))
+        ProjectAsset.objects.filter(pk=assets[-1].pk).delete()     # bypasses invalidation
+        assert 'sow' not in {g['type'] for g in api_client.get(hub_url(project)).data}
+
+    def test_rejects_bad_params(self, api_client, organizer, project):
+        api_client.force_authenticate(user=organizer)
+        assert api_client.get(hub_url(project), {'type': 'nope'}).status_code == 400
+        assert api_client.get(hub_url(project), {'page': 'x'}).status_code == 400
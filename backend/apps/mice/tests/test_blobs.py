@@ -0,0 +1,110 @@
+# backend/apps/mice/tests/test_blobs.py
+
+from datetime import timedelta
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from apps.mice.blobs import (
+    blob_storage, collect_garbage, migrate_legacy_files, storage_report,
+)
+from apps.mice.models import AssetBlob, MICEProject, ProjectAsset
+from apps.mice.previews import preview_path, preview_sizes
+
+KEY_VISUAL = b'\x89PNG\r\n\x1a\n' + b'key visual' * 1000
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def second_project(event, organizer):
+    event.pk, event.slug = None, 'sales-kickoff'
+    event.save()
+    return MICEProject.objects.create(
+        event=event, organizer=organizer, client_company='Bank Jaya', client_pic='Pak Budi',
+    )
+
+
+def upload(api_client, project, content=KEY_VISUAL, name='kv.png'):
+    return api_client.post(f'/api/v1/mice/projects/{project.pk}/assets/', {
+        'title': 'Key visual', 'asset_type': 'key_visual',
+        'file': SimpleUploadedFile(name, content, content_type='image/png'),
+    })
+
+
+def blob_files(media_root):
+    return [p for p in (media_root / 'mice' / 'blobs').rglob('*') if p.is_file()]
+
+
+@pytest.mark.django_db
+class TestDedup:
+
+    def test_identical_uploads_share_one_blob(self, api_client, organizer, project, second_project, media_root):
+        api_client.force_authenticate(user=organizer)
+        first  = upload(api_client, project)
+        second = upload(api_client, second_project, name='kv-final.png')
+        assert first.status_code == second.status_code == 201
+
+        blob = AssetBlob.objects.get()
+        assert blob.ref_count == 2 and blob.size == len(KEY_VISUAL)
+        assets = ProjectAsset.objects.all()
+        assert {a.file.name for a in assets} == {blob.file.name}
+        assert all(a.file_size == len(KEY_VISUAL) for a in assets)
+        assert len(blob_files(media_root)) == 1
+
+        report = storage_report()
+        assert report['stored'] == len(KEY_VISUAL)
+        assert report['saved'] == len(KEY_VISUAL)
+
+    def test_replace_and_delete_release_references(self, api_client, organizer, project):
+        api_client.force_authenticate(user=organizer)
+        asset_id = upload(api_client, project).data['id']
+        old = AssetBlob.objects.get()
+
+        response = api_client.patch(
+            f'/api/v1/mice/projects/{project.pk}/assets/{asset_id}/',
+            {'file': SimpleUploadedFile('kv2.png', b'other content')},
+        )
+        assert response.status_code == 200
+        old.refresh_from_db()
+        assert old.ref_count == 0
+        new = ProjectAsset.objects.get().blob
+        assert new.ref_count == 1
+
+        api_client.delete(f'/api/v1/mice/projects/{project.pk}/assets/{asset_id}/')
+        new.refresh_from_db()
+        assert new.ref_count == 0
+
+    def test_gc_honours_grace_and_recounts(self, api_client, organizer, project, media_root):
+        api_client.force_authenticate(user=organizer)
+        upload(api_client, project)
+        upload(api_client, project, content=b'unused soon')
+        orphan = AssetBlob.objects.get(size=len(b'unused soon'))
+        for size_name in preview_sizes():
+            blob_storage().save(preview_path(orphan.file.name, size_name), ContentFile(b'jpeg'))
+        ProjectAsset.objects.filter(title='Key visual', blob__size=len(b'unused soon')).delete()
+
+        assert collect_garbage() == (0, 0)          # still inside the grace period
+        later = timezone.now() + timedelta(hours=2)
+        assert collect_garbage(now=later) == (1, len(b'unused soon'))
+        assert AssetBlob.objects.get().ref_count == 1
+        assert len(blob_files(media_root)) == 1
+
+    def test_migrate_legacy_files(self, project, media_root):
+        storage = blob_storage()
+        names = [storage.save(f'mice/assets/2025/01/{n}.png', ContentFile(KEY_VISUAL)) for n in 'ab']
+        ProjectAsset.objects.bulk_create(
+            ProjectAsset(mice_project=project, title=name, file=name)
+            for name in names + ['mice/assets/2025/01/gone.png']
+        )
+
+        assert migrate_legacy_files(batch_size=1) == (2, 1)
+        assert migrate_legacy_files() == (0, 1)
+        blob = AssetBlob.objects.get()
+        assert blob.ref_count == 2
+        assert not any(storage.exists(n) for n in names)
+        assert all(a.file.read() == KEY_VISUAL for a in ProjectAsset.objects.filter(blob=blob))
@@ -0,0 +1,85 @@
+# backend/apps/mice/tests/test_bundles.py
+
+import io
+import zipfile
+import pytest
+from django.core.files.base import ContentFile
+from apps.mice import bundles
+from apps.mice.models import ProjectAsset, Quotation, QuotationStatus, SubEvent
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def assets(project):
+    gala = SubEvent.objects.create(mice_project=project, title='Gala Dinner')
+    made = []
+    for title, asset_type, sub_event, visible, content in [
+        ('Main KV', 'key_visual', None, True, b'kv' * 5000),
+        ('Main KV', 'key_visual', None, True, b'kv v2' * 10),
+        ('Stage', 'stage_3d', gala, True, b'stage' * 100),
+        ('Vendor contract', 'contract', None, False, b'secret'),
+    ]:
+        asset = ProjectAsset(
+            mice_project=project, title=title, asset_type=asset_type,
+            sub_event=sub_event, client_visible=visible,
+        )
+        asset.file.save(f'{title}.png', ContentFile(content), save=False)
+        asset.save()
+        made.append(asset)
+    return made
+
+
+def read_zip(response):
+    body = b''.join(response.streaming_content)
+    assert len(body) == int(response['Content-Length'])
+    archive = zipfile.ZipFile(io.BytesIO(body))
+    assert archive.testzip() is None
+    return {name: archive.read(name) for name in archive.namelist()}
+
+
+@pytest.mark.django_db
+class TestBundle:
+
+    def test_streams_filtered_assets(self, api_client, organizer, project, assets):
+        api_client.force_authenticate(user=organizer)
+        url = f'/api/v1/mice/projects/{project.pk}/assets/bundle/'
+        response = api_client.get(url)
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/zip'
+        files = read_zip(response)
+        assert set(files) == {
+            'Key Visual 2D/Main KV.png', 'Key Visual 2D/Main KV (2).png',
+            'Gala Dinner/Stage Design 3D/Stage.png', 'Vendor Contract/Vendor contract.png',
+        }
+        assert files['Vendor Contract/Vendor contract.png'] == b'secret'
+
+        files = read_zip(api_client.get(url, {'asset_type': 'stage_3d'}))
+        assert list(files) == ['Gala Dinner/Stage Design 3D/Stage.png']
+        files = read_zip(api_client.get(url, {'client_visible': 'false'}))
+        assert list(files) == ['Vendor Contract/Vendor contract.png']
+
+    def test_other_organizer_gets_404(self, api_client, other_organizer, project, assets):
+        api_client.force_authenticate(user=other_organizer)
+        response = api_client.get(f'/api/v1/mice/projects/{project.pk}/assets/bundle/')
+        assert response.status_code == 404
+
+    def test_portal_bundle_is_client_visible_only(self, api_client, project, assets):
+        quotation = Quotation.objects.create(mice_project=project, status=QuotationStatus.SENT)
+        url = f'/api/v1/mice/quotation/portal/{quotation.client_token}/assets/bundle/'
+        files = read_zip(api_client.get(url))
+        assert len(files) == 3
+        assert not any('Contract' in name for name in files)
+
+    def test_size_matches_with_zip64_records(self, assets, monkeypatch):
+        # A tiny ZIP64 limit exercises the ZIP64 header / descriptor / end
+        # record paths without multi-GB fixtures
+        monkeypatch.setattr(zipfile, 'ZIP64_LIMIT', 600)
+        members = bundles.plan(assets)
+        body = b''.join(bundles.stream(members))
+        assert len(body) == bundles.archive_size(members)
+        assert zipfile.ZipFile(io.BytesIO(body)).read('Key Visual 2D/Main KV.png') == b'kv' * 5000
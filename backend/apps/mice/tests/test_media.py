@@ -0,0 +1,105 @@
+# backend/apps/mice/tests/test_media.py
+
+from urllib.parse import urlparse
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from apps.mice.models import ProjectAsset, Quotation, QuotationStatus
+
+VIDEO = bytes(range(256)) * 40      # 10 KiB
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def asset(project, organizer):
+    asset = ProjectAsset(
+        mice_project=project, uploaded_by=organizer, title='Opening video',
+        asset_type='multimedia', mime_type='video/mp4', client_visible=True,
+    )
+    asset.file = ContentFile(VIDEO, name='opening.mp4')
+    asset.save()
+    return asset
+
+
+def path_of(url):
+    return urlparse(url).path
+
+
+def file_url(api_client, organizer, project, asset):
+    api_client.force_authenticate(user=organizer)
+    data = api_client.get(f'/api/v1/mice/projects/{project.pk}/assets/{asset.pk}/').data
+    assert 'file' not in data
+    api_client.force_authenticate(user=None)
+    return path_of(data['file_url'])
+
+
+@pytest.mark.django_db
+class TestAssetMedia:
+
+    def test_signed_url_serves_full_file_with_cache_headers(self, api_client, organizer, project, asset):
+        url = file_url(api_client, organizer, project, asset)
+        response = api_client.get(url)
+        assert response.status_code == 200
+        assert b''.join(response.streaming_content) == VIDEO
+        assert response['Content-Type'] == 'video/mp4'
+        assert response['Accept-Ranges'] == 'bytes'
+        assert response['ETag'] == f'"{asset.blob_id}"'
+        assert response['Cache-Control'].startswith('private, max-age=')
+
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code == 304
+        download = api_client.get(url, {'download': '1'})
+        assert download['Content-Disposition'] == 'attachment; filename="Opening video.mp4"'
+
+    def test_range_requests(self, api_client, organizer, project, asset):
+        url = file_url(api_client, organizer, project, asset)
+        response = api_client.get(url, HTTP_RANGE='bytes=100-199')
+        assert response.status_code == 206
+        assert response['Content-Range'] == f'bytes 100-199/{len(VIDEO)}'
+        assert b''.join(response.streaming_content) == VIDEO[100:200]
+
+        tail = api_client.get(url, HTTP_RANGE='bytes=-10')
+        assert b''.join(tail.streaming_content) == VIDEO[-10:]
+        assert api_client.get(url, HTTP_RANGE=f'bytes={len(VIDEO)}-').status_code == 416
+        stale = api_client.get(url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"old"')
+        assert stale.status_code == 200
+
+    def test_tampered_or_hidden(self, api_client, organizer, project, asset):
+        url = file_url(api_client, organizer, project, asset)
+        assert api_client.get(url.replace('/media/', '/media/x')).status_code == 404
+        assert api_client.get(f'/media/{asset.file.name}').status_code == 404
+
+        quotation = Quotation.objects.create(mice_project=project, status=QuotationStatus.SENT)
+        portal = api_client.get(f'/api/v1/mice/quotation/portal/{quotation.client_token}/assets/').data
+        client_url = path_of(portal[0]['file_url'])
+        assert api_client.get(client_url).status_code == 200
+
+        ProjectAsset.objects.filter(pk=asset.pk).update(client_visible=False)
+        assert api_client.get(client_url).status_code == 404
+        # The organizer's link is unaffected by client visibility
+        assert api_client.get(url).status_code == 200
+
+    def test_expired_link(self, api_client, organizer, project, asset, settings, monkeypatch):
+        url = file_url(api_client, organizer, project, asset)
+        monkeypatch.setattr('apps.mice.media.time.time', lambda: 10 ** 11)
+        assert api_client.get(url).status_code == 403
+
+    def test_offloads_to_proxy(self, api_client, organizer, project, asset, settings):
+        url = file_url(api_client, organizer, project, asset)
+        settings.MEDIA_DELIVERY = 'nginx'
+        response = api_client.get(url)
+        assert response['X-Accel-Redirect'] == f'/protected-media/{asset.file.name}'
+        assert response.content == b''
+
+
+@pytest.mark.django_db
+def test_public_media(api_client):
+    default_storage.save('avatars/a.png', ContentFile(b'png'))
+    response = api_client.get('/media/avatars/a.png')
+    assert response.status_code == 200
+    assert response['Cache-Control'] == 'public, max-age=86400'
+    assert api_client.get('/media/avatars/../mice/x').status_code == 404
@@ -0,0 +1,88 @@
+# backend/apps/mice/tests/test_numbering.py
+
+import datetime
+import threading
+import time
+import pytest
+from django.db import OperationalError, connection, transaction
+from apps.mice.models import (
+    MICEProject, QuotationNumberSequence, format_quotation_number,
+)
+
+
+def test_formats():
+    when = datetime.date(2025, 4, 7)
+    assert format_quotation_number('{seq:03d}/QUO-EH/{month:02d}/{year}', 20, when) == '020/QUO-EH/04/2025'
+    assert format_quotation_number('{seq:03d}/QUO-MEO/{month_roman}/{year}', 20, when) == '020/QUO-MEO/IV/2025'
+    assert format_quotation_number('Q{yy}-{seq:04d}', 7, when) == 'Q25-0007'
+
+
+@pytest.mark.django_db
+class TestSequence:
+
+    def test_counters_are_per_organizer_and_year(self, organizer, other_organizer):
+        next_value = QuotationNumberSequence.next_value
+        assert [next_value(organizer.pk, 2025) for _ in range(3)] == [1, 2, 3]
+        assert next_value(organizer.pk, 2026) == 1
+        assert next_value(other_organizer.pk, 2025) == 1
+
+    def test_project_gets_next_number(self, project, event, organizer, settings):
+        settings.MICE_QUOTATION_NUMBER_FORMAT = 'QUO-{year}-{seq:03d}'
+        year = datetime.date.today().year
+        assert project.quotation_number.startswith('001/QUO-EH/')
+        assert QuotationNumberSequence.next_number(organizer.pk) == f'QUO-{year}-002'
+
+    def test_rolled_back_save_returns_the_number(self, organizer, event):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                MICEProject.objects.create(event=event, organizer=organizer, client_company='A', client_pic='B')
+                raise RuntimeError
+        project = MICEProject.objects.create(event=event, organizer=organizer, client_company='A', client_pic='B')
+        assert project.quotation_number.startswith('001/')
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_allocation_is_unique_and_gap_free(organizer, event, settings):
+    """Projects created from many threads at once get numbers 1…N exactly once each."""
+    settings.MICE_QUOTATION_NUMBER_FORMAT = '{seq}'
+    threads, per_thread, retries = 8, 15, 200
+    # MICEProject is one-to-one with Event — one event per project
+    events = []
+    for i in range(threads * per_thread):
+        event.pk, event.slug = None, f'annual-gathering-{i}'
+        event.save(force_insert=True)
+        events.append(event.pk)
+    errors = []
+
+    def worker(event_ids):
+        try:
+            for event_id in event_ids:
+                for _ in range(retries):
+                    try:
+                        MICEProject.objects.create(
+                            event_id=event_id, organizer=organizer, client_company='A', client_pic='B',
+                        )
+                        break
+                    except OperationalError:
+                        # SQLite reports lock contention instead of waiting
+                        time.sleep(0.01)
+                else:
+                    raise RuntimeError(f'Still locked after {retries} attempts')
+        except Exception as e:   # pragma: no cover — surfaced below
+            errors.append(e)
+        finally:
+            connection.close()
+
+    pool = [
+        threading.Thread(target=worker, args=(events[n::threads],))
+        for n in range(threads)
+    ]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join(timeout=120)
+
+    assert not any(t.is_alive() for t in pool)
+    assert not errors
+    numbers = MICEProject.objects.values_list('quotation_number', flat=True)
+    assert sorted(int(n) for n in numbers) == list(range(1, threads * per_thread + 1))
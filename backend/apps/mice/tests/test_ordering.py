@@ -0,0 +1,114 @@
+# backend/apps/mice/tests/test_ordering.py
+
+import pytest
+from rest_framework import status
+from apps.mice.models import QuotationLineItem, QuotationSection, SubEvent
+from apps.mice.ordering import RANK_GAP, apply_order, move_item
+
+
+@pytest.mark.django_db
+class TestSortOrderHelpers:
+    """Gap-based rank helpers"""
+
+    def test_apply_order_spaces_ranks(self, line_items):
+        qs = QuotationLineItem.objects.filter(section=line_items[0].section)
+        ids = [line_items[2].pk, line_items[0].pk, line_items[1].pk]
+
+        written = apply_order(qs, ids)
+
+        assert written == 3
+        ranks = dict(qs.values_list('pk', 'sort_order'))
+        assert [ranks[pk] for pk in ids] == [RANK_GAP, 2 * RANK_GAP, 3 * RANK_GAP]
+
+    def test_partial_order_keeps_the_rest_after_it(self, line_items):
+        qs = QuotationLineItem.objects.filter(section=line_items[0].section)
+        # Legacy ranks 0, 1, 2 — the unlisted rows must not collide with the new ones
+        apply_order(qs, [line_items[2].pk])
+
+        ordered = list(qs.order_by('sort_order').values_list('pk', 'sort_order'))
+        assert ordered == [
+            (line_items[2].pk, RANK_GAP),
+            (line_items[0].pk, 2 * RANK_GAP),
+            (line_items[1].pk, 3 * RANK_GAP),
+        ]
+
+    def test_apply_order_rejects_foreign_ids(self, line_items, other_organizer):
+        qs = QuotationLineItem.objects.filter(
+            section=line_items[0].section,
+            section__quotation__mice_project__organizer=other_organizer,
+        )
+        with pytest.raises(ValueError):
+            apply_order(qs, [line_items[0].pk])
+
+    def test_move_touches_only_one_row_when_gaps_exist(self, line_items):
+        qs = QuotationLineItem.objects.filter(section=line_items[0].section)
+        apply_order(qs, [item.pk for item in line_items])
+
+        rank, written = move_item(qs, line_items[2].pk, after=line_items[0].pk)
+
+        assert written == 1
+        assert RANK_GAP < rank < 2 * RANK_GAP
+        ordered = list(qs.order_by('sort_order').values_list('pk', flat=True))
+        assert ordered == [line_items[0].pk, line_items[2].pk, line_items[1].pk]
+
+    def test_move_rebalances_when_no_gap(self, line_items):
+        qs = QuotationLineItem.objects.filter(section=line_items[0].section)
+        # Legacy ranks 0, 1, 2 have no room between them
+        rank, written = move_item(qs, line_items[2].pk, before=line_items[1].pk)
+
+        assert rank == 2 * RANK_GAP
+        ordered = list(qs.order_by('sort_order').values_list('pk', flat=True))
+        assert ordered == [line_items[0].pk, line_items[2].pk, line_items[1].pk]
+
+
+@pytest.mark.django_db
+class TestReorderEndpoints:
+    """reorder / move actions on the nested MICE routes"""
+
+    def test_line_item_reorder(self, api_client, organizer, quotation, section, line_items):
+        api_client.force_authenticate(user=organizer)
+        url = f'/api/v1/mice/quotations/{quotation.pk}/sections/{section.pk}/items/reorder/'
+        order = [str(line_items[1].pk), str(line_items[2].pk), str(line_items[0].pk)]
+
+        response = api_client.post(url, {'order': order}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['reordered'] == 3
+        ordered = [str(pk) for pk in section.line_items.order_by('sort_order').values_list('pk', flat=True)]
+        assert ordered == order
+
+    def test_line_item_reorder_rejects_other_organizer(self, api_client, other_organizer, quotation, section, line_items):
+        api_client.force_authenticate(user=other_organizer)
+        url = f'/api/v1/mice/quotations/{quotation.pk}/sections/{section.pk}/items/reorder/'
+
+        response = api_client.post(url, {'order': [str(line_items[0].pk)]}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_section_move(self, api_client, organizer, quotation, section):
+        second = QuotationSection.objects.create(quotation=quotation, name='Entertainment', sort_order=1)
+        api_client.force_authenticate(user=organizer)
+        url = f'/api/v1/mice/quotations/{quotation.pk}/sections/move/'
+
+        response = api_client.post(url, {'id': str(second.pk), 'after': None}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert list(quotation.sections.order_by('sort_order')) == [second, section]
+
+    def test_sub_event_reorder(self, api_client, organizer, project):
+        a = SubEvent.objects.create(mice_project=project, title='Welcome Dinner')
+        b = SubEvent.objects.create(mice_project=project, title='Yoga & Golf')
+        api_client.force_authenticate(user=organizer)
+        url = f'/api/v1/mice/projects/{project.pk}/sub-events/reorder/'
+
+        response = api_client.post(url, {'order': [str(b.pk), str(a.pk)]}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert list(project.sub_events.order_by('sort_order')) == [b, a]
+
+    def test_task_reorder_requires_project(self, api_client, organizer, project):
+        api_client.force_authenticate(user=organizer)
+
+        response = api_client.post('/api/v1/mice/tasks/reorder/', {'order': ['x']}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
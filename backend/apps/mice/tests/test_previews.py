@@ -0,0 +1,108 @@
+# backend/apps/mice/tests/test_previews.py
+
+import io
+from concurrent.futures import Future
+from urllib.parse import urlparse
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+from apps.mice.models import PreviewStatus, ProjectAsset
+from apps.mice.previews import claim, generate_previews, preview_sizes, process, render
+
+
+def png(width=2000, height=1000, mode='RGBA'):
+    buffer = io.BytesIO()
+    Image.new(mode, (width, height), (200, 30, 30, 128) if mode == 'RGBA' else 'red').save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+def upload(api_client, project, content, name, content_type):
+    return api_client.post(f'/api/v1/mice/projects/{project.pk}/assets/', {
+        'title': name, 'asset_type': 'key_visual',
+        'file': SimpleUploadedFile(name, content, content_type=content_type),
+    })
+
+
+def test_render_sizes_keep_aspect_ratio():
+    rendered = render(png(), 'image/png', {'sm': 160, 'lg': 1280})
+    sizes = {name: Image.open(io.BytesIO(data)).size for name, data in rendered.items()}
+    assert sizes == {'sm': (160, 80), 'lg': (1280, 640)}
+    assert all(Image.open(io.BytesIO(data)).format == 'JPEG' for data in rendered.values())
+
+
+class InlineExecutor:
+    """Renders on submit and tracks how many results are still uncollected."""
+
+    def __init__(self):
+        self.in_flight = self.peak = 0
+
+    def submit(self, fn, *args):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        future = Future()
+        future.set_result(fn(*args))
+        collect = future.result
+
+        def result():
+            self.in_flight -= 1
+            return collect()
+        future.result = result
+        return future
+
+
+@pytest.mark.django_db
+class TestPreviewPipeline:
+
+    def test_upload_is_pending_until_worker_runs(self, api_client, organizer, project):
+        api_client.force_authenticate(user=organizer)
+        response = upload(api_client, project, png(), 'kv.png', 'image/png')
+        assert response.data['preview_status'] == 'pending'
+        assert response.data['preview_urls'] is None
+
+        assert generate_previews(workers=0) == {PreviewStatus.READY: 1}
+        data = api_client.get(f'/api/v1/mice/projects/{project.pk}/assets/{response.data["id"]}/').data
+        assert set(data['preview_urls']) == set(preview_sizes())
+        thumbnail = api_client.get(urlparse(data['preview_urls']['sm']).path)
+        assert thumbnail['Content-Type'] == 'image/jpeg'
+        assert Image.open(io.BytesIO(b''.join(thumbnail.streaming_content))).size == (160, 80)
+
+    def test_unsupported_and_duplicates(self, api_client, organizer, project):
+        api_client.force_authenticate(user=organizer)
+        image = png(mode='RGB')
+        upload(api_client, project, image, 'a.png', 'image/png')
+        upload(api_client, project, image, 'b.png', 'image/png')
+        upload(api_client, project, b'PK\x03\x04docx', 'sow.docx',
+               'application/vnd.openxmlformats-officedocument.wordprocessingml.document')
+
+        counts = generate_previews(batch_size=2, workers=2)
+        assert counts == {PreviewStatus.READY: 2, PreviewStatus.UNSUPPORTED: 1}
+        a, b = ProjectAsset.objects.filter(mime_type='image/png')
+        assert a.previews == b.previews
+        assert generate_previews(workers=0) == {}
+
+    def test_renders_in_flight_stay_within_the_window(self, api_client, organizer, project):
+        api_client.force_authenticate(user=organizer)
+        for width in range(100, 106):
+            upload(api_client, project, png(width, 50), f'{width}.png', 'image/png')
+
+        executor = InlineExecutor()
+        assets = process(claim(10), executor, window=2)
+        assert executor.peak == 2 and executor.in_flight == 0
+        assert {a.preview_status for a in assets} == {PreviewStatus.READY}
+
+    def test_new_file_requeues_previews(self, api_client, organizer, project):
+        api_client.force_authenticate(user=organizer)
+        asset_id = upload(api_client, project, png(), 'kv.png', 'image/png').data['id']
+        generate_previews(workers=0)
+        api_client.patch(
+            f'/api/v1/mice/projects/{project.pk}/assets/{asset_id}/',
+            {'file': SimpleUploadedFile('kv2.png', png(400, 400), content_type='image/png')},
+        )
+        asset = ProjectAsset.objects.get()
+        assert asset.preview_status == PreviewStatus.PENDING and asset.previews == {}
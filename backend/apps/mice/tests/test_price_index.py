@@ -0,0 +1,101 @@
+# backend/apps/mice/tests/test_price_index.py
+
+import pytest
+from decimal import Decimal
+from django.db import transaction
+from apps.mice.models import QuotationLineItem, Vendor, VendorPriceIndex
+from apps.mice.price_index import rebuild_price_index
+
+RATES_URL = '/api/v1/mice/vendors/rates/'
+
+
+def _item(section, vendor, name, price, **extra):
+    return QuotationLineItem.objects.create(
+        section=section, vendor=vendor, item_name=name,
+        modal_price=Decimal(price), vol_unit='unit', **extra,
+    )
+
+
+def _state():
+    return sorted(
+        VendorPriceIndex.objects.values_list(
+            'organizer_id', 'vendor_id', 'category', 'item_key', 'vol_unit',
+            'sample_count', 'p25', 'median', 'p75', 'last_price',
+        ),
+        key=str,
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPriceIndex:
+
+    def test_percentiles_and_last_price(self, organizer, section, vendor):
+        for price in ('1000', '2000', '3000', '4000', '9000'):
+            _item(section, vendor, 'Sound System', price)
+
+        row = VendorPriceIndex.objects.get(vendor=vendor)
+        assert row.item_key == 'sound system'
+        assert row.sample_count == 5
+        assert (row.p25, row.median, row.p75) == (Decimal('2000'), Decimal('3000'), Decimal('4000'))
+        assert row.last_price == Decimal('9000')
+
+        category_row = VendorPriceIndex.objects.get(vendor=None, category='av_technical')
+        assert category_row.sample_count == 5
+
+    def test_revisions_count_once(self, quotation, section, vendor):
+        """Clones share a lineage and count once, at the latest price."""
+        _item(section, vendor, 'Sound System', '1000')
+        revision = quotation.create_revision()
+        clone = QuotationLineItem.objects.get(section__quotation=revision)
+        clone.modal_price = Decimal('1500')
+        clone.save()
+
+        row = VendorPriceIndex.objects.get(vendor=vendor)
+        assert row.sample_count == 1
+        assert row.median == Decimal('1500')
+
+    def test_rename_refreshes_old_key(self, section, vendor):
+        item = _item(section, vendor, 'Sound System', '1000')
+        item = QuotationLineItem.objects.get(pk=item.pk)
+        item.item_name = 'Line Array'
+        item.save()
+        assert set(VendorPriceIndex.objects.values_list('item_key', flat=True)) == {'line array'}
+
+    def test_refresh_waits_for_commit(self, section, vendor):
+        with transaction.atomic():
+            for price in ('1000', '2000', '3000'):
+                _item(section, vendor, 'Sound System', price)
+            assert not VendorPriceIndex.objects.exists()
+        assert VendorPriceIndex.objects.get(vendor=vendor).sample_count == 3
+
+    def test_incremental_matches_rebuild(self, organizer, section, vendor):
+        other = Vendor.objects.create(created_by=organizer, name='Sonic', category='av_technical')
+        _item(section, vendor, 'Sound System', '1000')
+        _item(section, other, 'sound-system', '3000')
+        deleted = _item(section, other, 'Sound System', '5000')
+        deleted.delete()
+
+        incremental = _state()
+        rebuild_price_index()
+        assert incremental == _state()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestRatesEndpoint:
+
+    def test_prefix_lookup_is_one_query(
+        self, api_client, organizer, section, vendor, django_assert_num_queries,
+    ):
+        _item(section, vendor, 'Sound System', '1000')
+        api_client.force_authenticate(user=organizer)
+        with django_assert_num_queries(1):
+            response = api_client.get(RATES_URL, {'q': 'SOUND-sys'})
+        assert response.status_code == 200
+        assert [r['vendor_name'] for r in response.data] == ['Bali Sound Pro', None]
+        assert response.data[0]['median'] == '1000.00'
+
+    def test_scoped_to_organizer(self, api_client, other_organizer, section, vendor):
+        _item(section, vendor, 'Sound System', '1000')
+        api_client.force_authenticate(user=other_organizer)
+        response = api_client.get(RATES_URL, {'q': 'sound'})
+        assert response.data == []
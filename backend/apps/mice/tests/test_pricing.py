@@ -0,0 +1,143 @@
+# backend/apps/mice/tests/test_pricing.py
+
+import random
+import pytest
+from decimal import Decimal
+from django.db import transaction
+from rest_framework import status
+from apps.mice.models import QuotationLineItem, QuotationSection, Vendor
+from apps.mice.pricing import QuotationPricer
+
+TOTAL_FIELDS = [
+    'subtotal_modal', 'subtotal_client', 'fee_management_amt',
+    'total_before_tax', 'ppn_amt', 'total_after_tax',
+    'margin_produksi', 'total_margin', 'sodaqoh_amt',
+    'net_margin', 'margin_pct_of_total',
+]
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _recalculated_totals(quotation, mutate):
+    """Apply `mutate` to real rows, run recalculate(), then roll everything back."""
+    totals = {}
+    try:
+        with transaction.atomic():
+            mutate()
+            quotation.recalculate()
+            totals = {f: getattr(quotation, f) for f in TOTAL_FIELDS}
+            raise _Rollback
+    except _Rollback:
+        pass
+    quotation.refresh_from_db()
+    return totals
+
+
+def _assert_matches(result, totals):
+    for field in TOTAL_FIELDS:
+        assert Decimal(result[field]) == totals[field], field
+
+
+@pytest.mark.django_db
+class TestQuotationPricer:
+    """Vectorised what-if pricing must match the Decimal engine exactly"""
+
+    @pytest.fixture
+    def awkward_items(self, organizer, quotation, section):
+        catering = Vendor.objects.create(created_by=organizer, name='Jimbaran Catering', category='catering')
+        second = QuotationSection.objects.create(quotation=quotation, name='Entertainment', sort_order=1)
+        rng = random.Random(20250401)
+        items = []
+        for i in range(40):
+            items.append(QuotationLineItem.objects.create(
+                section=section if i % 2 else second,
+                vendor=catering if i % 3 == 0 else None,
+                item_name=f'Item {i}',
+                qty=Decimal(rng.randint(1, 50000)) / 100,
+                duration=Decimal(rng.randint(1, 500)) / 100,
+                modal_price=Decimal(rng.randint(0, 10 ** 10)) / 100,
+                margin_pct=Decimal(rng.randint(0, 4000)) / 10000,
+            ))
+        quotation.refresh_from_db()
+        return second, items
+
+    def test_baseline_matches_recalculate(self, quotation, awkward_items):
+        result = QuotationPricer(quotation).simulate([{}])[0]
+        _assert_matches(result, {f: getattr(quotation, f) for f in TOTAL_FIELDS})
+
+    def test_parameter_scenarios_match_recalculate(self, quotation, awkward_items):
+        second, _ = awkward_items
+        scenarios = [
+            {'fee_management_pct': Decimal('0.08'), 'ppn_pct': Decimal('0.12')},
+            {'category_margins': {'catering': Decimal('0.20')}, 'sodaqoh_pct': Decimal('0.0333')},
+            {'section_margins': {str(second.pk): Decimal('0.1777')}, 'pph_vendor_pct': Decimal('0.0275')},
+        ]
+        results = QuotationPricer(quotation).simulate(scenarios)
+
+        def fee_and_ppn():
+            quotation.fee_management_pct = Decimal('0.08')
+            quotation.ppn_pct = Decimal('0.12')
+        _assert_matches(results[0], _recalculated_totals(quotation, fee_and_ppn))
+
+        def catering():
+            quotation.sodaqoh_pct = Decimal('0.0333')
+            for item in QuotationLineItem.objects.filter(section__quotation=quotation, vendor__category='catering'):
+                item.margin_pct = Decimal('0.20')
+                item.save()
+        _assert_matches(results[1], _recalculated_totals(quotation, catering))
+
+        def section_and_pph():
+            quotation.pph_vendor_pct = Decimal('0.0275')
+            quotation.save()
+            for item in QuotationLineItem.objects.filter(section__quotation=quotation).select_related('section'):
+                if item.section_id == second.pk:
+                    item.margin_pct = Decimal('0.1777')
+                item.save()
+        _assert_matches(results[2], _recalculated_totals(quotation, section_and_pph))
+
+    def test_large_amounts_fall_back_to_exact_integers(self, quotation, section):
+        QuotationLineItem.objects.create(
+            section=section, item_name='Stadium', qty=Decimal('10'),
+            duration=Decimal('8'), modal_price=Decimal('12345678901.23'),
+        )
+        quotation.refresh_from_db()
+        pricer = QuotationPricer(quotation)
+
+        assert pricer.dtype is object
+        _assert_matches(pricer.simulate([{}])[0], {f: getattr(quotation, f) for f in TOTAL_FIELDS})
+
+
+@pytest.mark.django_db
+class TestSimulateEndpoint:
+    """POST /api/v1/mice/quotations/{id}/simulate/"""
+
+    def test_simulate_is_read_only(self, api_client, organizer, quotation, line_items):
+        quotation.refresh_from_db()
+        before = quotation.total_after_tax
+        api_client.force_authenticate(user=organizer)
+
+        response = api_client.post(
+            f'/api/v1/mice/quotations/{quotation.pk}/simulate/',
+            {'scenarios': [{'name': 'fee 8%', 'fee_management_pct': '0.08'}]},
+            format='json',
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert Decimal(response.data['baseline']['total_after_tax']) == before
+        assert response.data['scenarios'][0]['name'] == 'fee 8%'
+        assert Decimal(response.data['scenarios'][0]['total_after_tax']) < before
+        quotation.refresh_from_db()
+        assert quotation.total_after_tax == before
+
+    def test_simulate_rejects_unknown_category(self, api_client, organizer, quotation):
+        api_client.force_authenticate(user=organizer)
+
+        response = api_client.post(
+            f'/api/v1/mice/quotations/{quotation.pk}/simulate/',
+            {'scenarios': [{'category_margins': {'spaceships': '0.2'}}]},
+            format='json',
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
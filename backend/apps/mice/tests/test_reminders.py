@@ -0,0 +1,67 @@
+# backend/apps/mice/tests/test_reminders.py
+
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.core import mail
+from django.utils import timezone
+from apps.mice.models import ProjectTask, Quotation, Reminder, ReminderKind
+from apps.mice.reminders import keyset, run_pass
+from apps.notifications.outbox import drain
+
+DAY = datetime.timedelta(days=1)
+
+
+@pytest.mark.django_db
+class TestReminders:
+
+    def test_keyset_walks_every_row_once(self, project):
+        due = timezone.now()
+        for i in range(7):
+            # Equal due dates force the pk tie-break
+            ProjectTask.objects.create(mice_project=project, title=f'T{i}', due_at=due + (i // 3) * DAY)
+        seen = [t.pk for batch in keyset(ProjectTask.objects.all(), 'due_at', 2) for t in batch]
+        assert sorted(seen) == sorted(ProjectTask.objects.values_list('pk', flat=True))
+        assert len(seen) == len(set(seen))
+
+    def test_flags_overdue_tasks_in_bulk(self, project):
+        task = ProjectTask.objects.create(mice_project=project, title='Brief', due_at=timezone.now() + DAY)
+        assert not task.is_overdue
+
+        counts = run_pass(now=timezone.now() + 2 * DAY, digest=False)
+        assert counts['flagged'] == 1
+        task.refresh_from_db()
+        assert task.is_overdue
+
+        task.complete()
+        assert not ProjectTask.objects.get(pk=task.pk).is_overdue
+
+    def test_digest_is_deduplicated_per_user(self, project, organizer, quotation):
+        now = timezone.now()
+        ProjectTask.objects.create(mice_project=project, title='Rundown', due_at=now + datetime.timedelta(hours=3))
+        ProjectTask.objects.bulk_create([
+            ProjectTask(mice_project=project, title='Venue deposit', due_at=now - DAY),
+        ])
+        Quotation.objects.filter(pk=quotation.pk).update(
+            status='approved', payment_term_1=Decimal('5000000'),
+            payment_term_1_due=timezone.localdate(now) + DAY,
+        )
+
+        counts = run_pass(now=now)
+        assert (counts['flagged'], counts['tasks_due'], counts['installments']) == (1, 1, 1)
+        assert counts['digests'] == 1
+        drain()
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == [organizer.email]
+        assert '3 reminders, 1 overdue' in mail.outbox[0].subject
+        assert 'Installment 1 of Rp 5,000,000' in mail.outbox[0].body
+
+        # A second pass finds the same occurrences — nothing new is sent
+        assert run_pass(now=now)['digests'] == 0
+        assert Reminder.objects.count() == 3
+
+        # A missed installment is a new occurrence
+        later = run_pass(now=now + 2 * DAY)
+        assert later['installments'] == 1
+        assert Reminder.objects.filter(kind=ReminderKind.PAYMENT_OVERDUE).count() == 1
@@ -0,0 +1,123 @@
+# backend/apps/mice/tests/test_rollups.py
+
+import datetime
+import pytest
+from decimal import Decimal
+from django.utils import timezone
+from apps.mice.models import (
+    FinancialRollup, Quotation, QuotationStatus, RollupMetric,
+)
+from apps.mice.rollups import rebuild_rollups, receivables_aging
+
+ANALYTICS_URL = '/api/v1/mice/analytics/'
+
+
+def _state(organizer):
+    """Rollup rows as comparable tuples."""
+    return sorted(
+        FinancialRollup.objects.filter(organizer=organizer).values_list(
+            'metric', 'period', 'status', 'client_company',
+            'quotation_count', 'amount', 'net_margin', 'sodaqoh_amt',
+        )
+    )
+
+
+@pytest.mark.django_db
+class TestIncrementalRollups:
+
+    def test_totals_follow_line_item_edits(self, organizer, quotation, line_items):
+        """Every line item save flows into the pipeline row of the quotation."""
+        quotation.refresh_from_db()
+        row = FinancialRollup.objects.get(
+            organizer=organizer, metric=RollupMetric.PIPELINE,
+        )
+        assert row.status == QuotationStatus.DRAFT
+        assert row.quotation_count == 1
+        assert row.amount == quotation.total_after_tax
+        assert row.net_margin == quotation.net_margin
+
+    def test_status_change_moves_between_rows(self, organizer, quotation, line_items):
+        """Sending moves the quotation out of 'draft' and leaves no empty row behind."""
+        quotation.send_to_client()
+        statuses = FinancialRollup.objects.filter(
+            organizer=organizer, metric=RollupMetric.PIPELINE,
+        ).values_list('status', flat=True)
+        assert list(statuses) == [QuotationStatus.SENT]
+
+    def test_incremental_matches_rebuild(self, organizer, project, quotation, line_items):
+        """After a full lifecycle, incremental rows equal a from-scratch rebuild."""
+        quotation.send_to_client()
+        revision = quotation.create_revision()
+        revision.payment_term_1 = Decimal('10000000')
+        revision.payment_term_2 = Decimal('5000000')
+        revision.payment_term_1_due = datetime.date(2026, 1, 15)
+        revision.save()
+        revision.send_to_client()
+        revision.approve_by_client()
+        Quotation.objects.filter(pk=revision.pk).update(payment_term_1_paid=True)
+        revision.sync_rollups()
+        project.client_company = 'PT Mandiri Utama'
+        project.save()
+        line_items[0].delete()
+
+        incremental = _state(organizer)
+        rebuild_rollups(organizer)
+        assert incremental == _state(organizer)
+        assert {row[3] for row in incremental} == {'PT Mandiri Utama'}
+
+    def test_delete_retracts_contribution(self, organizer, quotation, line_items):
+        quotation.delete()
+        assert not FinancialRollup.objects.filter(organizer=organizer).exists()
+
+    def test_receivables_aging_buckets(self, organizer, quotation, line_items):
+        """Unpaid terms land in the bucket of their due month."""
+        Quotation.objects.filter(pk=quotation.pk).update(
+            status=QuotationStatus.APPROVED, approved_at=timezone.now(),
+            payment_term_1=Decimal('1000'), payment_term_1_due=datetime.date(2026, 3, 10),
+            payment_term_2=Decimal('2000'), payment_term_2_due=datetime.date(2026, 9, 1),
+        )
+        quotation.sync_rollups()
+
+        aging = {b['bucket']: b for b in receivables_aging(organizer, today=datetime.date(2026, 10, 19))}
+        assert aging['overdue_3_plus_months']['outstanding'] == '1000.00'
+        assert aging['overdue_1_month']['outstanding'] == '2000.00'
+        assert aging['not_yet_due']['terms'] == 0
+
+
+@pytest.mark.django_db
+class TestAnalyticsEndpoints:
+
+    def test_pipeline_is_one_query(
+        self, api_client, organizer, quotation, line_items, django_assert_num_queries,
+    ):
+        api_client.force_authenticate(user=organizer)
+        with django_assert_num_queries(1):
+            response = api_client.get(ANALYTICS_URL + 'pipeline/')
+        assert response.status_code == 200
+        assert response.data[0]['status'] == 'draft'
+        assert response.data[0]['quotations'] == 1
+
+    def test_top_clients_scoped_to_organizer(
+        self, api_client, other_organizer, quotation, line_items,
+    ):
+        quotation.send_to_client()
+        quotation.approve_by_client()
+        api_client.force_authenticate(user=other_organizer)
+        response = api_client.get(ANALYTICS_URL + 'top-clients/')
+        assert response.status_code == 200
+        assert response.data == []
+
+    def test_top_clients_ranks_realized_value(self, api_client, organizer, quotation, line_items):
+        quotation.send_to_client()
+        quotation.approve_by_client()
+        quotation.refresh_from_db()
+        api_client.force_authenticate(user=organizer)
+        month = timezone.localdate().strftime('%Y-%m')
+        response = api_client.get(ANALYTICS_URL + 'top-clients/', {'from': month, 'to': month})
+        assert response.data[0]['client_company'] == 'Mandiri Utama Finance'
+        assert response.data[0]['total'] == str(quotation.total_after_tax)
+
+    def test_rejects_malformed_month(self, api_client, organizer):
+        api_client.force_authenticate(user=organizer)
+        response = api_client.get(ANALYTICS_URL + 'realized-margin/', {'from': '2026-13'})
+        assert response.status_code == 400
@@ -0,0 +1,130 @@
+# backend/apps/mice/tests/test_schedule.py
+
+import datetime
+
+import pytest
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from apps.mice.models import ProjectTask, TaskDependency
+from apps.mice.schedule import CycleError, Schedule, get_schedule
+
+DAY = datetime.timedelta(days=1)
+T0  = datetime.datetime(2026, 3, 2, tzinfo=datetime.timezone.utc)
+
+
+def node(key, days, status='todo', completed_at=None):
+    return {
+        'id': key, 'title': key, 'status': status, 'start_at': None,
+        'duration': days * DAY, 'completed_at': completed_at,
+    }
+
+
+@pytest.fixture
+def diamond():
+    # a ─► b ─► d
+    #  └─► c ──┘      b: 3 days, c: 1 day → c has 2 days of slack
+    return Schedule(
+        'p', [node('a', 1), node('b', 3), node('c', 1), node('d', 2)],
+        [('a', 'b', datetime.timedelta(0)), ('a', 'c', datetime.timedelta(0)),
+         ('b', 'd', datetime.timedelta(0)), ('c', 'd', datetime.timedelta(0))],
+        T0,
+    )
+
+
+class TestSchedule:
+
+    def test_forward_and_backward_pass(self, diamond):
+        assert diamond.es['d'] == T0 + 4 * DAY
+        assert diamond.finish == T0 + 6 * DAY
+        assert diamond.slack('c') == 2 * DAY
+        assert diamond.ls['c'] == T0 + 3 * DAY
+        assert diamond.critical_path() == ['a', 'b', 'd']
+
+    def test_lag_and_done_tasks(self, diamond):
+        diamond.set_edge('a', 'c', 3 * DAY)
+        assert diamond.es['c'] == T0 + 4 * DAY
+        assert diamond.es['d'] == T0 + 5 * DAY
+        assert diamond.critical_path() == ['a', 'c', 'd']
+
+        diamond.set_task(node('a', 1, status='done', completed_at=T0 - DAY))
+        assert diamond.ef['a'] == T0 - DAY
+        assert 'a' not in diamond.critical_path()
+
+    def test_incremental_matches_full_rebuild(self, diamond):
+        diamond.set_task(node('c', 5))
+        diamond.set_edge('b', 'd', None)
+        diamond.set_edge('c', 'b', DAY)
+        diamond.remove_task('a')
+        fresh = Schedule(
+            'p', [diamond.nodes[n] for n in diamond.nodes],
+            [(p, s, lag) for p in diamond.succ for s, lag in diamond.succ[p].items()],
+            T0,
+        )
+        for times in ('es', 'ef', 'ls', 'lf'):
+            assert getattr(diamond, times) == getattr(fresh, times)
+        assert diamond.finish == fresh.finish == T0 + 9 * DAY
+
+    def test_cycle_is_reported(self):
+        with pytest.raises(CycleError):
+            Schedule('p', [node('a', 1), node('b', 1)],
+                     [('a', 'b', DAY), ('b', 'a', DAY)], T0)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTaskDependencies:
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+
+    @pytest.fixture
+    def tasks(self, project):
+        return [
+            ProjectTask.objects.create(mice_project=project, title=title, duration=days * DAY)
+            for title, days in [('Venue', 2), ('Rundown', 1), ('Print', 3)]
+        ]
+
+    def test_link_refuses_cycles(self, tasks):
+        venue, rundown, printing = tasks
+        TaskDependency.link(venue, rundown)
+        TaskDependency.link(rundown, printing)
+        with pytest.raises(ValidationError, match='Venue'):
+            TaskDependency.link(printing, venue)
+        assert TaskDependency.objects.count() == 2
+
+    def test_cached_schedule_follows_changes(self, project, tasks):
+        venue, rundown, printing = tasks
+        TaskDependency.link(venue, rundown)
+        first = get_schedule(project.pk)
+        assert first.es[rundown.pk] == first.ef[venue.pk]
+
+        TaskDependency.link(rundown, printing, DAY)
+        venue.duration = 4 * DAY
+        venue.save()
+        cached = cache.get(f'mice:schedule:{project.pk}')
+        assert cached.es[printing.pk] == cached.anchor + 6 * DAY
+
+        # A bulk update bypasses the hooks — the fingerprint catches it
+        ProjectTask.objects.filter(pk=printing.pk).update(
+            duration=DAY, updated_at=printing.updated_at + DAY,
+        )
+        assert get_schedule(project.pk).finish == cached.anchor + 7 * DAY
+
+        rundown.delete()
+        assert get_schedule(project.pk).finish == cached.anchor + 4 * DAY
+
+    def test_gantt_and_dependency_api(self, api_client, organizer, project, tasks):
+        venue, rundown, printing = tasks
+        api_client.force_authenticate(user=organizer)
+        url = f'/api/v1/mice/projects/{project.pk}/dependencies/'
+        response = api_client.post(url, {'predecessor': venue.pk, 'successor': printing.pk})
+        assert response.status_code == 201
+        response = api_client.post(url, {'predecessor': printing.pk, 'successor': venue.pk})
+        assert response.status_code == 400
+
+        data = api_client.get(f'/api/v1/mice/projects/{project.pk}/gantt/').data
+        assert data['critical_path'] == [str(venue.pk), str(printing.pk)]
+        rows = {row['id']: row for row in data['tasks']}
+        assert rows[str(rundown.pk)]['slack'] == 4 * DAY
+        assert rows[str(printing.pk)]['predecessors'] == [{'id': str(venue.pk), 'lag': datetime.timedelta(0)}]
+        assert data['event_slack'] == project.event.start_date - data['finish']
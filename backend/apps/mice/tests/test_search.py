@@ -0,0 +1,88 @@
+# backend/apps/mice/tests/test_search.py
+
+import pytest
+from decimal import Decimal
+from apps.mice.models import QuotationLineItem, Vendor
+from apps.mice.search import UserLRU, recent_lookups, similarity
+
+VENDOR_URL    = '/api/v1/mice/vendors/autocomplete/'
+LINE_ITEM_URL = '/api/v1/mice/line-items/autocomplete/'
+
+
+@pytest.fixture(autouse=True)
+def _fresh_lru():
+    recent_lookups._users.clear()
+
+
+def test_similarity_matches_pg_trgm():
+    """pg_trgm: similarity('word', 'two words') = 4 / 11."""
+    assert similarity('word', 'two words') == pytest.approx(4 / 11)
+    assert similarity('sound', 'sound') == 1.0
+
+
+def test_lru_evicts_oldest_entry():
+    lru = UserLRU(per_user=2)
+    for key in ('a', 'b', 'c'):
+        lru.put(1, key, key)
+    assert lru.get(1, 'a') is None
+    assert lru.get(1, 'c') == 'c'
+
+
+@pytest.mark.django_db
+class TestVendorAutocomplete:
+
+    @pytest.fixture
+    def vendors(self, organizer, other_organizer):
+        for name in ('Bali Sound Pro', 'Balinese Catering', 'Sonic Bali'):
+            Vendor.objects.create(created_by=organizer, name=name, category='other')
+        Vendor.objects.create(created_by=other_organizer, name='Bali Secret', category='other')
+
+    def test_prefix_ranks_first_and_scoped(self, api_client, organizer, vendors):
+        api_client.force_authenticate(user=organizer)
+        response = api_client.get(VENDOR_URL, {'q': 'bali s'})
+        names = [r['name'] for r in response.data['results']]
+        assert names[0] == 'Bali Sound Pro'
+        assert 'Bali Secret' not in names
+        assert response.data['partial'] is False
+
+    def test_fuzzy_substring_fallback(self, api_client, organizer, vendors):
+        api_client.force_authenticate(user=organizer)
+        response = api_client.get(VENDOR_URL, {'q': 'sound'})
+        assert [r['name'] for r in response.data['results']][0] == 'Bali Sound Pro'
+
+    def test_repeat_lookup_served_from_lru(
+        self, api_client, organizer, vendors, django_assert_num_queries,
+    ):
+        api_client.force_authenticate(user=organizer)
+        api_client.get(VENDOR_URL, {'q': 'bali'})
+        with django_assert_num_queries(0):
+            api_client.get(VENDOR_URL, {'q': 'Bali'})
+
+    def test_vendor_write_clears_lru(self, api_client, organizer, vendors):
+        api_client.force_authenticate(user=organizer)
+        api_client.get(VENDOR_URL, {'q': 'bali'})
+        api_client.post('/api/v1/mice/vendors/', {'name': 'Bali Lights', 'category': 'other'}, format='json')
+        response = api_client.get(VENDOR_URL, {'q': 'bali'})
+        assert 'Bali Lights' in [r['name'] for r in response.data['results']]
+
+
+@pytest.mark.django_db
+class TestLineItemAutocomplete:
+
+    def test_distinct_items_at_latest_price(self, api_client, organizer, quotation, section):
+        for price in ('1000', '1200'):
+            QuotationLineItem.objects.create(
+                section=section, item_name='Sound System', detail='Main hall',
+                modal_price=Decimal(price),
+            )
+        api_client.force_authenticate(user=organizer)
+        response = api_client.get(LINE_ITEM_URL, {'q': 'sound sys'})
+        results = response.data['results']
+        assert len(results) == 1
+        assert results[0]['uses'] == 2
+        assert results[0]['modal_price'] == Decimal('1200.00')
+
+    def test_scoped_to_organizer(self, api_client, other_organizer, line_items):
+        api_client.force_authenticate(user=other_organizer)
+        response = api_client.get(LINE_ITEM_URL, {'q': 'ballroom'})
+        assert response.data['results'] == []
@@ -0,0 +1,158 @@
+# backend/apps/mice/tests/test_uploads.py
+
+import hashlib
+from datetime import timedelta
+import pytest
+from django.utils import timezone
+from apps.mice.models import AssetUpload, AssetUploadPart, ProjectAsset, UploadStatus
+from apps.mice import uploads
+
+PART = 256 * 1024
+PDF  = b'%PDF-1.7\n' + bytes(range(256)) * 2100     # a little over two parts
+
+
+def uploads_url(project):
+    return f'/api/v1/mice/projects/{project.pk}/uploads/'
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def upload(api_client, organizer, project):
+    api_client.force_authenticate(user=organizer)
+    response = api_client.post(uploads_url(project), {
+        'filename': 'rundown.pdf', 'total_size': len(PDF), 'part_size': PART,
+        'asset_type': 'sow', 'title': 'Rundown', 'client_visible': True,
+    }, format='json')
+    assert response.status_code == 201, response.data
+    assert response.data['part_count'] == 3
+    return AssetUpload.objects.get(pk=response.data['id'])
+
+
+def put_part(api_client, project, upload, number, data, **headers):
+    return api_client.generic(
+        'PUT', f'{uploads_url(project)}{upload.pk}/parts/{number}/', data,
+        content_type='application/octet-stream', **headers,
+    )
+
+
+def chunks():
+    return [PDF[i:i + PART] for i in range(0, len(PDF), PART)]
+
+
+@pytest.mark.django_db
+class TestChunkedUpload:
+
+    def test_resume_and_complete(self, api_client, project, upload, media_root):
+        first, second, third = chunks()
+        assert put_part(api_client, project, upload, 1, first).status_code == 200
+        assert put_part(api_client, project, upload, 3, third).status_code == 200
+
+        state = api_client.get(f'{uploads_url(project)}{upload.pk}/').data
+        assert [p['number'] for p in state['received']] == [1, 3]
+
+        response = put_part(
+            api_client, project, upload, 2, second,
+            HTTP_X_CONTENT_SHA256=hashlib.sha256(second).hexdigest(),
+        )
+        assert response.status_code == 200
+
+        response = api_client.post(
+            f'{uploads_url(project)}{upload.pk}/complete/',
+            {'sha256': hashlib.sha256(PDF).hexdigest()}, format='json',
+        )
+        assert response.status_code == 202, response.data
+        assert response.data['status'] == 'assembling'
+        assert not ProjectAsset.objects.exists()        # nothing read in the request
+
+        assert uploads.assemble_pending() == (1, 0)
+        state = api_client.get(f'{uploads_url(project)}{upload.pk}/').data
+        assert state['status'] == 'completed'
+        asset = ProjectAsset.objects.get(pk=state['asset']['id'])
+        assert asset.file_size == len(PDF)
+        assert asset.mime_type == 'application/pdf'
+        assert asset.client_visible and asset.asset_type == 'sow'
+        assert asset.file.read() == PDF
+
+        upload.refresh_from_db()
+        assert upload.status == UploadStatus.COMPLETED and upload.asset == asset
+        assert not AssetUploadPart.objects.exists()
+        assert not (media_root / 'mice' / 'uploads' / str(upload.pk)).exists() or \
+            not any((media_root / 'mice' / 'uploads' / str(upload.pk)).iterdir())
+
+    def test_part_checksum_and_size_are_checked(self, api_client, project, upload):
+        first = chunks()[0]
+        response = put_part(api_client, project, upload, 1, first, HTTP_X_CONTENT_SHA256='0' * 64)
+        assert response.status_code == 400
+        assert put_part(api_client, project, upload, 1, first[:-1]).status_code == 400
+        assert put_part(api_client, project, upload, 4, first).status_code == 400
+        assert not upload.parts.exists()
+
+    def test_complete_needs_every_part_and_the_right_checksum(self, api_client, project, upload, media_root):
+        for number, data in enumerate(chunks()[:2], start=1):
+            put_part(api_client, project, upload, number, data)
+        url = f'{uploads_url(project)}{upload.pk}/complete/'
+        response = api_client.post(url, {'sha256': hashlib.sha256(PDF).hexdigest()}, format='json')
+        assert response.status_code == 400 and 'Missing parts: 3' in response.data['detail']
+
+        put_part(api_client, project, upload, 3, chunks()[2])
+        assert api_client.post(url, {'sha256': 'not hex'}, format='json').status_code == 400
+        assert api_client.post(url, {'sha256': 'f' * 64}, format='json').status_code == 202
+        assert api_client.post(url, {'sha256': 'f' * 64}, format='json').status_code == 400
+        assert api_client.delete(f'{uploads_url(project)}{upload.pk}/').status_code == 400
+
+        # A mismatch sends the upload back to the client, and stores nothing
+        assert uploads.assemble_pending() == (0, 1)
+        state = api_client.get(f'{uploads_url(project)}{upload.pk}/').data
+        assert state['status'] == 'active' and 'Checksum mismatch' in state['error']
+        assert not ProjectAsset.objects.exists()
+        assert not [p for p in (media_root / 'mice' / 'blobs').rglob('*') if p.is_file()]
+
+    def test_claimed_duplicate_must_match_the_stored_content(self, api_client, project, organizer):
+        api_client.force_authenticate(user=organizer)
+        digest = hashlib.sha256(PDF).hexdigest()
+        for content in (PDF, PDF[::-1]):
+            upload = uploads.initiate(project, organizer, 'rundown.pdf', len(content), part_size=PART)
+            for number, start in enumerate(range(0, len(content), PART), start=1):
+                put_part(api_client, project, upload, number, content[start:start + PART])
+            uploads.complete(upload, digest)
+        # Knowing an existing file's hash does not get a reference to it
+        assert uploads.assemble_pending() == (1, 1)
+        assert ProjectAsset.objects.get().blob.ref_count == 1
+
+    def test_other_organizer_cannot_see_upload(self, api_client, project, upload, other_organizer):
+        api_client.force_authenticate(user=other_organizer)
+        assert api_client.get(f'{uploads_url(project)}{upload.pk}/').status_code == 404
+        assert put_part(api_client, project, upload, 1, chunks()[0]).status_code == 404
+
+    def test_sweep_removes_expired_and_aborted(self, api_client, project, upload, organizer):
+        put_part(api_client, project, upload, 1, chunks()[0])
+        other = uploads.initiate(project, organizer, 'b.pdf', 10)
+        assert api_client.delete(f'{uploads_url(project)}{other.pk}/').status_code == 204
+
+        assert uploads.sweep() == 1
+        assert AssetUpload.objects.filter(pk=upload.pk).exists()
+
+        AssetUpload.objects.filter(pk=upload.pk).update(expires_at=timezone.now() - timedelta(minutes=1))
+        assert uploads.sweep() == 1
+        assert not AssetUpload.objects.exists() and not AssetUploadPart.objects.exists()
+
+    def test_duplicate_content_reuses_blob(self, api_client, project, organizer, media_root):
+        api_client.force_authenticate(user=organizer)
+        digest = hashlib.sha256(PDF).hexdigest()
+        assets = []
+        for _ in range(2):
+            upload = uploads.initiate(project, organizer, 'rundown.pdf', len(PDF), part_size=PART)
+            for number, data in enumerate(chunks(), start=1):
+                put_part(api_client, project, upload, number, data)
+            uploads.complete(upload, digest)
+            assert uploads.assemble_pending() == (1, 0)
+            upload.refresh_from_db()
+            assets.append(upload.asset)
+        assert assets[0].blob_id == assets[1].blob_id == digest
+        assert assets[1].blob.ref_count == 2
+        assert len([p for p in (media_root / 'mice' / 'blobs').rglob('*') if p.is_file()]) == 1
@@ -0,0 +1,177 @@
+# backend/apps/mice/tests/test_views.py
+
+import pytest
+from decimal import Decimal
+from rest_framework import status
+from apps.mice.models import Quotation, QuotationLineItem, QuotationSection, QuotationStatus
+from apps.notifications.models import OutboxMessage
+
+
+@pytest.mark.django_db
+class TestQuotationBatchLineItems:
+    """PATCH /api/v1/mice/quotations/{id}/line-items/"""
+
+    def url(self, quotation):
+        return f'/api/v1/mice/quotations/{quotation.pk}/line-items/'
+
+    def test_batch_update_create_delete(self, api_client, organizer, quotation, section, line_items):
+        other = QuotationSection.objects.create(quotation=quotation, name='Entertainment', sort_order=1)
+        api_client.force_authenticate(user=organizer)
+        payload = {
+            'update': [
+                {'id': str(line_items[0].pk), 'qty': '3'},
+                {'id': str(line_items[1].pk), 'margin_pct': '0.20', 'section': str(other.pk)},
+            ],
+            'create': [
+                {'section': str(other.pk), 'item_name': 'Band', 'modal_price': '15000000'},
+            ],
+            'delete': [str(line_items[2].pk)],
+        }
+
+        response = api_client.patch(self.url(quotation), payload, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['updated']) == 2
+        assert len(response.data['created']) == 1
+        assert response.data['deleted'] == [str(line_items[2].pk)]
+        assert not QuotationLineItem.objects.filter(pk=line_items[2].pk).exists()
+
+        moved = QuotationLineItem.objects.get(pk=line_items[1].pk)
+        assert moved.section_id == other.pk
+        assert moved.margin_amt == Decimal('70000.00')
+
+        # Stored totals must equal a from-scratch recalculation
+        totals = response.data['totals']
+        quotation.recalculate()
+        assert Decimal(totals['total_after_tax']) == quotation.total_after_tax
+        assert Decimal(totals['net_margin']) == quotation.net_margin
+        section.refresh_from_db()
+        assert section.subtotal_modal == Decimal('75000000.00')
+
+    def test_batch_recalculates_quotation_once(self, api_client, organizer, quotation, section, line_items, monkeypatch):
+        calls = []
+        original = Quotation.recalculate
+        monkeypatch.setattr(Quotation, 'recalculate', lambda self: calls.append(1) or original(self))
+        api_client.force_authenticate(user=organizer)
+        payload = {'update': [{'id': str(item.pk), 'qty': '4'} for item in line_items]}
+
+        response = api_client.patch(self.url(quotation), payload, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(calls) == 1
+
+    def test_batch_rejects_foreign_section(self, api_client, organizer, quotation, line_items, project):
+        foreign = QuotationSection.objects.create(
+            quotation=Quotation.objects.create(mice_project=project, revision=2), name='Other',
+        )
+        api_client.force_authenticate(user=organizer)
+        payload = {'create': [{'section': str(foreign.pk), 'item_name': 'X', 'modal_price': '1'}]}
+
+        response = api_client.patch(self.url(quotation), payload, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not QuotationLineItem.objects.filter(item_name='X').exists()
+
+    def test_batch_requires_ownership(self, api_client, other_organizer, quotation, line_items):
+        api_client.force_authenticate(user=other_organizer)
+        payload = {'delete': [str(line_items[0].pk)]}
+
+        response = api_client.patch(self.url(quotation), payload, format='json')
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestQuotationDiff:
+    """Revision diff — organizer and client portal variants"""
+
+    @pytest.fixture
+    def revisions(self, quotation, section, line_items):
+        quotation.refresh_from_db()
+        rev2 = quotation.create_revision()
+        items = {i.item_name: i for i in QuotationLineItem.objects.filter(section__quotation=rev2)}
+        items['Catering'].qty = Decimal('5')
+        items['Catering'].save()
+        items['Sound System'].delete()
+        new_section = rev2.sections.get()
+        QuotationLineItem.objects.create(section=new_section, item_name='LED Screen', modal_price=Decimal('9000000'))
+        rev2.refresh_from_db()
+        return quotation, rev2
+
+    def test_create_revision_keeps_lineage(self, quotation, section, line_items):
+        rev2 = quotation.create_revision()
+        original = set(QuotationLineItem.objects.filter(section__quotation=quotation).values_list('lineage_id', flat=True))
+        cloned = set(QuotationLineItem.objects.filter(section__quotation=rev2).values_list('lineage_id', flat=True))
+        assert original == cloned
+        assert rev2.sections.get().lineage_id == section.lineage_id
+
+    def test_organizer_diff(self, api_client, organizer, project, revisions, django_assert_max_num_queries):
+        rev1, rev2 = revisions
+        api_client.force_authenticate(user=organizer)
+
+        with django_assert_max_num_queries(2):
+            response = api_client.get(f'/api/v1/mice/projects/{project.pk}/quotation-diff/?base=1&target=2')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['summary'] == {'added': 1, 'removed': 1, 'changed': 1, 'unchanged': 1}
+        changed = response.data['items']['changed'][0]
+        assert changed['item_name'] == 'Catering'
+        assert changed['changes']['qty'] == {'base': '2.00', 'target': '5.00'}
+        assert 'total_modal' in changed['changes']
+        delta = Decimal(response.data['totals']['total_after_tax']['delta'])
+        assert delta == rev2.total_after_tax - rev1.total_after_tax
+        assert response.data['sections'][0]['status'] == 'changed'
+
+    def test_client_diff_hides_internal_pricing(self, api_client, revisions):
+        rev1, rev2 = revisions
+        rev1.send_to_client()
+        rev2.send_to_client()
+
+        response = api_client.get(f'/api/v1/mice/quotation/portal/{rev2.client_token}/diff/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['base']['revision'] == 1
+        body = str(response.data)
+        for secret in ('modal_price', 'margin', 'pph', 'subtotal_modal', 'sodaqoh'):
+            assert secret not in body
+
+    def test_client_diff_needs_revisions_the_client_received(self, api_client, revisions):
+        rev1, rev2 = revisions
+        rev2.send_to_client()
+        Quotation.objects.filter(pk=rev1.pk).update(status=QuotationStatus.SUPERSEDED)
+
+        url = f'/api/v1/mice/quotation/portal/{rev2.client_token}/diff/'
+        assert api_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+        rev1.send_to_client()
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+
+        Quotation.objects.filter(pk=rev2.pk).update(status=QuotationStatus.SENT, sent_at=None)
+        assert api_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_client_diff_blocks_drafts(self, api_client, revisions):
+        _, rev2 = revisions
+
+        response = api_client.get(f'/api/v1/mice/quotation/portal/{rev2.client_token}/diff/')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestQuotationEmails:
+
+    def test_send_and_approve_queue_outbox_messages(self, api_client, organizer, project, quotation):
+        project.client_email = 'sari@client.test'
+        project.save()
+        api_client.force_authenticate(user=organizer)
+
+        response = api_client.post(f'/api/v1/mice/quotations/{quotation.pk}/send_to_client/')
+        assert response.status_code == status.HTTP_200_OK
+        sent = OutboxMessage.objects.get(kind='quotation_sent')
+        assert sent.recipient == 'sari@client.test'
+        assert quotation.client_token in sent.body
+
+        response = api_client.post(f'/api/v1/mice/quotation/portal/{quotation.client_token}/approve/')
+        assert response.status_code == status.HTTP_200_OK
+        approved = OutboxMessage.objects.get(kind='quotation_approved')
+        assert approved.recipient == organizer.email and approved.digest
+
@@ -0,0 +1,86 @@
+# backend/apps/mice/tests/test_workload.py
+
+import datetime
+
+import pytest
+from django.utils import timezone
+from apps.users.models import User
+from apps.mice.models import MICEProject, ProjectTask
+from apps.mice.workload import workload
+
+DAY = datetime.timedelta(days=1)
+
+
+@pytest.fixture
+def crew():
+    return User.objects.create_user(
+        username='crew', email='crew@test.com', password='testpass123',
+        first_name='Made', last_name='Wira',
+    )
+
+
+@pytest.fixture
+def other_project(event, other_organizer):
+    event.pk, event.slug = None, 'other-gathering'
+    event.organizer = other_organizer
+    event.save()
+    return MICEProject.objects.create(
+        event=event, organizer=other_organizer, client_company='Bank Jaya', client_pic='Pak Adi',
+    )
+
+
+@pytest.fixture
+def tasks(project, other_project, crew, organizer):
+    now = timezone.now()
+    made = []
+    for mice_project, title, due, task_status, assignee in [
+        (project,       'Site visit',    now - DAY,      'todo',         crew),
+        (project,       'Rundown',       now + DAY,      'in_progress',  crew),
+        (project,       'Print banners', now + 9 * DAY,  'blocked',      crew),
+        (project,       'Invoice',       None,           'todo',         crew),
+        (project,       'Catering',      now + DAY,      'done',         crew),
+        (other_project, 'Sound check',   now + 2 * DAY,  'todo',         crew),
+        (project,       'Venue',         now + 3 * DAY,  'todo',         organizer),
+    ]:
+        made.append(ProjectTask.objects.create(
+            mice_project=mice_project, title=title, due_at=due,
+            status=task_status, assigned_to=assignee,
+        ))
+    return made
+
+
+@pytest.mark.django_db
+class TestWorkload:
+
+    def test_counts_and_histogram(self, tasks, crew):
+        now   = timezone.now()
+        rows  = workload(ProjectTask.objects.all(), bucket='day', periods=14, now=now)
+        first = rows[0]
+        assert first['assignee'] == crew.pk and first['name'] == 'Made Wira'
+        assert (first['open'], first['overdue'], first['blocked'], first['unscheduled']) == (5, 1, 1, 1)
+        assert sum(b['tasks'] for b in first['load']) == 3
+        assert first['load'][1]['duration'] == DAY
+        assert rows[1]['open'] == 1
+
+    def test_crew_member_sees_own_tasks_across_projects(self, api_client, tasks, crew):
+        api_client.force_authenticate(user=crew)
+        data = api_client.get('/api/v1/mice/tasks/workload/', {'assignee': 'me'}).data
+        assert [row['open'] for row in data['assignees']] == [5]
+
+        columns = api_client.get('/api/v1/mice/tasks/board/', {'assignee': 'me', 'limit': 1}).data
+        todo = columns[0]
+        assert (todo['status'], todo['count'], todo['pages']) == ('todo', 3, 3)
+        assert todo['tasks'][0]['title'] == 'Site visit'
+        assert {t['project_name'] for c in columns for t in c['tasks']} <= {'Mandiri Utama Finance', 'Bank Jaya'}
+
+        page = api_client.get(
+            '/api/v1/mice/tasks/board/', {'assignee': 'me', 'limit': 1, 'status': 'todo', 'page': 2},
+        ).data
+        assert [c['status'] for c in page] == ['todo']
+        assert page[0]['tasks'][0]['title'] == 'Sound check'
+
+    def test_organizer_scope_excludes_other_projects(self, api_client, tasks, organizer):
+        api_client.force_authenticate(user=organizer)
+        data = api_client.get('/api/v1/mice/tasks/workload/').data
+        assert sorted(row['open'] for row in data['assignees']) == [1, 4]
+        assert api_client.get('/api/v1/mice/tasks/workload/', {'bucket': 'month'}).status_code == 400
@@ -0,0 +1,372 @@
+# =============================================================================
+# apps/mice/uploads.py
+# =============================================================================
+# Resumable chunked uploads for ProjectAsset files.
+#
+#   initiate  → AssetUpload row with part size / count and an expiry
+#   part n    → the request body is streamed straight into storage at
+#               mice/uploads/<id>/<n>, hashed and counted on the way through
+#   complete  → checks every part is there, records the client's whole-file
+#               SHA-256 and marks the upload `assembling` — no file is read
+#   assemble  → a worker (sweep_asset_uploads) reads the parts once, in
+#               order: new content is hashed while it is written to the blob
+#               store (apps/mice/blobs.py) and kept only if it matches;
+#               content already stored is hashed to prove it. The ProjectAsset
+#               is then created with file_size and mime_type from the bytes.
+#               On a mismatch the upload goes back to `active` with an error
+#   sweep     → expired or aborted uploads lose their parts and rows
+#
+# Nothing ever holds more than READ_CHUNK bytes of a file in memory, and no
+# request reads a whole file back.
+# =============================================================================
+
+import hashlib
+import mimetypes
+import os
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from . import blobs
+from .models import AssetBlob, AssetUpload, AssetUploadPart, ProjectAsset, UploadStatus
+
+READ_CHUNK = 1024 * 1024
+
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+MIN_PART_SIZE     = 256 * 1024
+MAX_PART_SIZE     = 64 * 1024 * 1024
+SHA256_RE         = re.compile(r'^[0-9a-f]{64}$')
+
+
+class UploadError(ValueError):
+    pass
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def asset_storage():
+    return ProjectAsset._meta.get_field('file').storage
+
+
+# ── Streaming helpers ─────────────────────────────────────────────────────────
+
+class HashingReader:
+    """
+    File-like wrapper that hashes and counts what is read through it and
+    refuses to yield more than `limit` bytes.
+    """
+
+    def __init__(self, stream, limit=None):
+        self.stream = stream
+        self.limit  = limit
+        self.size   = 0
+        self.digest = hashlib.sha256()
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = READ_CHUNK
+        chunk = self.stream.read(size)
+        self.size += len(chunk)
+        if self.limit is not None and self.size > self.limit:
+            raise UploadError(f'Part is larger than the expected {self.limit} bytes')
+        self.digest.update(chunk)
+        return chunk
+
+    def hexdigest(self):
+        return self.digest.hexdigest()
+
+    def close(self):
+        if hasattr(self.stream, 'close'):
+            self.stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class PartsReader:
+    """Reads stored parts back-to-back as one stream, one file open at a time."""
+
+    def __init__(self, storage, paths):
+        self.storage = storage
+        self.paths   = list(paths)
+        self.current = None
+
+    def read(self, size=-1):
+        while True:
+            if self.current is None:
+                if not self.paths:
+                    return b''
+                self.current = self.storage.open(self.paths.pop(0), 'rb')
+            chunk = self.current.read(size if size and size > 0 else READ_CHUNK)
+            if chunk:
+                return chunk
+            self.current.close()
+            self.current = None
+
+    def close(self):
+        if self.current is not None:
+            self.current.close()
+            self.current = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# ── MIME sniffing ─────────────────────────────────────────────────────────────
+
+_SIGNATURES = [
+    (b'%PDF-',              'application/pdf'),
+    (b'\x89PNG\r\n\x1a\n',  'image/png'),
+    (b'\xff\xd8\xff',       'image/jpeg'),
+    (b'GIF87a',             'image/gif'),
+    (b'GIF89a',             'image/gif'),
+    (b'glTF',               'model/gltf-binary'),
+    (b'ID3',                'audio/mpeg'),
+    (b'\x1a\x45\xdf\xa3',   'video/webm'),
+]
+
+
+def sniff_mime(head, filename):
+    """
+    MIME type from the file's first bytes, falling back to the extension.
+    Containers (ZIP, RIFF, ISO-BMFF) defer to the extension when it agrees.
+    """
+    guessed = mimetypes.guess_type(filename)[0]
+    for magic, mime in _SIGNATURES:
+        if head.startswith(magic):
+            return mime
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    if head[4:8] == b'ftyp':
+        if guessed and guessed.split('/')[0] in ('video', 'audio', 'image'):
+            return guessed
+        return 'video/quicktime' if head[8:10] == b'qt' else 'video/mp4'
+    if head.startswith(b'PK\x03\x04'):
+        # docx / xlsx / pptx / key visual bundles are ZIPs underneath
+        return guessed or 'application/zip'
+    return guessed or 'application/octet-stream'
+
+
+# ── Lifecycle ─────────────────────────────────────────────────────────────────
+
+def initiate(project, user, filename, total_size, part_size=None, **asset_fields):
+    """Open an upload for `project`. Returns the AssetUpload."""
+    # ProjectAsset.file_size is a PositiveIntegerField
+    max_size = _setting('MICE_UPLOAD_MAX_SIZE', 2 ** 31 - 1)
+    if total_size <= 0 or total_size > max_size:
+        raise UploadError(f'total_size must be between 1 and {max_size} bytes')
+
+    part_size = part_size or _setting('MICE_UPLOAD_PART_SIZE', DEFAULT_PART_SIZE)
+    if part_size > MAX_PART_SIZE or (part_size < MIN_PART_SIZE and part_size < total_size):
+        raise UploadError(
+            f'part_size must be between {MIN_PART_SIZE} and {MAX_PART_SIZE} bytes'
+        )
+
+    ttl = _setting('MICE_UPLOAD_TTL_HOURS', 24)
+    return AssetUpload.objects.create(
+        mice_project    = project,
+        uploaded_by     = user,
+        filename        = os.path.basename(filename),
+        total_size      = total_size,
+        part_size       = min(part_size, total_size),
+        expires_at      = timezone.now() + timedelta(hours=ttl),
+        **asset_fields,
+    )
+
+
+def _check_active(upload):
+    if upload.status != UploadStatus.ACTIVE:
+        raise UploadError(f'Upload is {upload.status}')
+    if upload.expires_at <= timezone.now():
+        raise UploadError('Upload has expired')
+
+
+def store_part(upload, number, stream, sha256=None):
+    """
+    Stream one part into storage. Re-sending a part replaces it, so a
+    client resumes by re-sending whatever GET …/uploads/{id}/ lists as
+    missing. Returns the AssetUploadPart.
+    """
+    _check_active(upload)
+    if not 1 <= number <= upload.part_count:
+        raise UploadError(f'Part number must be between 1 and {upload.part_count}')
+
+    storage  = asset_storage()
+    expected = upload.expected_part_size(number)
+    path     = f'{upload.storage_prefix}/{number:05d}'
+    if storage.exists(path):
+        storage.delete(path)
+
+    reader = HashingReader(stream, limit=expected)
+    try:
+        saved = storage.save(path, File(reader, name=path))
+    except UploadError:
+        if storage.exists(path):
+            storage.delete(path)
+        raise
+
+    error = None
+    if reader.size != expected:
+        error = f'Part {number} must be {expected} bytes, got {reader.size}'
+    elif sha256 and sha256.lower() != reader.hexdigest():
+        error = f'Part {number} checksum mismatch'
+    if error:
+        storage.delete(saved)
+        raise UploadError(error)
+
+    part, _ = AssetUploadPart.objects.update_or_create(
+        upload=upload, number=number,
+        defaults={'size': reader.size, 'sha256': reader.hexdigest(), 'path': saved},
+    )
+    AssetUpload.objects.filter(pk=upload.pk).update(updated_at=timezone.now())
+    return part
+
+
+def complete(upload, sha256):
+    """
+    Hand a fully received upload to the assembly worker, to be checked
+    against the whole-file `sha256`. Returns the upload, now `assembling`.
+    """
+    _check_active(upload)
+    sha256 = (sha256 or '').lower()
+    if not SHA256_RE.match(sha256):
+        raise UploadError('sha256 must be 64 hex digits')
+    numbers = set(upload.parts.values_list('number', flat=True))
+    missing = sorted(set(range(1, upload.part_count + 1)) - numbers)
+    if missing:
+        raise UploadError(f'Missing parts: {", ".join(map(str, missing))}')
+
+    if not AssetUpload.objects.filter(pk=upload.pk, status=UploadStatus.ACTIVE).update(
+        status=UploadStatus.ASSEMBLING, sha256=sha256, error='', updated_at=timezone.now(),
+    ):
+        upload.refresh_from_db(fields=['status'])
+        raise UploadError(f'Upload is {upload.status}')
+    upload.status, upload.sha256, upload.error = UploadStatus.ASSEMBLING, sha256, ''
+    return upload
+
+
+def assemble(upload):
+    """
+    Store an `assembling` upload's parts as its ProjectAsset, reading them
+    once. Returns the asset, or None when the content does not match the
+    checksum (the upload is then `active` again, with `error` set).
+    Call with the upload's row locked.
+    """
+    storage = asset_storage()
+    paths   = list(upload.parts.order_by('number').values_list('path', flat=True))
+    readers = []
+
+    def open_parts():
+        readers.append(HashingReader(PartsReader(storage, paths), limit=upload.total_size))
+        return readers[-1]
+
+    def verify():
+        reader = readers[-1]
+        if reader.size != upload.total_size or reader.hexdigest() != upload.sha256:
+            raise UploadError('Checksum mismatch — re-send the affected parts and complete again')
+
+    try:
+        if AssetBlob.objects.filter(pk=upload.sha256).exists():
+            # Identical content is stored already — prove these parts are it
+            with open_parts() as reader:
+                while reader.read(READ_CHUNK):
+                    pass
+            verify()
+        blob = blobs.acquire(upload.sha256, upload.total_size, open_parts, check=verify)
+    except UploadError as e:
+        AssetUpload.objects.filter(pk=upload.pk).update(
+            status=UploadStatus.ACTIVE, error=str(e), updated_at=timezone.now(),
+        )
+        upload.status, upload.error = UploadStatus.ACTIVE, str(e)
+        return None
+
+    with storage.open(paths[0], 'rb') as first:
+        head = first.read(512)
+    asset = ProjectAsset.objects.create(
+        mice_project    = upload.mice_project,
+        uploaded_by     = upload.uploaded_by,
+        sub_event       = upload.sub_event,
+        asset_type      = upload.asset_type,
+        title           = upload.title,
+        description     = upload.description,
+        version         = upload.version,
+        client_visible  = upload.client_visible,
+        mime_type       = sniff_mime(head, upload.filename),
+        blob            = blob,
+        file            = blob.file.name,
+        file_size       = blob.size,
+    )
+    AssetUpload.objects.filter(pk=upload.pk).update(
+        status=UploadStatus.COMPLETED, asset=asset, updated_at=timezone.now(),
+    )
+    _discard_parts(upload)
+    upload.status, upload.asset = UploadStatus.COMPLETED, asset
+    return asset
+
+
+def assemble_pending(limit=None):
+    """
+    Assemble `assembling` uploads one at a time, each under its row lock
+    so several workers can share the queue. Returns (completed, failed).
+    """
+    completed = failed = 0
+    while limit is None or completed + failed < limit:
+        with transaction.atomic():
+            upload = (
+                AssetUpload.objects.select_for_update(skip_locked=True)
+                .filter(status=UploadStatus.ASSEMBLING)
+                .order_by('updated_at').first()
+            )
+            if upload is None:
+                break
+            if assemble(upload) is None:
+                failed += 1
+            else:
+                completed += 1
+    return completed, failed
+
+
+def _discard_parts(upload):
+    storage = asset_storage()
+    for path in upload.parts.values_list('path', flat=True):
+        storage.delete(path)
+    upload.parts.all().delete()
+
+
+def abort(upload):
+    """Discard the parts; the row is removed by the next sweep."""
+    with transaction.atomic():
+        _discard_parts(upload)
+        AssetUpload.objects.filter(pk=upload.pk).update(
+            status=UploadStatus.ABORTED, updated_at=timezone.now(),
+        )
+    upload.status = UploadStatus.ABORTED
+
+
+def sweep(now=None):
+    """
+    Delete expired active uploads and aborted ones, parts included.
+    Returns the number of uploads removed.
+    """
+    now   = now or timezone.now()
+    stale = AssetUpload.objects.filter(status=UploadStatus.ACTIVE, expires_at__lte=now) | \
+            AssetUpload.objects.filter(status=UploadStatus.ABORTED)
+    removed = 0
+    for upload in stale.iterator():
+        with transaction.atomic():
+            _discard_parts(upload)
+            upload.delete()
+        removed += 1
+    return removed
@@ -13,11 +13,19 @@ from .views import (
     QuotationSectionViewSet,
     QuotationLineItemViewSet,
     ProjectTaskViewSet,
+    TaskDependencyViewSet,
     ProjectAssetViewSet,
+    AssetUploadViewSet,
     VendorViewSet,
+    FinancialAnalyticsViewSet,
     quotation_client_portal,
     quotation_client_approve,
+    quotation_client_diff,
+    quotation_client_assets,
+    quotation_client_asset_bundle,
+    line_item_autocomplete,
 )
+from .media import asset_media
 
 # ── Root router ───────────────────────────────────────────────────────────────
 router = DefaultRouter()
@@ -26,12 +34,15 @@ router.register(r'quotations',  QuotationViewSet,   basename='mice-quotation')
 router.register(r'vendors',     VendorViewSet,      basename='mice-vendor')
 router.register(r'tasks',       ProjectTaskViewSet, basename='mice-task')
 router.register(r'assets',      ProjectAssetViewSet,basename='mice-asset')
+router.register(r'analytics',   FinancialAnalyticsViewSet, basename='mice-analytics')
 
 # ── Nested: projects → sub-events ────────────────────────────────────────────
 projects_router = nested_routers.NestedDefaultRouter(router, r'projects', lookup='project')
 projects_router.register(r'sub-events', SubEventViewSet, basename='project-sub-events')
 projects_router.register(r'tasks',      ProjectTaskViewSet, basename='project-tasks')
+projects_router.register(r'dependencies', TaskDependencyViewSet, basename='project-dependencies')
 projects_router.register(r'assets',     ProjectAssetViewSet, basename='project-assets')
+projects_router.register(r'uploads',    AssetUploadViewSet, basename='project-uploads')
 
 # ── Nested: quotations → sections ────────────────────────────────────────────
 quotations_router = nested_routers.NestedDefaultRouter(router, r'quotations', lookup='quotation')
@@ -49,6 +60,15 @@ urlpatterns = [
     path('', include(quotations_router.urls)),
     path('', include(sections_router.urls)),
 
+    path(
+        'line-items/autocomplete/',
+        line_item_autocomplete,
+        name='line-item-autocomplete',
+    ),
+
+    # Signed asset media — the token is the authorization
+    path('media/<str:token>/', asset_media, name='asset-media'),
+
     # Public client portal — no auth required
     path(
         'quotation/portal/<str:token>/',
@@ -60,4 +80,19 @@ urlpatterns = [
         quotation_client_approve,
         name='quotation-portal-approve',
     ),
+    path(
+        'quotation/portal/<str:token>/diff/',
+        quotation_client_diff,
+        name='quotation-portal-diff',
+    ),
+    path(
+        'quotation/portal/<str:token>/assets/',
+        quotation_client_assets,
+        name='quotation-portal-assets',
+    ),
+    path(
+        'quotation/portal/<str:token>/assets/bundle/',
+        quotation_client_asset_bundle,
+        name='quotation-portal-asset-bundle',
+    ),
 ]
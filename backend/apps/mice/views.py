@@ -2,19 +2,25 @@
 # apps/mice/views.py
 # =============================================================================
 
+import datetime
+import io
+
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from rest_framework import viewsets, generics, status, permissions
+from rest_framework import viewsets, generics, mixins, status, permissions
 from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 
 from .models import (
     MICEProject, SubEvent, Quotation, QuotationSection,
-    QuotationLineItem, ProjectTask, ProjectAsset, Vendor,
-    ProjectStatus, QuotationStatus,
+    QuotationLineItem, ProjectTask, TaskDependency, ProjectAsset, Vendor,
+    AssetUpload, ProjectStatus, QuotationStatus, RollupMetric, TaskStatus, UploadStatus,
 )
 from .serializers import (
     MICEProjectListSerializer, MICEProjectDetailSerializer,
@@ -23,10 +29,27 @@ from .serializers import (
     QuotationCreateSerializer, QuotationSummarySerializer,
     SectionCreateSerializer, SectionOrganizerSerializer,
     LineItemCreateSerializer, LineItemOrganizerSerializer,
-    SubEventSerializer, ProjectTaskSerializer,
-    ProjectAssetSerializer, VendorSerializer,
+    LineItemBatchSerializer, PricingSimulationSerializer,
+    SubEventSerializer, ProjectTaskSerializer, TaskDependencySerializer, BoardTaskSerializer,
+    ProjectAssetSerializer, ProjectAssetClientSerializer,
+    VendorSerializer, VendorRateSerializer,
+    AssetUploadInitiateSerializer, AssetUploadSerializer,
 )
 from .permissions import IsMICEProjectOrganizer
+from .ordering import SortOrderMixin
+from .pricing import QuotationPricer
+from .diff import diff_quotations, load_revision_pair
+from .price_index import refresh_price_index, suggest_rates
+from .search import autocomplete_line_items, autocomplete_vendors, recent_lookups
+from . import asset_hub, bundles, rollups, schedule, uploads, workload
+
+
+def _limit_param(request, default, maximum):
+    """?limit= clamped to 1…maximum; None when it is not an integer."""
+    try:
+        return min(max(int(request.query_params.get('limit', default)), 1), maximum)
+    except ValueError:
+        return None
 
 
 # ── MICEProject ───────────────────────────────────────────────────────────────
@@ -88,7 +111,6 @@ class MICEProjectViewSet(viewsets.ModelViewSet):
         project = self.get_object()
         quotation = project.active_quotation
         tasks = project.tasks.all()
-        now = timezone.now()
 
         return Response({
             'project': MICEProjectListSerializer(project, context={'request': request}).data,
@@ -97,15 +119,56 @@ class MICEProjectViewSet(viewsets.ModelViewSet):
                 'total':        tasks.count(),
                 'done':         tasks.filter(status='done').count(),
                 'in_progress':  tasks.filter(status='in_progress').count(),
-                'overdue':      tasks.filter(
-                    status__in=['todo', 'in_progress'], due_at__lt=now
-                ).count(),
+                'overdue':      tasks.filter(is_overdue=True).count(),
             },
             'sub_events': SubEventSerializer(
                 project.sub_events.filter(is_active=True), many=True
             ).data,
         })
 
+    @action(detail=True, methods=['get'])
+    def gantt(self, request, pk=None):
+        """
+        GET /api/v1/mice/projects/{id}/gantt/
+        Critical-path schedule: earliest/latest start and finish, slack and
+        predecessors per task, the critical path and the buffer before the
+        event starts.
+        """
+        project = get_object_or_404(
+            MICEProject.objects.select_related('event'), pk=pk, organizer=request.user,
+        )
+        try:
+            return Response(schedule.gantt(project))
+        except schedule.CycleError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_409_CONFLICT)
+
+    @action(detail=True, methods=['get'], url_path='quotation-diff')
+    def quotation_diff(self, request, pk=None):
+        """
+        GET /api/v1/mice/projects/{id}/quotation-diff/?base=2&target=3
+        Organizer diff between two revisions — full internal pricing.
+        """
+        try:
+            base_rev   = int(request.query_params['base'])
+            target_rev = int(request.query_params['target'])
+        except (KeyError, ValueError):
+            return Response(
+                {'detail': 'base and target revision numbers are required'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            base, target = load_revision_pair(
+                Quotation.objects.filter(
+                    mice_project_id=pk, mice_project__organizer=request.user,
+                ),
+                base_rev, target_rev,
+            )
+        except (Quotation.DoesNotExist, DjangoValidationError):
+            return Response(
+                {'detail': 'Revision not found'}, status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(diff_quotations(base, target))
+
 # =============================================================================
 # PATCH 2: Add to apps/mice/views.py
 # Add this action INSIDE MICEProjectViewSet class, after the `dashboard` action
@@ -135,10 +198,11 @@ class MICEProjectViewSet(viewsets.ModelViewSet):
 
 # ── SubEvent ──────────────────────────────────────────────────────────────────
 
-class SubEventViewSet(viewsets.ModelViewSet):
+class SubEventViewSet(SortOrderMixin, viewsets.ModelViewSet):
     """
     Nested under MICEProject.
     /api/v1/mice/projects/{project_id}/sub-events/
+    /api/v1/mice/projects/{project_id}/sub-events/reorder/ and /move/
     """
     serializer_class    = SubEventSerializer
     permission_classes  = [IsAuthenticated]
@@ -201,6 +265,163 @@ class QuotationViewSet(viewsets.ModelViewSet):
             QuotationOrganizerSerializer(quotation, context={'request': request}).data
         )
 
+    @action(detail=True, methods=['patch'], url_path='line-items')
+    def batch_line_items(self, request, pk=None):
+        """
+        PATCH /api/v1/mice/quotations/{id}/line-items/
+        Body: {
+          "update": [ {"id": "uuid", "qty": 3, ...}, ... ],
+          "create": [ {"section": "uuid", "item_name": "...", ...}, ... ],
+          "delete": [ "uuid", ... ]
+        }
+        Applies a grid edit in one transaction: derived prices are computed
+        in memory, rows are written with bulk_update/bulk_create, and each
+        touched section plus the quotation is recalculated exactly once.
+        Returns only the changed rows and the new totals.
+        """
+        quotation = get_object_or_404(
+            Quotation, pk=pk, mice_project__organizer=request.user,
+        )
+        payload = LineItemBatchSerializer(data=request.data)
+        payload.is_valid(raise_exception=True)
+        updates = payload.validated_data['update']
+        creates = payload.validated_data['create']
+        deletes = payload.validated_data['delete']
+
+        sections = {s.pk: s for s in quotation.sections.all()}
+        for s in sections.values():
+            s.quotation = quotation
+
+        vendor_ids = {
+            row['vendor_id'] for row in updates + creates if row.get('vendor_id')
+        }
+        vendors = {
+            v.pk: v for v in Vendor.objects.filter(pk__in=vendor_ids, created_by=request.user)
+        }
+        errors = {}
+        unknown_vendors = vendor_ids - set(vendors)
+        if unknown_vendors:
+            errors['vendor'] = [f'Unknown vendor: {v}' for v in unknown_vendors]
+        unknown_sections = {
+            row['section_id'] for row in updates + creates if 'section_id' in row
+        } - set(sections)
+        if unknown_sections:
+            errors['section'] = [f'Section not in this quotation: {s}' for s in unknown_sections]
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        touched = set()
+        now     = timezone.now()
+
+        with transaction.atomic():
+            items = {
+                item.pk: item for item in QuotationLineItem.objects.filter(
+                    pk__in=[row['id'] for row in updates],
+                    section__quotation=quotation,
+                ).select_related('vendor').select_for_update(of=('self',))
+            }
+            missing = [str(row['id']) for row in updates if row['id'] not in items]
+            if missing:
+                return Response(
+                    {'update': [f'Unknown line item: {i}' for i in missing]},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            # ── Deletes — one DELETE, no per-row cascade ──────────────────────
+            doomed = QuotationLineItem.objects.filter(
+                pk__in=deletes, section__quotation=quotation,
+            )
+            touched.update(doomed.values_list('section_id', flat=True).distinct())
+            price_keys = set(doomed.values_list('vendor_id', 'item_key', 'vol_unit'))
+            deleted_ids = [str(pk) for pk in doomed.values_list('pk', flat=True)]
+            doomed.delete()
+
+            # ── Updates — apply in memory, one bulk_update ────────────────────
+            fields = {'updated_at'}
+            for row in updates:
+                item = items[row['id']]
+                touched.add(item.section_id)
+                for field, value in row.items():
+                    if field == 'id':
+                        continue
+                    setattr(item, field, value)
+                    fields.add(field)
+                item.section    = sections[item.section_id]
+                item.vendor     = vendors.get(item.vendor_id)
+                item.updated_at = now
+                item.calculate()
+                touched.add(item.section_id)
+                price_keys.update([item._loaded_price_key, item.price_key])
+            if items:
+                fields.update([
+                    'total_modal', 'margin_amt', 'total_margin',
+                    'pph_amt', 'client_price', 'total_client', 'item_key',
+                ])
+                QuotationLineItem.objects.bulk_update(items.values(), sorted(fields))
+
+            # ── Creates — one bulk_create ─────────────────────────────────────
+            created = []
+            for row in creates:
+                row = dict(row)
+                row.pop('id', None)
+                section_id = row.pop('section_id')
+                item = QuotationLineItem(section=sections[section_id], **row)
+                item.vendor = vendors.get(item.vendor_id)
+                item.calculate()
+                created.append(item)
+                touched.add(section_id)
+                price_keys.add(item.price_key)
+            QuotationLineItem.objects.bulk_create(created)
+
+            # ── Recalculate each touched section and the quotation once ───────
+            for section_id in touched:
+                sections[section_id].recalculate(cascade=False)
+            quotation.recalculate()
+            refresh_price_index(request.user.pk, price_keys)
+
+        return Response({
+            'updated':  LineItemOrganizerSerializer(items.values(), many=True).data,
+            'created':  LineItemOrganizerSerializer(created, many=True).data,
+            'deleted':  deleted_ids,
+            'sections': [
+                {
+                    'id':               str(section_id),
+                    'subtotal_modal':   sections[section_id].subtotal_modal,
+                    'subtotal_client':  sections[section_id].subtotal_client,
+                }
+                for section_id in touched
+            ],
+            'totals':   QuotationSummarySerializer(quotation).data,
+        })
+
+    @action(detail=True, methods=['post'])
+    def simulate(self, request, pk=None):
+        """
+        POST /api/v1/mice/quotations/{id}/simulate/
+        Body: { "scenarios": [
+            { "name": "fee 8%", "fee_management_pct": "0.08" },
+            { "name": "catering 20%", "category_margins": { "catering": "0.20" } }
+        ] }
+        Read-only what-if pricing. Line items are loaded once and every
+        scenario is evaluated in a single vectorised pass. The first result
+        is always the unmodified baseline.
+        """
+        quotation = get_object_or_404(
+            Quotation, pk=pk, mice_project__organizer=request.user,
+        )
+        serializer = PricingSimulationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        scenarios = [{'name': 'baseline'}] + serializer.validated_data['scenarios']
+        pricer    = QuotationPricer(quotation)
+        results   = pricer.simulate(scenarios)
+        return Response({
+            'quotation':    str(quotation.pk),
+            'line_items':   len(pricer),
+            'baseline':     results[0],
+            'scenarios':    results[1:],
+        })
+
     @action(detail=True, methods=['post'])
     def send_to_client(self, request, pk=None):
         """
@@ -243,9 +464,11 @@ class QuotationViewSet(viewsets.ModelViewSet):
         term = request.data.get('term')
         if term == 1:
             Quotation.objects.filter(pk=quotation.pk).update(payment_term_1_paid=True)
+            quotation.sync_rollups()
             return Response({'term': 1, 'paid': True})
         elif term == 2:
             Quotation.objects.filter(pk=quotation.pk).update(payment_term_2_paid=True)
+            quotation.sync_rollups()
             return Response({'term': 2, 'paid': True})
         return Response(
             {'detail': 'term must be 1 or 2'},
@@ -255,9 +478,10 @@ class QuotationViewSet(viewsets.ModelViewSet):
 
 # ── QuotationSection ──────────────────────────────────────────────────────────
 
-class QuotationSectionViewSet(viewsets.ModelViewSet):
+class QuotationSectionViewSet(SortOrderMixin, viewsets.ModelViewSet):
     """
     /api/v1/mice/quotations/{quotation_id}/sections/
+    /api/v1/mice/quotations/{quotation_id}/sections/reorder/ and /move/
     """
     permission_classes = [IsAuthenticated]
 
@@ -318,9 +542,10 @@ class QuotationSectionViewSet(viewsets.ModelViewSet):
 
 # ── QuotationLineItem ─────────────────────────────────────────────────────────
 
-class QuotationLineItemViewSet(viewsets.ModelViewSet):
+class QuotationLineItemViewSet(SortOrderMixin, viewsets.ModelViewSet):
     """
     /api/v1/mice/sections/{section_id}/items/
+    /api/v1/mice/sections/{section_id}/items/reorder/ and /move/
     """
     permission_classes = [IsAuthenticated]
 
@@ -391,6 +616,7 @@ class QuotationLineItemViewSet(viewsets.ModelViewSet):
 
         # Single recalculate after all items inserted
         section.recalculate()
+        refresh_price_index(request.user.pk, [obj.price_key for obj in created])
 
         return Response(
             LineItemOrganizerSerializer(
@@ -399,24 +625,39 @@ class QuotationLineItemViewSet(viewsets.ModelViewSet):
             status=status.HTTP_201_CREATED,
         )
 
-    @action(detail=False, methods=['post'])
-    def reorder(self, request, section_pk=None):
-        """
-        POST /api/v1/mice/sections/{section_pk}/items/reorder/
-        Body: { "order": ["uuid1", "uuid2", "uuid3"] }
-        Updates sort_order for all items in one call.
-        """
-        section = get_object_or_404(
-            QuotationSection,
-            pk=section_pk,
-            quotation__mice_project__organizer=request.user,
-        )
-        order = request.data.get('order', [])
-        for i, item_id in enumerate(order):
-            QuotationLineItem.objects.filter(
-                pk=item_id, section=section
-            ).update(sort_order=i)
-        return Response({'reordered': len(order)})
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def line_item_autocomplete(request):
+    """
+    GET /api/v1/mice/line-items/autocomplete/?q=sound sys&limit=10
+    Past line items of the organizer to reuse in the quotation editor —
+    one result per distinct item/detail/vendor, at its latest price.
+    """
+    limit = _limit_param(request, default=10, maximum=50)
+    if limit is None:
+        return Response({'detail': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(autocomplete_line_items(request.user, request.query_params.get('q', ''), limit))
+
+
+def _bundle_response(project, assets, suffix=''):
+    """Streaming ZIP response for `assets`; 404 when nothing matches."""
+    try:
+        members = bundles.plan(assets.select_related('sub_event'))
+    except DjangoValidationError:
+        return Response({'detail': 'sub_event must be an id'}, status=status.HTTP_400_BAD_REQUEST)
+    if not members:
+        return Response({'detail': 'No assets match'}, status=status.HTTP_404_NOT_FOUND)
+    response = StreamingHttpResponse(
+        (chunk for chunk in bundles.stream(members) if chunk),
+        content_type='application/zip',
+    )
+    response['Content-Length']      = bundles.archive_size(members)
+    response['Content-Disposition'] = (
+        f'attachment; filename="{bundles.bundle_filename(project, suffix)}"'
+    )
+    response['X-Bundle-Files']      = len(members)
+    return response
 
 
 # ── Client portal (PUBLIC — no auth) ─────────────────────────────────────────
@@ -445,6 +686,49 @@ def quotation_client_portal(request, token):
     )
 
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def quotation_client_diff(request, token):
+    """
+    GET /api/v1/mice/quotation/portal/{token}/diff/?base=2
+    Public endpoint — what changed since an earlier revision the client
+    received. Defaults to the previous revision. Client prices only.
+    Both revisions must have been sent to the client.
+    """
+    revisions = {
+        q.client_token: q for q in Quotation.objects.filter(
+            mice_project__quotations__client_token=token,
+        )
+    }
+    target = revisions.get(token)
+    if target is None:
+        return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+    if target.status == QuotationStatus.DRAFT:
+        return Response(
+            {'detail': 'This quotation is not yet available for review'},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+    if target.sent_at is None:
+        return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+    try:
+        base_rev = int(request.query_params.get('base', target.revision - 1))
+    except ValueError:
+        return Response(
+            {'detail': 'base must be a revision number'},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    base = next(
+        (q for q in revisions.values()
+         if q.revision == base_rev and q.sent_at is not None),
+        None,
+    )
+    if base is None:
+        return Response(
+            {'detail': 'Revision not found'}, status=status.HTTP_404_NOT_FOUND,
+        )
+    return Response(diff_quotations(base, target, client=True))
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def quotation_client_approve(request, token):
@@ -470,9 +754,60 @@ def quotation_client_approve(request, token):
     })
 
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def quotation_client_assets(request, token):
+    """
+    GET /api/v1/mice/quotation/portal/{token}/assets/?asset_type=
+    Public endpoint — the project's client-visible assets, with signed
+    file and preview URLs.
+    """
+    quotation = get_object_or_404(
+        Quotation.objects.select_related('mice_project'), client_token=token,
+    )
+    if quotation.status == QuotationStatus.DRAFT:
+        return Response(
+            {'detail': 'This quotation is not yet available for review'},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+    assets = quotation.mice_project.assets.filter(client_visible=True).order_by('asset_type', '-created_at')
+    asset_type = request.query_params.get('asset_type')
+    if asset_type:
+        assets = assets.filter(asset_type=asset_type)
+    return Response(
+        ProjectAssetClientSerializer(assets, many=True, context={'request': request}).data
+    )
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def quotation_client_asset_bundle(request, token):
+    """
+    GET /api/v1/mice/quotation/portal/{token}/assets/bundle/?asset_type=&sub_event=
+    Public endpoint — ZIP of the project's client-visible assets.
+    """
+    quotation = get_object_or_404(
+        Quotation.objects.select_related('mice_project'), client_token=token,
+    )
+    if quotation.status == QuotationStatus.DRAFT:
+        return Response(
+            {'detail': 'This quotation is not yet available for review'},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+    project = quotation.mice_project
+    assets  = project.assets.filter(client_visible=True).order_by('asset_type', '-created_at')
+    asset_type = request.query_params.get('asset_type')
+    if asset_type:
+        assets = assets.filter(asset_type=asset_type)
+    sub_event = request.query_params.get('sub_event')
+    if sub_event:
+        assets = assets.filter(sub_event_id=sub_event)
+    return _bundle_response(project, assets)
+
+
 # ── ProjectTask ───────────────────────────────────────────────────────────────
 
-class ProjectTaskViewSet(viewsets.ModelViewSet):
+class ProjectTaskViewSet(SortOrderMixin, viewsets.ModelViewSet):
     serializer_class    = ProjectTaskSerializer
     permission_classes  = [IsAuthenticated]
 
@@ -493,12 +828,123 @@ class ProjectTaskViewSet(viewsets.ModelViewSet):
         )
         serializer.save(mice_project=project)
 
+    def get_reorder_queryset(self):
+        # Tasks are ordered per project — refuse to rank across projects
+        if not (self.kwargs.get('project_pk') or self.request.query_params.get('project')):
+            raise ValidationError({'project': 'project is required to reorder tasks'})
+        return self.get_queryset()
+
     @action(detail=True, methods=['post'])
     def complete(self, request, pk=None):
         task = self.get_object()
         task.complete()
         return Response(self.get_serializer(task).data)
 
+    def _workload_scope(self):
+        """
+        Cross-project scope: the organizer's projects plus the caller's own
+        assignments. ?assignee= narrows to one person ('me' for the caller).
+        """
+        tasks = workload.visible_tasks(self.request.user)
+        if self.kwargs.get('project_pk'):
+            tasks = tasks.filter(mice_project_id=self.kwargs['project_pk'])
+        assignee = self.request.query_params.get('assignee')
+        if assignee == 'me':
+            tasks = tasks.filter(assigned_to=self.request.user)
+        elif assignee:
+            tasks = tasks.filter(assigned_to_id=assignee)
+        return tasks
+
+    @action(detail=False, methods=['get'])
+    def workload(self, request, project_pk=None):
+        """
+        GET /api/v1/mice/tasks/workload/?bucket=week&periods=6&assignee=
+        Open, overdue and due-this-week counts per assignee across all
+        projects, with a load histogram of what falls due per day or week.
+        """
+        bucket = request.query_params.get('bucket', 'week')
+        try:
+            periods = min(max(int(request.query_params.get('periods', 6)), 1), workload.MAX_PERIODS)
+        except ValueError:
+            periods = None
+        if bucket not in workload.BUCKETS or periods is None:
+            return Response(
+                {'detail': 'bucket must be day or week and periods a number'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            rows = workload.workload(self._workload_scope(), bucket, periods)
+        except DjangoValidationError:
+            return Response({'detail': 'assignee must be an id'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'bucket': bucket, 'assignees': rows})
+
+    @action(detail=False, methods=['get'])
+    def board(self, request, project_pk=None):
+        """
+        GET /api/v1/mice/tasks/board/?assignee=me&limit=20&page=1&status=
+        Kanban columns per status across projects; page one column with
+        ?status=&page=.
+        """
+        page_size = _limit_param(request, default=20, maximum=100)
+        try:
+            page = max(int(request.query_params.get('page', 1)), 1)
+        except ValueError:
+            page = None
+        if page is None or page_size is None:
+            return Response(
+                {'detail': 'page and limit must be numbers'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        task_status = request.query_params.get('status')
+        if task_status and task_status not in TaskStatus.values:
+            return Response({'detail': 'Unknown status'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            return Response(workload.board(
+                request, self._workload_scope(), BoardTaskSerializer,
+                task_status, page, page_size,
+            ))
+        except DjangoValidationError:
+            return Response({'detail': 'assignee must be an id'}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class TaskDependencyViewSet(mixins.ListModelMixin,
+                            mixins.CreateModelMixin,
+                            mixins.DestroyModelMixin,
+                            viewsets.GenericViewSet):
+    """
+    Finish-to-start dependencies between a project's tasks.
+    GET    /api/v1/mice/projects/{project_id}/dependencies/
+    POST   /api/v1/mice/projects/{project_id}/dependencies/       — {predecessor, successor, lag}
+    DELETE /api/v1/mice/projects/{project_id}/dependencies/{id}/
+    Edges that would close a cycle are refused with 400.
+    """
+    serializer_class    = TaskDependencySerializer
+    permission_classes  = [IsAuthenticated]
+
+    def get_queryset(self):
+        return TaskDependency.objects.filter(
+            successor__mice_project_id=self.kwargs['project_pk'],
+            successor__mice_project__organizer=self.request.user,
+        ).select_related('predecessor', 'successor').order_by('created_at')
+
+    def create(self, request, *args, **kwargs):
+        project = get_object_or_404(
+            MICEProject, pk=self.kwargs['project_pk'], organizer=request.user,
+        )
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        if {data['predecessor'].mice_project_id, data['successor'].mice_project_id} != {project.pk}:
+            return Response(
+                {'detail': 'Both tasks must belong to this project'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            edge = TaskDependency.link(data['predecessor'], data['successor'], data.get('lag'))
+        except DjangoValidationError as e:
+            return Response({'detail': ' '.join(e.messages)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self.get_serializer(edge).data, status=status.HTTP_201_CREATED)
+
 
 # ── ProjectAsset ──────────────────────────────────────────────────────────────
 
@@ -551,43 +997,203 @@ class ProjectAssetViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], url_path='by-type')
     def by_type(self, request, *args, **kwargs):
         """
-        Return assets grouped by type.
-        Used by the Asset Hub UI.
+        GET /api/v1/mice/projects/{project_id}/assets/by-type/
+            ?limit=20&page=1&type=key_visual
+        Assets grouped by type, as used by the Asset Hub UI. Every group
+        carries its full count and size and shows page `page`; pass `type`
+        to page through a single group.
         """
         project_id = self.kwargs.get('project_pk') or request.query_params.get('project')
         if not project_id:
             return Response({'error': 'project_id required'}, status=400)
+        project = get_object_or_404(MICEProject, pk=project_id, organizer=request.user)
 
-        assets = ProjectAsset.objects.filter(
-            mice_project_id=project_id,
-            mice_project__organizer=request.user,
-        ).select_related('uploaded_by').order_by('asset_type', '-created_at')
-
-        # Group by asset_type
-        grouped = {}
-        type_labels = dict(ProjectAsset.ASSET_TYPES)
-
-        for asset in assets:
-            t = asset.asset_type
-            if t not in grouped:
-                grouped[t] = {
-                    'type':     t,
-                    'label':    type_labels.get(t, t),
-                    'assets':   [],
-                    'count':    0,
-                    'internal': t == 'contract',  # vendor contracts always internal
-                }
-            serializer = ProjectAssetSerializer(
-                asset, context={'request': request}
+        asset_type = request.query_params.get('type')
+        if asset_type and asset_type not in dict(ProjectAsset.ASSET_TYPES):
+            return Response({'detail': 'Unknown asset type'}, status=status.HTTP_400_BAD_REQUEST)
+        page_size = _limit_param(request, default=20, maximum=100)
+        try:
+            page = max(int(request.query_params.get('page', 1)), 1)
+        except ValueError:
+            page = None
+        if page is None or page_size is None:
+            return Response(
+                {'detail': 'page and limit must be numbers'},
+                status=status.HTTP_400_BAD_REQUEST,
             )
-            grouped[t]['assets'].append(serializer.data)
-            grouped[t]['count'] += 1
 
-        # Return in consistent order matching ASSET_TYPES
-        order = [t for t, _ in ProjectAsset.ASSET_TYPES]
-        result = [grouped[t] for t in order if t in grouped]
+        return Response(asset_hub.grouped_assets(
+            request, project.pk, ProjectAssetSerializer,
+            asset_type=asset_type, page=page, page_size=page_size,
+        ))
+
+    @action(detail=False, methods=['get'])
+    def bundle(self, request, *args, **kwargs):
+        """
+        GET /api/v1/mice/projects/{project_id}/assets/bundle/
+            ?asset_type=key_visual&sub_event={id}&client_visible=true
+        Streams a ZIP of the matching assets with an exact Content-Length.
+        """
+        project_id = self.kwargs.get('project_pk') or request.query_params.get('project')
+        if not project_id:
+            return Response({'detail': 'project is required'}, status=status.HTTP_400_BAD_REQUEST)
+        project = get_object_or_404(MICEProject, pk=project_id, organizer=request.user)
+
+        assets = self.get_queryset().filter(mice_project=project)
+        sub_event = request.query_params.get('sub_event')
+        if sub_event:
+            assets = assets.filter(sub_event_id=sub_event)
+        client_visible = request.query_params.get('client_visible')
+        if client_visible in ('true', 'false'):
+            assets = assets.filter(client_visible=client_visible == 'true')
+        return _bundle_response(project, assets)
+
+
+# ── Chunked asset uploads ─────────────────────────────────────────────────────
+
+class AssetUploadViewSet(
+    mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet,
+):
+    """
+    Resumable chunked uploads that end as a ProjectAsset.
+    POST   /api/v1/mice/projects/{project_id}/uploads/                — initiate
+    GET    /api/v1/mice/projects/{project_id}/uploads/{id}/           — state, parts received
+    PUT    /api/v1/mice/projects/{project_id}/uploads/{id}/parts/{n}/ — raw part bytes
+    POST   /api/v1/mice/projects/{project_id}/uploads/{id}/complete/  — { "sha256": "…" }, then
+                                                                        poll GET until completed
+    DELETE /api/v1/mice/projects/{project_id}/uploads/{id}/           — abort
+    """
+    serializer_class    = AssetUploadSerializer
+    permission_classes  = [IsAuthenticated]
+
+    def get_queryset(self):
+        return AssetUpload.objects.filter(
+            mice_project__organizer=self.request.user,
+            mice_project=self.kwargs['project_pk'],
+        ).select_related('asset').prefetch_related('parts')
+
+    def create(self, request, project_pk=None):
+        project = get_object_or_404(MICEProject, pk=project_pk, organizer=request.user)
+        serializer = AssetUploadInitiateSerializer(data=request.data, context={'project': project})
+        serializer.is_valid(raise_exception=True)
+        try:
+            upload = uploads.initiate(project, request.user, **serializer.validated_data)
+        except uploads.UploadError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            AssetUploadSerializer(upload, context={'request': request}).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    def destroy(self, request, project_pk=None, pk=None):
+        upload = self.get_object()
+        if upload.status in (UploadStatus.ASSEMBLING, UploadStatus.COMPLETED):
+            return Response(
+                {'detail': f'Upload is already {upload.status}'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        uploads.abort(upload)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=True, methods=['put'], url_path=r'parts/(?P<number>[0-9]+)')
+    def part(self, request, project_pk=None, pk=None, number=None):
+        """
+        PUT …/uploads/{id}/parts/{n}/ with the raw bytes as the body.
+        Optional header X-Content-SHA256 verifies the part on arrival.
+        The body is streamed to storage — request.data is never parsed.
+        """
+        upload = self.get_object()
+        try:
+            part = uploads.store_part(
+                upload, int(number), request.stream or io.BytesIO(),
+                sha256=request.headers.get('X-Content-SHA256'),
+            )
+        except uploads.UploadError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'number': part.number, 'size': part.size, 'sha256': part.sha256})
+
+    @action(detail=True, methods=['post'])
+    def complete(self, request, project_pk=None, pk=None):
+        """
+        POST …/uploads/{id}/complete/ — Body: { "sha256": "<hex of the whole file>" }
+        Queues the upload for assembly (202). GET the upload until it is
+        `completed` with its asset, or back to `active` with an error.
+        """
+        upload = self.get_object()
+        sha256 = request.data.get('sha256')
+        if not sha256:
+            return Response({'detail': 'sha256 is required'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            upload = uploads.complete(upload, sha256)
+        except uploads.UploadError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            AssetUploadSerializer(upload, context={'request': request}).data,
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+# ── Financial analytics ───────────────────────────────────────────────────────
+
+class FinancialAnalyticsViewSet(viewsets.ViewSet):
+    """
+    Organizer-wide financial analytics, served from FinancialRollup.
+    /api/v1/mice/analytics/pipeline/
+    /api/v1/mice/analytics/realized-margin/
+    /api/v1/mice/analytics/receivables-aging/
+    /api/v1/mice/analytics/top-clients/
+
+    Ranges are whole months: ?from=2025-01&to=2025-06 (both optional).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def _period_range(self, request):
+        bounds = []
+        for param in ('from', 'to'):
+            value = request.query_params.get(param)
+            if not value:
+                bounds.append(None)
+                continue
+            try:
+                bounds.append(datetime.datetime.strptime(value, '%Y-%m').date())
+            except ValueError:
+                raise ValidationError({param: 'Expected a month as YYYY-MM'})
+        return bounds
+
+    @action(detail=False, methods=['get'])
+    def pipeline(self, request):
+        """GET /api/v1/mice/analytics/pipeline/ — value per quotation status."""
+        start, end = self._period_range(request)
+        return Response(rollups.pipeline(request.user, start, end))
+
+    @action(detail=False, methods=['get'], url_path='realized-margin')
+    def realized_margin(self, request):
+        """GET /api/v1/mice/analytics/realized-margin/ — approved revenue & margin per month."""
+        start, end = self._period_range(request)
+        return Response(rollups.realized_margin(request.user, start, end))
+
+    @action(detail=False, methods=['get'], url_path='receivables-aging')
+    def receivables_aging(self, request):
+        """GET /api/v1/mice/analytics/receivables-aging/ — unpaid terms by months overdue."""
+        return Response(rollups.receivables_aging(request.user))
+
+    @action(detail=False, methods=['get'], url_path='top-clients')
+    def top_clients(self, request):
+        """
+        GET /api/v1/mice/analytics/top-clients/?basis=realized|pipeline&limit=10
+        """
+        start, end = self._period_range(request)
+        basis = request.query_params.get('basis', RollupMetric.REALIZED)
+        if basis not in (RollupMetric.REALIZED, RollupMetric.PIPELINE):
+            return Response(
+                {'detail': 'basis must be "realized" or "pipeline"'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        limit = _limit_param(request, default=10, maximum=100)
+        if limit is None:
+            return Response({'detail': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(rollups.top_clients(request.user, start, end, basis=basis, limit=limit))
 
-        return Response(result)
 
 # ── Vendor ────────────────────────────────────────────────────────────────────
 
@@ -608,3 +1214,50 @@ class VendorViewSet(viewsets.ModelViewSet):
         if search:
             qs = qs.filter(name__icontains=search)
         return qs.order_by('name')
+
+    def perform_create(self, serializer):
+        serializer.save()
+        recent_lookups.clear(self.request.user.pk)
+
+    def perform_update(self, serializer):
+        serializer.save()
+        recent_lookups.clear(self.request.user.pk)
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        recent_lookups.clear(self.request.user.pk)
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """
+        GET /api/v1/mice/vendors/autocomplete/?q=bali snd&limit=10
+        Prefix + fuzzy vendor search, ranked by similarity and recency.
+        `partial` is true when the latency budget cut the fuzzy stage.
+        """
+        limit = _limit_param(request, default=10, maximum=50)
+        if limit is None:
+            return Response({'detail': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(autocomplete_vendors(request.user, request.query_params.get('q', ''), limit))
+
+    @action(detail=False, methods=['get'])
+    def rates(self, request):
+        """
+        GET /api/v1/mice/vendors/rates/?q=ballroom&vendor=&category=&vol_unit=&limit=10
+        Suggested modal rates from past line items, read from VendorPriceIndex.
+        Vendor-specific rows come first, then category-wide ones.
+        """
+        query = request.query_params.get('q', '')
+        limit = _limit_param(request, default=10, maximum=50)
+        if limit is None:
+            return Response({'detail': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            rows = suggest_rates(
+                request.user, query,
+                vendor      = request.query_params.get('vendor'),
+                category    = request.query_params.get('category'),
+                vol_unit    = request.query_params.get('vol_unit'),
+                limit       = limit,
+            )
+        except DjangoValidationError:
+            return Response({'detail': 'Invalid vendor id'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(VendorRateSerializer(rows, many=True).data)
@@ -0,0 +1,143 @@
+# =============================================================================
+# apps/mice/workload.py
+# =============================================================================
+# Cross-project views of ProjectTask by assignee.
+#
+#   workload — per assignee: open, overdue, blocked and due-this-week counts
+#              plus a load histogram (tasks and planned duration due per day
+#              or week). One GROUP BY assigned_to over open tasks, with one
+#              filtered COUNT/SUM per bucket — the (assigned_to, status)
+#              index narrows the rows, the partial open-tasks-by-due_at
+#              index serves the date ranges.
+#   board    — Kanban columns per status, each paged independently: one
+#              grouped count and one ROW_NUMBER() query for every column's
+#              page at once (the same shape as asset_hub.grouped_assets).
+# =============================================================================
+
+import datetime
+
+from django.db.models import Count, F, Q, Sum, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from .models import OPEN_TASK_STATUSES, ProjectTask, TaskStatus
+
+BUCKETS         = {'day': datetime.timedelta(days=1), 'week': datetime.timedelta(weeks=1)}
+MAX_PERIODS     = 26
+
+
+def visible_tasks(user):
+    """Tasks of the user's own projects, plus tasks assigned to them anywhere."""
+    return ProjectTask.objects.filter(Q(mice_project__organizer=user) | Q(assigned_to=user))
+
+
+def _period_start(now, bucket):
+    start = timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0)
+    if bucket == 'week':
+        start -= datetime.timedelta(days=start.weekday())
+    return start
+
+
+def workload(tasks, bucket='week', periods=6, now=None):
+    """
+    [{assignee, name, email, open, overdue, blocked, due_this_week,
+      unscheduled, later, load: [{start, tasks, duration}]}], busiest first.
+    `tasks` is the queryset in scope (already filtered by user / project).
+    """
+    now         = now or timezone.now()
+    width       = BUCKETS[bucket]
+    start       = _period_start(now, bucket)
+    edges       = [start + width * i for i in range(periods + 1)]
+    week_end    = _period_start(now, 'week') + BUCKETS['week']
+
+    aggregates = {
+        'open':             Count('pk'),
+        'overdue':          Count('pk', filter=Q(due_at__lt=now)),
+        'blocked':          Count('pk', filter=Q(status=TaskStatus.BLOCKED)),
+        'due_this_week':    Count('pk', filter=Q(due_at__gte=now, due_at__lt=week_end)),
+        'unscheduled':      Count('pk', filter=Q(due_at__isnull=True)),
+        'later':            Count('pk', filter=Q(due_at__gte=edges[-1])),
+    }
+    for i in range(periods):
+        window = Q(due_at__gte=edges[i], due_at__lt=edges[i + 1])
+        aggregates[f'tasks_{i}']    = Count('pk', filter=window)
+        aggregates[f'duration_{i}'] = Sum('duration', filter=window)
+
+    rows = (
+        tasks.filter(assigned_to__isnull=False, status__in=OPEN_TASK_STATUSES)
+        .order_by()
+        .values(
+            'assigned_to', 'assigned_to__first_name', 'assigned_to__last_name',
+            'assigned_to__username', 'assigned_to__email',
+        )
+        .annotate(**aggregates)
+    )
+
+    result = []
+    for row in rows:
+        name = f"{row['assigned_to__first_name']} {row['assigned_to__last_name']}".strip()
+        result.append({
+            'assignee':         row['assigned_to'],
+            'name':             name or row['assigned_to__username'],
+            'email':            row['assigned_to__email'],
+            'open':             row['open'],
+            'overdue':          row['overdue'],
+            'blocked':          row['blocked'],
+            'due_this_week':    row['due_this_week'],
+            'unscheduled':      row['unscheduled'],
+            'later':            row['later'],
+            'load': [
+                {
+                    'start':    edges[i],
+                    'tasks':    row[f'tasks_{i}'],
+                    'duration': row[f'duration_{i}'] or datetime.timedelta(0),
+                }
+                for i in range(periods)
+            ],
+        })
+    result.sort(key=lambda r: (-r['open'], -r['overdue'], r['name']))
+    return result
+
+
+def board(request, tasks, serializer_class, status=None, page=1, page_size=20):
+    """
+    [{status, label, count, page, pages, tasks}] in TaskStatus order. Every
+    column shows page `page`, or only `status` when given. Columns list the
+    soonest due first, undated tasks last.
+    """
+    if status:
+        tasks = tasks.filter(status=status)
+
+    counts = dict(
+        tasks.order_by().values_list('status').annotate(count=Count('pk'))
+    )
+
+    offset = (page - 1) * page_size
+    rows = list(
+        tasks.filter(status__in=counts)
+        .select_related('assigned_to', 'sub_event', 'mice_project')
+        .annotate(position=Window(
+            RowNumber(), partition_by=[F('status')],
+            order_by=[F('due_at').asc(nulls_last=True), F('sort_order').asc(), F('pk').asc()],
+        ))
+        .filter(position__gt=offset, position__lte=offset + page_size)
+        .order_by('status', 'position')
+    )
+    serialized = serializer_class(rows, many=True, context={'request': request}).data
+
+    columns = {}
+    for task, data in zip(rows, serialized):
+        columns.setdefault(task.status, []).append(data)
+
+    return [
+        {
+            'status':   value,
+            'label':    label,
+            'count':    counts.get(value, 0),
+            'page':     page,
+            'pages':    -(-counts.get(value, 0) // page_size),
+            'tasks':    columns.get(value, []),
+        }
+        for value, label in TaskStatus.choices
+        if not status or value == status
+    ]
@@ -0,0 +1,20 @@
+# apps/notifications/admin.py
+from django.contrib import admin
+from .models import OutboxMessage, OutboxStatus
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display    = ['kind', 'recipient', 'subject', 'status', 'attempts', 'next_attempt_at', 'sent_at']
+    list_filter     = ['status', 'kind', 'digest']
+    search_fields   = ['recipient', 'subject']
+    readonly_fields = ['created_at', 'sent_at', 'last_error']
+    actions         = ['retry']
+
+    @admin.action(description='Retry selected messages now')
+    def retry(self, request, queryset):
+        from django.utils import timezone
+        count = queryset.exclude(status=OutboxStatus.SENT).update(
+            status=OutboxStatus.PENDING, attempts=0, next_attempt_at=timezone.now(),
+        )
+        self.message_user(request, f'{count} messages requeued')
@@ -0,0 +1,9 @@
+# apps/notifications/apps.py
+from django.apps import AppConfig
+
+
+class NotificationsConfig(AppConfig):
+    default_auto_field  = 'django.db.models.BigAutoField'
+    name                = 'apps.notifications'
+    label               = 'notifications'
+    verbose_name        = 'Notifications'
@@ -0,0 +1,56 @@
+# backend/apps/notifications/management/commands/drain_outbox.py
+
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.notifications.outbox import drain, requeue_failed
+
+BACKENDS = {
+    'console':  'django.core.mail.backends.console.EmailBackend',
+    'file':     'django.core.mail.backends.filebased.EmailBackend',
+    'smtp':     'django.core.mail.backends.smtp.EmailBackend',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Deliver queued outbox emails in batches over one connection, with '
+        'retries and per-recipient rate limits. '
+        'Run from cron, or keep it running with --interval.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--backend', choices=sorted(BACKENDS), default=None,
+                            help='Override OUTBOX_EMAIL_BACKEND / EMAIL_BACKEND, e.g. console or file for offline runs')
+        parser.add_argument('--file-path', default=None,
+                            help='Directory for --backend file (default EMAIL_FILE_PATH)')
+        parser.add_argument('--retry-failed', action='store_true',
+                            help='Requeue messages that used up their attempts first')
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Seconds between passes; 0 (default) runs once and exits')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] is not None and options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        if options['interval'] < 0:
+            raise CommandError('--interval must be zero or positive')
+        if options['file_path'] and options['backend'] != 'file':
+            raise CommandError('--file-path needs --backend file')
+
+        if options['retry_failed']:
+            self.stdout.write(f'Requeued {requeue_failed()} messages')
+
+        while True:
+            connection = None
+            if options['backend']:
+                extra = {'file_path': options['file_path']} if options['file_path'] else {}
+                connection = get_connection(BACKENDS[options['backend']], **extra)
+            counts  = drain(batch_size=options['batch_size'], connection=connection)
+            summary = ', '.join(f'{n} {name}' for name, n in counts.items())
+            self.stdout.write(self.style.SUCCESS(f'Outbox: {summary}'))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,61 @@
+# =============================================================================
+# apps/notifications/models.py
+# =============================================================================
+# Transactional outbox for outgoing email.
+#
+# Domain code never talks to SMTP. It writes an OutboxMessage in the same
+# transaction as the change the email is about (outbox.enqueue), so a
+# rolled-back change sends nothing and a committed one is never lost. The
+# drain_outbox worker delivers pending messages later — see outbox.py.
+# =============================================================================
+
+from django.db import models
+
+
+class OutboxStatus(models.TextChoices):
+    PENDING = 'pending', 'Pending'
+    SENT    = 'sent',    'Sent'
+    FAILED  = 'failed',  'Failed'       # gave up after MAX_ATTEMPTS
+
+
+class OutboxMessage(models.Model):
+    """
+    One email waiting for (or done with) delivery.
+
+    next_attempt_at doubles as the worker's lease: claiming a message pushes
+    it into the future, so a crashed worker's batch simply becomes due
+    again. `digest` messages wait a short window and are combined with the
+    recipient's other digestible messages into a single email.
+    """
+    id              = models.BigAutoField(primary_key=True)
+    kind            = models.CharField(max_length=50, help_text='e.g. registration_confirmed')
+    recipient       = models.EmailField()
+    subject         = models.CharField(max_length=300)
+    body            = models.TextField()
+    digest          = models.BooleanField(default=False)
+
+    status          = models.CharField(
+        max_length=10, choices=OutboxStatus.choices, default=OutboxStatus.PENDING,
+    )
+    attempts        = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField()
+    last_error      = models.TextField(blank=True)
+
+    created_at      = models.DateTimeField(auto_now_add=True)
+    sent_at         = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table    = 'notifications_outbox'
+        ordering    = ['-created_at']
+        indexes     = [
+            # The worker's queue: pending messages by due time
+            models.Index(
+                fields=['next_attempt_at'], name='notifications_outbox_due_idx',
+                condition=models.Q(status='pending'),
+            ),
+            # Per-recipient rate limit window
+            models.Index(fields=['recipient', 'sent_at'], name='notifications_outbox_rate_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} → {self.recipient} [{self.status}]'
@@ -0,0 +1,229 @@
+# =============================================================================
+# apps/notifications/outbox.py
+# =============================================================================
+# Writing to and draining the email outbox (OutboxMessage).
+#
+#   enqueue  — call inside the domain transaction; one INSERT, no I/O
+#              (enqueue_many: one bulk INSERT for batch jobs)
+#   drain    — the drain_outbox worker: claims due messages in batches
+#              (SELECT … FOR UPDATE SKIP LOCKED, then a lease on
+#              next_attempt_at), folds digestible messages into one email
+#              per recipient, applies the per-recipient rate limit and sends
+#              everything over one open connection. Failures are retried
+#              with exponential backoff until OUTBOX_MAX_ATTEMPTS.
+#
+# Settings (all optional):
+#   OUTBOX_EMAIL_BACKEND   backend for the worker (default EMAIL_BACKEND) —
+#                          console or filebased to run it offline
+#   OUTBOX_BATCH_SIZE      messages claimed per round trip        (100)
+#   OUTBOX_MAX_ATTEMPTS    deliveries tried before giving up      (6)
+#   OUTBOX_BACKOFF         first retry delay, doubling each time  (1 min)
+#   OUTBOX_BACKOFF_MAX     longest retry delay                    (6 h)
+#   OUTBOX_LEASE           how long a claimed batch stays hidden  (5 min)
+#   OUTBOX_DIGEST_WINDOW   how long digestible messages wait      (5 min)
+#   OUTBOX_RATE_LIMIT      (emails, seconds) per recipient        (20, 1 h)
+# =============================================================================
+
+import datetime
+import random
+from collections import Counter
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from .models import OutboxMessage, OutboxStatus
+
+
+def _setting(name, default):
+    return getattr(settings, f'OUTBOX_{name}', default)
+
+
+def _seconds(name, default):
+    value = _setting(name, default)
+    return value if isinstance(value, datetime.timedelta) else datetime.timedelta(seconds=value)
+
+
+def enqueue(recipient, subject, body, kind, digest=False):
+    """
+    Queue one email. Call it inside the transaction that makes the change
+    the email reports. Returns the OutboxMessage, or None without a
+    recipient.
+    """
+    if not recipient:
+        return None
+    delay = _seconds('DIGEST_WINDOW', 300) if digest else datetime.timedelta(0)
+    return OutboxMessage.objects.create(
+        kind=kind, recipient=recipient, subject=subject[:300], body=body,
+        digest=digest, next_attempt_at=timezone.now() + delay,
+    )
+
+
+def enqueue_many(messages, kind):
+    """
+    Queue many emails of one kind in a single bulk insert — for imports and
+    other batch jobs. `messages` are (recipient, subject, body) tuples; ones
+    without a recipient are skipped. Returns how many were queued.
+    """
+    now  = timezone.now()
+    rows = [
+        OutboxMessage(kind=kind, recipient=recipient, subject=subject[:300], body=body,
+                      next_attempt_at=now)
+        for recipient, subject, body in messages if recipient
+    ]
+    OutboxMessage.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def backoff(attempts):
+    """Delay before retry number `attempts` (1-based), with up to 10% jitter."""
+    base  = _seconds('BACKOFF', 60)
+    delay = min(base * 2 ** (attempts - 1), _seconds('BACKOFF_MAX', 6 * 60 * 60))
+    return delay * (1 + random.random() / 10)
+
+
+# ── Claiming ──────────────────────────────────────────────────────────────────
+
+def _lease(queryset, now, batch_size=None):
+    """Lock, lease and return the pks of `queryset` that no other worker holds."""
+    with transaction.atomic():
+        rows = (
+            queryset.select_for_update(skip_locked=True)
+            .order_by('next_attempt_at', 'pk')
+            .values_list('pk', flat=True)
+        )
+        ids = list(rows[:batch_size] if batch_size else rows)
+        OutboxMessage.objects.filter(pk__in=ids).update(next_attempt_at=now + _seconds('LEASE', 300))
+    return ids
+
+
+def claim(batch_size, now):
+    """
+    Up to `batch_size` due messages, plus every other pending digestible
+    message of the recipients who have a digest due — those go out together.
+    """
+    pending = OutboxMessage.objects.filter(status=OutboxStatus.PENDING)
+    ids     = _lease(pending.filter(next_attempt_at__lte=now), now, batch_size)
+    digest_recipients = set(
+        OutboxMessage.objects.filter(pk__in=ids, digest=True).values_list('recipient', flat=True)
+    )
+    if digest_recipients:
+        ids += _lease(
+            pending.filter(digest=True, recipient__in=digest_recipients).exclude(pk__in=ids), now,
+        )
+    return list(OutboxMessage.objects.filter(pk__in=ids).order_by('created_at', 'pk'))
+
+
+# ── Delivery ──────────────────────────────────────────────────────────────────
+
+def _emails(messages):
+    """[(email, [messages])] — digestible messages folded per recipient."""
+    emails, digests = [], {}
+    for message in messages:
+        if message.digest:
+            digests.setdefault(message.recipient, []).append(message)
+        else:
+            emails.append((message.subject, message.body, message.recipient, [message]))
+    for recipient, group in digests.items():
+        if len(group) == 1:
+            emails.append((group[0].subject, group[0].body, recipient, group))
+            continue
+        body = '\n\n'.join(f'── {m.subject}\n\n{m.body}' for m in group)
+        emails.append((f'{len(group)} updates: {group[0].subject}', body, recipient, group))
+    from_email = settings.DEFAULT_FROM_EMAIL
+    return [
+        (EmailMessage(subject=subject, body=body, from_email=from_email, to=[recipient]), group)
+        for subject, body, recipient, group in emails
+    ]
+
+
+def _budgets(recipients, now):
+    """
+    {recipient: (emails still allowed, when the window frees up)}. Counts
+    sent messages, so a digest uses up one slot per message it carried.
+    """
+    limit, window = _setting('RATE_LIMIT', (20, 60 * 60))
+    window = datetime.timedelta(seconds=window)
+    recent = {
+        row['recipient']: row
+        for row in OutboxMessage.objects.filter(
+            recipient__in=recipients, status=OutboxStatus.SENT, sent_at__gte=now - window,
+        ).values('recipient').annotate(emails=Count('pk'), oldest=Min('sent_at'))
+    }
+    return {
+        r: (limit - recent[r]['emails'], recent[r]['oldest'] + window) if r in recent else (limit, now + window)
+        for r in recipients
+    }
+
+
+def deliver(messages, connection, now):
+    """
+    Send claimed `messages` over `connection` and record every outcome in one
+    bulk update. Returns a Counter of emails sent and messages deferred,
+    retried and failed.
+    """
+    counts       = Counter()
+    max_attempts = _setting('MAX_ATTEMPTS', 6)
+    budgets      = _budgets({m.recipient for m in messages}, now)
+
+    for email, group in _emails(messages):
+        recipient = group[0].recipient
+        allowed, frees_at = budgets[recipient]
+        if allowed <= 0:
+            # Over the recipient's rate limit — not a failed attempt
+            for message in group:
+                message.next_attempt_at = frees_at
+            counts['deferred'] += len(group)
+            continue
+        try:
+            connection.send_messages([email])
+        except Exception as e:
+            for message in group:
+                message.attempts   += 1
+                message.last_error  = f'{type(e).__name__}: {e}'[:2000]
+                if message.attempts >= max_attempts:
+                    message.status = OutboxStatus.FAILED
+                    counts['failed'] += 1
+                else:
+                    message.next_attempt_at = now + backoff(message.attempts)
+                    counts['retried'] += 1
+            # Start the next email on a fresh connection
+            connection.close()
+            connection.open()
+        else:
+            budgets[recipient] = (allowed - len(group), frees_at)
+            for message in group:
+                message.status, message.sent_at, message.last_error = OutboxStatus.SENT, now, ''
+            counts['sent'] += 1
+
+    OutboxMessage.objects.bulk_update(
+        messages, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'],
+    )
+    return counts
+
+
+def drain(batch_size=None, now=None, connection=None):
+    """
+    Deliver everything due now, batch by batch, over one connection.
+    Returns {'sent', 'deferred', 'retried', 'failed'}.
+    """
+    now        = now or timezone.now()
+    batch_size = batch_size or _setting('BATCH_SIZE', 100)
+    connection = connection or get_connection(_setting('EMAIL_BACKEND', None))
+    counts     = Counter(sent=0, deferred=0, retried=0, failed=0)
+    with connection:
+        while True:
+            batch = claim(batch_size, now)
+            if not batch:
+                break
+            counts.update(deliver(batch, connection, now))
+    return dict(counts)
+
+
+def requeue_failed():
+    """Give failed messages a fresh set of attempts."""
+    return OutboxMessage.objects.filter(status=OutboxStatus.FAILED).update(
+        status=OutboxStatus.PENDING, attempts=0, next_attempt_at=timezone.now(),
+    )
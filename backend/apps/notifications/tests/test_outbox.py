@@ -0,0 +1,95 @@
+# backend/apps/notifications/tests/test_outbox.py
+
+import datetime
+from smtplib import SMTPServerDisconnected
+
+import pytest
+from django.core import mail
+from django.utils import timezone
+from apps.notifications.models import OutboxMessage, OutboxStatus
+from apps.notifications.outbox import backoff, drain, enqueue
+
+
+class FlakyConnection:
+    """Email backend stand-in that fails the first `failures` sends."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.sent     = []
+        self.opened   = 0
+
+    def open(self):
+        self.opened += 1
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def send_messages(self, messages):
+        if self.failures:
+            self.failures -= 1
+            raise SMTPServerDisconnected('Connection unexpectedly closed')
+        self.sent.extend(messages)
+        return len(messages)
+
+
+@pytest.mark.django_db
+class TestOutbox:
+
+    def test_rollback_discards_message(self):
+        from django.db import transaction
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                enqueue('a@test.com', 'Hi', 'Body', kind='test')
+                raise RuntimeError
+        assert not OutboxMessage.objects.exists()
+
+    def test_drain_sends_once_over_one_connection(self):
+        for i in range(3):
+            enqueue(f'user{i}@test.com', f'Subject {i}', 'Body', kind='test')
+        assert drain(batch_size=2)['sent'] == 3
+        assert [m.to for m in mail.outbox] == [['user0@test.com'], ['user1@test.com'], ['user2@test.com']]
+        assert drain()['sent'] == 0
+        assert OutboxMessage.objects.filter(status=OutboxStatus.SENT).count() == 3
+
+    def test_digestible_messages_fold_per_recipient(self, settings):
+        settings.OUTBOX_DIGEST_WINDOW = 60
+        now = timezone.now()
+        for n in range(3):
+            enqueue('pm@test.com', f'Approval {n}', f'Body {n}', kind='test', digest=True)
+        assert drain(now=now)['sent'] == 0
+        assert drain(now=now + datetime.timedelta(minutes=2))['sent'] == 1
+        assert mail.outbox[0].subject == '3 updates: Approval 0'
+        assert 'Body 2' in mail.outbox[0].body
+
+    def test_failures_back_off_then_give_up(self, settings):
+        settings.OUTBOX_MAX_ATTEMPTS = 2
+        message = enqueue('a@test.com', 'Hi', 'Body', kind='test')
+        now     = timezone.now()
+
+        assert drain(now=now, connection=FlakyConnection(failures=5))['retried'] == 1
+        message.refresh_from_db()
+        assert message.attempts == 1 and 'SMTPServerDisconnected' in message.last_error
+        assert datetime.timedelta(seconds=60) <= message.next_attempt_at - now <= datetime.timedelta(seconds=66)
+
+        later = message.next_attempt_at
+        assert drain(now=later, connection=FlakyConnection(failures=5))['failed'] == 1
+        message.refresh_from_db()
+        assert message.status == OutboxStatus.FAILED
+        assert backoff(30) <= datetime.timedelta(hours=6, minutes=36)
+
+    def test_rate_limit_defers_without_using_attempts(self, settings):
+        settings.OUTBOX_RATE_LIMIT = (2, 3600)
+        for n in range(3):
+            enqueue('busy@test.com', f'Hi {n}', 'Body', kind='test')
+        counts = drain()
+        assert (counts['sent'], counts['deferred']) == (2, 1)
+        deferred = OutboxMessage.objects.get(status=OutboxStatus.PENDING)
+        assert deferred.attempts == 0
+        assert deferred.next_attempt_at > timezone.now() + datetime.timedelta(minutes=59)
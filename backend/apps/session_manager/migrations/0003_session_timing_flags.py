@@ -0,0 +1,41 @@
+# Session.is_ongoing / has_ended become columns (they were computed
+# properties), with a partial index over sessions not yet ended. Existing
+# sessions are filled in here; Session.save() and the advance_event_status
+# command keep them current.
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_timing(apps, schema_editor):
+    Session = apps.get_model('session_manager', 'Session')
+    now = timezone.now()
+    Session.objects.filter(end_time__lt=now).update(has_ended=True)
+    Session.objects.filter(start_time__lte=now, end_time__gte=now).update(is_ongoing=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_initial'),
+        ('session_manager', '0002_initial'),
+        ('tracks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='has_ended',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='session',
+            name='is_ongoing',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(condition=models.Q(('has_ended', False)), fields=['end_time'], name='session_not_ended_idx'),
+        ),
+        migrations.RunPython(fill_timing, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# updated_at indexes for the analytics snapshots (apps/analytics), which
+# read the rows changed since a watermark.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_updated_at_index'),
+        ('session_manager', '0003_session_timing_flags'),
+        ('tracks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['updated_at'], name='session_man_updated_29f9fa_idx'),
+        ),
+    ]
@@ -6,6 +6,8 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.db.models import Q
+from django.utils import timezone
+from apps.events.cache import invalidate_on_commit
 from apps.events.models import Event
 from apps.tracks.models import Track
 
@@ -139,6 +141,10 @@ class Session(models.Model):
     slides_url = models.URLField(blank=True)
     recording_url = models.URLField(blank=True)
     
+    # Timing state, materialized by save() and the advance_event_status job
+    is_ongoing = models.BooleanField(default=False, editable=False)
+    has_ended = models.BooleanField(default=False, editable=False)
+    
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -150,6 +156,14 @@ class Session(models.Model):
         indexes = [
             models.Index(fields=['event', 'start_time']),
             models.Index(fields=['track', 'start_time']),
+            # Sessions the lifecycle job still has to advance
+            models.Index(
+                fields=['end_time'],
+                name='session_not_ended_idx',
+                condition=Q(has_ended=False),
+            ),
+            # Analytics snapshots read changes since a watermark (apps/analytics)
+            models.Index(fields=['updated_at']),
         ]
     
     def __str__(self):
@@ -204,23 +218,22 @@ class Session(models.Model):
         if not self.duration_minutes and self.start_time and self.end_time:
             self.duration_minutes = int((self.end_time - self.start_time).total_seconds() / 60)
         
+        self.refresh_timing()
         self.full_clean()
         super().save(*args, **kwargs)
+        invalidate_on_commit(self.event_id)
+    
+    def delete(self, *args, **kwargs):
+        invalidate_on_commit(self.event_id)
+        return super().delete(*args, **kwargs)
+    
+    def refresh_timing(self, now=None):
+        """Recompute is_ongoing / has_ended from the session times"""
+        now = now or timezone.now()
+        self.is_ongoing = bool(self.start_time and self.end_time and self.start_time <= now <= self.end_time)
+        self.has_ended = bool(self.end_time and now > self.end_time)
     
     @property
     def speaker_names(self):
         """Get comma-separated speaker names"""
         return ', '.join([speaker.name for speaker in self.speakers.all()])
-    
-    @property
-    def is_ongoing(self):
-        """Check if session is currently ongoing"""
-        from django.utils import timezone
-        now = timezone.now()
-        return self.start_time <= now <= self.end_time
-    
-    @property
-    def has_ended(self):
-        """Check if session has ended"""
-        from django.utils import timezone
-        return timezone.now() > self.end_time
\ No newline at end of file
@@ -4,6 +4,7 @@
 
 from django.db import models
 from django.core.exceptions import ValidationError
+from apps.events.cache import invalidate_on_commit
 from apps.events.models import Event
 
 
@@ -41,6 +42,14 @@ class Track(models.Model):
     def __str__(self):
         return f"{self.event.title} - {self.name}"
     
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_on_commit(self.event_id)
+    
+    def delete(self, *args, **kwargs):
+        invalidate_on_commit(self.event_id)
+        return super().delete(*args, **kwargs)
+    
     @property
     def session_count(self):
         """Get number of sessions in this track"""
@@ -0,0 +1,182 @@
+# ============================================
+# backend/eventmaster/media.py
+# ============================================
+# Media delivery: Django authorizes, the front proxy transfers.
+#
+# MEDIA_DELIVERY selects how the bytes leave the server:
+#   'django'   — range-aware FileResponse from gunicorn (default, and the
+#                only option without a proxy in front)
+#   'nginx'    — X-Accel-Redirect to MEDIA_ACCEL_PREFIX + <storage name>;
+#                the prefix must be an `internal` location aliased to
+#                MEDIA_ROOT
+#   'sendfile' — X-Sendfile with the absolute path (Apache mod_xsendfile,
+#                lighttpd, Caddy)
+#
+# Every mode sends the same ETag / Last-Modified / Cache-Control headers and
+# answers conditional requests with 304 before touching the file.
+# ============================================
+
+import mimetypes
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_safe
+
+PUBLIC_CACHE_CONTROL  = 'public, max-age=86400'
+PRIVATE_CACHE_CONTROL = 'private, max-age=3600'
+
+_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class _RangeReader:
+    """Reads at most `length` bytes of `file` from its current position."""
+
+    def __init__(self, file, length):
+        self.file      = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def _byte_range(header, size):
+    """
+    (start, end) inclusive for a single `bytes=` range, None when the header
+    should be ignored (absent, malformed or multi-range), or False when the
+    range cannot be satisfied.
+    """
+    match = _RANGE.match(header or '')
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if not length:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end   = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _disposition(filename, as_attachment):
+    kind = 'attachment' if as_attachment else 'inline'
+    if not filename:
+        return kind
+    try:
+        filename.encode('ascii')
+        return f'{kind}; filename="{filename}"'
+    except UnicodeEncodeError:
+        return f"{kind}; filename*=utf-8''{quote(filename)}"
+
+
+def send_file(request, name, storage=None, *, filename=None, content_type=None,
+              as_attachment=False, etag=None, cache_control=PRIVATE_CACHE_CONTROL):
+    """
+    Response delivering `name` from `storage` once the caller has authorized
+    the request. `etag` defaults to modification time and size; pass a
+    content hash when one is known.
+    """
+    storage = storage or default_storage
+    try:
+        size     = storage.size(name)
+        modified = storage.get_modified_time(name)
+    except (OSError, SuspiciousFileOperation):
+        raise Http404('File not found')
+
+    etag     = quote_etag(etag or f'{int(modified.timestamp()):x}-{size:x}')
+    modified = modified.timestamp()
+    headers  = {'ETag': etag, 'Cache-Control': cache_control}
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=modified)
+    if not_modified is not None:
+        for header, value in headers.items():
+            not_modified[header] = value
+        return not_modified
+
+    content_type = content_type or mimetypes.guess_type(filename or name)[0] or 'application/octet-stream'
+    headers.update({
+        'Last-Modified':        http_date(modified),
+        'Accept-Ranges':        'bytes',
+        'Content-Disposition':  _disposition(filename, as_attachment),
+    })
+
+    mode = getattr(settings, 'MEDIA_DELIVERY', 'django')
+    if mode == 'nginx':
+        # nginx serves ranges and conditional requests itself
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = getattr(settings, 'MEDIA_ACCEL_PREFIX', '/protected-media/') + quote(name)
+    elif mode == 'sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = storage.path(name)
+    else:
+        response = _file_response(request, storage, name, size, etag, content_type)
+
+    for header, value in headers.items():
+        response[header] = value
+    return response
+
+
+def _file_response(request, storage, name, size, etag, content_type):
+    byte_range = _byte_range(request.headers.get('Range'), size)
+    if_range   = request.headers.get('If-Range')
+    if if_range and if_range != etag:
+        # The client's partial copy is stale — send everything
+        byte_range = None
+
+    if byte_range is False:
+        response = HttpResponse(status=416, content_type=content_type)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    file = storage.open(name, 'rb')
+    if byte_range is None:
+        # Whole file: FileResponse hands the descriptor to wsgi.file_wrapper
+        response = FileResponse(file, content_type=content_type)
+        response['Content-Length'] = size
+        return response
+
+    start, end = byte_range
+    file.seek(start)
+    response = FileResponse(_RangeReader(file, end - start + 1), status=206, content_type=content_type)
+    response['Content-Length'] = end - start + 1
+    response['Content-Range']  = f'bytes {start}-{end}/{size}'
+    return response
+
+
+# ── Public media ─────────────────────────────────────────────────────────────
+
+def public_prefixes():
+    return tuple(getattr(settings, 'MEDIA_PUBLIC_PREFIXES', (
+        'avatars/', 'events/banners/', 'speakers/profiles/',
+    )))
+
+
+@require_safe
+def serve_public_media(request, path):
+    """
+    /media/<path> for files that are public by nature — avatars, event
+    banners, speaker photos. Everything else (MICE project assets) is only
+    reachable through its app's authorized, signed URLs.
+    """
+    if not path.startswith(public_prefixes()) or '..' in path.split('/'):
+        raise Http404('File not found')
+    return send_file(request, path, cache_control=PUBLIC_CACHE_CONTROL)
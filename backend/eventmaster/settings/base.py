@@ -42,6 +42,8 @@ INSTALLED_APPS = [
     'apps.tracks',
     'apps.users',
     'apps.mice',
+    'apps.notifications',
+    'apps.analytics',
 ]
 
 MIDDLEWARE = [
@@ -66,6 +66,13 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Who transfers media bytes once Django has authorized the request —
+# 'django' (range-aware FileResponse), 'nginx' (X-Accel-Redirect) or
+# 'sendfile' (X-Sendfile). For nginx, alias MEDIA_ACCEL_PREFIX to MEDIA_ROOT:
+#   location /protected-media/ { internal; alias /app/media/; }
+MEDIA_DELIVERY = os.getenv("MEDIA_DELIVERY", "django")
+MEDIA_ACCEL_PREFIX = os.getenv("MEDIA_ACCEL_PREFIX", "/protected-media/")
+
 # Future: Uncomment when switching to DO Spaces
 # DEFAULT_FILE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
 # STATICFILES_STORAGE = 'storages.backends.s3boto3.StaticRootS3Boto3Storage'
@@ -169,12 +176,19 @@ LOGGING = {
 # -------------------------------------
 # Performance (✅ ADDED)
 # -------------------------------------
-# Cache (use locmem for now, switch to Redis later)
+# Cache: locmem unless REDIS_URL is set. Per-process, so the versioned
+# response caches (apps/events/cache.py, apps/mice/asset_hub.py) stay off
+# on it — every gunicorn worker would otherwise serve its own stale copy.
 CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
     }
 }
+if os.getenv("REDIS_URL"):
+    CACHES["default"] = {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": os.getenv("REDIS_URL"),
+    }
 
 # -------------------------------------
 # Gunicorn health check endpoint (optional)
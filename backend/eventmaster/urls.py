@@ -2,13 +2,17 @@
 # backend/eventmaster/urls.py
 # ============================================
 
+import re
+
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 from drf_spectacular.views import (SpectacularAPIView, SpectacularRedocView,
                                    SpectacularSwaggerView)
 
+from eventmaster.media import serve_public_media
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/v1/', include('apps.events.urls')),
@@ -16,6 +20,7 @@ urlpatterns = [
     path('api/v1/', include('apps.tracks.urls')),
     path('api/v1/', include('apps.users.urls')),
     path('api/v1/mice/', include('apps.mice.urls')),
+    path('api/v1/analytics/', include('apps.analytics.urls')),
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
@@ -25,6 +30,13 @@ urlpatterns = [
 if settings.DEBUG:
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
 
-# ✅ Always serve media (dev AND production)
-# WhiteNoise handles /static/, Django handles /media/
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+# Media: public files (avatars, banners, speaker photos) only. MICE assets
+# go through signed URLs. With MEDIA_DELIVERY = 'nginx' / 'sendfile' the
+# proxy transfers the bytes — see eventmaster/media.py
+urlpatterns += [
+    re_path(
+        r'^%s(?P<path>.+)$' % re.escape(settings.MEDIA_URL.lstrip('/')),
+        serve_public_media,
+        name='media',
+    ),
+]
\ No newline at end of file